@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Callable, Optional
+from typing import Any, Dict, List, Callable, Optional, Tuple
 from pathlib import Path
 import json
 import asyncio
@@ -11,14 +11,31 @@ import re
 import uuid
 
 from llm.clients import LLMClient
+from llm.client_pool import LLMClientPool
+from llm.governor import Priority, llm_priority
 from .agent_prompt import build_agent_system_prompt
 from .tools.registry_cache import get_cached_registry, initialize_registry_cache
 from .tools.tool_impl import build_preferences_context  # reuse the same formatter
 from config.loader import load_runtime_config
-from .tool_summarizers import summarize_tool_result
-from .tools.result_cache import put_tool_result
+from .tool_summarizers import dumps_bytes, summarize_tool_result_bytes_async, untabulate
+from .tools.result_cache import put_tool_result, tool_dedup_key
 from ux.progress import build_progress_broadcaster
 from integrations.ttl_cache import shared_cache
+from integrations.circuit_breaker import CircuitOpenError, circuit_registry
+from integrations.deadline import Deadline, DeadlineExceeded, clamp_timeout_ms, clamp_timeout_s, current_deadline, deadline_scope
+from llm.response_cache import get_llm_response_cache
+from .speculative_prefetch import SpeculativePrefetcher
+from .streaming_tools import ToolCallAssembler
+from .intent_classifier import append_training_example, load_intent_classifier
+from .intent_router import IntentMatch, get_intent_router, render_template
+from .context_compaction import ContextCompactor
+from .tool_plan import PlanError, PlanExecutor, PlanStep, build_plan_prompt, describe_tools, parse_plan
+from .latency_tracker import LatencyTracker, get_latency_tracker
+from .model_router import ModelRouter, get_model_router
+from .write_hooks import WriteHooks, get_write_hooks
+
+# Bump when the classification prompt changes so cached answers are not reused
+QUERY_CLASSIFICATION_PROMPT_VERSION = "qc-v1"
 
 
 class Agent:
@@ -47,8 +64,22 @@ class Agent:
             self.progress = None  # Fallback; progress is best-effort
         # Per-instance caches/state
         self._role_selection_cache: Dict[str, Dict[str, Any]] = {}
-        self._circuit: Dict[str, Dict[str, Any]] = {}
         self._tuning_cfg: Dict[str, Any] = {}
+        self._speculation: Optional[SpeculativePrefetcher] = None
+        # Read-only calls dispatched while a completion streams: tool_call id -> (call key, task)
+        self._early_tasks: Dict[str, Tuple[str, asyncio.Task]] = {}
+        self._compactor: Optional[ContextCompactor] = None
+        self._tool_hosts: Dict[str, str] = {}
+        self._request_deadline: Optional[Deadline] = None
+        try:
+            self._latency: Optional[LatencyTracker] = get_latency_tracker(project_root)
+        except Exception:
+            self._latency = None
+        try:
+            self._router: Optional[ModelRouter] = get_model_router(project_root)
+        except Exception:
+            self._router = None
+        self._turns_left = 1
 
     def _classify_query_complexity_heuristic(self, msgs: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Lightweight heuristic to estimate query complexity without an LLM call.
@@ -112,45 +143,61 @@ class Agent:
         try:
             if must_write:
                 return None, None
-            user_texts: List[str] = [str(m.get("content", "")) for m in msgs if m.get("role") == "user"]
-            text = "\n".join(user_texts).strip()
-            tl = text.lower()
-            tool_calls: List[Any] = []
-            finalize_instruction = ""
-
-            # Trending fast-path
-            if any(k in tl for k in ("trending", "what's trending", "whats trending")):
-                tool_calls.append(self._build_tool_call("tmdb_discovery_suite", {"discovery_types": ["trending"]}))
-                tool_calls.append(self._build_tool_call("search_plex", {"filters": {"sort_by": "addedAt", "sort_order": "desc"}, "limit": 4, "response_level": "compact"}))
-                finalize_instruction = "Finalize: top results with brief notes."
-                return tool_calls, finalize_instruction
-
-            # Library overview / recent additions fast-path
-            if any(k in tl for k in ("recently added", "what's new", "whats new", "on deck", "continue watching", "library")):
-                tool_calls.append(self._build_tool_call("plex_library_overview", {"section_type": "movie", "limit": 4, "response_level": "compact"}))
-                tool_calls.append(self._build_tool_call("plex_library_overview", {"section_type": "show", "limit": 4, "response_level": "compact"}))
-                finalize_instruction = "Finalize: concise library highlights."
-                return tool_calls, finalize_instruction
-
-            # Actor-based fast-path (e.g., "movies with Tom Hanks")
-            actor_name = None
-            m = re.search(r"(?:movies?|shows?)\s+(?:with|featuring|starring)\s+([A-Za-z][A-Za-z\.'\-]+(?:\s+[A-Za-z][A-Za-z\.'\-]+){1,3})", text, flags=re.IGNORECASE)
-            if m:
-                actor_name = m.group(1).strip()
-            else:
-                # Alternate phrasing: "with <Name> movies"
-                m2 = re.search(r"(?:with|featuring|starring)\s+([A-Za-z][A-Za-z\.'\-]+(?:\s+[A-Za-z][A-Za-z\.'\-]+){1,3})\s+(?:movies?|shows?)", text, flags=re.IGNORECASE)
-                if m2:
-                    actor_name = m2.group(1).strip()
-            if actor_name:
-                tool_calls.append(self._build_tool_call("search_plex", {"filters": {"actors": [actor_name], "sort_by": "year", "sort_order": "desc"}, "limit": 6, "response_level": "compact"}))
-                finalize_instruction = f"Finalize: best picks with {actor_name}."
-                return tool_calls, finalize_instruction
-
-            return None, None
+            match = self._route_fastpath_intent(msgs)
+            if match is None:
+                return None, None
+            tool_calls = [self._build_tool_call(step.tool, step.args) for step in match.tool_steps()]
+            return tool_calls, match.finalize
         except Exception:
             return None, None
 
+    @staticmethod
+    def _user_intent_requires_write(msgs: List[Dict[str, Any]]) -> bool:
+        """Heuristic: do the user messages ask for a write (add/delete/update in Radarr/Sonarr, ratings)?"""
+        try:
+            text_parts: List[str] = [str(m.get("content", "")) for m in msgs if m.get("role") == "user"]
+            text = "\n".join(text_parts).lower()
+            if not text.strip():
+                return False
+            write_verbs = ("add", "delete", "remove", "update", "monitor", "set ")
+            targets = ("radarr", "sonarr", "rating", "watchlist", "queue")
+            if any(w in text for w in write_verbs) and any(t in text for t in targets):
+                return True
+            if "to my radarr" in text or "to radarr" in text or "into radarr" in text:
+                return True
+            # Bare 'add <title>' implies adding media
+            if "add" in text and not any(x in text for x in ("rating", "stars", "review", "note")):
+                return True
+        except Exception:
+            pass
+        return False
+
+    def _route_fastpath_intent(self, msgs: List[Dict[str, Any]]) -> Optional[IntentMatch]:
+        # Route the latest user message only: earlier turns were answered already and
+        # their slots (a title asked about before) must not leak into this one
+        latest = next((m for m in reversed(msgs) if m.get("role") == "user"), None)
+        if latest is None or self._user_intent_requires_write([latest]):
+            return None
+        return get_intent_router().route(str(latest.get("content", "")).strip())
+
+    def _render_fastpath_reply(self, msgs: List[Dict[str, Any]], flattened_results: List[tuple]) -> Optional[str]:
+        """Answer a routed fast-path intent from its response template, skipping the finalize LLM call."""
+        try:
+            rc = load_runtime_config(self.project_root)
+            if not bool((rc.get("ux", {}) or {}).get("templateReplies", False)):
+                return None
+            match = self._route_fastpath_intent(msgs)
+            if match is None or not match.intent.template:
+                return None
+            by_tool: Dict[str, List[Any]] = {}
+            for item in flattened_results:
+                # (tool_call_id, name, result, attempts, cache_hit)
+                by_tool.setdefault(item[1], []).append(item[2])
+            return render_template(match, by_tool)
+        except Exception as e:
+            self.log.debug(f"fast-path template render failed: {e}")
+            return None
+
     def _get_role_selection(self, role: str) -> Dict[str, Any]:
         """Resolve and cache LLM selection for a role for this Agent instance."""
         if role in self._role_selection_cache:
@@ -160,6 +207,42 @@ class Agent:
         self._role_selection_cache[role] = sel
         return sel
 
+    def _turn_budget_ms(self, turns_left: Optional[int] = None) -> Optional[float]:
+        """Share of the request deadline available to one LLM turn, None without a deadline."""
+        deadline = current_deadline() or self._request_deadline
+        if deadline is None:
+            return None
+        return deadline.remaining_ms() / max(1, turns_left if turns_left is not None else self._turns_left)
+
+    def _route_model(self, role: str, model: str) -> str:
+        """Latency-aware model for this turn (``llm.routing``); the configured model when routing is off."""
+        if self._router is None:
+            return model
+        try:
+            decision = self._router.choose(getattr(self.llm, "provider", "openai"), role, model, self._turn_budget_ms())
+        except Exception as e:
+            self.log.debug(f"model routing failed: {e}")
+            return model
+        if decision.model != model:
+            self.log.info("llm routed", extra={"role": role, "from": model, "to": decision.model, "reason": decision.reason, "predicted_ms": decision.predicted_ms, "budget_ms": decision.budget_ms})
+        return decision.model
+
+    def _record_llm_call(self, model: str, duration_ms: float, error: Optional[BaseException]) -> None:
+        # Running out of the request's own budget or a rejected call says nothing about the model
+        if self._router is None or isinstance(error, (DeadlineExceeded, CircuitOpenError, asyncio.CancelledError)):
+            return
+        self._router.record(getattr(self.llm, "provider", "openai"), model, duration_ms, ok=error is None)
+
+    async def _timed_llm_call(self, model: str, aw: Any) -> Any:
+        t0 = time.monotonic()
+        try:
+            resp = await aw
+        except BaseException as e:
+            self._record_llm_call(model, (time.monotonic() - t0) * 1000, e)
+            raise
+        self._record_llm_call(model, (time.monotonic() - t0) * 1000, None)
+        return resp
+
     def _classify_tool_family(self, name: str) -> str:
         n = (name or "").lower()
         if n.startswith("tmdb_"):
@@ -191,8 +274,37 @@ class Agent:
             "backoffBaseMs": int(per_tool.get(name, {}).get("backoffBaseMs", per_family.get(family, {}).get("backoffBaseMs", default_backoff))),
             "hedgeDelayMs": int(hedge_by_family.get(family, 0)),
         }
+        # Live latency replaces the static values once enough samples exist for this tool@host
+        if self._latency is not None:
+            adaptive = (tools_cfg.get("adaptive", {}) or {})
+            host = self._tool_host(family)
+            try:
+                cfg["timeoutMs"] = self._latency.timeout_ms(name, host, cfg["timeoutMs"])
+                if cfg["hedgeDelayMs"] > 0 or family in (adaptive.get("hedgeFamilies") or []):
+                    cfg["hedgeDelayMs"] = self._latency.hedge_delay_ms(name, host, cfg["hedgeDelayMs"])
+            except Exception:
+                pass
         return cfg
 
+    def _tool_host(self, family: str) -> str:
+        """Backend host a tool family talks to; latency is tracked per tool@host."""
+        host = self._tool_hosts.get(family)
+        if host is not None:
+            return host
+        host = "local"
+        try:
+            if family == "tmdb":
+                host = "api.themoviedb.org"
+            elif family in ("plex", "radarr", "sonarr"):
+                from urllib.parse import urlparse
+                from config.loader import load_settings
+                base = getattr(load_settings(self.project_root), f"{family}_base_url", None)
+                host = (urlparse(base).netloc or "local") if base else "local"
+        except Exception:
+            host = "local"
+        self._tool_hosts[family] = host
+        return host
+
     def _select_parallelism_for_family(self, family: str) -> int:
         tools_cfg = self._tuning_cfg.get("tools", {}) or self._tuning_cfg.get("tools_cfg", {}) or {}
         default_parallelism = int(tools_cfg.get("parallelism", 4))
@@ -227,23 +339,38 @@ class Agent:
         except Exception:
             return None
 
-    def _prune_old_tool_messages(self, messages: List[Dict[str, Any]], max_tool_messages: int) -> None:
-        """Keep only the most recent N tool messages to control context growth."""
+    def _build_context_compactor(self, rc: Dict[str, Any]) -> Optional[ContextCompactor]:
+        cfg = ((rc.get("tools", {}) or {}).get("contextCompaction", {}) or {})
+        if not bool(cfg.get("enabled", True)):
+            return None
+        counter = None
+        if hasattr(self.llm, "count_tokens"):
+            # Same tokenizer the conversation store uses
+            counter = lambda s: self.llm.count_tokens([{"content": s}])  # noqa: E731
+        return ContextCompactor(
+            int(cfg.get("budgetTokens", 12000)),
+            count_text=counter,
+            summary_max_items=int(cfg.get("summaryMaxItems", 3)),
+            tabular_min_rows=self._tabular_min_rows(rc),
+        )
+
+    @staticmethod
+    def _tabular_min_rows(rc: Dict[str, Any]) -> int:
+        """Smallest list sent to the model as a cols/rows table (0 keeps plain JSON lists)."""
+        cfg = ((rc.get("tools", {}) or {}).get("summaries", {}) or {})
         try:
-            indices = [i for i, m in enumerate(messages) if m.get("role") == "tool"]
-            if len(indices) <= max_tool_messages:
-                return
-            # Remove oldest tool messages beyond the cap
-            to_remove = indices[: len(indices) - max_tool_messages]
-            removed_count = len(to_remove)
-            for idx in reversed(to_remove):
-                messages.pop(idx)
-            messages.append({
-                "role": "system",
-                "content": f"Older tool outputs pruned to reduce context. Pruned_count={removed_count}."
-            })
+            return int(cfg.get("tabularMinRows", 3))
         except Exception:
+            return 0
+
+    def _compact_context(self, messages: List[Dict[str, Any]]) -> None:
+        """Shrink older tool results in place so the next prompt fits the token budget."""
+        if self._compactor is None:
             return
+        try:
+            self._compactor.compact(messages)
+        except Exception as e:
+            self.log.debug(f"context compaction failed: {e}")
 
     async def _emit_progress(self, event: str, data: Any) -> None:
         try:
@@ -263,6 +390,7 @@ class Agent:
 
     async def _achat_once(self, messages: List[Dict[str, Any]], model: str, role: str, tool_choice_override: Optional[str] = None) -> Any:
         """Async version of _chat_once for non-blocking LLM calls."""
+        model = self._route_model(role, model)
         if self.log.isEnabledFor(logging.DEBUG):
             self.log.debug("LLM.achat start", extra={
                 "model": model,
@@ -283,13 +411,13 @@ class Agent:
                 params["tool_choice"] = tool_choice_value
             else:
                 params.pop("tool_choice", None)
-            resp = await self.llm.achat(
+            resp = await self._timed_llm_call(model, self.llm.achat(
                 model=model,
                 messages=messages,
                 tools=tools_to_send,
                 reasoning=sel.get("reasoningEffort"),
                 **params,
-            )
+            ))
         else:
             # No fallback - force async implementation
             sel = self._get_role_selection(role)
@@ -301,13 +429,13 @@ class Agent:
             else:
                 params.pop("tool_choice", None)
             # Force async implementation - no blocking fallbacks
-            resp = await self.llm.achat(
+            resp = await self._timed_llm_call(model, self.llm.achat(
                 model=model,
                 messages=messages,
                 tools=tools_to_send,
                 reasoning=sel.get("reasoningEffort"),
                 **params,
-            )
+            ))
 
         try:
             content_preview = (resp.choices[0].message.content or "")[:120]  # type: ignore[attr-defined]
@@ -326,6 +454,151 @@ class Agent:
         await self._emit_progress("llm.finish", {"model": model, "content_preview": content_preview})
         return resp
 
+    async def _astream_chat_once(
+        self,
+        messages: List[Dict[str, Any]],
+        model: str,
+        role: str,
+        tool_choice_override: Optional[str] = None,
+        on_tool_call: Optional[Callable[[Any], None]] = None,
+        on_content: Optional[Callable[[str], Any]] = None,
+    ) -> Any:
+        """Streaming variant of _achat_once that reports each tool call as soon as its arguments are final.
+
+        Content goes to ``on_content`` only for a turn that ends without tool calls: live
+        when no tools are offered, otherwise in one piece once the stream has ended (a
+        preamble before tool calls is never shown). If the stream fails after text was
+        forwarded, ``on_content.reset()`` is called (when available) to discard it.
+        Returns a completion-shaped object so callers can treat it like an ``achat`` response.
+        Falls back to ``_achat_once`` if streaming fails.
+        """
+        model = self._route_model(role, model)
+        sel = self._get_role_selection(role)
+        params = dict(sel.get("params", {}))
+        tool_choice_value = tool_choice_override if tool_choice_override is not None else params.pop("tool_choice", "auto")
+        tools_to_send = None if tool_choice_value == "none" else self.openai_tools
+        if tools_to_send is not None:
+            params["tool_choice"] = tool_choice_value
+        else:
+            params.pop("tool_choice", None)
+        await self._emit_progress("llm.start", {"model": model, "messages": len(messages), "stream": True})
+        if getattr(self, "progress", None) is not None:
+            try:
+                await self.progress.typing_start("llm")
+            except Exception:
+                pass
+        assembler = ToolCallAssembler(on_tool_call)
+        forwarded = False
+        forwarding = on_content is not None
+        # Only a turn that cannot call tools is known to be the answer while it streams
+        live = tools_to_send is None
+        held: List[str] = []
+
+        async def _forward(part: str) -> None:
+            nonlocal forwarded, forwarding
+            try:
+                maybe = on_content(part)  # type: ignore[misc]
+                if asyncio.iscoroutine(maybe):
+                    await maybe
+                forwarded = True
+            except Exception:
+                forwarding = False
+
+        async def _reset_preview() -> None:
+            reset = getattr(on_content, "reset", None)
+            if forwarded and reset is not None:
+                try:
+                    reset()
+                except Exception:
+                    pass
+
+        t_stream = time.monotonic()
+        try:
+            async for delta in self.llm.astream_chat_deltas(
+                model=model,
+                messages=messages,
+                tools=tools_to_send,
+                reasoning=sel.get("reasoningEffort"),
+                **params,
+            ):
+                part = assembler.feed(delta)
+                if not forwarding or not part:
+                    continue
+                if live:
+                    await _forward(part)
+                else:
+                    held.append(part)
+            assembler.close()
+            resp = assembler.to_response()
+            if forwarding and held and not assembler.tool_calls:
+                await _forward("".join(held))
+            self._record_llm_call(model, (time.monotonic() - t_stream) * 1000, None)
+        except Exception as e:
+            self._record_llm_call(model, (time.monotonic() - t_stream) * 1000, e)
+            await _reset_preview()
+            if isinstance(e, DeadlineExceeded):
+                raise
+            if LLMClientPool.is_throttle(e):
+                # The pool already backed off per Retry-After; a second full attempt only deepens the 429 storm
+                raise
+            # Calls already dispatched keep running; the loop matches them to the
+            # retry's tool calls by name and arguments, so none executes twice
+            self.log.warning(f"streaming chat failed, falling back to non-streaming: {e}")
+            return await self._achat_once(messages, model, role, tool_choice_override)
+        finally:
+            if getattr(self, "progress", None) is not None:
+                try:
+                    await self.progress.typing_stop("llm")
+                except Exception:
+                    pass
+        await self._emit_progress("llm.finish", {"model": model, "content_preview": (resp.choices[0].message.content or "")[:120]})
+        return resp
+
+    async def _achat_final(self, messages: List[Dict[str, Any]], model: str, role: str, on_content: Optional[Callable[[str], Any]] = None) -> Any:
+        """Finalization turn without tools; streams the answer to ``on_content`` when the client supports it."""
+        self._compact_context(messages)
+        self._turns_left = 1
+        # The final answer may use the time held back from tool/LLM work, and goes ahead of queued LLM calls
+        with deadline_scope(self._request_deadline or current_deadline()), llm_priority(Priority.FINAL_ANSWER):
+            if on_content is not None and hasattr(self.llm, "astream_chat_deltas"):
+                return await self._astream_chat_once(messages, model, role, "none", on_content=on_content)
+            return await self._achat_once(messages, model, role, tool_choice_override="none")
+
+    async def _finalize_on_deadline(self, messages: List[Dict[str, Any]], model: str, role: str, on_content: Optional[Callable[[str], Any]] = None) -> Any:
+        """Best-effort answer from the results gathered so far once the work budget is spent."""
+        deadline = self._request_deadline
+        await self._emit_progress("agent.deadline", {"remaining_ms": int(deadline.remaining_ms()) if deadline else 0})
+        messages.append({
+            "role": "system",
+            "content": "Time is up for this request. Answer now from the tool results above only; briefly say what you could not check. Do not call tools.",
+        })
+        try:
+            from config.loader import resolve_llm_selection
+            quick_provider, quick_sel = resolve_llm_selection(self.project_root, "quick")
+            current_provider, _ = resolve_llm_selection(self.project_root, role)
+            if quick_sel.get("model") and quick_provider == current_provider:
+                resp = await self._achat_final(messages, quick_sel["model"], "quick", on_content)
+            else:
+                resp = await self._achat_final(messages, model, role, on_content)
+        except Exception as e:
+            self.log.warning(f"deadline finalization failed: {e}")
+            resp = {"choices": [{"message": {"content": "Sorry, that took longer than I can wait right now. Please try again in a moment."}}]}
+        try:
+            if getattr(self, "progress", None) is not None:
+                self.progress.stop_heartbeat("agent")
+        except Exception:
+            pass
+        await self._emit_progress("agent.finish", {"reason": "deadline"})
+        return resp
+
+    def _work_budget_low(self) -> bool:
+        """True when the work deadline cannot fit another model turn."""
+        work = current_deadline()
+        if work is None or self._request_deadline is None:
+            return False
+        min_turn_ms = int(((self._tuning_cfg.get("ux", {}) or {}).get("minTurnMs", 1500)))
+        return work.remaining_ms() < min_turn_ms
+
     def _calculate_result_confidence(self, tool_name_and_results: List[tuple]) -> float:
         """Calculate confidence score (0.0-1.0) for finalization decision."""
         try:
@@ -446,53 +719,46 @@ class Agent:
             pass
         return False
 
+    @staticmethod
+    def _tool_call_key(tc: Any) -> str:
+        """Name and arguments of a tool call, independent of its id and of key order."""
+        try:
+            return tool_dedup_key(tc.function.name, json.loads(tc.function.arguments or "{}"))
+        except Exception:
+            return f"{tc.function.name}:{tc.function.arguments}"
+
+    @staticmethod
+    async def _result_for(tc_id: str, task: "asyncio.Task") -> Tuple[Any, ...]:
+        """Result of a streamed call, reported under the id of the call it stands in for."""
+        _old_id, *rest = await task
+        return (tc_id, *rest)
+
+    def _get_circuit_key(self, name: str, args: Dict[str, Any]) -> str:
+        """Breaker key for a tool: the upstream service it calls, shared by every tool of that family."""
+        family = self._classify_tool_family(name)
+        if family in ("tmdb", "plex", "radarr", "sonarr"):
+            return f"{family}@{self._tool_host(family)}"
+        # Bundled and local tools span several (or no) upstreams
+        return f"tool:{name}"
+
     def _is_circuit_open(self, circuit_key: str) -> bool:
-        """Check if the circuit breaker is open for a specific route/tool key."""
+        """Check the shared breaker for ``circuit_key``; in half-open this claims the probe slot."""
         try:
-            circuit_config = self._tuning_cfg.get("tools_cfg", {}).get("circuit", {})
-            open_after_failures = circuit_config.get("openAfterFailures", 3)
-            open_for_ms = circuit_config.get("openForMs", 3000)
-            
-            if circuit_key not in self._circuit:
-                return False
-            
-            circuit_state = self._circuit[circuit_key]
-            failure_count = circuit_state.get("failures", 0)
-            last_failure_time = circuit_state.get("last_failure", 0)
-            
-            if failure_count >= open_after_failures:
-                # Check if enough time has passed to reset the circuit
-                import time
-                current_time = time.time() * 1000  # Convert to milliseconds
-                if current_time - last_failure_time > open_for_ms:
-                    # Reset circuit
-                    self._circuit[circuit_key] = {"failures": 0, "last_failure": 0}
-                    return False
-                return True
-            
-            return False
+            return not circuit_registry.get(circuit_key).allow()
         except Exception:
             return False
 
-    def _record_circuit_failure(self, circuit_key: str) -> None:
-        """Record a failure for circuit breaker tracking scoped to a circuit key."""
+    def _record_circuit_error(self, circuit_key: str, error: BaseException) -> None:
+        """Record a failed call on the shared breaker; it decides whether the error counts against the upstream."""
         try:
-            import time
-            current_time = time.time() * 1000  # Convert to milliseconds
-            
-            if circuit_key not in self._circuit:
-                self._circuit[circuit_key] = {"failures": 0, "last_failure": 0}
-            
-            self._circuit[circuit_key]["failures"] += 1
-            self._circuit[circuit_key]["last_failure"] = current_time
+            circuit_registry.get(circuit_key).record_error(error)
         except Exception:
             pass
 
     def _record_circuit_success(self, circuit_key: str) -> None:
-        """Record a success to reset circuit breaker for a circuit key."""
+        """Record a success (closes a half-open breaker)."""
         try:
-            if circuit_key in self._circuit:
-                self._circuit[circuit_key] = {"failures": 0, "last_failure": 0}
+            circuit_registry.get(circuit_key).record_success()
         except Exception:
             pass
 
@@ -555,6 +821,56 @@ class Agent:
             return False
         return False
 
+    def _write_hooks_for(self, name: str) -> Optional[WriteHooks]:
+        tools_cfg = (self._tuning_cfg.get("tools", {}) or {})
+        if not bool((tools_cfg.get("writeHooks", {}) or {}).get("enabled", True)):
+            return None
+        return get_write_hooks(name)
+
+    async def _hook_reader(self, tool: str, args: Dict[str, Any]) -> Any:
+        """Read-only tool call for write hooks, bounded by the tool's timeout and the request deadline."""
+        timeout_ms = clamp_timeout_ms(self._select_tool_tuning(tool).get("timeoutMs", 8000))
+        return await asyncio.wait_for(self.tool_registry.get(tool)(args), timeout=max(timeout_ms, 1) / 1000)
+
+    def _unsourced_hooked_writes(self, tool_calls: List[Any], messages: List[Dict[str, Any]]) -> List[Any]:
+        """Hooked write calls whose target id was not returned by any tool earlier in this run.
+
+        Verify only echoes the requested id back, so a made-up id would be added and "verified".
+        """
+        seen = "\n".join(str(m.get("content") or "") for m in messages if m.get("role") == "tool")
+        out = []
+        for tc in tool_calls:
+            name = getattr(getattr(tc, "function", None), "name", "")
+            hooks = self._write_hooks_for(name) if self._is_write_tool_name(name) else None
+            if hooks is None:
+                continue
+            try:
+                target = json.loads(tc.function.arguments or "{}").get(hooks.id_arg)
+            except Exception:
+                target = None
+            if target is None or not re.search(rf"(?<![\w.]){re.escape(str(target))}(?![\w.])", seen):
+                out.append(tc)
+        return out
+
+    def _writes_all_hooked(self, tool_calls: List[Any], messages: List[Dict[str, Any]]) -> bool:
+        """True when every write call in the turn has hooks and targets an id a tool already returned in this run,
+        so it may run without a read phase."""
+        writes = [tc for tc in tool_calls if self._is_write_tool_name(getattr(getattr(tc, "function", None), "name", ""))]
+        if not writes or any(self._write_hooks_for(tc.function.name) is None for tc in writes):
+            return False
+        return not self._unsourced_hooked_writes(writes, messages)
+
+    def _writes_verified(self, flat_results: List[tuple]) -> bool:
+        """True when every successful write in the batch was confirmed by its verify hook."""
+        verified = False
+        for _tc_id, name, result, _attempts, _cache_hit in flat_results:
+            if not self._is_write_tool_name(str(name)) or not isinstance(result, dict) or "error" in result or result.get("ok") is False:
+                continue
+            if not (result.get("verification") or {}).get("verified"):
+                return False
+            verified = True
+        return verified
+
     def _contains_write_failure(self, flat_results: List[tuple]) -> bool:
         """Detect if any write-style tool explicitly failed in the last batch."""
         try:
@@ -716,9 +1032,23 @@ class Agent:
 
         # De-duplicate identical tool calls within the same run
         try:
-            dedup_key = f"{name}:{json.dumps(args, sort_keys=True, separators=(',', ':'))}"
+            dedup_key = tool_dedup_key(name, args)
         except Exception:
             dedup_key = None
+        # Result (or in-flight task) from speculative prefetch for this run
+        spec = self._speculation
+        if spec is not None and not self._is_write_tool_name(name):
+            try:
+                spec_result = await spec.claim(name, args if isinstance(args, dict) else {})
+            except Exception:
+                spec_result = None
+            if spec_result is not None:
+                self.log.info("tool speculative prefetch hit", extra={"name": name})
+                if dedup_cache is not None and dedup_key is not None:
+                    dedup_cache[dedup_key] = spec_result
+                await self._emit_progress("tool.finish", {"name": name, "status": "ok", "duration_ms": 0, "attempts": 0, "cache_hit": True})
+                return tc.id, name, spec_result, 0, True
+
         if dedup_cache is not None and dedup_key is not None and dedup_key in dedup_cache:
             self.log.info("tool dedup cache hit", extra={"name": name})
             result = dedup_cache[dedup_key]
@@ -737,6 +1067,19 @@ class Agent:
             except Exception:
                 pass
 
+        # Deterministic preflight for hooked writes (duplicates, bad ids) before touching the service
+        hooks = self._write_hooks_for(name)
+        if hooks is not None and hooks.preflight is not None and isinstance(args, dict):
+            try:
+                pre = await hooks.preflight(args, self._hook_reader)
+            except Exception as e:
+                self.log.debug(f"write preflight failed for {name}: {e}")
+                pre = None
+            if pre is not None:
+                self.log.info("write preflight answered", extra={"name": name, "error": pre.get("error"), "already_exists": pre.get("already_exists")})
+                await self._emit_progress("tool.finish", {"name": name, "status": "ok" if "error" not in pre else "error", "duration_ms": 0, "attempts": 0, "cache_hit": False})
+                return tc.id, name, pre, 0, False
+
         # Emit tool start only for actual executions (not dedup hits)
         await self._emit_progress("tool.start", {"name": name, "args": args_json})
 
@@ -751,28 +1094,38 @@ class Agent:
         backoff_base_ms = int(tuning.get("backoffBaseMs", backoff_base_ms))
         hedge_delay_ms = int(tuning.get("hedgeDelayMs", 0))
 
+        attempt_timeout_ms = timeout_ms
+
         async def attempt_once():
             try:
-                return await asyncio.wait_for(self.tool_registry.get(name)(args), timeout=timeout_ms / 1000)
+                return await asyncio.wait_for(self.tool_registry.get(name)(args), timeout=attempt_timeout_ms / 1000)
             except asyncio.TimeoutError as e:
                 raise e
 
         while True:
+            # Never wait past the request deadline; a clamped timeout is the budget running out, not the tool failing
+            attempt_timeout_ms = clamp_timeout_ms(timeout_ms)
+            if attempt_timeout_ms <= 0:
+                last_err = {"ok": False, "error": "deadline_exceeded", "name": name, "message": "No time left in this request's budget"}
+                result = last_err
+                status = "error"
+                break
             # Compute circuit key and check breaker before attempting
             try:
                 circuit_key = self._get_circuit_key(name, args if isinstance(args, dict) else {})
             except Exception:
                 circuit_key = name
             if self._is_circuit_open(circuit_key):
-                last_err = {"ok": False, "error": "circuit_breaker_open", "name": name, "message": "Circuit breaker is open for this tool"}
+                last_err = {"ok": False, "error": "circuit_breaker_open", "name": name, "upstream": circuit_key, "retry_in_ms": circuit_registry.get(circuit_key).retry_in_ms(), "message": "Upstream service is failing; not calling it until the breaker recovers"}
                 result = last_err
                 status = "error"
                 break
                 
+            attempt_start = time.monotonic()
             try:
-                # Hedged attempt for read-only TMDB-like tools
+                # Hedged attempt for read-only tools (families with a hedge delay)
                 is_read_only = not self._is_write_tool_name(name)
-                if hedge_delay_ms > 0 and is_read_only and self._classify_tool_family(name) == "tmdb":
+                if hedge_delay_ms > 0 and is_read_only:
                     primary = asyncio.create_task(attempt_once())
                     try:
                         await asyncio.wait_for(asyncio.shield(primary), timeout=hedge_delay_ms / 1000)
@@ -787,13 +1140,25 @@ class Agent:
                 else:
                     result = await attempt_once()
                 status = "ok"
+                if self._latency is not None:
+                    self._latency.record(name, self._tool_host(self._classify_tool_family(name)), (time.monotonic() - attempt_start) * 1000)
                 # Record success to reset circuit breaker
                 self._record_circuit_success(circuit_key)
                 break
             except asyncio.TimeoutError as e:
+                if attempt_timeout_ms < timeout_ms:
+                    circuit_registry.get(circuit_key).record_error(DeadlineExceeded())
+                    last_err = {"ok": False, "error": "deadline_exceeded", "timeout_ms": attempt_timeout_ms, "name": name}
+                    result = last_err
+                    status = "error"
+                    break
+                last_exc: BaseException = e
                 last_err = {"ok": False, "error": "timeout", "timeout_ms": timeout_ms, "name": name}
+                if self._latency is not None:
+                    self._latency.record(name, self._tool_host(self._classify_tool_family(name)), timeout_ms, ok=False)
                 error_classification = "retryable"  # Timeouts are retryable
             except Exception as e:
+                last_exc = e
                 # Attach status code if present
                 status_code = None
                 try:
@@ -805,8 +1170,9 @@ class Agent:
                     last_err["status"] = status_code
                 error_classification = self._classify_error_retryability(e)
             
-            # Record failure for circuit breaker
-            self._record_circuit_failure(circuit_key)
+            # Client errors mean the upstream answered; only unhealthy responses count against the breaker,
+            # and a late client error never closes a breaker that opened meanwhile
+            self._record_circuit_error(circuit_key, last_exc)
             
             # Check if we should retry based on error classification
             if error_classification == "non_retryable":
@@ -825,8 +1191,19 @@ class Agent:
                 break
             # backoff with jitter
             jitter = (attempt + 1) * 0.1
-            await asyncio.sleep((backoff_base_ms / 1000) * (2 ** attempt) + jitter)
+            backoff_s = (backoff_base_ms / 1000) * (2 ** attempt) + jitter
+            if clamp_timeout_s(backoff_s) < backoff_s:
+                result = last_err
+                status = "error"
+                break
+            await asyncio.sleep(backoff_s)
             attempt += 1
+        if status == "ok" and hooks is not None and hooks.verify is not None and isinstance(result, dict) and "error" not in result:
+            try:
+                result = dict(result)
+                result["verification"] = await hooks.verify(args, result, self._hook_reader)
+            except Exception as e:
+                self.log.debug(f"write verify failed for {name}: {e}")
         duration_ms = int((time.monotonic() - start) * 1000)
         # Store in dedup cache for subsequent identical calls
         if dedup_cache is not None and dedup_key is not None and status == "ok":
@@ -903,12 +1280,60 @@ class Agent:
                     individual_results.append(error_result)
             return individual_results
 
+    def _start_speculative_prefetch(self, base_messages: List[Dict[str, Any]], rc: Dict[str, Any]) -> None:
+        """Launch predicted read-only tool calls so they overlap with the first LLM turn."""
+        try:
+            cfg = ((rc.get("tools", {}) or {}).get("speculativePrefetch", {}) or {})
+            if not bool(cfg.get("enabled", True)):
+                return
+            spec = SpeculativePrefetcher(
+                self.tool_registry,
+                is_write_tool=self._is_write_tool_name,
+                max_calls=int(cfg.get("maxCalls", 4)),
+                timeout_ms=int(cfg.get("timeoutMs", 6000)),
+            )
+            predictions = spec.predict(base_messages)
+            if predictions and spec.start(predictions):
+                self._speculation = spec
+        except Exception as e:
+            self.log.debug(f"speculative prefetch skipped: {e}")
+
     async def _arun_tools_loop(self, base_messages: List[Dict[str, Any]], model: str, role: str, max_iters: int | None = None, stream_final_to_callback: Optional[Callable[[str], Any]] = None) -> Any:
         """Async version of _run_tools_loop with pipelined execution for maximum performance."""
+        self._speculation = None
+        self._early_tasks = {}
+        # Tools and intermediate model turns run against a deadline that keeps
+        # ux.synthesisReserveMs back, so a best-effort answer always fits
+        self._request_deadline = current_deadline()
+        work_deadline = None
+        if self._request_deadline is not None:
+            ux_cfg = (load_runtime_config(self.project_root).get("ux", {}) or {})
+            work_deadline = self._request_deadline.reserve(int(ux_cfg.get("synthesisReserveMs", 4000)))
+        try:
+            with deadline_scope(work_deadline):
+                return await self._arun_tools_loop_inner(base_messages, model, role, max_iters, stream_final_to_callback)
+        finally:
+            # A failed LLM turn can leave streamed calls running; none outlives the run
+            early, self._early_tasks = list(self._early_tasks.values()), {}
+            for _key, task in early:
+                task.cancel()
+            if early:
+                await asyncio.gather(*(task for _key, task in early), return_exceptions=True)
+            spec, self._speculation = self._speculation, None
+            if spec is not None:
+                try:
+                    await spec.finish()
+                except Exception:
+                    pass
+
+    async def _arun_tools_loop_inner(self, base_messages: List[Dict[str, Any]], model: str, role: str, max_iters: int | None = None, stream_final_to_callback: Optional[Callable[[str], Any]] = None) -> Any:
         # Load runtime config for loop controls
         rc = load_runtime_config(self.project_root)
         # Cache tuning for subordinate helpers
         self._tuning_cfg = rc or {}
+        self._compactor = self._build_context_compactor(rc)
+        circuit_cfg = ((rc.get("tools", {}) or {}).get("circuit", {}) or {})
+        circuit_registry.configure(open_after_failures=circuit_cfg.get("openAfterFailures", 3), open_for_ms=circuit_cfg.get("openForMs", 3000))
         # Role-specific iteration limits: prefer agentMaxIters/workerMaxIters, fallback to legacy maxIters
         llm_cfg = rc.get("llm", {}) or {}
         if role in ("smart", "chat"):
@@ -928,27 +1353,6 @@ class Agent:
         else:
             cfg_max_iters = int(llm_cfg_for_iters.get("maxIters", 8))
         messages: List[Dict[str, Any]] = []
-        # Infer if user intent requires a write
-        def _user_intent_requires_write(msgs: List[Dict[str, Any]]) -> bool:
-            try:
-                text_parts: List[str] = [str(m.get("content", "")) for m in msgs if m.get("role") == "user"]
-                text = "\n".join(text_parts).lower()
-                if not text.strip():
-                    return False
-                write_verbs = ("add", "delete", "remove", "update", "monitor", "set ")
-                targets = ("radarr", "sonarr", "rating", "watchlist", "queue")
-                if any(w in text for w in write_verbs) and any(t in text for t in targets):
-                    return True
-                if "to my radarr" in text or "to radarr" in text or "into radarr" in text:
-                    return True
-                # Bare 'add <title>' implies adding media
-                if "add" in text and not any(x in text for x in ("rating", "stars", "review", "note")):
-                    return True
-            except Exception:
-                pass
-            return False
-
-
 
         # Zero-LLM fast-path for common read-only flows (run BEFORE classification to avoid extra LLM calls)
         fast_calls, fast_finalize_hint = self._detect_zero_llm_fastpath(base_messages, must_write=False)
@@ -1003,6 +1407,17 @@ class Agent:
                 else:
                     flattened_results.append(result)
 
+            templated = self._render_fastpath_reply(base_messages, flattened_results)
+            if templated:
+                self.log.info("fast path answered from template")
+                try:
+                    if getattr(self, "progress", None) is not None:
+                        self.progress.stop_heartbeat("agent")
+                except Exception:
+                    pass
+                await self._emit_progress("agent.finish", {"reason": "fast_path_template"})
+                return {"choices": [{"message": {"content": templated}}]}
+
             processed_messages = await self._process_results_async(flattened_results)
             messages.extend(processed_messages)
 
@@ -1016,7 +1431,7 @@ class Agent:
 
             final_system = (fast_finalize_hint or "Finalize now: produce a concise, friendly list of 3 items max, each as 'Title (Year)'. Only include [Plex] tag if a Plex tool confirmed availability for that item; otherwise omit it. Do not call tools. Reply must be non-empty.")
             messages.append({"role": "system", "content": final_system})
-            resp = await self._achat_once(messages, quick_model, "quick", tool_choice_override="none")
+            resp = await self._achat_final(messages, quick_model, "quick", stream_final_to_callback)
             try:
                 content = resp.choices[0].message.content  # type: ignore[attr-defined]
             except Exception:
@@ -1040,9 +1455,15 @@ class Agent:
             await self._emit_progress("agent.finish", {"reason": "fast_path"})
             return resp
 
+        # Start likely read-only lookups now so they overlap classification and the first LLM turn
+        self._start_speculative_prefetch(base_messages, rc)
+
         # Query classification (LLM-based by default); on failure, return a neutral classification
         use_llm_cls = bool((rc.get("llm", {}) or {}).get("useLlmQueryClassification", False))
-        if use_llm_cls:
+        local_result = self._classify_query_complexity_local(base_messages, rc)
+        if local_result is not None:
+            classification_result = local_result
+        elif use_llm_cls:
             try:
                 classification_result = await self._classify_query_complexity_llm(base_messages)
             except Exception:
@@ -1074,7 +1495,7 @@ class Agent:
             classification_guidance += "Use the suggested tools in parallel for optimal results."
             messages.append({"role": "system", "content": classification_guidance})
         
-        must_write = requires_write or _user_intent_requires_write(base_messages)
+        must_write = requires_write or self._user_intent_requires_write(base_messages)
         
         # Optionally elevate to smart model for complex reasoning tasks
         try:
@@ -1082,7 +1503,8 @@ class Agent:
                 from config.loader import resolve_llm_selection
                 _prov, smart_sel = resolve_llm_selection(self.project_root, "smart")
                 smart_model = smart_sel.get("model")
-                if smart_model:
+                # Stay on the chat model when the reasoning model is predicted to blow the budget
+                if smart_model and (self._router is None or self._router.fits(getattr(self.llm, "provider", "openai"), smart_model, self._turn_budget_ms(iters))):
                     model = smart_model
                     role = "smart"
         except Exception:
@@ -1221,7 +1643,7 @@ class Agent:
                 "content": (fast_finalize_hint or "Finalize now with a concise, friendly reply. Do not call tools."),
             })
 
-            resp = await self._achat_once(messages, quick_model or "gpt-5-nano", "quick", tool_choice_override="none")
+            resp = await self._achat_final(messages, quick_model or "gpt-5-nano", "quick", stream_final_to_callback)
             try:
                 if getattr(self, "progress", None) is not None:
                     self.progress.stop_heartbeat("agent")
@@ -1231,6 +1653,8 @@ class Agent:
             return resp
         # Deduplicate identical tool calls within a run to reduce latency
         dedup_cache: Dict[str, Any] = {}
+        if self._speculation is not None:
+            self._speculation.attach(dedup_cache)
         last_response: Any = None
         force_finalize_next = False
         next_tool_choice_override: Optional[str] = None
@@ -1242,9 +1666,60 @@ class Agent:
         llm_calls_count = 0
         import time as _t
         t_loop_start = _t.monotonic()
-        
+
+        # Streaming dispatch: read-only tool calls start as soon as their arguments
+        # are final instead of after the whole completion has been generated
+        can_stream = hasattr(self.llm, "astream_chat_deltas")
+        stream_tool_calls = bool(llm_cfg.get("streamToolCalls", False)) and can_stream
+        stream_content = stream_final_to_callback is not None and can_stream
+        early_tasks = self._early_tasks
+        stream_timeout_ms = int(rc.get("tools", {}).get("timeoutMs", 8000))
+        stream_retry_max = int(rc.get("tools", {}).get("retryMax", 2))
+        stream_backoff_base_ms = int(rc.get("tools", {}).get("backoffBaseMs", 200))
+
+        def _start_llm_call(tool_choice_override: Optional[str], turns_left: int) -> asyncio.Task:
+            self._compact_context(messages)
+            # The routed model must fit this turn's share of what is left of the work budget
+            self._turns_left = max(1, turns_left)
+            dispatch_early = stream_tool_calls and tool_choice_override != "none"
+            if not dispatch_early and not stream_content:
+                return asyncio.create_task(self._achat_once(messages, model, role, tool_choice_override=tool_choice_override))
+            on_tool_call: Optional[Callable[[Any], None]] = None
+            if dispatch_early:
+                # Validation turns run at most one read, chosen after the full response
+                allow_early = not (require_validation_read or write_completed)
+
+                def on_tool_call(tc: Any) -> None:
+                    if allow_early and not self._is_write_tool_name(tc.function.name):
+                        early_tasks[tc.id] = (self._tool_call_key(tc), asyncio.create_task(
+                            self._execute_single_tool(tc, stream_timeout_ms, stream_retry_max, stream_backoff_base_ms, dedup_cache)
+                        ))
+
+            return asyncio.create_task(self._astream_chat_once(messages, model, role, tool_choice_override, on_tool_call, stream_final_to_callback))
+
+        # Plan mode: one planning turn, then the whole dependency graph runs without
+        # further model calls; on a step failure the loop below repairs from the results
+        plan_cfg = (llm_cfg.get("planMode", {}) or {})
+        if bool(plan_cfg.get("enabled", False)) and str(complexity).lower() in [str(c).lower() for c in plan_cfg.get("complexities", ["complex"])]:
+            plan_outcome = await self._run_plan_mode(messages, model, role, must_write, plan_cfg, dedup_cache, stream_final_to_callback)
+            if plan_outcome is not None:
+                planned_resp, plan_wrote, plan_calls = plan_outcome
+                total_tool_calls += plan_calls
+                llm_calls_count += 1
+                if plan_wrote:
+                    seen_write_intent = True
+                    write_completed = True
+                if planned_resp is not None:
+                    try:
+                        if getattr(self, "progress", None) is not None:
+                            self.progress.stop_heartbeat("agent")
+                    except Exception:
+                        pass
+                    await self._emit_progress("agent.finish", {"reason": "plan", "tool_calls": total_tool_calls})
+                    return planned_resp
+
         # PIPELINED EXECUTION: Start first LLM call immediately
-        current_llm_task = asyncio.create_task(self._achat_once(messages, model, role, tool_choice_override=next_tool_choice_override))
+        current_llm_task = _start_llm_call(next_tool_choice_override, iters)
         llm_calls_count += 1
         next_tool_choice_override = None
         
@@ -1255,7 +1730,10 @@ class Agent:
             await self._emit_progress("thinking", {"iteration": f"{iter_idx+1}/{iters}"})
             
             # Wait for current LLM call to complete
-            last_response = await current_llm_task
+            try:
+                last_response = await current_llm_task
+            except DeadlineExceeded:
+                return await self._finalize_on_deadline(messages, model, role, stream_final_to_callback)
             choice = last_response.choices[0]
             msg = choice.message
             tool_calls = getattr(msg, 'tool_calls', None)
@@ -1299,6 +1777,10 @@ class Agent:
                     "role": "system",
                     "content": "Validation step: run exactly one quick read-only check (e.g., fetch the item/list) to confirm the write succeeded. Do not perform any write operations. Then finalize."
                 })
+            elif not write_phase_allowed and self._writes_all_hooked(tool_calls, messages):
+                # Hooked writes check their own preconditions, so they run in the turn they are requested
+                write_phase_allowed = True
+                await self._emit_progress("phase.write_enabled", {"iteration": f"{iter_idx+1}/{iters}", "hooks": True})
             elif not write_phase_allowed:
                 ro_calls = [tc for tc in tool_calls if not self._is_write_tool_name(getattr(getattr(tc, 'function', None), 'name', ''))]
                 if ro_calls:
@@ -1309,6 +1791,18 @@ class Agent:
                         "role": "system",
                         "content": "Phase 1 (read-only): gather information and identify exact targets. Do not perform writes yet. Next, you may perform the necessary write."
                     })
+                elif self._unsourced_hooked_writes(tool_calls, messages):
+                    # A write-only first turn with an id no lookup returned: identify the target first
+                    held = sorted({tc.function.name for tc in tool_calls})
+                    tool_calls = []
+                    await self._emit_progress("phase.read_only", {"iteration": f"{iter_idx+1}/{iters}", "held_writes": held})
+                    messages.append({
+                        "role": "system",
+                        "content": (
+                            f"Phase 1 (read-only): {', '.join(held)} was not run because its id did not come from a lookup. "
+                            "Identify the exact target with a read-only tool (e.g., tmdb_search, radarr_lookup, sonarr_lookup) first, then perform the write."
+                        ),
+                    })
                 else:
                     write_phase_allowed = True
                     await self._emit_progress("phase.write_enabled", {"iteration": f"{iter_idx+1}/{iters}"})
@@ -1318,18 +1812,19 @@ class Agent:
                     })
 
             # Append assistant message that contains ONLY the tool calls we will actually execute
-            messages.append({
-                "role": "assistant",
-                "content": "",
-                "tool_calls": [
-                    {
-                        "id": tc.id,
-                        "type": tc.type,
-                        "function": {"name": tc.function.name, "arguments": tc.function.arguments},
-                    }
-                    for tc in tool_calls
-                ],
-            })
+            if tool_calls:
+                messages.append({
+                    "role": "assistant",
+                    "content": "",
+                    "tool_calls": [
+                        {
+                            "id": tc.id,
+                            "type": tc.type,
+                            "function": {"name": tc.function.name, "arguments": tc.function.arguments},
+                        }
+                        for tc in tool_calls
+                    ],
+                })
 
             # Execute tool calls concurrently with bounded parallelism and batching
             rc = load_runtime_config(self.project_root)
@@ -1338,8 +1833,26 @@ class Agent:
             retry_max = int(rc.get("tools", {}).get("retryMax", 2))
             backoff_base_ms = int(rc.get("tools", {}).get("backoffBaseMs", 200))
 
+            # Calls dispatched while the completion streamed are only awaited here; after a
+            # non-streaming fallback the ids are new, so those match on name and arguments
+            streamed_ids = {tc.id for tc in tool_calls if tc.id in early_tasks}
+            streamed_tasks = [early_tasks.pop(tc_id)[1] for tc_id in streamed_ids]
+            pending_calls = []
+            for tc in tool_calls:
+                if tc.id in streamed_ids:
+                    continue
+                key = self._tool_call_key(tc)
+                match = next((tc_id for tc_id, (k, _task) in early_tasks.items() if k == key), None)
+                if match is None:
+                    pending_calls.append(tc)
+                else:
+                    streamed_tasks.append(self._result_for(tc.id, early_tasks.pop(match)[1]))
+            for _key, leftover in early_tasks.values():
+                leftover.cancel()
+            early_tasks.clear()
+
             # Group tool calls by type for potential batching
-            tool_groups = self._group_tool_calls_for_batching(tool_calls)
+            tool_groups = self._group_tool_calls_for_batching(pending_calls)
             
             async def run_one_or_batch(tc_or_group):
                 if isinstance(tc_or_group, list):
@@ -1358,7 +1871,7 @@ class Agent:
                     return await run_one_or_batch(tc_or_group)
 
             # Execute tool calls first, then prepare for next iteration
-            tool_execution_task = asyncio.gather(*[sem_wrapped(tc_or_group) for tc_or_group in tool_groups])
+            tool_execution_task = asyncio.gather(*[sem_wrapped(tc_or_group) for tc_or_group in tool_groups], *streamed_tasks)
             
             # Wait for tool execution to complete first
             results = await tool_execution_task
@@ -1410,9 +1923,9 @@ class Agent:
                     
                     if quick_model and quick_provider == current_provider:
                         self.log.info(f"Using quick model {quick_model} for early termination finalization")
-                        resp = await self._achat_once(messages, quick_model, "quick", tool_choice_override="none")
+                        resp = await self._achat_final(messages, quick_model, "quick", stream_final_to_callback)
                     else:
-                        resp = await self._achat_once(messages, model, role, tool_choice_override="none")
+                        resp = await self._achat_final(messages, model, role, stream_final_to_callback)
                     
                     try:
                         if getattr(self, "progress", None) is not None:
@@ -1425,12 +1938,29 @@ class Agent:
                     self.log.warning(f"Early termination finalization failed: {e}, continuing with normal flow")
                     # Continue with normal flow if early termination fails
             
+            if self._work_budget_low():
+                return await self._finalize_on_deadline(messages, model, role, stream_final_to_callback)
+
+            if not require_validation_read and self._contains_write_success(flattened_results) and self._writes_verified(flattened_results):
+                # Verify hooks already confirmed the write from the returned resource: skip the validation turn
+                await self._emit_progress("phase.write_verified", {"iteration": f"{iter_idx+1}/{iters}"})
+                messages.append({
+                    "role": "system",
+                    "content": "The write succeeded and was verified (see the verification field). Finalize now: produce a concise, friendly user-facing reply with no meta-instructions or headings. Do not call tools.",
+                })
+                resp = await self._achat_final(messages, model, role, stream_final_to_callback)
+                try:
+                    if getattr(self, "progress", None) is not None:
+                        self.progress.stop_heartbeat("agent")
+                except Exception:
+                    pass
+                await self._emit_progress("agent.finish", {"reason": "write_verified"})
+                return resp
+
             # Start next LLM call after tool execution and result processing is complete
             next_llm_task = None
             if iter_idx < iters - 1:  # Not the last iteration
-                next_llm_task = asyncio.create_task(
-                    self._achat_once(messages, model, role, tool_choice_override=next_tool_choice_override)
-                )
+                next_llm_task = _start_llm_call(next_tool_choice_override, iters - iter_idx - 1)
                 llm_calls_count += 1
             # Post-write validation planning and finalize gating (mirrors sync path)
             write_success = self._contains_write_success(flattened_results)
@@ -1476,12 +2006,12 @@ class Agent:
                         
                         if quick_model and quick_provider == current_provider:
                             self.log.info(f"Using quick model {quick_model} for post-validation finalization")
-                            resp = await self._achat_once(messages, quick_model, "quick", tool_choice_override="none")
+                            resp = await self._achat_final(messages, quick_model, "quick", stream_final_to_callback)
                         else:
-                            resp = await self._achat_once(messages, model, role, tool_choice_override="none")
+                            resp = await self._achat_final(messages, model, role, stream_final_to_callback)
                     except Exception as e:
                         self.log.warning(f"Failed to use quick model for post-validation finalization: {e}, falling back to {model}")
-                        resp = await self._achat_once(messages, model, role, tool_choice_override="none")
+                        resp = await self._achat_final(messages, model, role, stream_final_to_callback)
                     
                     try:
                         if getattr(self, "progress", None) is not None:
@@ -1635,6 +2165,8 @@ class Agent:
                         
                         # Extract meaningful findings based on tool type
                         if isinstance(summary, dict):
+                            # Tabular lists (cols/rows) back to objects
+                            summary = {k: untabulate(v) for k, v in summary.items()}
                             # Prefer listing top items when available
                             if "items" in summary and isinstance(summary["items"], list) and summary["items"]:
                                 top = summary["items"][:3]
@@ -1954,6 +2486,134 @@ Generate a response that acknowledges the iteration limit while being genuinely
         model = sel.get("model", "gpt-5")
         return await self._arun_tools_loop(messages, model=model, role="smart")
 
+    async def _run_plan_mode(
+        self,
+        messages: List[Dict[str, Any]],
+        model: str,
+        role: str,
+        must_write: bool,
+        plan_cfg: Dict[str, Any],
+        dedup_cache: Dict[str, Any],
+        on_content: Optional[Callable[[str], Any]] = None,
+    ) -> Optional[tuple]:
+        """Ask for a tool DAG once, execute it, then synthesize.
+
+        Returns None when no usable plan was produced (nothing was executed).
+        Otherwise returns ``(response, wrote, tool_calls)``; ``response`` is None
+        when a step failed, in which case ``messages`` holds the executed steps
+        and a repair note for the regular loop to continue from.
+        """
+        max_steps = int(plan_cfg.get("maxSteps", 8))
+        plan_messages = list(messages) + [{
+            "role": "system",
+            "content": build_plan_prompt(describe_tools(self.openai_tools), max_steps=max_steps, allow_writes=must_write),
+        }]
+        try:
+            # A tool-less turn would be admitted as a final answer; planning must not take those slots
+            with llm_priority(Priority.TOOL_SELECTION):
+                resp = await self._achat_once(plan_messages, model, role, tool_choice_override="none")
+            steps = parse_plan(resp.choices[0].message.content or "", max_steps=max_steps)
+            for step in steps:
+                self.tool_registry.get(step.tool)
+                if not self._is_write_tool_name(step.tool):
+                    continue
+                if not must_write:
+                    raise PlanError(f"unrequested write step {step.tool}")
+                # The tool loop's write policy: only hooked writes, on an id a planned lookup returns
+                hooks = self._write_hooks_for(step.tool)
+                target = step.args.get(hooks.id_arg) if hooks is not None else None
+                if not (isinstance(target, str) and target.startswith("$")):
+                    raise PlanError(f"write step {step.tool} needs write hooks and an id from an earlier step")
+        except Exception as e:
+            self.log.info(f"plan mode skipped: {e}")
+            return None
+
+        await self._emit_progress("plan.start", {"steps": [s.tool for s in steps]})
+        rc_exec = load_runtime_config(self.project_root)
+        tools_cfg = rc_exec.get("tools", {}) or {}
+        timeout_ms = int(tools_cfg.get("timeoutMs", 8000))
+        retry_max = int(tools_cfg.get("retryMax", 2))
+        backoff_base_ms = int(tools_cfg.get("backoffBaseMs", 200))
+        executed: List[tuple] = []
+        call_ids: Dict[int, Any] = {}
+
+        async def run_tool(step: PlanStep, args: Dict[str, Any]) -> Any:
+            tc = self._build_tool_call(step.tool, args)
+            call_ids[step.id] = tc
+            out = await self._execute_single_tool(tc, timeout_ms, retry_max, backoff_base_ms, dedup_cache)
+            executed.append(out)
+            return out[2]
+
+        run = await PlanExecutor(run_tool, max_parallel=int(tools_cfg.get("parallelism", 4))).run(steps)
+        self.log.info("plan executed", extra={"steps": len(steps), "ok": run.ok, "wall_ms": run.wall_ms})
+
+        ran = [call_ids[sid] for sid in run.results if sid in call_ids]
+        if ran:
+            messages.append({
+                "role": "assistant",
+                "content": "",
+                "tool_calls": [
+                    {"id": tc.id, "type": tc.type, "function": {"name": tc.function.name, "arguments": tc.function.arguments}}
+                    for tc in ran
+                ],
+            })
+            # Keep tool messages in the same order as the assistant tool_calls
+            order = {tc.id: i for i, tc in enumerate(ran)}
+            executed.sort(key=lambda out: order.get(out[0], len(order)))
+            messages.extend(await self._process_results_async(executed))
+        wrote = any(r.status == "ok" and self._is_write_tool_name(r.step.tool) for r in run.results.values())
+
+        if not run.ok:
+            problems = "; ".join(f"step {r.step.id} ({r.step.tool}) {r.status}: {r.error}" for r in run.failed)
+            messages.append({"role": "system", "content": f"Planned execution incomplete: {problems}. Repair with further tool calls or explain the failure."})
+            await self._emit_progress("plan.failed", {"failed": [r.step.id for r in run.failed]})
+            return None, wrote, len(ran)
+
+        messages.append({"role": "system", "content": "All planned steps succeeded. Finalize now from the tool results. Do not call tools."})
+        final = await self._achat_final(messages, model, role, on_content)
+        return final, wrote, len(ran)
+
+    def _intent_classifier_cfg(self) -> Dict[str, Any]:
+        rc = load_runtime_config(self.project_root)
+        return ((rc.get("llm", {}) or {}).get("intentClassifier", {}) or {})
+
+    def _resolve_project_path(self, value: str) -> Path:
+        p = Path(value)
+        return p if p.is_absolute() else self.project_root / p
+
+    def _classify_query_complexity_local(self, msgs: List[Dict[str, Any]], rc: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Classify with the in-process intent model; None when disabled, untrained or unsure."""
+        cfg = ((rc.get("llm", {}) or {}).get("intentClassifier", {}) or {})
+        if not bool(cfg.get("enabled", False)):
+            return None
+        try:
+            clf = load_intent_classifier(self._resolve_project_path(str(cfg.get("modelPath", "data/intent_model.json"))))
+            if clf is None:
+                return None
+            user_query = "\n".join(str(m.get("content", "")) for m in msgs if m.get("role") == "user").strip()
+            if not user_query:
+                return None
+            result = clf.classify(user_query)
+            if result["confidence"] < float(cfg.get("minConfidence", 0.55)):
+                # Low-confidence predictions defer to the LLM (or heuristic) path
+                return None
+            self.log.info("query classified locally", extra={"complexity": result["complexity"], "confidence": result["confidence"], "families": result.get("families", [])})
+            return result
+        except Exception as e:
+            self.log.debug(f"local intent classification failed: {e}")
+            return None
+
+    def _log_intent_training_example(self, user_query: str, classification: Dict[str, Any], latency_ms: int) -> None:
+        """Append an LLM-labelled query to the intent training log (best-effort)."""
+        try:
+            cfg = self._intent_classifier_cfg()
+            if not bool(cfg.get("logTrainingData", False)):
+                return
+            path = self._resolve_project_path(str(cfg.get("trainingLogPath", "data/intent_training.jsonl")))
+            append_training_example(path, user_query, classification, latency_ms)
+        except Exception as e:
+            self.log.debug(f"failed to log intent training example: {e}")
+
     async def _classify_query_complexity_llm(self, msgs: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Use LLM to classify query complexity and extract metadata for better decision making."""
         try:
@@ -1992,10 +2652,22 @@ Respond in JSON format:
 }}"""
 
             messages = [{"role": "user", "content": classification_prompt}]
-            
-            # Use async chat for classification
-            resp = await self._achat_once(messages, model, "summarizer")
-            content = resp.choices[0].message.content
+
+            # Classification output depends only on the query text, so repeated
+            # phrasings are answered from the response cache without a round trip
+            resp_cache = get_llm_response_cache(self.project_root)
+            cached = resp_cache.get("summarizer", model, QUERY_CLASSIFICATION_PROMPT_VERSION, user_query) if resp_cache else None
+            if cached is not None:
+                self.log.info("query classification served from cache")
+                content = cached
+                latency_ms = 0
+            else:
+                t0 = time.monotonic()
+                # Background class: tools are offered, which would otherwise admit it as tool selection
+                with llm_priority(Priority.CLASSIFICATION):
+                    resp = await self._achat_once(messages, model, "summarizer")
+                content = resp.choices[0].message.content
+                latency_ms = int((time.monotonic() - t0) * 1000)
             
             # Handle case where LLM returns None content
             if content is None:
@@ -2013,7 +2685,9 @@ Respond in JSON format:
             import json
             try:
                 result = json.loads(content)
-                return {
+                if resp_cache is not None and cached is None:
+                    await resp_cache.aput("summarizer", model, QUERY_CLASSIFICATION_PROMPT_VERSION, user_query, content, latency_ms)
+                classification = {
                     "complexity": result.get("complexity", "unknown"),
                     "confidence": float(result.get("confidence", 0.0)),
                     "reasoning": result.get("reasoning", ""),
@@ -2021,6 +2695,9 @@ Respond in JSON format:
                     "suggested_tools": result.get("suggested_tools", []),
                     "estimated_iterations": int(result.get("estimated_iterations", 3))
                 }
+                if cached is None:
+                    self._log_intent_training_example(user_query, classification, latency_ms)
+                return classification
             except (json.JSONDecodeError, KeyError, ValueError) as e:
                 self.log.error(f"Failed to parse LLM classification response: {e}")
                 raise RuntimeError(f"LLM classification response parsing failed: {e}")
@@ -2044,6 +2721,10 @@ Respond in JSON format:
         # Determine max items to keep in summaries and cache TTL
         list_max_default = int(self._tuning_cfg.get("list_max_default", 5))
         cache_ttl_sec = int(self._tuning_cfg.get("cache_ttl_short", 60))
+        summary_cfg = ((self._tuning_cfg.get("tools", {}) or {}).get("summaries", {}) or {})
+        max_bytes = int(summary_cfg.get("maxBytes", 0)) or None
+        offload_min_items = int(summary_cfg.get("offloadMinItems", 2000))
+        tabular_min_rows = self._tabular_min_rows(self._tuning_cfg)
         
         async def process_single_result(tool_call_id, name, result, attempts, cache_hit):
             """Process a single tool result asynchronously with no blocking operations."""
@@ -2055,20 +2736,28 @@ Respond in JSON format:
             except Exception:
                 ref_id = None
 
-            # Summarize and minify tool output
+            # Summarize straight to JSON bytes with the tool's compiled summarizer (byte-budgeted)
             try:
                 # If result set is very small (<=2), preserve raw fields (truncated) instead of lossy summary
                 preserved = self._preserve_raw_if_small(result, max_keep=2)
                 fam = self._classify_tool_family(name)
                 fam_budgets = (self._tuning_cfg.get("tools_cfg", {}).get("listMaxItemsByFamily", {}) or {})
                 list_max_items = int(fam_budgets.get(fam, list_max_default))
-                summarized = preserved if preserved is not None else summarize_tool_result(name, result, max_items=list_max_items)
+                if preserved is not None:
+                    summary_bytes = dumps_bytes(preserved)
+                else:
+                    summary_bytes = await summarize_tool_result_bytes_async(
+                        name,
+                        result,
+                        max_items=list_max_items,
+                        max_bytes=max_bytes,
+                        offload_min_items=offload_min_items,
+                        tabular_min_rows=tabular_min_rows,
+                    )
             except Exception:
-                summarized = result
+                summary_bytes = dumps_bytes(result)
 
-            # Create payload and serialize JSON directly (no blocking)
-            payload = {"ref_id": ref_id, "summary": summarized}
-            content = json.dumps(payload, separators=(",", ":"))
+            content = (b'{"ref_id":' + dumps_bytes(ref_id) + b',"summary":' + summary_bytes + b"}").decode("utf-8")
             
             return {
                 "role": "tool",
@@ -170,6 +170,16 @@ class PromptComponents:
             "  * system_health_overview: unified health + disk space"
         )
 
+    @staticmethod
+    def tool_result_format() -> str:
+        return (
+            "TOOL RESULTS:\n"
+            "- Lists may arrive as tables: {cols:[...], rows:[[...],...]}. Each row "
+            "is one item; its values follow the cols order (null = missing).\n"
+            "- \"omitted\": N means N more items exist; use fetch_cached_result "
+            "with ref_id if you need them."
+        )
+
     @staticmethod
     def tool_selection_guide() -> str:
         return (
@@ -184,9 +194,9 @@ class PromptComponents:
             "- Movie details → tmdb_search (details included) → present\n"
             "- TV details → tmdb_search_tv (details included) → present\n"
             "- Add movie → tmdb_search + radarr_lookup + search_plex → "
-            "radarr_add_movie → validate\n"
+            "radarr_add_movie (duplicate check + verification are automatic)\n"
             "- Add TV → tmdb_search_tv + sonarr_lookup + search_plex → "
-            "sonarr_add_series → validate\n"
+            "sonarr_add_series (duplicate check + verification are automatic)\n"
             "- Trends → tmdb_discovery_suite(discovery_types:['trending']) + search_plex\n"
             "- Similar → *_details + *_similar + search_plex\n"
             "- Preferences → query_household_preferences → read_household_preferences\n"
@@ -226,7 +236,7 @@ class PromptComponents:
             "- Add The Matrix: Batch1 → tmdb_search('The Matrix', include_details:true)"
             " + radarr_lookup('The Matrix') + search_plex('The Matrix'); "
             "Batch2 → radarr_add_movie(tmdb_id, qualityProfileId=1, "
-            "rootFolderPath='D:\\\\Movies') → validate with radarr_get_movies.\n"
+            "rootFolderPath='D:\\\\Movies') → done (the add result carries its verification).\n"
             "- Trending: Batch1 → tmdb_discovery_suite(discovery_types:['trending']) "
             "+ search_plex(filters:{sort_by:'addedAt', sort_order:'desc'}) → present.\n"
             "- 80s horror: Batch1 → tmdb_discovery_suite(discovery_types:['discover'], "
@@ -415,6 +425,7 @@ def build_minimal_system_prompt() -> str:
             c.bundled_tools_guide(),
             c.performance_optimization(),
             c.tool_syntax_guidance(),
+            c.tool_result_format(),
             c.tool_selection_guide(),
             c.sub_agent_integration(),
             c.timeout_aware_execution(),
@@ -450,6 +461,7 @@ def build_general_system_prompt(
             c.communication_style(),
             c.workflow_optimization(),
             c.performance_optimization(),
+            c.tool_result_format(),
             c.tool_selection_guide(),
             c.timeout_aware_execution(),
             c.quality_standards(),
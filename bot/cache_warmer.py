@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from config.loader import load_runtime_config
+from integrations.ttl_cache import shared_cache
+from .tools.result_cache import tool_dedup_key
+
+
+@dataclass
+class WarmJob:
+    """A read-only tool call whose result is kept warm in the shared session cache."""
+    name: str
+    tool: str
+    args: Dict[str, Any] = field(default_factory=dict)
+    ttl_sec: int = 300
+
+
+@dataclass
+class WarmJobStats:
+    runs: int = 0
+    failures: int = 0
+    last_ms: int = 0
+    total_ms: int = 0
+    max_ms: int = 0
+    last_run_at: Optional[float] = None
+    last_error: Optional[str] = None
+    next_run_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        ok_runs = self.runs - self.failures
+        return {
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_ms": self.last_ms,
+            "avg_ms": int(self.total_ms / ok_runs) if ok_runs > 0 else 0,
+            "max_ms": self.max_ms,
+            "last_run_at": self.last_run_at,
+            "last_error": self.last_error,
+            "next_run_at": self.next_run_at,
+        }
+
+
+# Defaults mirror the fast-path recipes in bot.intent_router.DEFAULT_INTENTS so that
+# the fast-path tool calls hit the warm entries verbatim.
+DEFAULT_WARM_JOBS: List[Dict[str, Any]] = [
+    {"name": "plex_overview_movie", "tool": "plex_library_overview", "args": {"section_type": "movie", "limit": 4, "response_level": "compact"}, "ttlSec": 120},
+    {"name": "plex_overview_show", "tool": "plex_library_overview", "args": {"section_type": "show", "limit": 4, "response_level": "compact"}, "ttlSec": 120},
+    {"name": "plex_recently_added", "tool": "search_plex", "args": {"filters": {"sort_by": "addedAt", "sort_order": "desc"}, "limit": 4, "response_level": "compact"}, "ttlSec": 120},
+    {"name": "tmdb_trending", "tool": "tmdb_discovery_suite", "args": {"discovery_types": ["trending"]}, "ttlSec": 900},
+    {"name": "tmdb_trending_today", "tool": "tmdb_discovery_suite", "args": {"discovery_types": ["trending"], "time_window": "day"}, "ttlSec": 900},
+    {"name": "tmdb_genres_movie", "tool": "tmdb_genres", "args": {"media_type": "movie"}, "ttlSec": 86400},
+    {"name": "tmdb_genres_tv", "tool": "tmdb_genres", "args": {"media_type": "tv"}, "ttlSec": 86400},
+    {"name": "radarr_quality_profiles", "tool": "radarr_quality_profiles", "args": {}, "ttlSec": 3600},
+    {"name": "radarr_root_folders", "tool": "radarr_root_folders", "args": {}, "ttlSec": 3600},
+    {"name": "sonarr_quality_profiles", "tool": "sonarr_quality_profiles", "args": {}, "ttlSec": 3600},
+    {"name": "sonarr_root_folders", "tool": "sonarr_root_folders", "args": {}, "ttlSec": 3600},
+]
+
+
+class CacheWarmer:
+    """Background scheduler that warms hot, slow-changing tool results.
+
+    - Runs every configured job once at startup, then refreshes each job ahead of
+      its TTL (``refreshAheadPct``) with random jitter so jobs do not align
+    - Stores results under the same ``tool:<dedup key>`` entries the Agent reads,
+      so the first user to ask is served from cache
+    - Caps concurrent refreshes with a semaphore and applies a per-job timeout
+    - Keeps per-job timing metrics for inspection via ``get_stats()``
+    """
+
+    def __init__(
+        self,
+        project_root: Path,
+        *,
+        registry: Any = None,
+        jobs: Optional[List[WarmJob]] = None,
+        concurrency: Optional[int] = None,
+        refresh_ahead_pct: Optional[float] = None,
+        jitter_pct: Optional[float] = None,
+        timeout_ms: Optional[int] = None,
+    ) -> None:
+        self.project_root = project_root
+        rc = load_runtime_config(project_root)
+        cfg = (rc.get("cache", {}) or {}).get("warmer", {}) or {}
+        self.enabled = bool(cfg.get("enabled", True))
+        self.concurrency = max(1, int(concurrency if concurrency is not None else cfg.get("concurrency", 3)))
+        self.refresh_ahead_pct = float(refresh_ahead_pct if refresh_ahead_pct is not None else cfg.get("refreshAheadPct", 0.2))
+        self.jitter_pct = float(jitter_pct if jitter_pct is not None else cfg.get("jitterPct", 0.1))
+        self.timeout_ms = int(timeout_ms if timeout_ms is not None else cfg.get("timeoutMs", 10000))
+        self.jobs = jobs if jobs is not None else self._jobs_from_config(cfg.get("jobs"))
+        self._registry = registry
+        self._sem = asyncio.Semaphore(self.concurrency)
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._stats: Dict[str, WarmJobStats] = {job.name: WarmJobStats() for job in self.jobs}
+        self._log = logging.getLogger("moviebot.cache_warmer")
+
+    @staticmethod
+    def _jobs_from_config(raw: Any) -> List[WarmJob]:
+        entries = raw if isinstance(raw, list) and raw else DEFAULT_WARM_JOBS
+        jobs: List[WarmJob] = []
+        for entry in entries:
+            if not isinstance(entry, dict) or not entry.get("tool"):
+                continue
+            tool = str(entry["tool"])
+            jobs.append(WarmJob(
+                name=str(entry.get("name") or tool),
+                tool=tool,
+                args=dict(entry.get("args") or {}),
+                ttl_sec=int(entry.get("ttlSec", 300)),
+            ))
+        return jobs
+
+    def _get_registry(self) -> Any:
+        if self._registry is None:
+            from .tools.registry_cache import get_cached_registry, initialize_registry_cache
+            initialize_registry_cache(self.project_root)
+            _, self._registry = get_cached_registry()
+        return self._registry
+
+    def _refresh_delay_s(self, job: WarmJob) -> float:
+        base = job.ttl_sec * max(0.05, 1.0 - self.refresh_ahead_pct)
+        jitter = base * self.jitter_pct * random.uniform(-1.0, 1.0)
+        return max(1.0, base + jitter)
+
+    async def run_job(self, job: WarmJob) -> bool:
+        """Execute one job and store its result; returns True on success."""
+        stats = self._stats.setdefault(job.name, WarmJobStats())
+        async with self._sem:
+            t0 = time.monotonic()
+            stats.runs += 1
+            stats.last_run_at = time.time()
+            try:
+                fn = self._get_registry().get(job.tool)
+                result = await asyncio.wait_for(fn(dict(job.args)), timeout=self.timeout_ms / 1000)
+                if isinstance(result, dict) and (result.get("ok") is False or "error" in result):
+                    raise RuntimeError(str(result.get("error") or "tool returned an error"))
+                shared_cache.set(f"tool:{tool_dedup_key(job.tool, job.args)}", result, job.ttl_sec)
+                stats.last_error = None
+                ok = True
+            except Exception as e:  # noqa: BLE001
+                stats.failures += 1
+                stats.last_error = str(e) or type(e).__name__
+                ok = False
+            duration_ms = int((time.monotonic() - t0) * 1000)
+        stats.last_ms = duration_ms
+        if ok:
+            stats.total_ms += duration_ms
+            stats.max_ms = max(stats.max_ms, duration_ms)
+        self._log.info("cache warm job done", extra={"job": job.name, "tool": job.tool, "ok": ok, "duration_ms": duration_ms})
+        return ok
+
+    async def warm_all(self) -> Dict[str, bool]:
+        """Run every job once, concurrently (bounded by the semaphore)."""
+        results = await asyncio.gather(*[self.run_job(job) for job in self.jobs])
+        return {job.name: ok for job, ok in zip(self.jobs, results)}
+
+    async def _job_loop(self, job: WarmJob) -> None:
+        stats = self._stats[job.name]
+        try:
+            # Spread the startup burst a little
+            await asyncio.sleep(random.uniform(0, self.jitter_pct) if self.jitter_pct > 0 else 0)
+            while True:
+                ok = await self.run_job(job)
+                # Retry failed jobs sooner, but never hammer a down service
+                delay = self._refresh_delay_s(job) if ok else min(60.0, max(5.0, job.ttl_sec * 0.1))
+                stats.next_run_at = time.time() + delay
+                await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            return
+
+    def start(self) -> None:
+        """Start one background loop per job; safe to call more than once."""
+        if not self.enabled:
+            self._log.info("cache warmer disabled by config")
+            return
+        for job in self.jobs:
+            if job.name not in self._tasks:
+                self._tasks[job.name] = asyncio.create_task(self._job_loop(job))
+
+    async def stop(self) -> None:
+        tasks = list(self._tasks.values())
+        self._tasks.clear()
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-job metrics for monitoring."""
+        return {
+            "enabled": self.enabled,
+            "running": bool(self._tasks),
+            "concurrency": self.concurrency,
+            "jobs": {name: st.to_dict() for name, st in self._stats.items()},
+        }
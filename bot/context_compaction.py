@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from integrations.ttl_cache import shared_cache
+from .tool_summarizers import summarize_tool_result, untabulate
+
+
+# Stages a tool message moves through; never back
+STAGE_ORIGINAL = 0
+STAGE_SUMMARY = 1
+STAGE_STUB = 2
+
+# Approximate per-message framing cost in chat formats (role, separators)
+_MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def _default_token_counter() -> Callable[[str], int]:
+    try:
+        import tiktoken
+
+        enc = tiktoken.get_encoding("cl100k_base")
+        return lambda s: len(enc.encode(s))
+    except Exception:
+        # ~4 characters per token for English/JSON text
+        return lambda s: (len(s) + 3) // 4
+
+
+@dataclass
+class CompactionReport:
+    tokens_before: int
+    tokens_after: int
+    summarized: int = 0
+    stubbed: int = 0
+    dropped_turns: int = 0
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.summarized or self.stubbed or self.dropped_turns)
+
+
+class ContextCompactor:
+    """Keeps a chat transcript under a token budget by shrinking older tool results.
+
+    Over budget, tool messages are compacted oldest first, one step at a time:
+    1. re-summarized with ``summarize_tool_result`` (from the raw result behind
+       their ``ref_id``) using a smaller item budget
+    2. replaced by a one-line stub that keeps the ``ref_id`` so the model can
+       still call ``fetch_cached_result``
+    3. as a last resort, whole older turns (the assistant ``tool_calls`` message
+       together with all of its tool replies) are dropped
+
+    Tool messages of the most recent assistant turn are never touched, and every
+    remaining tool message still follows the assistant message that requested
+    it, so the transcript stays valid for the Chat Completions API. Token costs
+    are memoized per content string; stages are tracked per message object.
+    """
+
+    def __init__(
+        self,
+        budget_tokens: int,
+        *,
+        count_text: Optional[Callable[[str], int]] = None,
+        summary_max_items: int = 3,
+        tabular_min_rows: int = 0,
+    ) -> None:
+        self.budget_tokens = int(budget_tokens)
+        self.summary_max_items = int(summary_max_items)
+        self.tabular_min_rows = int(tabular_min_rows)
+        self._count_text = count_text or _default_token_counter()
+        self._cost_cache: Dict[str, int] = {}
+        self._stage: Dict[int, int] = {}
+        self._log = logging.getLogger("moviebot.context_compaction")
+
+    # ------------------------------------------------------------ costs
+
+    def _text_cost(self, text: str) -> int:
+        cost = self._cost_cache.get(text)
+        if cost is None:
+            cost = self._count_text(text)
+            if len(self._cost_cache) > 4096:
+                self._cost_cache.clear()
+            self._cost_cache[text] = cost
+        return cost
+
+    def message_cost(self, msg: Dict[str, Any]) -> int:
+        cost = _MESSAGE_OVERHEAD_TOKENS
+        content = msg.get("content")
+        if isinstance(content, str) and content:
+            cost += self._text_cost(content)
+        for tc in msg.get("tool_calls") or []:
+            fn = tc.get("function", {}) if isinstance(tc, dict) else {}
+            cost += self._text_cost(str(fn.get("name", ""))) + self._text_cost(str(fn.get("arguments", "")))
+        return cost
+
+    def total_cost(self, messages: List[Dict[str, Any]]) -> int:
+        return sum(self.message_cost(m) for m in messages)
+
+    # ------------------------------------------------------- transforms
+
+    @staticmethod
+    def _parse(content: Any) -> Dict[str, Any]:
+        try:
+            data = json.loads(content) if isinstance(content, str) else None
+        except Exception:
+            data = None
+        return data if isinstance(data, dict) else {"summary": content}
+
+    def _summarized_content(self, msg: Dict[str, Any]) -> Optional[str]:
+        data = self._parse(msg.get("content"))
+        ref_id = data.get("ref_id")
+        raw = shared_cache.get(ref_id) if ref_id else None
+        if raw is None:
+            return None
+        try:
+            summary = summarize_tool_result(
+                str(msg.get("name", "")), raw, max_items=self.summary_max_items, tabular_min_rows=self.tabular_min_rows
+            )
+        except Exception:
+            return None
+        return json.dumps({"ref_id": ref_id, "summary": summary}, separators=(",", ":"))
+
+    @staticmethod
+    def _one_line(name: str, summary: Any) -> str:
+        lists = [untabulate(v) for v in summary.values()] if isinstance(summary, dict) else []
+        lists = [v for v in lists if isinstance(v, list)]
+        if isinstance(summary, list):
+            lists = [summary]
+        if lists:
+            items = lists[0]
+            labels = []
+            for it in items[:2]:
+                if isinstance(it, dict):
+                    label = it.get("title") or it.get("name")
+                    if label:
+                        labels.append(f"{label} ({it['year']})" if it.get("year") else str(label))
+            head = f"{name}: {len(items)} item(s)"
+            return head + (f" e.g. {', '.join(labels)}" if labels else "")
+        if isinstance(summary, dict):
+            keys = ", ".join(list(summary.keys())[:5])
+            return f"{name}: object with {keys}" if keys else f"{name}: empty result"
+        return f"{name}: {str(summary)[:80]}"
+
+    def _stub_content(self, msg: Dict[str, Any]) -> str:
+        data = self._parse(msg.get("content"))
+        ref_id = data.get("ref_id")
+        # Describe the full raw result when it is still cached; the summary may be truncated
+        source = shared_cache.get(ref_id) if ref_id else None
+        if source is None:
+            source = data.get("summary")
+        stub: Dict[str, Any] = {"compacted": self._one_line(str(msg.get("name", "tool")), source)}
+        if ref_id:
+            stub["ref_id"] = ref_id
+        return json.dumps(stub, separators=(",", ":"), ensure_ascii=False)
+
+    # ----------------------------------------------------------- engine
+
+    @staticmethod
+    def _protected_tool_ids(messages: List[Dict[str, Any]]) -> Set[int]:
+        """Tool messages answering the latest assistant tool_calls turn."""
+        for i in range(len(messages) - 1, -1, -1):
+            m = messages[i]
+            if m.get("role") == "assistant" and m.get("tool_calls"):
+                return {id(t) for t in messages[i + 1:] if t.get("role") == "tool"}
+        return set()
+
+    def compact(self, messages: List[Dict[str, Any]]) -> CompactionReport:
+        """Compact ``messages`` in place until they fit the budget (or nothing is left to shrink)."""
+        total = self.total_cost(messages)
+        report = CompactionReport(total, total)
+        if total <= self.budget_tokens:
+            return report
+        protected = self._protected_tool_ids(messages)
+        candidates = [m for m in messages if m.get("role") == "tool" and id(m) not in protected]
+
+        for target_stage in (STAGE_SUMMARY, STAGE_STUB):
+            for msg in candidates:
+                if total <= self.budget_tokens:
+                    break
+                if self._stage.get(id(msg), STAGE_ORIGINAL) >= target_stage:
+                    continue
+                new_content = self._summarized_content(msg) if target_stage == STAGE_SUMMARY else self._stub_content(msg)
+                self._stage[id(msg)] = target_stage
+                if new_content is None:
+                    continue
+                before = self.message_cost(msg)
+                after = before - self._text_cost(str(msg.get("content") or "")) + self._text_cost(new_content)
+                if after >= before:
+                    continue
+                msg["content"] = new_content
+                total += after - before
+                if target_stage == STAGE_SUMMARY:
+                    report.summarized += 1
+                else:
+                    report.stubbed += 1
+
+        # Last resort: drop the oldest complete tool turns
+        while total > self.budget_tokens:
+            dropped = self._drop_oldest_turn(messages, protected)
+            if not dropped:
+                break
+            total -= dropped
+            report.dropped_turns += 1
+
+        report.tokens_after = total
+        if report.changed:
+            self._log.info(
+                "context compacted",
+                extra={"tokens_before": report.tokens_before, "tokens_after": total, "summarized": report.summarized, "stubbed": report.stubbed, "dropped_turns": report.dropped_turns},
+            )
+        return report
+
+    def _drop_oldest_turn(self, messages: List[Dict[str, Any]], protected: Set[int]) -> int:
+        for i, m in enumerate(messages):
+            if m.get("role") != "assistant" or not m.get("tool_calls"):
+                continue
+            ids = {tc.get("id") for tc in m["tool_calls"] if isinstance(tc, dict)}
+            group = [i] + [j for j in range(i + 1, len(messages)) if messages[j].get("role") == "tool" and messages[j].get("tool_call_id") in ids]
+            if any(id(messages[j]) in protected for j in group):
+                return 0
+            freed = sum(self.message_cost(messages[j]) for j in group)
+            for j in sorted(group, reverse=True):
+                # Forget the stage so a new message reusing this id() starts fresh
+                self._stage.pop(id(messages.pop(j)), None)
+            return freed
+        return 0
@@ -24,7 +24,17 @@ from .commands import (
 from .conversation import CONVERSATIONS
 from .agent import Agent
 from .agent_prompt import build_minimal_system_prompt
+from .cache_warmer import CacheWarmer
+from integrations.plex_sync import PlexSyncEngine, start_plex_sync
+from .run_scheduler import AgentRunScheduler
+from .intent_router import get_intent_router
+from integrations.deadline import Deadline, deadline_scope
 from .discord_embeds import MovieBotEmbeds, ProgressIndicator
+from llm.response_cache import get_llm_response_cache
+from ux.streaming import StreamingMessageEditor
+
+# Bump when the card classification prompt changes so cached answers are not reused
+CARD_CLASSIFICATION_PROMPT_VERSION = "card-v1"
 
 
 def ephemeral_embed(title: str, description: str) -> discord.Embed:
@@ -396,6 +406,17 @@ class MovieBotClient(discord.Client):
     def __init__(self, *, intents: discord.Intents):
         super().__init__(intents=intents)
         self.tree = app_commands.CommandTree(self)
+        self.cache_warmer: Optional[CacheWarmer] = None
+        self.plex_sync: Optional[PlexSyncEngine] = None
+        self._run_scheduler: Optional[AgentRunScheduler] = None
+
+    @property
+    def run_scheduler(self) -> AgentRunScheduler:
+        """Process-wide admission control for agent runs (``ux.runScheduler``)."""
+        if self._run_scheduler is None:
+            cfg = ((load_runtime_config(self.project_root).get("ux", {}) or {}).get("runScheduler", {}) or {})  # type: ignore[attr-defined]
+            self._run_scheduler = AgentRunScheduler(max_concurrent=int(cfg.get("maxConcurrentRuns", 4)))
+        return self._run_scheduler
 
     async def setup_hook(self) -> None:
         # During development, sync commands to a single guild if provided
@@ -406,6 +427,24 @@ class MovieBotClient(discord.Client):
             await self.tree.sync(guild)
         else:
             await self.tree.sync()
+        # Warm hot, slow-changing reads in the background so the first asker is served from cache
+        try:
+            self.cache_warmer = CacheWarmer(self.project_root)  # type: ignore[attr-defined]
+            self.cache_warmer.start()
+        except Exception as e:
+            logging.getLogger("moviebot.bot").warning(f"Cache warmer failed to start: {e}")
+        # Keep the local Plex index and cached Plex reads in step with the server
+        try:
+            self.plex_sync = await start_plex_sync(self.project_root)  # type: ignore[attr-defined]
+        except Exception as e:
+            logging.getLogger("moviebot.bot").warning(f"Plex sync failed to start: {e}")
+
+    async def close(self) -> None:
+        if self.cache_warmer is not None:
+            await self.cache_warmer.stop()
+        if self.plex_sync is not None:
+            await self.plex_sync.stop()
+        await super().close()
 
     async def _enrich_movie_data(self, title: str, year: str) -> dict:
         """Try to enrich movie data with TMDb information."""
@@ -485,17 +524,28 @@ Respond in JSON format:
 }}"""
 
             messages = [{"role": "user", "content": classification_prompt}]
-            
-            # Use the agent's LLM client for classification
-            from .agent import Agent
-            from config.loader import load_settings
-            settings = load_settings(self.project_root)
-            provider, _ = resolve_llm_selection(self.project_root, "summarizer")
-            api_key = settings.openai_api_key if provider == "openai" else (settings.openrouter_api_key or "")
-            
-            agent = Agent(api_key=api_key, project_root=self.project_root, provider=provider)
-            resp = await agent.llm.achat(model=model, messages=messages, **(sel.get("params", {}) or {}))
-            content = resp.choices[0].message.content
+
+            resp_cache = get_llm_response_cache(self.project_root)
+            cached = resp_cache.get("summarizer", model, CARD_CLASSIFICATION_PROMPT_VERSION, text) if resp_cache else None
+            if cached is not None:
+                logging.getLogger("moviebot.bot").info("card classification served from cache")
+                content = cached
+                latency_ms = 0
+            else:
+                # Use the agent's LLM client for classification
+                from .agent import Agent
+                from config.loader import load_settings
+                settings = load_settings(self.project_root)
+                provider, _ = resolve_llm_selection(self.project_root, "summarizer")
+                api_key = settings.openai_api_key if provider == "openai" else (settings.openrouter_api_key or "")
+
+                agent = Agent(api_key=api_key, project_root=self.project_root, provider=provider)
+                t0 = time.monotonic()
+                from llm.governor import Priority, llm_priority
+                with llm_priority(Priority.CLASSIFICATION):
+                    resp = await agent.llm.achat(model=model, messages=messages, **(sel.get("params", {}) or {}))
+                content = resp.choices[0].message.content
+                latency_ms = int((time.monotonic() - t0) * 1000)
             
             # Handle case where LLM returns None content
             if content is None:
@@ -513,6 +563,8 @@ Respond in JSON format:
             import json
             try:
                 result = json.loads(content)
+                if resp_cache is not None and cached is None:
+                    await resp_cache.aput("summarizer", model, CARD_CLASSIFICATION_PROMPT_VERSION, text, content, latency_ms)
                 return {
                     "should_create_card": bool(result.get("should_create_card", False)),
                     "confidence": float(result.get("confidence", 0.0)),
@@ -800,6 +852,7 @@ Respond in JSON format:
 
     async def _reply_llm_message(self, message: discord.Message) -> None:
         log = logging.getLogger("moviebot.bot")
+        t_received = time.monotonic()
         if not message.content:
             return
         conv_id = message.channel.id
@@ -820,6 +873,7 @@ Respond in JSON format:
         
         progress_message = None
         progress_update_task = None
+        streamer: Optional[StreamingMessageEditor] = None
         # Event-driven progress updates
         progress_events: asyncio.Queue = asyncio.Queue()
         last_rendered = None
@@ -876,7 +930,6 @@ Respond in JSON format:
         # Set the LLM client in the conversation store for token counting
         CONVERSATIONS.set_llm_client(agent.llm)
         
-        CONVERSATIONS.add_user(conv_id, content)
         log.info("incoming message", extra={
             "channel_id": conv_id,
             "author": str(message.author),
@@ -885,43 +938,9 @@ Respond in JSON format:
 
         # Lightweight quick-path: respond directly with a small model if tools likely unnecessary
         def _is_quick_path(s: str) -> bool:
-            s_lo = s.strip().lower()
-            if not s_lo:
-                return False
-
-            # Avoid quick path for actionable/tool-intent requests
-            blocklist = [
-                "search", "find", "recommend", "recommendation", "trending", "popular",
-                "add", "queue", "status", "recent", "on deck", "continue", "rate", "rating",
-                "unwatched", "collection", "details", "similar", "top rated", "upcoming",
-                "now playing", "watch providers", "providers",
-                "plex", "radarr", "sonarr", "tmdb"
-            ]
-            for term in blocklist:
-                if re.search(r"\b" + re.escape(term) + r"\b", s_lo):
-                    return False
-
-            # Heuristic: treat "Title (Year)" patterns as actionable (e.g., add/search), not quick path
-            # e.g., "synchronic (2020)", "inception (2010)"
-            try:
-                if re.search(r"\((19|20)\d{2}\)", s, flags=re.IGNORECASE):
-                    return False
-            except Exception:
-                pass
-
-            # Greetings / pleasantries / capability queries / style-only asks
-            quick_keywords = [
-                "hi", "hello", "hey", "how are you", "what can you do", "help", "capabilities",
-                "who are you", "what is moviebot", "explain yourself", "about you", "commands",
-                "format", "how to use", "usage", "examples", "tips", "thanks", "thank you"
-            ]
-
-            for phrase in quick_keywords:
-                if re.search(r"\b" + re.escape(phrase) + r"\b", s_lo):
-                    return True
-
-            # Default: not quick-path
-            return False
+            # Greetings / capability / style-only asks with no tool-intent terms;
+            # the intent table compiles both word lists into one matcher
+            return get_intent_router().is_quick_path(s)
 
         # Quick-path answer function using the 'quick' role
         async def _maybe_quick_path_response(text: str) -> str | None:
@@ -941,114 +960,95 @@ Respond in JSON format:
             except Exception:
                 return None
 
-        # Run blocking LLM call in a thread to avoid blocking the event loop
-        loop = asyncio.get_running_loop()
-        history = CONVERSATIONS.tail(conv_id)
-        
-        # Log token count for monitoring
-        token_count = CONVERSATIONS.get_token_count(conv_id)
-        log.info("conversation token count", extra={
-            "channel_id": conv_id,
-            "token_count": token_count,
-            "message_count": len(history)
-        })
+        async def _show_queue_position(position: int) -> None:
+            nonlocal progress_message
+            embed = MovieBotEmbeds.create_progress_embed(
+                "MovieBot Queued",
+                f"Lots of requests right now, you're number {position} in line. I'll start on yours shortly.",
+                progress=0.0,
+                status="loading",
+            )
+            try:
+                if progress_message is None:
+                    progress_message = await message.channel.send(embed=embed, silent=True)
+                else:
+                    await progress_message.edit(embed=embed)
+            except Exception as e:
+                log.debug(f"Failed to show queue position: {e}")
+
+        queue_wait_ms = 0.0
         
+        # One latency budget for the whole reply, counted from receipt but not charged
+        # for time queued for a run slot; the agent, tools and clients clamp their own
+        # timeouts to what is left of it
+        budget_ms = int((load_runtime_config(self.project_root).get("ux", {}) or {}).get("requestBudgetMs", 30000))  # type: ignore[attr-defined]
+        deadline = Deadline(budget_ms, start=t_received)
+
         try:
-            async with message.channel.typing():
-                # Show a progress note if it takes too long - optimized threshold
-                rc = load_runtime_config(self.project_root)  # type: ignore[attr-defined]
-                progress_ms = int(rc.get("ux", {}).get("progressThresholdMs", 3000))  # Reduced from 5000ms for faster feedback
-                done = asyncio.Event()
-                used_quick_path = False
-
-                async def progress_updater():
-                    """Update the progress message only when real events occur, but not too often."""
-                    nonlocal progress_message, last_rendered
-                    # Load throttling knobs
-                    rc_local = load_runtime_config(self.project_root)  # type: ignore[attr-defined]
-                    min_update_ms = int(rc_local.get("ux", {}).get("progressUpdateIntervalMs", 5000))
-                    freq = int(rc_local.get("ux", {}).get("progressUpdateFrequency", 3))
-                    last_edit_ms = 0.0
-                    event_counter = 0
+            with deadline_scope(deadline):
+                # Global cap, one run per channel, round-robin across users, quick path first
+                async with self.run_scheduler.slot(
+                    user=str(message.author.id), channel=str(conv_id), quick=_is_quick_path(content), on_position=_show_queue_position
+                ) as queue_wait_ms, message.channel.typing():
+                    deadline.extend(queue_wait_ms)
+                    # History is read once this channel's previous run has answered
+                    CONVERSATIONS.add_user(conv_id, content)
+                    history = CONVERSATIONS.tail(conv_id)
+                    log.info("conversation token count", extra={
+                        "channel_id": conv_id,
+                        "token_count": CONVERSATIONS.get_token_count(conv_id),
+                        "message_count": len(history),
+                    })
+                    # Show a progress note if it takes too long - optimized threshold
+                    rc = load_runtime_config(self.project_root)  # type: ignore[attr-defined]
+                    progress_ms = int(rc.get("ux", {}).get("progressThresholdMs", 3000))  # Reduced from 5000ms for faster feedback
+                    done = asyncio.Event()
+                    used_quick_path = False
+                    # Render the final answer into a reply that is edited as tokens arrive
+                    if bool(rc.get("ux", {}).get("streamFinalAnswer", True)):
+                        async def _send_stream(preview: str):
+                            return await message.reply(preview, mention_author=False)
+
+                        async def _edit_stream(sent, preview: str):
+                            return await sent.edit(content=preview)
+
+                        streamer = StreamingMessageEditor(
+                            _send_stream,
+                            _edit_stream,
+                            min_interval_s=float(rc.get("ux", {}).get("streamEditIntervalMs", 1200)) / 1000.0,
+                            started_at=t_received,
+                        )
+
+                    async def progress_updater():
+                        """Update the progress message only when real events occur, but not too often."""
+                        nonlocal progress_message, last_rendered
+                        # Load throttling knobs
+                        rc_local = load_runtime_config(self.project_root)  # type: ignore[attr-defined]
+                        min_update_ms = int(rc_local.get("ux", {}).get("progressUpdateIntervalMs", 5000))
+                        freq = int(rc_local.get("ux", {}).get("progressUpdateFrequency", 3))
+                        last_edit_ms = 0.0
+                        event_counter = 0
                     
-                    # Initialize progress calculator
-                    progress_calc = ProgressCalculator()
+                        # Initialize progress calculator
+                        progress_calc = ProgressCalculator()
                     
-                    try:
-                        # Wait until either done or threshold elapses
-                        await asyncio.wait_for(done.wait(), timeout=progress_ms / 1000)
-                        return  # Completed before we needed any status message
-                    except asyncio.TimeoutError:
-                        pass
-
-                    # After threshold, create the status message on first event or use a generic opener
-                    try:
                         try:
-                            evt = await asyncio.wait_for(progress_events.get(), timeout=1.0)
+                            # Wait until either done or threshold elapses
+                            await asyncio.wait_for(done.wait(), timeout=progress_ms / 1000)
+                            return  # Completed before we needed any status message
                         except asyncio.TimeoutError:
-                            evt = {"type": "thinking", "details": ""}
-
-                        # Calculate progress based on event type
-                        progress_value = progress_calc.calculate_progress(evt.get("type"), evt)
-                        
-                        # Extract tool name from details if it's a dict
-                        tool_name = None
-                        details = evt.get("details")
-                        if isinstance(details, dict):
-                            tool_name = details.get("name") or details.get("tool")
-                        elif isinstance(details, str):
-                            tool_name = details
-                        
-                        initial = _get_clever_progress_message(1,  # type: ignore[attr-defined]
-                                                               tool_name,
-                                                               evt.get("type"))
-                        
-                        # Create rich progress embed
-                        progress_embed = MovieBotEmbeds.create_progress_embed(
-                            "MovieBot Working",
-                            initial,
-                            progress=progress_value,
-                            status="working"
-                        )
-                        progress_message = await message.channel.send(embed=progress_embed, silent=True)
-                        last_rendered = initial
+                            pass
 
-                        # Consume subsequent events until done
-                        while not done.is_set():
+                        # After threshold, create the status message on first event or use a generic opener
+                        try:
                             try:
-                                evt = await asyncio.wait_for(progress_events.get(), timeout=30)
-                                print(f"PROGRESS UPDATER: {evt}")
-                                log.debug(f"Progress updater received event: {evt}")
+                                evt = await asyncio.wait_for(progress_events.get(), timeout=1.0)
                             except asyncio.TimeoutError:
-                                # No new events for a while; do not update arbitrarily
-                                log.debug("Progress updater timeout - no events for 30s")
-                                continue
-
-                            # Determine if we should update based on type, frequency, and time interval
-                            ptype = evt.get("type")
-                            log.debug(f"Processing event type: {ptype}")
-                            if ptype in {"heartbeat"}:
-                                log.debug("Skipping heartbeat event")
-                                continue
-
-                            event_counter += 1
-                            now_ms = time.monotonic() * 1000.0
-                            should_update = False
-                            # Update based on time interval (respect config)
-                            if (now_ms - last_edit_ms) >= min_update_ms:
-                                should_update = True
-                                log.debug(f"Update triggered by time interval: {now_ms - last_edit_ms}ms >= {min_update_ms}ms")
-                            # Also update on every event if frequency is 1, or every Nth event
-                            elif freq == 1 or (freq > 1 and (event_counter % freq == 0)):
-                                should_update = True
-                                log.debug(f"Update triggered by frequency: event {event_counter}, freq {freq}")
-                            if not should_update:
-                                log.debug(f"Skipping update: time={now_ms - last_edit_ms}ms, freq={freq}, event={event_counter}")
-                                continue
+                                evt = {"type": "thinking", "details": ""}
 
                             # Calculate progress based on event type
-                            progress_value = progress_calc.calculate_progress(ptype, evt)
-                            
+                            progress_value = progress_calc.calculate_progress(evt.get("type"), evt)
+                        
                             # Extract tool name from details if it's a dict
                             tool_name = None
                             details = evt.get("details")
@@ -1056,78 +1056,132 @@ Respond in JSON format:
                                 tool_name = details.get("name") or details.get("tool")
                             elif isinstance(details, str):
                                 tool_name = details
-                            
-                            new_message = _get_clever_progress_message(event_counter, tool_name, ptype)  # type: ignore[attr-defined]
-                            log.debug(f"Progress update: {progress_value:.1%} - {new_message}")
-                            if progress_message and new_message != last_rendered:
-                                # Update progress embed with calculated progress
-                                updated_embed = MovieBotEmbeds.create_progress_embed(
-                                    "MovieBot Working",
-                                    new_message,
-                                    progress=progress_value,
-                                    status="working"
-                                )
-                                log.debug(f"Updating progress message: {progress_value:.1%}")
-                                await progress_message.edit(embed=updated_embed)
-                                last_rendered = new_message
-                                last_edit_ms = now_ms
+                        
+                            initial = _get_clever_progress_message(1,  # type: ignore[attr-defined]
+                                                                   tool_name,
+                                                                   evt.get("type"))
+                        
+                            # Create rich progress embed
+                            progress_embed = MovieBotEmbeds.create_progress_embed(
+                                "MovieBot Working",
+                                initial,
+                                progress=progress_value,
+                                status="working"
+                            )
+                            if progress_message is None:
+                                progress_message = await message.channel.send(embed=progress_embed, silent=True)
                             else:
-                                log.debug(f"Skipping duplicate message or no progress_message")
-                    except Exception as e:
-                        log.warning(f"Failed to send or update progress message: {e}")
+                                # Replace the queue-position note
+                                await progress_message.edit(embed=progress_embed)
+                            last_rendered = initial
+
+                            # Consume subsequent events until done
+                            while not done.is_set():
+                                try:
+                                    evt = await asyncio.wait_for(progress_events.get(), timeout=30)
+                                    print(f"PROGRESS UPDATER: {evt}")
+                                    log.debug(f"Progress updater received event: {evt}")
+                                except asyncio.TimeoutError:
+                                    # No new events for a while; do not update arbitrarily
+                                    log.debug("Progress updater timeout - no events for 30s")
+                                    continue
+
+                                # Determine if we should update based on type, frequency, and time interval
+                                ptype = evt.get("type")
+                                log.debug(f"Processing event type: {ptype}")
+                                if ptype in {"heartbeat"}:
+                                    log.debug("Skipping heartbeat event")
+                                    continue
+
+                                event_counter += 1
+                                now_ms = time.monotonic() * 1000.0
+                                should_update = False
+                                # Update based on time interval (respect config)
+                                if (now_ms - last_edit_ms) >= min_update_ms:
+                                    should_update = True
+                                    log.debug(f"Update triggered by time interval: {now_ms - last_edit_ms}ms >= {min_update_ms}ms")
+                                # Also update on every event if frequency is 1, or every Nth event
+                                elif freq == 1 or (freq > 1 and (event_counter % freq == 0)):
+                                    should_update = True
+                                    log.debug(f"Update triggered by frequency: event {event_counter}, freq {freq}")
+                                if not should_update:
+                                    log.debug(f"Skipping update: time={now_ms - last_edit_ms}ms, freq={freq}, event={event_counter}")
+                                    continue
+
+                                # Calculate progress based on event type
+                                progress_value = progress_calc.calculate_progress(ptype, evt)
+                            
+                                # Extract tool name from details if it's a dict
+                                tool_name = None
+                                details = evt.get("details")
+                                if isinstance(details, dict):
+                                    tool_name = details.get("name") or details.get("tool")
+                                elif isinstance(details, str):
+                                    tool_name = details
+                            
+                                new_message = _get_clever_progress_message(event_counter, tool_name, ptype)  # type: ignore[attr-defined]
+                                log.debug(f"Progress update: {progress_value:.1%} - {new_message}")
+                                if progress_message and new_message != last_rendered:
+                                    # Update progress embed with calculated progress
+                                    updated_embed = MovieBotEmbeds.create_progress_embed(
+                                        "MovieBot Working",
+                                        new_message,
+                                        progress=progress_value,
+                                        status="working"
+                                    )
+                                    log.debug(f"Updating progress message: {progress_value:.1%}")
+                                    await progress_message.edit(embed=updated_embed)
+                                    last_rendered = new_message
+                                    last_edit_ms = now_ms
+                                else:
+                                    log.debug(f"Skipping duplicate message or no progress_message")
+                        except Exception as e:
+                            log.warning(f"Failed to send or update progress message: {e}")
 
-                try:
-                    # Try quick-path first (do not start progress updates yet)
-                    quick_text = await _maybe_quick_path_response(content)
-                    if quick_text is not None and quick_text.strip():
-                        response = {"choices": [{"message": {"content": quick_text}}]}
-                        used_quick_path = True
-                    else:
-                        # Only start progress updates if we are not using quick path
-                        progress_update_task = asyncio.create_task(progress_updater())
-                        try:
-                            # Buffer streamed chunks internally; do not send partials to the user
-                            streamed_text_parts: list[str] = []
-
-                            async def _on_stream(chunk: str) -> None:
-                                if not chunk:
-                                    return
-                                streamed_text_parts.append(chunk)
-
-                            response = await agent.aconverse(history, stream_final_to_callback=_on_stream)
-                        except Exception:
-                            # As a last resort, try quick-path even if heuristic failed initially
-                            fallback_text = await _maybe_quick_path_response(content)
-                            if fallback_text:
-                                response = {"choices": [{"message": {"content": fallback_text}}]}
-                                used_quick_path = True
-                            else:
-                                raise
-                finally:
-                    done.set()
-                    if progress_update_task:
-                        progress_update_task.cancel()
-                        # Wait for task to complete cancellation to prevent memory leaks
-                        try:
-                            await asyncio.wait_for(progress_update_task, timeout=1.0)
-                        except (asyncio.CancelledError, asyncio.TimeoutError):
-                            pass
+                    try:
+                        # Try quick-path first (do not start progress updates yet)
+                        quick_text = await _maybe_quick_path_response(content)
+                        if quick_text is not None and quick_text.strip():
+                            response = {"choices": [{"message": {"content": quick_text}}]}
+                            used_quick_path = True
+                        else:
+                            # Only start progress updates if we are not using quick path
+                            progress_update_task = asyncio.create_task(progress_updater())
+                            try:
+                                response = await agent.aconverse(history, stream_final_to_callback=streamer)
+                            except Exception:
+                                # As a last resort, try quick-path even if heuristic failed initially
+                                fallback_text = await _maybe_quick_path_response(content)
+                                if fallback_text:
+                                    response = {"choices": [{"message": {"content": fallback_text}}]}
+                                    used_quick_path = True
+                                else:
+                                    raise
+                    finally:
+                        done.set()
+                        if progress_update_task:
+                            progress_update_task.cancel()
+                            # Wait for task to complete cancellation to prevent memory leaks
+                            try:
+                                await asyncio.wait_for(progress_update_task, timeout=1.0)
+                            except (asyncio.CancelledError, asyncio.TimeoutError):
+                                pass
                         
-            # Extract text from response for both SDK objects and plain dicts
-            try:
-                if isinstance(response, dict):
-                    choices = response.get("choices", [])  # type: ignore[assignment]
-                    if choices and isinstance(choices[0], dict):
-                        msg = choices[0].get("message", {})
-                        text = msg.get("content", "")
+                # Extract text from response for both SDK objects and plain dicts
+                try:
+                    if isinstance(response, dict):
+                        choices = response.get("choices", [])  # type: ignore[assignment]
+                        if choices and isinstance(choices[0], dict):
+                            msg = choices[0].get("message", {})
+                            text = msg.get("content", "")
+                        else:
+                            text = str(response)
+                    elif hasattr(response, "choices"):
+                        text = response.choices[0].message.content  # type: ignore[attr-defined]
                     else:
                         text = str(response)
-                elif hasattr(response, "choices"):
-                    text = response.choices[0].message.content  # type: ignore[attr-defined]
-                else:
+                except Exception:
                     text = str(response)
-            except Exception:
-                text = str(response)
         except Exception as e:  # noqa: BLE001
             text = f"(error talking to model: {e})"
             done.set()
@@ -1136,10 +1190,15 @@ Respond in JSON format:
         
         # Send final reply with text (always)
         CONVERSATIONS.add_assistant(conv_id, text)
-        log.info("assistant reply", extra={"channel_id": conv_id, "content_preview": text[:120]})
+        log.info("assistant reply", extra={"channel_id": conv_id, "content_preview": text[:120], "queue_wait_ms": int(queue_wait_ms), "total_ms": int((time.monotonic() - t_received) * 1000)})
         
-        # Always send the text response first
-        await message.reply(text, mention_author=False)
+        # Always send the text response first (reusing the streamed reply when there is one)
+        streamed_reply = None
+        if streamer is not None:
+            streamed_reply = await streamer.finalize(text)
+            log.info("final answer streaming", extra={"channel_id": conv_id, **streamer.metrics()})
+        if streamed_reply is None:
+            await message.reply(text, mention_author=False)
         
         # Optionally send rich cards as additional messages if appropriate
         response_embeds = await self._create_smart_embed(text, used_quick_path)
@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import json
+import math
+import random
+import re
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+COMPLEXITIES: Tuple[str, ...] = ("simple", "medium", "complex")
+FAMILIES: Tuple[str, ...] = ("plex", "tmdb", "radarr", "sonarr")
+_ESTIMATED_ITERATIONS = {"simple": 2, "medium": 3, "complex": 4}
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+MODEL_VERSION = 1
+
+
+def families_for_tools(tool_names: Iterable[str]) -> List[str]:
+    """Map tool names (as suggested by the LLM classifier) to service families."""
+    found: List[str] = []
+    for name in tool_names or []:
+        n = str(name).lower()
+        for fam in FAMILIES:
+            if fam in n and fam not in found:
+                found.append(fam)
+    return found
+
+
+def featurize(text: str, n_features: int) -> Dict[int, float]:
+    """Hashed word 1-2 grams plus character 3-grams, L2 normalized.
+
+    crc32 keeps hashes stable across processes (``hash()`` is salted).
+    """
+    tokens = _TOKEN_RE.findall((text or "").lower())
+    grams: List[str] = [f"w:{t}" for t in tokens]
+    grams += [f"b:{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    for t in tokens:
+        padded = f"<{t}>"
+        grams += [f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+    feats: Dict[int, float] = {}
+    for g in grams:
+        idx = zlib.crc32(g.encode("utf-8")) % n_features
+        feats[idx] = feats.get(idx, 0.0) + 1.0
+    norm = math.sqrt(sum(v * v for v in feats.values())) or 1.0
+    return {k: v / norm for k, v in feats.items()}
+
+
+def _sigmoid(z: float) -> float:
+    if z >= 0:
+        return 1.0 / (1.0 + math.exp(-z))
+    e = math.exp(z)
+    return e / (1.0 + e)
+
+
+@dataclass
+class _Linear:
+    """One linear scorer: sparse weights plus bias."""
+    w: Dict[int, float] = field(default_factory=dict)
+    b: float = 0.0
+
+    def score(self, x: Dict[int, float]) -> float:
+        w = self.w
+        return self.b + sum(w.get(i, 0.0) * v for i, v in x.items())
+
+    def update(self, x: Dict[int, float], grad: float, lr: float, l2: float) -> None:
+        w = self.w
+        for i, v in x.items():
+            w[i] = w.get(i, 0.0) * (1.0 - lr * l2) - lr * grad * v
+        self.b -= lr * grad
+
+
+@dataclass
+class IntentPrediction:
+    complexity: str
+    confidence: float
+    requires_write: bool
+    write_probability: float
+    families: List[str]
+    family_probabilities: Dict[str, float]
+    latency_us: float = 0.0
+
+
+class IntentClassifier:
+    """In-process replacement for the LLM query-complexity call.
+
+    A softmax head predicts complexity, a logistic head predicts write intent and
+    one logistic head per service family predicts which tool families are
+    needed. Features are hashed n-grams, so the model is a small sparse JSON
+    file trained offline from logged LLM classifications
+    (``scripts/intent_classifier.py train``).
+    """
+
+    def __init__(self, n_features: int = 1 << 18) -> None:
+        self.n_features = int(n_features)
+        self.complexity = {c: _Linear() for c in COMPLEXITIES}
+        self.write = _Linear()
+        self.families = {f: _Linear() for f in FAMILIES}
+        self.trained_examples = 0
+
+    # ------------------------------------------------------------- inference
+
+    def predict(self, text: str) -> IntentPrediction:
+        t0 = time.perf_counter()
+        x = featurize(text, self.n_features)
+        scores = {c: head.score(x) for c, head in self.complexity.items()}
+        top = max(scores.values())
+        exp = {c: math.exp(s - top) for c, s in scores.items()}
+        total = sum(exp.values())
+        probs = {c: v / total for c, v in exp.items()}
+        complexity = max(probs, key=probs.get)  # type: ignore[arg-type]
+        write_p = _sigmoid(self.write.score(x))
+        fam_p = {f: _sigmoid(head.score(x)) for f, head in self.families.items()}
+        return IntentPrediction(
+            complexity=complexity,
+            confidence=probs[complexity],
+            requires_write=write_p >= 0.5,
+            write_probability=write_p,
+            families=[f for f, p in fam_p.items() if p >= 0.5],
+            family_probabilities=fam_p,
+            latency_us=(time.perf_counter() - t0) * 1e6,
+        )
+
+    def classify(self, text: str) -> Dict[str, Any]:
+        """Prediction in the same shape as ``Agent._classify_query_complexity_llm``."""
+        p = self.predict(text)
+        return {
+            "complexity": p.complexity,
+            "confidence": round(p.confidence, 3),
+            "reasoning": f"local intent model (families: {', '.join(p.families) or 'none'})",
+            "requires_write": p.requires_write,
+            "suggested_tools": [],
+            "estimated_iterations": _ESTIMATED_ITERATIONS.get(p.complexity, 3),
+            "families": p.families,
+        }
+
+    # -------------------------------------------------------------- training
+
+    def fit(self, examples: List[Dict[str, Any]], *, epochs: int = 12, lr: float = 0.5, l2: float = 1e-5, seed: int = 13) -> "IntentClassifier":
+        """Plain SGD on logistic/softmax losses over labelled examples.
+
+        Each example needs ``query``, ``complexity``, ``requires_write`` and
+        ``families`` (see ``append_training_example``).
+        """
+        data = [(featurize(str(ex.get("query", "")), self.n_features), ex) for ex in examples if ex.get("query")]
+        rng = random.Random(seed)
+        for epoch in range(max(1, epochs)):
+            rng.shuffle(data)
+            step = lr / (1.0 + 0.5 * epoch)
+            for x, ex in data:
+                label = str(ex.get("complexity", "medium")).lower()
+                scores = {c: head.score(x) for c, head in self.complexity.items()}
+                top = max(scores.values())
+                exp = {c: math.exp(s - top) for c, s in scores.items()}
+                total = sum(exp.values())
+                for c, head in self.complexity.items():
+                    head.update(x, exp[c] / total - (1.0 if c == label else 0.0), step, l2)
+                y_write = 1.0 if ex.get("requires_write") else 0.0
+                self.write.update(x, _sigmoid(self.write.score(x)) - y_write, step, l2)
+                fams = set(ex.get("families") or [])
+                for f, head in self.families.items():
+                    head.update(x, _sigmoid(head.score(x)) - (1.0 if f in fams else 0.0), step, l2)
+        self.trained_examples = len(data)
+        return self
+
+    # ----------------------------------------------------------- persistence
+
+    @staticmethod
+    def _dump(head: _Linear) -> Dict[str, Any]:
+        # Drop near-zero weights to keep the file small
+        return {"b": round(head.b, 6), "w": {str(i): round(v, 6) for i, v in head.w.items() if abs(v) >= 1e-5}}
+
+    @staticmethod
+    def _load(raw: Dict[str, Any]) -> _Linear:
+        return _Linear(w={int(i): float(v) for i, v in (raw.get("w") or {}).items()}, b=float(raw.get("b", 0.0)))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": MODEL_VERSION,
+            "n_features": self.n_features,
+            "trained_examples": self.trained_examples,
+            "complexity": {c: self._dump(h) for c, h in self.complexity.items()},
+            "write": self._dump(self.write),
+            "families": {f: self._dump(h) for f, h in self.families.items()},
+        }
+
+    def save(self, path: Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(json.dumps(self.to_dict(), separators=(",", ":")), encoding="utf-8")
+        tmp.replace(path)
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, Any]) -> "IntentClassifier":
+        if int(raw.get("version", 0)) != MODEL_VERSION:
+            raise ValueError(f"unsupported intent model version: {raw.get('version')}")
+        clf = cls(n_features=int(raw["n_features"]))
+        for c in COMPLEXITIES:
+            clf.complexity[c] = cls._load((raw.get("complexity") or {}).get(c, {}))
+        clf.write = cls._load(raw.get("write") or {})
+        for f in FAMILIES:
+            clf.families[f] = cls._load((raw.get("families") or {}).get(f, {}))
+        clf.trained_examples = int(raw.get("trained_examples", 0))
+        return clf
+
+    @classmethod
+    def load(cls, path: Path) -> "IntentClassifier":
+        return cls.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
+
+
+# ------------------------------------------------------------------ helpers
+
+_loaded: Dict[str, Tuple[float, IntentClassifier]] = {}
+_load_lock = threading.Lock()
+
+
+def load_intent_classifier(path: Path) -> Optional[IntentClassifier]:
+    """Load (and cache until the file changes) a trained model; None if absent or invalid."""
+    path = Path(path)
+    try:
+        mtime = path.stat().st_mtime
+    except OSError:
+        return None
+    key = str(path)
+    with _load_lock:
+        cached = _loaded.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        try:
+            clf = IntentClassifier.load(path)
+        except Exception:
+            return None
+        _loaded[key] = (mtime, clf)
+        return clf
+
+
+def read_training_examples(path: Path) -> List[Dict[str, Any]]:
+    examples: List[Dict[str, Any]] = []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    examples.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return examples
+
+
+def append_training_example(path: Path, query: str, classification: Dict[str, Any], latency_ms: int) -> None:
+    """Log one LLM-labelled query so the local model can be (re)trained from real traffic."""
+    record = {
+        "ts": int(time.time()),
+        "query": query,
+        "complexity": classification.get("complexity"),
+        "requires_write": bool(classification.get("requires_write", False)),
+        "families": families_for_tools(classification.get("suggested_tools") or []),
+        "latency_ms": int(latency_ms),
+    }
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with _load_lock:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
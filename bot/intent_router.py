@@ -0,0 +1,324 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+# Intent kinds:
+# - fastpath: answered from a fixed tool recipe without an LLM planning turn
+# - block: tool-intent words that rule out the small-talk quick path
+# - quick: greetings/capability questions answered by the quick model without tools
+KINDS = ("fastpath", "block", "quick")
+
+_SLOT_GROUP_RE = re.compile(r"\(\?P<(\w+)>")
+_PLACEHOLDER_RE = re.compile(r"^\{(\w+)\}$")
+# A slot starting with one of these is a reference or a quantifier ("is it on plex",
+# "are any Nolan films on plex", "which comedies are available"), not a name to look up
+_VAGUE_SLOT_WORDS = frozenset((
+    "it", "its", "this", "that", "these", "those", "they", "them", "he", "she", "him", "her",
+    "any", "anything", "some", "something", "all", "every", "everything", "each", "either", "both",
+    "many", "much", "more", "most", "few", "several", "other", "others", "another", "none", "nothing",
+    "which", "what", "whatever", "there", "here", "available", "new", "one", "ones",
+))
+
+
+@dataclass(frozen=True)
+class ToolStep:
+    tool: str
+    args: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class Intent:
+    """One row of the intent table.
+
+    ``keywords`` are whole-word literals, compiled into a trie-shaped regex.
+    ``patterns`` are regex fragments; named groups become slots that can be
+    referenced as ``"{slot}"`` in recipe args and in ``finalize``. ``template``
+    names a renderer in ``TEMPLATES`` that can answer from tool results alone.
+    """
+    name: str
+    kind: str
+    patterns: Tuple[str, ...] = ()
+    keywords: Tuple[str, ...] = ()
+    recipe: Tuple[ToolStep, ...] = ()
+    finalize: str = ""
+    template: Optional[str] = None
+
+
+@dataclass
+class IntentMatch:
+    intent: Intent
+    slots: Dict[str, str]
+    span: Tuple[int, int]
+    rank: int = 0
+
+    def tool_steps(self) -> List[ToolStep]:
+        return [ToolStep(s.tool, _fill(s.args, self.slots)) for s in self.intent.recipe]
+
+    @property
+    def finalize(self) -> str:
+        try:
+            return self.intent.finalize.format_map(self.slots)
+        except (KeyError, ValueError):
+            return self.intent.finalize
+
+
+def _fill(value: Any, slots: Dict[str, str]) -> Any:
+    """Substitute ``"{slot}"`` placeholders in (nested) recipe args."""
+    if isinstance(value, str):
+        m = _PLACEHOLDER_RE.match(value)
+        return slots.get(m.group(1), value) if m else value
+    if isinstance(value, dict):
+        return {k: _fill(v, slots) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_fill(v, slots) for v in value]
+    return value
+
+
+def _is_vague_slot(value: str) -> bool:
+    words = value.lower().split()
+    return not words or words[0].strip("\"“”'.,!?") in _VAGUE_SLOT_WORDS
+
+
+def _trie_regex(words: Iterable[str]) -> str:
+    """Regex for a set of literals with shared prefixes factored out.
+
+    ``re`` tries alternatives one by one, so ``(?:on deck|on the|...)`` is much
+    cheaper as ``on (?:deck|the)``; this gives Aho-Corasick-like scanning cost.
+    """
+    trie: Dict[str, Any] = {}
+    for w in words:
+        node = trie
+        for ch in w.lower():
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: Dict[str, Any]) -> str:
+        end = "" in node
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch != ""]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if end:
+            return "(?:" + body + ")?"
+        return body
+
+    return build(trie)
+
+
+class IntentRouter:
+    """Compiles an intent table into a single alternation regex.
+
+    Every pattern becomes one named alternative, so a message is scanned once
+    regardless of table size. When several intents match, the one listed first
+    in the table wins; within a position, earlier alternatives take precedence.
+    """
+
+    def __init__(self, intents: Iterable[Intent]) -> None:
+        self.intents: List[Intent] = list(intents)
+        self._groups: Dict[str, int] = {}
+        parts: List[str] = []
+        for i, intent in enumerate(self.intents):
+            if intent.kind not in KINDS:
+                raise ValueError(f"unknown intent kind {intent.kind!r} for {intent.name}")
+            alternatives = list(intent.patterns)
+            if intent.keywords:
+                alternatives.append(r"\b" + _trie_regex(intent.keywords) + r"\b")
+            for j, pattern in enumerate(alternatives):
+                gname = f"i{i}_{j}"
+                # Namespace slot groups so identical slot names in different rows do not collide
+                body = _SLOT_GROUP_RE.sub(lambda m, g=gname: f"(?P<{g}__{m.group(1)}>", pattern)
+                parts.append(f"(?P<{gname}>{body})")
+                self._groups[gname] = i
+        self._regex = re.compile("|".join(parts), re.IGNORECASE)
+
+    def match_all(self, text: str) -> List[IntentMatch]:
+        out: List[IntentMatch] = []
+        for m in self._regex.finditer(text or ""):
+            gname = m.lastgroup
+            if gname is None or gname not in self._groups:
+                continue
+            prefix = gname + "__"
+            slots = {k[len(prefix):]: v.strip() for k, v in m.groupdict().items() if v is not None and k.startswith(prefix)}
+            if any(_is_vague_slot(v) for v in slots.values()):
+                continue
+            rank = self._groups[gname]
+            out.append(IntentMatch(self.intents[rank], slots, m.span(), rank))
+        return out
+
+    @staticmethod
+    def _best(matches: List[IntentMatch], kinds: Tuple[str, ...]) -> Optional[IntentMatch]:
+        best: Optional[IntentMatch] = None
+        for match in matches:
+            if match.intent.kind in kinds and (best is None or match.rank < best.rank):
+                best = match
+        return best
+
+    def route(self, text: str, kinds: Tuple[str, ...] = ("fastpath",)) -> Optional[IntentMatch]:
+        """Highest-priority match among intents of the given kinds."""
+        return self._best(self.match_all(text), kinds)
+
+    def classify(self, text: str) -> Tuple[Optional[IntentMatch], bool]:
+        """One scan answering both questions: (fast-path match, is quick path)."""
+        if not (text or "").strip():
+            return None, False
+        matches = self.match_all(text)
+        kinds = {m.intent.kind for m in matches}
+        quick = "quick" in kinds and "fastpath" not in kinds and "block" not in kinds
+        return self._best(matches, ("fastpath",)), quick
+
+    def is_quick_path(self, text: str) -> bool:
+        """Small talk with no tool intent: a quick phrase and no fastpath/block hit."""
+        return self.classify(text)[1]
+
+
+_LIBRARY_RECIPE = (
+    ToolStep("plex_library_overview", {"section_type": "movie", "limit": 4, "response_level": "compact"}),
+    ToolStep("plex_library_overview", {"section_type": "show", "limit": 4, "response_level": "compact"}),
+)
+_NAME = r"[A-Za-z][A-Za-z\.'\-]+(?:\s+[A-Za-z][A-Za-z\.'\-]+){1,3}"
+
+DEFAULT_INTENTS: Tuple[Intent, ...] = (
+    Intent(
+        "trending",
+        "fastpath",
+        keywords=("trending",),
+        recipe=(
+            ToolStep("tmdb_discovery_suite", {"discovery_types": ["trending"]}),
+            ToolStep("search_plex", {"filters": {"sort_by": "addedAt", "sort_order": "desc"}, "limit": 4, "response_level": "compact"}),
+        ),
+        finalize="Finalize: top results with brief notes.",
+    ),
+    Intent(
+        "plex_availability",
+        "fastpath",
+        patterns=(
+            r"\b(?:do (?:i|we) have|is|are)\s+(?!there\b|anything\b|something\b|new\b)(?P<title>.{2,80}?)\s+(?:in|on)\s+(?:my\s+|our\s+|the\s+)?(?:plex|library)\b",
+        ),
+        recipe=(ToolStep("search_plex", {"query": "{title}", "limit": 3, "response_level": "compact"}),),
+        finalize="Finalize: say whether {title} is on Plex.",
+        template="plex_availability",
+    ),
+    Intent(
+        "recent_additions",
+        "fastpath",
+        keywords=("recently added", "what's new", "whats new", "what’s new"),
+        recipe=_LIBRARY_RECIPE,
+        finalize="Finalize: concise library highlights.",
+        template="recent_additions",
+    ),
+    Intent(
+        "library_overview",
+        "fastpath",
+        keywords=("on deck", "continue watching", "library"),
+        recipe=_LIBRARY_RECIPE,
+        finalize="Finalize: concise library highlights.",
+    ),
+    Intent(
+        "actor_filmography",
+        "fastpath",
+        patterns=(
+            rf"(?:movies?|shows?)\s+(?:with|featuring|starring)\s+(?P<actor>{_NAME})",
+            rf"(?:with|featuring|starring)\s+(?P<actor>{_NAME})\s+(?:movies?|shows?)",
+        ),
+        recipe=(ToolStep("search_plex", {"filters": {"actors": ["{actor}"], "sort_by": "year", "sort_order": "desc"}, "limit": 6, "response_level": "compact"}),),
+        finalize="Finalize: best picks with {actor}.",
+    ),
+    Intent(
+        "tool_terms",
+        "block",
+        patterns=(r"\((?:19|20)\d{2}\)",),  # "Title (Year)" reads as an add/search request
+        keywords=(
+            "search", "find", "recommend", "recommendation", "trending", "popular",
+            "add", "queue", "status", "recent", "on deck", "continue", "rate", "rating",
+            "unwatched", "collection", "details", "similar", "top rated", "upcoming",
+            "now playing", "watch providers", "providers",
+            "plex", "radarr", "sonarr", "tmdb",
+        ),
+    ),
+    Intent(
+        "small_talk",
+        "quick",
+        keywords=(
+            "hi", "hello", "hey", "how are you", "what can you do", "help", "capabilities",
+            "who are you", "what is moviebot", "explain yourself", "about you", "commands",
+            "format", "how to use", "usage", "examples", "tips", "thanks", "thank you",
+        ),
+    ),
+)
+
+
+# ------------------------------------------------------------ templates
+
+
+def _first_ok(results: Dict[str, List[Any]], tool: str) -> List[Dict[str, Any]]:
+    out = []
+    for r in results.get(tool, []):
+        if isinstance(r, dict) and r.get("ok") is not False and "error" not in r and r.get("success") is not False:
+            out.append(r)
+    return out
+
+
+def _label(item: Dict[str, Any]) -> str:
+    title = str(item.get("title") or "").strip()
+    year = item.get("year")
+    return f"{title} ({year})" if year else title
+
+
+def _render_plex_availability(slots: Dict[str, str], results: Dict[str, List[Any]]) -> Optional[str]:
+    found = _first_ok(results, "search_plex")
+    if not found:
+        return None
+    title = slots.get("title", "").strip("\"“”' ")
+    items = [i for i in (found[0].get("items") or []) if isinstance(i, dict) and i.get("title")]
+    exact = [i for i in items if str(i.get("title", "")).lower() == title.lower()]
+    if not exact:
+        # A miss may be a spelling or subtitle difference: let the LLM judge the close results
+        return None
+    names = ", ".join(f"**{_label(i)}**" for i in exact[:3])
+    return f"Yes — {names} {'is' if len(exact) == 1 else 'are'} on Plex."
+
+
+def _render_recent_additions(slots: Dict[str, str], results: Dict[str, List[Any]]) -> Optional[str]:
+    overviews = _first_ok(results, "plex_library_overview")
+    if not overviews:
+        return None
+    lines: List[str] = []
+    for label, ov in zip(("Movies", "Shows"), overviews):
+        recent = ov.get("recently_added") or {}
+        items = [i for i in (recent.get("items") or []) if isinstance(i, dict) and i.get("title")]
+        if items:
+            lines.append(f"**{label}:** " + ", ".join(_label(i) for i in items[:4]))
+    if not lines:
+        return None
+    return "Recently added to Plex:\n" + "\n".join(lines)
+
+
+TEMPLATES: Dict[str, Callable[[Dict[str, str], Dict[str, List[Any]]], Optional[str]]] = {
+    "plex_availability": _render_plex_availability,
+    "recent_additions": _render_recent_additions,
+}
+
+
+def render_template(match: IntentMatch, results: Dict[str, List[Any]]) -> Optional[str]:
+    """Reply text built from tool results, or None when the LLM should finalize instead."""
+    renderer = TEMPLATES.get(match.intent.template or "")
+    if renderer is None:
+        return None
+    try:
+        return renderer(match.slots, results)
+    except Exception:
+        return None
+
+
+_default_router: Optional[IntentRouter] = None
+
+
+def get_intent_router() -> IntentRouter:
+    """Process-wide router compiled from ``DEFAULT_INTENTS``."""
+    global _default_router
+    if _default_router is None:
+        _default_router = IntentRouter(DEFAULT_INTENTS)
+    return _default_router
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import asyncio
+import atexit
+import json
+import logging
+import math
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+class LatencySketch:
+    """Streaming quantile sketch over log-spaced buckets (DDSketch style).
+
+    Every quantile is reported within ``relative_accuracy`` of the true value
+    using a few dozen integer buckets, independent of how many samples were
+    seen. Counts are halved once ``max_count`` is exceeded so the sketch
+    follows latency shifts instead of averaging over all history.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.02, max_count: int = 2000) -> None:
+        self.relative_accuracy = float(relative_accuracy)
+        self.gamma = (1 + self.relative_accuracy) / (1 - self.relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.max_count = int(max_count)
+        self.buckets: Dict[int, float] = {}
+        self.count = 0.0
+
+    def add(self, value_ms: float) -> None:
+        key = int(math.ceil(math.log(max(float(value_ms), 1.0)) / self._log_gamma))
+        self.buckets[key] = self.buckets.get(key, 0.0) + 1.0
+        self.count += 1.0
+        if self.count > self.max_count:
+            self._decay()
+
+    def _decay(self) -> None:
+        self.buckets = {k: v / 2 for k, v in self.buckets.items() if v / 2 >= 0.25}
+        self.count = sum(self.buckets.values())
+
+    def quantile(self, q: float) -> Optional[float]:
+        if self.count <= 0:
+            return None
+        rank = max(0.0, min(1.0, q)) * (self.count - 1)
+        seen = 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                # Bucket midpoint (in log space) keeps the relative error bound
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"alpha": self.relative_accuracy, "buckets": {str(k): round(v, 3) for k, v in self.buckets.items()}}
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, Any], max_count: int = 2000) -> "LatencySketch":
+        sk = cls(float(raw.get("alpha", 0.02)), max_count=max_count)
+        sk.buckets = {int(k): float(v) for k, v in (raw.get("buckets") or {}).items()}
+        sk.count = sum(sk.buckets.values())
+        return sk
+
+
+def _clamp(value: float, lo: float, hi: float) -> int:
+    return int(max(lo, min(hi, value)))
+
+
+class LatencyTracker:
+    """Per tool@host latency sketches that turn live latency into timeouts and hedge delays.
+
+    - ``timeout_ms`` = p99 x ``timeout_multiplier``, clamped to the configured floor/ceiling
+    - ``hedge_delay_ms`` = p90, clamped the same way with the hedge bounds
+    - Until ``min_samples`` successes have been seen, the static value is used
+    - Sketches are saved to ``persist_path`` (at most every ``persist_interval_s``,
+      from a worker thread when an event loop is running) and reloaded on start,
+      so learned values survive restarts
+    """
+
+    def __init__(
+        self,
+        *,
+        timeout_multiplier: float = 3.0,
+        min_samples: int = 20,
+        timeout_floor_ms: int = 500,
+        timeout_ceiling_ms: int = 20000,
+        hedge_quantile: float = 0.9,
+        hedge_floor_ms: int = 50,
+        hedge_ceiling_ms: int = 2000,
+        persist_path: Optional[Path] = None,
+        persist_interval_s: float = 60.0,
+    ) -> None:
+        self.timeout_multiplier = float(timeout_multiplier)
+        self.min_samples = int(min_samples)
+        self.timeout_floor_ms = int(timeout_floor_ms)
+        self.timeout_ceiling_ms = int(timeout_ceiling_ms)
+        self.hedge_quantile = float(hedge_quantile)
+        self.hedge_floor_ms = int(hedge_floor_ms)
+        self.hedge_ceiling_ms = int(hedge_ceiling_ms)
+        self.persist_path = Path(persist_path) if persist_path else None
+        self.persist_interval_s = float(persist_interval_s)
+        self._sketches: Dict[str, LatencySketch] = {}
+        self._timeouts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._save_task: Optional[asyncio.Future] = None
+        self._dirty = False
+        self._last_save = time.monotonic()
+        self._log = logging.getLogger("moviebot.latency_tracker")
+        self._load()
+
+    @staticmethod
+    def key(tool: str, host: str) -> str:
+        return f"{tool}@{host or 'local'}"
+
+    def record(self, tool: str, host: str, duration_ms: float, *, ok: bool = True) -> None:
+        """Record one attempt.
+
+        A timed-out attempt (``ok=False``) is added at its timeout value, a lower
+        bound of the real latency, so a host that keeps timing out pushes its
+        learned timeout up instead of disappearing from the sketch.
+        """
+        k = self.key(tool, host)
+        with self._lock:
+            self._sketches.setdefault(k, LatencySketch()).add(duration_ms)
+            self._dirty = True
+            if not ok:
+                self._timeouts[k] = self._timeouts.get(k, 0) + 1
+        if self.persist_path is not None and time.monotonic() - self._last_save >= self.persist_interval_s:
+            self._save_soon()
+
+    def _save_soon(self) -> None:
+        """Save without blocking the caller: on the event loop the write runs in a worker thread."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.save()
+            return
+        if self._save_task is None or self._save_task.done():
+            self._save_task = loop.create_task(asyncio.to_thread(self.save))
+
+    def _quantile(self, tool: str, host: str, q: float) -> Optional[float]:
+        with self._lock:
+            sk = self._sketches.get(self.key(tool, host))
+            if sk is None or sk.count < self.min_samples:
+                return None
+            return sk.quantile(q)
+
+    def timeout_ms(self, tool: str, host: str, static_ms: int) -> int:
+        p99 = self._quantile(tool, host, 0.99)
+        if p99 is None:
+            return int(static_ms)
+        return _clamp(p99 * self.timeout_multiplier, self.timeout_floor_ms, self.timeout_ceiling_ms)
+
+    def hedge_delay_ms(self, tool: str, host: str, static_ms: int) -> int:
+        p = self._quantile(tool, host, self.hedge_quantile)
+        if p is None:
+            return int(static_ms)
+        return _clamp(p, self.hedge_floor_ms, self.hedge_ceiling_ms)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Learned quantiles and derived limits per tool@host."""
+        out: Dict[str, Any] = {}
+        with self._lock:
+            items = list(self._sketches.items())
+            timeouts = dict(self._timeouts)
+        for k, sk in items:
+            p50, p90, p99 = sk.quantile(0.5), sk.quantile(0.9), sk.quantile(0.99)
+            warm = sk.count >= self.min_samples
+            out[k] = {
+                "samples": int(sk.count),
+                "p50_ms": round(p50 or 0, 1),
+                "p90_ms": round(p90 or 0, 1),
+                "p99_ms": round(p99 or 0, 1),
+                "timeouts": timeouts.get(k, 0),
+                "learned_timeout_ms": _clamp((p99 or 0) * self.timeout_multiplier, self.timeout_floor_ms, self.timeout_ceiling_ms) if warm else None,
+                "learned_hedge_ms": _clamp(sk.quantile(self.hedge_quantile) or 0, self.hedge_floor_ms, self.hedge_ceiling_ms) if warm else None,
+            }
+        return out
+
+    # ------------------------------------------------------------ persistence
+
+    def _load(self) -> None:
+        if self.persist_path is None or not self.persist_path.exists():
+            return
+        try:
+            raw = json.loads(self.persist_path.read_text(encoding="utf-8"))
+            for k, v in (raw.get("sketches") or {}).items():
+                self._sketches[k] = LatencySketch.from_dict(v)
+        except Exception as e:
+            self._log.warning(f"Ignoring unreadable latency sketches: {e}")
+
+    def save(self) -> None:
+        if self.persist_path is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {"saved_at": int(time.time()), "sketches": {k: sk.to_dict() for k, sk in self._sketches.items()}}
+            self._dirty = False
+            self._last_save = time.monotonic()
+        try:
+            with self._save_lock:
+                self.persist_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.persist_path.with_suffix(self.persist_path.suffix + ".tmp")
+                tmp.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+                tmp.replace(self.persist_path)
+        except Exception as e:
+            self._log.debug(f"Failed to persist latency sketches: {e}")
+
+
+_tracker: Optional[LatencyTracker] = None
+_tracker_lock = threading.Lock()
+
+
+def get_latency_tracker(project_root: Path) -> Optional[LatencyTracker]:
+    """Process-wide tracker built from ``tools.adaptive`` config; None when disabled."""
+    global _tracker
+    if _tracker is not None:
+        return _tracker
+    from config.loader import load_runtime_config
+    cfg = (((load_runtime_config(project_root).get("tools", {}) or {}).get("adaptive", {})) or {})
+    if not bool(cfg.get("enabled", False)):
+        return None
+    with _tracker_lock:
+        if _tracker is None:
+            persist = cfg.get("persistPath")
+            persist_path = None
+            if persist:
+                persist_path = Path(persist)
+                if not persist_path.is_absolute():
+                    persist_path = project_root / persist_path
+            _tracker = LatencyTracker(
+                timeout_multiplier=float(cfg.get("timeoutMultiplier", 3.0)),
+                min_samples=int(cfg.get("minSamples", 20)),
+                timeout_floor_ms=int(cfg.get("timeoutFloorMs", 500)),
+                timeout_ceiling_ms=int(cfg.get("timeoutCeilingMs", 20000)),
+                hedge_quantile=float(cfg.get("hedgeQuantile", 0.9)),
+                hedge_floor_ms=int(cfg.get("hedgeFloorMs", 50)),
+                hedge_ceiling_ms=int(cfg.get("hedgeCeilingMs", 2000)),
+                persist_path=persist_path,
+                persist_interval_s=float(cfg.get("persistIntervalSec", 60)),
+            )
+            if persist_path is not None:
+                atexit.register(_tracker.save)
+    return _tracker
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .latency_tracker import LatencySketch
+
+
+@dataclass(frozen=True)
+class RouteDecision:
+    model: str
+    reason: str  # configured | override | cheapest_within_budget | fastest_over_budget
+    predicted_ms: Optional[float] = None
+    budget_ms: Optional[float] = None
+
+
+class _ModelStats:
+    __slots__ = ("sketch", "error_rate", "calls", "errors")
+
+    def __init__(self) -> None:
+        self.sketch = LatencySketch()
+        self.error_rate = 0.0
+        self.calls = 0
+        self.errors = 0
+
+
+class ModelRouter:
+    """Picks the model for each LLM turn from live latency and error statistics.
+
+    Each role has a candidate set: its configured model plus ``roles.<role>``
+    from config, all models judged good enough for that role. Per turn the
+    router picks the cheapest candidate whose predicted latency fits the
+    turn's budget; when none fits, the fastest one. Predicted latency is the
+    ``quantile`` of observed call durations, inflated by the error rate
+    (expected attempts), or the configured ``expectedMs`` prior until
+    ``min_samples`` calls were seen. Candidates whose error rate is above
+    ``max_error_rate`` are skipped while others are healthy. ``overrides``
+    pin a role to one model regardless of statistics.
+    """
+
+    def __init__(
+        self,
+        *,
+        models: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None,
+        roles: Optional[Dict[str, List[str]]] = None,
+        overrides: Optional[Dict[str, str]] = None,
+        quantile: float = 0.9,
+        min_samples: int = 10,
+        max_error_rate: float = 0.5,
+        error_alpha: float = 0.1,
+    ) -> None:
+        self.models = {p: dict(m or {}) for p, m in (models or {}).items()}
+        self.roles = {r: [str(x) for x in (c or [])] for r, c in (roles or {}).items()}
+        self.overrides = {r: str(m) for r, m in (overrides or {}).items() if m}
+        self.quantile = float(quantile)
+        self.min_samples = int(min_samples)
+        self.max_error_rate = float(max_error_rate)
+        self.error_alpha = float(error_alpha)
+        self._stats: Dict[str, _ModelStats] = {}
+        self._lock = threading.Lock()
+        self._log = logging.getLogger("moviebot.model_router")
+
+    @staticmethod
+    def key(provider: str, model: str) -> str:
+        return f"{provider}:{model}"
+
+    # --------------------------------------------------------------- stats
+
+    def record(self, provider: str, model: str, duration_ms: float, *, ok: bool = True) -> None:
+        """Record one completed call; failed calls only move the error rate."""
+        with self._lock:
+            st = self._stats.setdefault(self.key(provider, model), _ModelStats())
+            st.calls += 1
+            if ok:
+                st.sketch.add(duration_ms)
+            else:
+                st.errors += 1
+            st.error_rate += self.error_alpha * ((0.0 if ok else 1.0) - st.error_rate)
+
+    def _cost(self, provider: str, model: str) -> float:
+        spec = (self.models.get(provider) or {}).get(model) or {}
+        try:
+            return float(spec.get("cost"))
+        except Exception:
+            return float("inf")
+
+    def _error_rate(self, provider: str, model: str) -> float:
+        with self._lock:
+            st = self._stats.get(self.key(provider, model))
+            return st.error_rate if st is not None else 0.0
+
+    def predict_ms(self, provider: str, model: str) -> Optional[float]:
+        """Expected call latency, or None when there is neither enough data nor a prior."""
+        with self._lock:
+            st = self._stats.get(self.key(provider, model))
+            q = st.sketch.quantile(self.quantile) if st is not None and st.sketch.count >= self.min_samples else None
+            err = st.error_rate if st is not None else 0.0
+        if q is None:
+            prior = ((self.models.get(provider) or {}).get(model) or {}).get("expectedMs")
+            if prior is None:
+                return None
+            q = float(prior)
+        return q / max(0.05, 1.0 - err)
+
+    def fits(self, provider: str, model: str, budget_ms: Optional[float]) -> bool:
+        if budget_ms is None:
+            return True
+        predicted = self.predict_ms(provider, model)
+        return predicted is None or predicted <= budget_ms
+
+    # ------------------------------------------------------------- routing
+
+    def candidates(self, role: str, configured: str) -> List[str]:
+        out = [configured] if configured else []
+        for m in self.roles.get(role, []):
+            if m not in out:
+                out.append(m)
+        return out
+
+    def choose(self, provider: str, role: str, configured: str, budget_ms: Optional[float] = None) -> RouteDecision:
+        override = self.overrides.get(role)
+        if override:
+            return RouteDecision(override, "override", self.predict_ms(provider, override), budget_ms)
+        cands = self.candidates(role, configured)
+        if len(cands) <= 1:
+            return RouteDecision(configured, "configured", None, budget_ms)
+        healthy = [m for m in cands if self._error_rate(provider, m) <= self.max_error_rate] or cands
+        predicted = {m: self.predict_ms(provider, m) for m in healthy}
+        # Unknown cost sorts last; ties keep config order (configured model first)
+        by_cost = sorted(healthy, key=lambda m: self._cost(provider, m))
+        for m in by_cost:
+            p = predicted[m]
+            if budget_ms is None or p is None or p <= budget_ms:
+                return RouteDecision(m, "cheapest_within_budget", p, budget_ms)
+        fastest = min(healthy, key=lambda m: predicted[m] if predicted[m] is not None else float("inf"))
+        return RouteDecision(fastest, "fastest_over_budget", predicted[fastest], budget_ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            items = list(self._stats.items())
+        out: Dict[str, Any] = {}
+        for k, st in items:
+            provider, _, model = k.partition(":")
+            out[k] = {
+                "calls": st.calls,
+                "errors": st.errors,
+                "error_rate": round(st.error_rate, 3),
+                "p50_ms": round(st.sketch.quantile(0.5) or 0, 1),
+                "predicted_ms": round(self.predict_ms(provider, model) or 0, 1),
+            }
+        return out
+
+
+_router: Optional[ModelRouter] = None
+_router_lock = threading.Lock()
+
+
+def get_model_router(project_root: Path) -> Optional[ModelRouter]:
+    """Process-wide router built from ``llm.routing`` config; None when disabled."""
+    global _router
+    if _router is not None:
+        return _router
+    from config.loader import load_runtime_config
+    cfg = (((load_runtime_config(project_root).get("llm", {}) or {}).get("routing", {})) or {})
+    if not bool(cfg.get("enabled", False)):
+        return None
+    with _router_lock:
+        if _router is None:
+            _router = ModelRouter(
+                models=cfg.get("models") or {},
+                roles=cfg.get("roles") or {},
+                overrides=cfg.get("overrides") or {},
+                quantile=float(cfg.get("quantile", 0.9)),
+                min_samples=int(cfg.get("minSamples", 10)),
+                max_error_rate=float(cfg.get("maxErrorRate", 0.5)),
+            )
+    return _router
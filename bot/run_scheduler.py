@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Optional, Set
+
+from .latency_tracker import LatencySketch
+
+
+PRIORITY_QUICK = 0
+PRIORITY_NORMAL = 1
+
+
+@dataclass(eq=False)
+class _Ticket:
+    seq: int
+    user: str
+    channel: str
+    priority: int
+    enqueued_at: float
+    ready: asyncio.Future
+    on_position: Optional[Callable[[int], Any]] = None
+    position: int = 0
+
+
+class AgentRunScheduler:
+    """Admission control for agent runs across all Discord users.
+
+    - At most ``max_concurrent`` runs execute at once, process-wide
+    - Runs in the same channel execute one at a time, in arrival order, so each
+      sees the previous answer in the conversation history
+    - Waiting runs are served round-robin across users, so one user sending a
+      burst of messages cannot starve everyone else
+    - Quick-path requests (greetings, capability questions) are served before
+      tool-using runs
+    - ``on_position(n)`` is called whenever a waiting run's queue position
+      changes; queue wait times feed ``get_stats()``
+    """
+
+    def __init__(self, max_concurrent: int = 4) -> None:
+        self.max_concurrent = max(1, int(max_concurrent))
+        self._seq = itertools.count()
+        self._by_user: Dict[str, Deque[_Ticket]] = {}
+        self._by_channel: Dict[str, Deque[_Ticket]] = {}
+        self._user_order: Deque[str] = deque()
+        self._busy_channels: Set[str] = set()
+        self._running = 0
+        self._dispatched = 0
+        self._wait_sketch = LatencySketch()
+        self._max_wait_ms = 0.0
+        self._callbacks: Set[asyncio.Future] = set()
+        self._log = logging.getLogger("moviebot.scheduler")
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        *,
+        user: str,
+        channel: str,
+        quick: bool = False,
+        on_position: Optional[Callable[[int], Any]] = None,
+    ) -> AsyncIterator[float]:
+        """Wait for a run slot; yields the queue wait in milliseconds."""
+        ticket = _Ticket(
+            seq=next(self._seq),
+            user=str(user),
+            channel=str(channel),
+            priority=PRIORITY_QUICK if quick else PRIORITY_NORMAL,
+            enqueued_at=time.monotonic(),
+            ready=asyncio.get_running_loop().create_future(),
+            on_position=on_position,
+        )
+        self._enqueue(ticket)
+        try:
+            await ticket.ready
+        except BaseException:
+            if ticket.ready.done() and not ticket.ready.cancelled():
+                # Dispatched in the same tick the waiter was cancelled
+                self._release(ticket)
+            else:
+                self._remove(ticket)
+                self._dispatch()
+            raise
+        wait_ms = (time.monotonic() - ticket.enqueued_at) * 1000
+        self._wait_sketch.add(wait_ms)
+        self._max_wait_ms = max(self._max_wait_ms, wait_ms)
+        self._log.info("agent run started", extra={"user": ticket.user, "channel": ticket.channel, "quick": quick, "queue_wait_ms": int(wait_ms), "running": self._running, "queued": self.queued})
+        try:
+            yield wait_ms
+        finally:
+            self._release(ticket)
+
+    @property
+    def running(self) -> int:
+        return self._running
+
+    @property
+    def queued(self) -> int:
+        return sum(len(q) for q in self._by_user.values())
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._running,
+            "queued": self.queued,
+            "max_concurrent": self.max_concurrent,
+            "dispatched": self._dispatched,
+            "queue_wait_p50_ms": round(self._wait_sketch.quantile(0.5) or 0, 1),
+            "queue_wait_p95_ms": round(self._wait_sketch.quantile(0.95) or 0, 1),
+            "queue_wait_max_ms": round(self._max_wait_ms, 1),
+        }
+
+    # ------------------------------------------------------------ internals
+
+    def _enqueue(self, t: _Ticket) -> None:
+        if t.user not in self._by_user:
+            self._by_user[t.user] = deque()
+            self._user_order.append(t.user)
+        self._by_user[t.user].append(t)
+        self._by_channel.setdefault(t.channel, deque()).append(t)
+        self._dispatch()
+
+    def _remove(self, t: _Ticket) -> None:
+        uq = self._by_user.get(t.user)
+        if uq is not None and t in uq:
+            uq.remove(t)
+            if not uq:
+                del self._by_user[t.user]
+                self._user_order.remove(t.user)
+        cq = self._by_channel.get(t.channel)
+        if cq is not None and t in cq:
+            cq.remove(t)
+            if not cq:
+                del self._by_channel[t.channel]
+
+    def _release(self, t: _Ticket) -> None:
+        self._running -= 1
+        self._busy_channels.discard(t.channel)
+        self._dispatch()
+
+    def _eligible(self, t: _Ticket) -> bool:
+        # A channel runs one request at a time, oldest first
+        return t.channel not in self._busy_channels and self._by_channel[t.channel][0] is t
+
+    def _pick(self) -> Optional[_Ticket]:
+        for priority in (PRIORITY_QUICK, PRIORITY_NORMAL):
+            for user in self._user_order:
+                for t in self._by_user[user]:
+                    if t.priority <= priority and self._eligible(t):
+                        return t
+        return None
+
+    def _dispatch(self) -> None:
+        while self._running < self.max_concurrent:
+            t = self._pick()
+            if t is None:
+                break
+            self._remove(t)
+            if t.user in self._by_user:
+                # Served users go to the back of the round-robin order
+                self._user_order.remove(t.user)
+                self._user_order.append(t.user)
+            self._running += 1
+            self._dispatched += 1
+            self._busy_channels.add(t.channel)
+            t.ready.set_result(None)
+        self._notify_positions()
+
+    def _projected_order(self) -> List[_Ticket]:
+        """Waiting tickets in the order they are expected to start (priority, then round-robin)."""
+        rank = {u: i for i, u in enumerate(self._user_order)}
+        waiting = [(t.priority, idx, rank[u], t) for u, q in self._by_user.items() for idx, t in enumerate(q)]
+        waiting.sort(key=lambda x: (x[0], x[1], x[2]))
+        return [w[3] for w in waiting]
+
+    def _notify_positions(self) -> None:
+        for pos, t in enumerate(self._projected_order(), start=1):
+            if t.position == pos or t.on_position is None:
+                t.position = pos
+                continue
+            t.position = pos
+            try:
+                maybe = t.on_position(pos)
+                if asyncio.iscoroutine(maybe):
+                    fut = asyncio.ensure_future(maybe)
+                    self._callbacks.add(fut)
+                    fut.add_done_callback(self._callbacks.discard)
+            except Exception as e:
+                self._log.debug(f"queue position callback failed: {e}")
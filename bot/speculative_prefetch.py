@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from .tools.result_cache import tool_dedup_key
+
+
+# Argument values that are tool defaults; a default page is the page a prediction fetched
+_DEFAULT_ARG_VALUES: Dict[str, Any] = {"language": "en-US", "page": 1}
+_QUERY_KEYS = ("query", "q", "title", "name")
+# Args that pick what a call looks up; anything else (filters, limits, spelled-out
+# defaults) rides along on the model's call and does not block a match
+_IDENTIFYING_KEYS = _QUERY_KEYS + ("page",)
+
+
+def speculation_key(name: str, args: Dict[str, Any]) -> str:
+    """Looser key than ``tool_dedup_key`` used to match predictions to model calls.
+
+    Keeps only identifying args (query-like strings, lowercased, and a non-default
+    page), so ``{"query": "Dune"}`` matches ``{"query": "dune", "year": 2021}``.
+    """
+    canon: Dict[str, Any] = {}
+    for k, v in (args or {}).items():
+        if k not in _IDENTIFYING_KEYS or v is None or (k in _DEFAULT_ARG_VALUES and v == _DEFAULT_ARG_VALUES[k]):
+            continue
+        if k in _QUERY_KEYS and isinstance(v, str):
+            v = v.strip().lower()
+        canon[k] = v
+    return tool_dedup_key(name, canon)
+
+
+@dataclass
+class Prediction:
+    tool: str
+    args: Dict[str, Any]
+    reason: str = ""
+
+
+@dataclass
+class _Speculation:
+    prediction: Prediction
+    started_at: float
+    task: Optional["asyncio.Task[Any]"] = None
+    duration_ms: int = 0
+    ok: bool = False
+    used: bool = False
+
+
+@dataclass
+class SpeculationStats:
+    """Process-wide prediction quality counters."""
+    launched: int = 0
+    used: int = 0
+    wasted: int = 0
+    failed: int = 0
+    saved_ms: int = 0
+    wasted_ms: int = 0
+    by_reason: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "launched": self.launched,
+            "used": self.used,
+            "wasted": self.wasted,
+            "failed": self.failed,
+            "precision": (self.used / self.launched) if self.launched else 0.0,
+            "saved_ms": self.saved_ms,
+            "wasted_ms": self.wasted_ms,
+            "by_reason": {k: dict(v) for k, v in self.by_reason.items()},
+        }
+
+
+_STATS = SpeculationStats()
+
+
+def get_speculation_stats() -> Dict[str, Any]:
+    return _STATS.to_dict()
+
+
+def reset_speculation_stats() -> None:
+    global _STATS
+    _STATS = SpeculationStats()
+
+
+_TITLE_QUOTED_RE = re.compile(r"[\"“]([^\"”]{2,80})[\"”]")
+_LIBRARY_CHECK_RE = re.compile(r"(?:do i have|do we have|is|are)\s+(.{2,80}?)\s+(?:in|on)\s+(?:my|our|the)\s+(?:plex|library)", re.IGNORECASE)
+_ADD_RE = re.compile(r"\badd\s+(.{2,80}?)(?:\s+(?:to|into)\s+(?:my\s+)?(radarr|sonarr))?\s*[\.\!\?]?$", re.IGNORECASE)
+_PERSON_RE = re.compile(r"(?:who is|who's|directed by|films? by|movies? by|filmography of)\s+([A-Za-z][A-Za-z\.'\-]+(?:\s+[A-Za-z][A-Za-z\.'\-]+){1,3})", re.IGNORECASE)
+
+
+class SpeculativePrefetcher:
+    """Runs predicted read-only tool calls while the first LLM turn is in flight.
+
+    - ``predict()`` derives likely reads from the user text (title lookups,
+      person lookups, upcoming/now playing, Radarr/Sonarr add prerequisites)
+    - ``start()`` launches them in the background; writes are never launched
+    - ``claim()`` hands a finished (or still running) speculation to the
+      matching model tool call, and ``attach()`` deposits successful results
+      into the run's ``dedup_cache``
+    - ``finish()`` cancels leftovers and records precision and wasted work
+    """
+
+    def __init__(
+        self,
+        registry: Any,
+        *,
+        is_write_tool: Callable[[str], bool],
+        max_calls: int = 4,
+        timeout_ms: int = 6000,
+    ) -> None:
+        self._registry = registry
+        self._is_write_tool = is_write_tool
+        self.max_calls = max(0, int(max_calls))
+        self.timeout_ms = int(timeout_ms)
+        self._specs: Dict[str, _Speculation] = {}
+        self._sink: Optional[Dict[str, Any]] = None
+        self._finished = False
+        self._log = logging.getLogger("moviebot.speculative_prefetch")
+
+    def predict(self, msgs: List[Dict[str, Any]]) -> List[Prediction]:
+        text = "\n".join(str(m.get("content", "")) for m in msgs if m.get("role") == "user").strip()
+        if not text:
+            return []
+        tl = text.lower()
+        preds: List[Prediction] = []
+
+        m_add = _ADD_RE.search(text)
+        if m_add:
+            title = m_add.group(1).strip().strip("\"“”")
+            service = (m_add.group(2) or "").lower()
+            if service == "sonarr" or any(w in tl for w in (" show", " series", " season")):
+                preds.append(Prediction("tmdb_search_tv", {"query": title}, "add_lookup"))
+                preds.append(Prediction("sonarr_quality_profiles", {}, "add_prereq"))
+                preds.append(Prediction("sonarr_root_folders", {}, "add_prereq"))
+            else:
+                preds.append(Prediction("tmdb_search", {"query": title}, "add_lookup"))
+                preds.append(Prediction("radarr_quality_profiles", {}, "add_prereq"))
+                preds.append(Prediction("radarr_root_folders", {}, "add_prereq"))
+        else:
+            title = None
+            m_lib = _LIBRARY_CHECK_RE.search(text)
+            if m_lib:
+                title = m_lib.group(1).strip().strip("\"“”")
+            else:
+                m_q = _TITLE_QUOTED_RE.search(text)
+                if m_q:
+                    title = m_q.group(1).strip()
+            if title:
+                preds.append(Prediction("search_plex", {"query": title}, "title_lookup"))
+                preds.append(Prediction("tmdb_search", {"query": title}, "title_lookup"))
+
+        m_person = _PERSON_RE.search(text)
+        if m_person:
+            preds.append(Prediction("tmdb_search_person", {"query": m_person.group(1).strip()}, "person_lookup"))
+
+        if "upcoming" in tl or "coming soon" in tl:
+            preds.append(Prediction("tmdb_upcoming_movies", {}, "upcoming"))
+        if "in theaters" in tl or "now playing" in tl or "in theatres" in tl:
+            preds.append(Prediction("tmdb_now_playing_movies", {}, "now_playing"))
+
+        seen: set[str] = set()
+        out: List[Prediction] = []
+        for p in preds:
+            key = speculation_key(p.tool, p.args)
+            if key in seen or self._is_write_tool(p.tool):
+                continue
+            seen.add(key)
+            out.append(p)
+        return out[: self.max_calls]
+
+    async def _run(self, spec_key: str, pred: Prediction) -> Any:
+        spec = self._specs[spec_key]
+        try:
+            fn = self._registry.get(pred.tool)
+            result = await asyncio.wait_for(fn(dict(pred.args)), timeout=self.timeout_ms / 1000)
+            spec.ok = not (isinstance(result, dict) and (result.get("ok") is False or "error" in result))
+            if spec.ok and self._sink is not None:
+                self._sink[tool_dedup_key(pred.tool, pred.args)] = result
+            return result
+        except asyncio.TimeoutError:
+            return {"ok": False, "error": "timeout", "name": pred.tool}
+        except Exception as e:  # noqa: BLE001
+            return {"ok": False, "error": str(e), "name": pred.tool}
+        finally:
+            spec.duration_ms = int((time.monotonic() - spec.started_at) * 1000)
+
+    def start(self, predictions: List[Prediction]) -> int:
+        """Launch predictions in the background; returns how many were started."""
+        started = 0
+        for pred in predictions:
+            if self._is_write_tool(pred.tool):
+                continue
+            try:
+                self._registry.get(pred.tool)
+            except Exception:
+                continue
+            key = speculation_key(pred.tool, pred.args)
+            if key in self._specs:
+                continue
+            # Register before scheduling so _run can find its entry
+            self._specs[key] = _Speculation(prediction=pred, started_at=time.monotonic())
+            self._specs[key].task = asyncio.create_task(self._run(key, pred))
+            started += 1
+        if started:
+            self._log.info("speculative prefetch started", extra={"count": started, "tools": [p.tool for p in predictions]})
+        return started
+
+    def attach(self, dedup_cache: Dict[str, Any]) -> None:
+        """Bind the run's dedup cache; completed speculations are deposited immediately."""
+        self._sink = dedup_cache
+        for spec in self._specs.values():
+            if spec.task is not None and spec.task.done() and spec.ok:
+                try:
+                    dedup_cache[tool_dedup_key(spec.prediction.tool, spec.prediction.args)] = spec.task.result()
+                except Exception:
+                    pass
+
+    async def claim(self, name: str, args: Dict[str, Any]) -> Optional[Any]:
+        """Return the speculative result matching this call, waiting if still running."""
+        spec = self._specs.get(speculation_key(name, args))
+        if spec is None or spec.task is None:
+            return None
+        t_claim = time.monotonic()
+        result = await asyncio.shield(spec.task)
+        if not spec.ok:
+            return None
+        if not spec.used:
+            spec.used = True
+            # A real call started now would have taken about as long as the
+            # speculation did; only the part we still had to wait is not saved
+            waited_ms = int((time.monotonic() - t_claim) * 1000)
+            _STATS.saved_ms += max(0, spec.duration_ms - waited_ms)
+        return result
+
+    async def finish(self) -> Dict[str, Any]:
+        """Cancel unused speculations and fold this run into the global stats."""
+        if self._finished:
+            return {}
+        self._finished = True
+        run = {"launched": len(self._specs), "used": 0, "wasted": 0, "failed": 0, "wasted_ms": 0}
+        for spec in self._specs.values():
+            task = spec.task
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+            reason = spec.prediction.reason or spec.prediction.tool
+            per = _STATS.by_reason.setdefault(reason, {"launched": 0, "used": 0})
+            per["launched"] += 1
+            if spec.used:
+                run["used"] += 1
+                per["used"] += 1
+            else:
+                run["wasted"] += 1
+                run["wasted_ms"] += spec.duration_ms
+                if task is not None and not task.cancelled() and not spec.ok:
+                    run["failed"] += 1
+        _STATS.launched += run["launched"]
+        _STATS.used += run["used"]
+        _STATS.wasted += run["wasted"]
+        _STATS.failed += run["failed"]
+        _STATS.wasted_ms += run["wasted_ms"]
+        if run["launched"]:
+            self._log.info("speculative prefetch finished", extra=run)
+        return run
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import json
+import uuid
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+
+
+def _get(obj: Any, key: str) -> Any:
+    """Read a field from an SDK delta object or a plain dict."""
+    if isinstance(obj, dict):
+        return obj.get(key)
+    return getattr(obj, key, None)
+
+
+class StreamedToolFunction:
+    def __init__(self, name: str = "", arguments: str = "") -> None:
+        self.name = name
+        self.arguments = arguments
+
+
+class StreamedToolCall:
+    """Tool call assembled from stream fragments; shaped like the SDK's tool call objects."""
+
+    def __init__(self, index: int) -> None:
+        self.index = index
+        self.id = ""
+        self.type = "function"
+        self.function = StreamedToolFunction()
+        self.complete = False
+        # Incremental JSON scanner state for the arguments string
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._opened = False
+
+    def feed_arguments(self, fragment: str) -> bool:
+        """Append an arguments fragment; returns True once the top-level JSON object closes."""
+        self.function.arguments += fragment
+        for ch in fragment:
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+            if ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+                self._opened = True
+            elif ch in "}]":
+                self._depth -= 1
+                if self._opened and self._depth == 0:
+                    return True
+        return False
+
+
+class ToolCallAssembler:
+    """Rebuilds a chat completion from streamed deltas and reports tool calls as soon as they are final.
+
+    A tool call is final when its arguments JSON closes, when the next tool call
+    starts, or when the stream ends. ``on_complete`` fires exactly once per call,
+    in stream order, so callers can dispatch it while generation continues.
+    """
+
+    def __init__(self, on_complete: Optional[Callable[[StreamedToolCall], None]] = None) -> None:
+        self._on_complete = on_complete
+        self._calls: Dict[int, StreamedToolCall] = {}
+        self._content: List[str] = []
+
+    @property
+    def content(self) -> str:
+        return "".join(self._content)
+
+    @property
+    def tool_calls(self) -> List[StreamedToolCall]:
+        return [self._calls[i] for i in sorted(self._calls)]
+
+    def _finalize(self, call: StreamedToolCall) -> None:
+        if call.complete:
+            return
+        call.complete = True
+        if not call.id:
+            call.id = f"call_{uuid.uuid4().hex[:24]}"
+        if not call.function.arguments.strip():
+            call.function.arguments = "{}"
+        if self._on_complete is not None and call.function.name:
+            self._on_complete(call)
+
+    def feed(self, delta: Any) -> Optional[str]:
+        """Consume one delta; returns its content fragment, if any."""
+        part = _get(delta, "content")
+        if part:
+            self._content.append(part)
+        for frag in _get(delta, "tool_calls") or []:
+            index = _get(frag, "index")
+            index = int(index) if index is not None else len(self._calls)
+            call = self._calls.get(index)
+            if call is None:
+                # A new call starting means every earlier call is final
+                for prev in self.tool_calls:
+                    if prev.index < index:
+                        self._finalize(prev)
+                call = StreamedToolCall(index)
+                self._calls[index] = call
+            if _get(frag, "id"):
+                call.id = _get(frag, "id")
+            fn = _get(frag, "function")
+            if fn is None:
+                continue
+            if _get(fn, "name"):
+                call.function.name += _get(fn, "name")
+            args_part = _get(fn, "arguments")
+            if args_part and not call.complete and call.feed_arguments(args_part):
+                try:
+                    json.loads(call.function.arguments)
+                except Exception:
+                    # Scanner was fooled (e.g. unbalanced input); wait for the stream to move on
+                    continue
+                self._finalize(call)
+        return part or None
+
+    def close(self) -> None:
+        for call in self.tool_calls:
+            self._finalize(call)
+
+    def to_response(self) -> Any:
+        """Completion-shaped object compatible with ``resp.choices[0].message``."""
+        calls = self.tool_calls or None
+        message = SimpleNamespace(role="assistant", content=self.content, tool_calls=calls)
+        finish_reason = "tool_calls" if calls else "stop"
+        return SimpleNamespace(choices=[SimpleNamespace(message=message, finish_reason=finish_reason)])
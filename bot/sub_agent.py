@@ -9,6 +9,7 @@ import logging
 from llm.clients import LLMClient
 from .tools.registry_cache import get_cached_registry
 from config.loader import load_runtime_config
+from integrations.deadline import clamp_timeout_ms
 
 
 class SubAgent:
@@ -243,7 +244,7 @@ Remember: Search for ALL episodes, not just some of them!
                     return {"ok": False, "error": f"Tool {name} not found in registry"}
 
                 try:
-                    result = await asyncio.wait_for(tool_func(args), timeout=timeout_ms / 1000)
+                    result = await asyncio.wait_for(tool_func(args), timeout=clamp_timeout_ms(timeout_ms) / 1000)
                 except asyncio.TimeoutError:
                     return {"ok": False, "error": "timeout", "timeout_ms": timeout_ms, "name": name}
                 self.log.info(f"Tool {name} completed with result: {str(result)[:200]}...")
@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Set
+
+
+# "$2.results[0].id" -> step 2, path ".results[0].id"
+_REF_RE = re.compile(r"\$(\d+)((?:\.[A-Za-z_]\w*|\[-?\d+\])*)")
+_PATH_PART_RE = re.compile(r"\.([A-Za-z_]\w*)|\[(-?\d+)\]")
+_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$", re.MULTILINE)
+
+
+class PlanError(ValueError):
+    """The model's plan is malformed, cyclic or references unknown steps."""
+
+
+@dataclass
+class PlanStep:
+    id: int
+    tool: str
+    args: Dict[str, Any] = field(default_factory=dict)
+    depends_on: Set[int] = field(default_factory=set)
+
+
+@dataclass
+class StepResult:
+    step: PlanStep
+    status: str  # ok | failed | skipped
+    args: Dict[str, Any] = field(default_factory=dict)
+    result: Any = None
+    error: str = ""
+    duration_ms: int = 0
+
+
+@dataclass
+class PlanRun:
+    results: Dict[int, StepResult]
+    wall_ms: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return all(r.status == "ok" for r in self.results.values())
+
+    @property
+    def failed(self) -> List[StepResult]:
+        return [r for r in self.results.values() if r.status != "ok"]
+
+
+def _collect_refs(value: Any, out: Set[int]) -> None:
+    if isinstance(value, str):
+        out.update(int(m.group(1)) for m in _REF_RE.finditer(value))
+    elif isinstance(value, dict):
+        for v in value.values():
+            _collect_refs(v, out)
+    elif isinstance(value, list):
+        for v in value:
+            _collect_refs(v, out)
+
+
+def _lookup(value: Any, path: str) -> Any:
+    for m in _PATH_PART_RE.finditer(path):
+        key, idx = m.group(1), m.group(2)
+        if key is not None:
+            if not isinstance(value, dict) or key not in value:
+                raise KeyError(f"missing key '{key}'")
+            value = value[key]
+        else:
+            if not isinstance(value, list):
+                raise KeyError(f"cannot index non-list with [{idx}]")
+            try:
+                value = value[int(idx)]
+            except IndexError:
+                raise KeyError(f"index [{idx}] out of range") from None
+    return value
+
+
+def resolve_refs(value: Any, outputs: Dict[int, Any]) -> Any:
+    """Replace ``$N.path`` references with values from earlier step outputs.
+
+    A string that is exactly one reference keeps the referenced value's type;
+    references embedded in longer strings are substituted as text.
+    """
+    if isinstance(value, str):
+        whole = _REF_RE.fullmatch(value.strip())
+        if whole:
+            return _lookup(outputs[int(whole.group(1))], whole.group(2))
+        return _REF_RE.sub(lambda m: str(_lookup(outputs[int(m.group(1))], m.group(2))), value)
+    if isinstance(value, dict):
+        return {k: resolve_refs(v, outputs) for k, v in value.items()}
+    if isinstance(value, list):
+        return [resolve_refs(v, outputs) for v in value]
+    return value
+
+
+def parse_plan(raw: Any, *, max_steps: int = 8) -> List[PlanStep]:
+    """Parse and validate a plan given as JSON text, ``{"steps": [...]}`` or a list of steps."""
+    data = raw
+    if isinstance(raw, str):
+        text = _FENCE_RE.sub("", raw.strip())
+        start, end = text.find("{"), text.rfind("}")
+        if text.lstrip().startswith("["):
+            start, end = text.find("["), text.rfind("]")
+        if start < 0 or end <= start:
+            raise PlanError("no JSON plan found")
+        try:
+            data = json.loads(text[start:end + 1])
+        except json.JSONDecodeError as e:
+            raise PlanError(f"invalid plan JSON: {e}") from None
+    if isinstance(data, dict):
+        data = data.get("steps")
+    if not isinstance(data, list) or not data:
+        raise PlanError("plan has no steps")
+    if len(data) > max_steps:
+        raise PlanError(f"plan has {len(data)} steps (max {max_steps})")
+
+    steps: Dict[int, PlanStep] = {}
+    for i, item in enumerate(data):
+        if not isinstance(item, dict) or not isinstance(item.get("tool"), str):
+            raise PlanError(f"step {i + 1} has no tool")
+        sid = int(item.get("id", i + 1))
+        if sid in steps:
+            raise PlanError(f"duplicate step id {sid}")
+        args = item.get("args") or {}
+        if not isinstance(args, dict):
+            raise PlanError(f"step {sid} args must be an object")
+        deps: Set[int] = {int(d) for d in (item.get("depends_on") or [])}
+        _collect_refs(args, deps)
+        steps[sid] = PlanStep(sid, item["tool"], args, deps)
+
+    for step in steps.values():
+        unknown = step.depends_on - steps.keys()
+        if unknown or step.id in step.depends_on:
+            raise PlanError(f"step {step.id} references unknown step(s) {sorted(unknown) or [step.id]}")
+
+    # Reject cycles (DFS with colors)
+    state: Dict[int, int] = {}
+
+    def visit(sid: int) -> None:
+        if state.get(sid) == 1:
+            raise PlanError(f"plan has a dependency cycle through step {sid}")
+        if state.get(sid) == 2:
+            return
+        state[sid] = 1
+        for dep in steps[sid].depends_on:
+            visit(dep)
+        state[sid] = 2
+
+    for sid in steps:
+        visit(sid)
+    return list(steps.values())
+
+
+def _default_is_failure(result: Any) -> bool:
+    return isinstance(result, dict) and (result.get("ok") is False or "error" in result)
+
+
+class PlanExecutor:
+    """Runs a validated plan with maximum parallelism.
+
+    Every step starts as soon as all of its dependencies have succeeded. A
+    failed step marks its transitive dependents as skipped; independent
+    branches keep running so the caller gets every result that was obtainable.
+    """
+
+    def __init__(
+        self,
+        run_tool: Callable[[PlanStep, Dict[str, Any]], Awaitable[Any]],
+        *,
+        max_parallel: int = 8,
+        is_failure: Callable[[Any], bool] = _default_is_failure,
+    ) -> None:
+        self._run_tool = run_tool
+        self._sem = asyncio.Semaphore(max(1, int(max_parallel)))
+        self._is_failure = is_failure
+
+    async def run(self, steps: List[PlanStep]) -> PlanRun:
+        t0 = time.monotonic()
+        by_id = {s.id: s for s in steps}
+        results: Dict[int, StepResult] = {}
+        tasks: Dict[int, "asyncio.Task[StepResult]"] = {}
+
+        async def run_step(step: PlanStep) -> StepResult:
+            deps = [await tasks[d] for d in sorted(step.depends_on)]
+            bad = [d for d in deps if d.status != "ok"]
+            if bad:
+                res = StepResult(step, "skipped", error=f"dependency step {bad[0].step.id} {bad[0].status}")
+                results[step.id] = res
+                return res
+            outputs = {d.step.id: d.result for d in deps}
+            try:
+                args = resolve_refs(step.args, outputs)
+            except KeyError as e:
+                res = StepResult(step, "failed", error=f"unresolved reference: {e}")
+                results[step.id] = res
+                return res
+            started = time.monotonic()
+            try:
+                async with self._sem:
+                    result = await self._run_tool(step, args)
+                status = "failed" if self._is_failure(result) else "ok"
+                error = str(result.get("error", "")) if status == "failed" and isinstance(result, dict) else ""
+                res = StepResult(step, status, args, result, error)
+            except Exception as e:  # noqa: BLE001
+                res = StepResult(step, "failed", args, None, str(e))
+            res.duration_ms = int((time.monotonic() - started) * 1000)
+            results[step.id] = res
+            return res
+
+        # Tasks are created up front; each awaits its dependencies' tasks
+        for step in steps:
+            tasks[step.id] = asyncio.ensure_future(run_step(step))
+        await asyncio.gather(*tasks.values())
+        ordered = {sid: results[sid] for sid in by_id}
+        return PlanRun(ordered, int((time.monotonic() - t0) * 1000))
+
+
+def describe_tools(openai_tools: List[Dict[str, Any]]) -> str:
+    """Compact one-line-per-tool catalog (``name(arg, required_arg*)``) for the planning prompt."""
+    lines: List[str] = []
+    for t in openai_tools or []:
+        fn = t.get("function", t) if isinstance(t, dict) else {}
+        name = fn.get("name")
+        if not name:
+            continue
+        params = fn.get("parameters", {}) or {}
+        required = set(params.get("required", []) or [])
+        names = [p + ("*" if p in required else "") for p in (params.get("properties", {}) or {})]
+        lines.append(f"- {name}({', '.join(names)})")
+    return "\n".join(lines)
+
+
+def build_plan_prompt(tool_catalog: str, *, max_steps: int, allow_writes: bool) -> str:
+    writes = (
+        "Include the write step(s) the user asked for, then one read-only confirmation step."
+        if allow_writes
+        else "Only use read-only tools."
+    )
+    return (
+        "Plan the tool calls needed to answer the user, as one JSON object and nothing else:\n"
+        '{"steps": [{"id": 1, "tool": "<name>", "args": {...}}, ...]}\n'
+        f"- At most {max_steps} steps; independent steps run in parallel\n"
+        '- Use a previous step\'s output as "$<id>.<path>", e.g. "$1.results[0].id"; '
+        'add "depends_on": [ids] for ordering without data flow\n'
+        f"- {writes}\n"
+        '- If the request cannot be planned up front, reply {"steps": []}\n'
+        "Tools (* = required):\n" + tool_catalog
+    )
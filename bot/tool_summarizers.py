@@ -1,142 +1,327 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import asyncio
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None
 
-def _truncate_list(items: List[Any], max_items: int) -> List[Any]:
-    if not isinstance(items, list):
-        return items  # type: ignore[return-value]
-    if max_items <= 0 or len(items) <= max_items:
-        return items
-    return items[:max_items]
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Compact JSON as UTF-8 bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS, default=str)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
 
 
-def _keep_fields(obj: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
-    return {k: obj.get(k) for k in fields if k in obj}
+# ---------------------------------------------------------------- tables
 
+# A homogeneous list of objects can be sent as {"cols": [...], "rows": [[...], ...]}:
+# field names are declared once in the header and each item is a compact row
+TABLE_COLS = "cols"
+TABLE_ROWS = "rows"
+# Tables with more empty cells than this fraction stay plain lists
+_TABLE_MAX_MISSING = 0.25
 
-def _summarize_items_list(items: List[Dict[str, Any]], fields: List[str], max_items: int) -> List[Dict[str, Any]]:
-    items = _truncate_list(items, max_items)
-    summarized: List[Dict[str, Any]] = []
+
+def table_columns(items: List[Any], min_rows: int) -> Optional[List[str]]:
+    """Header for ``items`` when they are worth sending as a table, else None."""
+    if min_rows <= 0 or len(items) < min_rows:
+        return None
+    cols: Dict[str, None] = {}
+    filled = 0
     for it in items:
-        if isinstance(it, dict):
-            summarized.append(_keep_fields(it, fields))
-    return summarized
+        if not isinstance(it, dict) or not it:
+            return None
+        filled += len(it)
+        for k in it:
+            cols.setdefault(k, None)
+    if filled < (1 - _TABLE_MAX_MISSING) * len(cols) * len(items):
+        return None
+    return list(cols)
 
 
-def summarize_tool_result(name: str, result: Dict[str, Any], *, max_items: int = 5) -> Dict[str, Any]:
-    """
-    Deterministic, schema-light summarization to reduce tokens while preserving utility.
-    Keeps top-N items and essential fields per tool family.
+def tabulate(items: List[Any], min_rows: int = 3) -> Any:
+    """``items`` as a table when homogeneous enough, otherwise unchanged."""
+    cols = table_columns(items, min_rows)
+    if cols is None:
+        return items
+    return {TABLE_COLS: cols, TABLE_ROWS: [[it.get(c) for c in cols] for it in items]}
+
+
+def untabulate(value: Any) -> Any:
+    """Inverse of ``tabulate``: rows back to a list of objects; other values pass through."""
+    if isinstance(value, dict) and len(value) == 2 and isinstance(value.get(TABLE_COLS), list) and isinstance(value.get(TABLE_ROWS), list):
+        cols = value[TABLE_COLS]
+        return [{c: v for c, v in zip(cols, row) if v is not None} for row in value[TABLE_ROWS] if isinstance(row, list)]
+    return value
+
+
+# ------------------------------------------------------------------ specs
+
+
+@dataclass(frozen=True)
+class SummarySpec:
+    """Declarative description of how one tool's result is summarized.
+
+    - ``list_key``: the main list; capped to ``max_items`` and, when emitting
+      bytes, to the byte budget
+    - ``fields``: fields kept per list item (``None`` keeps whole items);
+      ``level_fields`` overrides them by the result's ``response_level``
+      (``"*"`` for unknown levels, else ``default_level`` applies)
+    - ``object_key``/``fields``: project a single nested object instead
+    - ``keep``: top-level keys copied when present; ``always``: copied even
+      when absent (as null); ``side_lists``: other lists with their own cap
+    - ``requires``: the spec applies only when this key is present, otherwise
+      ``fallback`` does (``None`` passes the result through unchanged)
+    - ``cap_all_lists``: generic shape, every top-level list is capped
     """
-    if not isinstance(result, dict):
-        return {"value": result}
 
-    out: Dict[str, Any] = {}
+    list_key: Optional[str] = None
+    fields: Optional[Tuple[str, ...]] = None
+    level_fields: Optional[Tuple[Tuple[str, Optional[Tuple[str, ...]]], ...]] = None
+    default_level: str = "compact"
+    object_key: Optional[str] = None
+    keep: Tuple[str, ...] = ()
+    always: Tuple[str, ...] = ()
+    side_lists: Tuple[Tuple[str, int], ...] = ()
+    requires: Optional[str] = None
+    fallback: Optional["SummarySpec"] = None
+    cap_all_lists: bool = False
 
-    # Plex families
-    if name in {
-        "search_plex", "get_plex_recently_added", "get_plex_on_deck", "get_plex_continue_watching",
-        "get_plex_unwatched", "get_plex_similar_items", "get_plex_movies_4k_or_hdr"
-    }:
-        items = result.get("items") or []
-        resp_level = str(result.get("response_level", "compact")).lower()
-        if resp_level == "minimal":
-            fields = ["title", "ratingKey", "type"]
-            out["items"] = _summarize_items_list(items, fields, max_items)
-        elif resp_level == "compact":
-            fields = ["title", "year", "rating", "ratingKey", "type"]
-            out["items"] = _summarize_items_list(items, fields, max_items)
-        elif resp_level == "standard":
-            fields = ["title", "year", "rating", "contentRating", "duration", "genres", "summary", "ratingKey", "type"]
-            out["items"] = _summarize_items_list(items, fields, max_items)
-        else:  # detailed: keep all fields, only truncate count
-            out["items"] = _truncate_list(items, max_items)
-        if "total_found" in result:
-            out["total_found"] = result.get("total_found")
-        if name == "get_plex_movies_4k_or_hdr":
-            # Keep useful debugging info minimal
-            attempts = result.get("attempts") or []
-            out["attempts"] = _truncate_list(attempts, 3)
-        if "section_type" in result:
-            out["section_type"] = result.get("section_type")
-        return out
 
-    if name in {"get_plex_collections"}:
-        cols = result.get("collections") or []
-        resp_level = str(result.get("response_level", "compact")).lower()
-        fields = ["title", "collection_id", "count"]
-        if resp_level in ("standard", "detailed"):
-            fields = ["title", "collection_id", "count", "summary"]
-        out["collections"] = _summarize_items_list(cols, fields, max_items)
-        if "total_found" in result:
-            out["total_found"] = result.get("total_found")
-        return out
+_PLEX_ITEM_LEVELS = (
+    ("minimal", ("title", "ratingKey", "type")),
+    ("compact", ("title", "year", "rating", "ratingKey", "type")),
+    ("standard", ("title", "year", "rating", "contentRating", "duration", "genres", "summary", "ratingKey", "type")),
+    ("detailed", None),
+    ("*", None),  # unknown levels keep whole items
+)
+_PLEX_ITEMS = SummarySpec(list_key="items", level_fields=_PLEX_ITEM_LEVELS, keep=("total_found", "section_type"))
+_TMDB_LIST = SummarySpec(requires="results", list_key="results", always=("page", "total_pages", "total_results"), fallback=None)
 
-    if name in {"get_plex_playlists"}:
-        pls = result.get("playlists") or []
-        resp_level = str(result.get("response_level", "compact")).lower()
-        fields = ["title", "playlist_id", "count"]
-        if resp_level in ("standard", "detailed"):
-            fields = ["title", "playlist_id", "count", "summary", "duration"]
-        out["playlists"] = _summarize_items_list(pls, fields, max_items)
-        if "total_found" in result:
-            out["total_found"] = result.get("total_found")
-        return out
+SUMMARY_SPECS: Dict[str, SummarySpec] = {
+    **{name: _PLEX_ITEMS for name in (
+        "search_plex", "get_plex_recently_added", "get_plex_on_deck", "get_plex_continue_watching",
+        "get_plex_unwatched", "get_plex_similar_items",
+    )},
+    "get_plex_movies_4k_or_hdr": SummarySpec(list_key="items", level_fields=_PLEX_ITEM_LEVELS, keep=("total_found", "section_type"), side_lists=(("attempts", 3),)),
+    "get_plex_collections": SummarySpec(
+        list_key="collections",
+        level_fields=(("compact", ("title", "collection_id", "count")), ("standard", ("title", "collection_id", "count", "summary")), ("detailed", ("title", "collection_id", "count", "summary"))),
+        keep=("total_found",),
+    ),
+    "get_plex_playlists": SummarySpec(
+        list_key="playlists",
+        level_fields=(("compact", ("title", "playlist_id", "count")), ("standard", ("title", "playlist_id", "count", "summary", "duration")), ("detailed", ("title", "playlist_id", "count", "summary", "duration"))),
+        keep=("total_found",),
+    ),
+    "get_plex_item_details": SummarySpec(object_key="item", fields=("title", "year", "ratingKey", "type", "rating", "genres", "summary")),
+    "radarr_get_movies": SummarySpec(list_key="movies", fields=("id", "title", "tmdbId", "year", "hasFile")),
+    "sonarr_get_series": SummarySpec(list_key="series", fields=("id", "title", "tvdbId", "status", "monitored")),
+    "sonarr_get_episodes": SummarySpec(list_key="episodes", fields=("id", "seasonNumber", "episodeNumber", "hasFile", "airDateUtc")),
+    "read_household_preferences": SummarySpec(requires="compact", keep=("compact",), fallback=SummarySpec(keep=("likes", "dislikes", "constraints", "anchors"))),
+}
+
+_DEFAULT_SPEC = SummarySpec(cap_all_lists=True)
 
-    if name in {"get_plex_item_details"}:
-        item = result.get("item") or {}
-        if isinstance(item, dict):
-            out["item"] = _keep_fields(item, ["title", "year", "ratingKey", "type", "rating", "genres", "summary"])
-        return out
 
-    # TMDb families
+def spec_for(name: str) -> SummarySpec:
+    spec = SUMMARY_SPECS.get(name)
+    if spec is not None:
+        return spec
     if name.startswith("tmdb_"):
-        # Common paged list shape
-        if "results" in result:
-            out["page"] = result.get("page")
-            out["total_pages"] = result.get("total_pages")
-            out["total_results"] = result.get("total_results")
-            results = result.get("results") or []
-            # Preserve whatever fields TMDb client produced for each item; only truncate count
-            out["results"] = _truncate_list(results, max_items)
-            return out
-        # Details shape: return as-is to respect chosen response level
-        return result
-
-    # Sonarr/Radarr common patterns
-    if name in {"radarr_get_movies"}:
-        movies = result.get("movies") or []
-        out["movies"] = _summarize_items_list(movies, ["id", "title", "tmdbId", "year", "hasFile"], max_items)
-        return out
+        # Paged list shape keeps whatever fields the TMDb client produced; details pass through
+        return _TMDB_LIST
+    return _DEFAULT_SPEC
 
-    if name in {"sonarr_get_series"}:
-        series = result.get("series") or []
-        out["series"] = _summarize_items_list(series, ["id", "title", "tvdbId", "status", "monitored"], max_items)
-        return out
 
-    if name in {"sonarr_get_episodes"}:
-        eps = result.get("episodes") or []
-        out["episodes"] = _summarize_items_list(eps, ["id", "seasonNumber", "episodeNumber", "hasFile", "airDateUtc"], max_items)
-        return out
+# -------------------------------------------------------------- compiler
+
+
+def _projector(fields: Optional[Tuple[str, ...]]) -> Callable[[List[Any]], List[Any]]:
+    if fields is None:
+        return lambda items: items
+    keys = tuple(fields)
+
+    def project(items: List[Any]) -> List[Any]:
+        return [{k: it[k] for k in keys if k in it} for it in items if isinstance(it, dict)]
 
-    # Preferences compact
-    if name in {"read_household_preferences"}:
-        if "compact" in result:
-            out["compact"] = result.get("compact")
-            return out
-        # fall-through minimal projection for safety
-        keys = [k for k in ("likes", "dislikes", "constraints", "anchors") if k in result]
-        for k in keys:
-            out[k] = result.get(k)
+    return project
+
+
+class CompiledSummarizer:
+    """A ``SummarySpec`` turned into closures once, then applied per result.
+
+    ``to_obj`` returns the summary as Python objects; ``to_bytes`` emits JSON
+    bytes directly and stops adding list items once ``max_bytes`` would be
+    exceeded, recording how many were left out under ``"omitted"``. With
+    ``tabular_min_rows`` > 0, homogeneous lists of at least that many objects
+    are emitted as tables (see ``tabulate``).
+    """
+
+    def __init__(self, spec: SummarySpec) -> None:
+        self.spec = spec
+        self._fallback = compile_spec(spec.fallback) if spec.fallback is not None else None
+        levels = dict(spec.level_fields or ())
+        self._by_level = {lvl: _projector(f) for lvl, f in levels.items()}
+        self._default_project = self._by_level.get(spec.default_level) if levels else _projector(spec.fields)
+        self._object_keys = tuple(spec.fields or ()) if spec.object_key else ()
+        self._keep = spec.keep
+        self._always = spec.always
+
+    def _active(self, result: Dict[str, Any]) -> Optional["CompiledSummarizer"]:
+        """Summarizer that applies to ``result``; None passes it through."""
+        if self.spec.requires is None or self.spec.requires in result:
+            return self
+        return self._fallback
+
+    def _project(self, result: Dict[str, Any]) -> Callable[[List[Any]], List[Any]]:
+        if not self._by_level:
+            return self._default_project
+        level = str(result.get("response_level", self.spec.default_level)).lower()
+        return self._by_level.get(level) or self._by_level.get("*") or self._default_project
+
+    def _head(self, result: Dict[str, Any]) -> List[Tuple[str, Any]]:
+        head: List[Tuple[str, Any]] = [(k, result.get(k)) for k in self._always]
+        head.extend((k, result[k]) for k in self._keep if k in result)
+        head.extend((k, (result.get(k) or [])[:cap]) for k, cap in self.spec.side_lists)
+        if self.spec.object_key:
+            obj = result.get(self.spec.object_key) or {}
+            if isinstance(obj, dict):
+                head.append((self.spec.object_key, {k: obj[k] for k in self._object_keys if k in obj}))
+        return head
+
+    def to_obj(self, result: Any, max_items: int = 5, tabular_min_rows: int = 0) -> Any:
+        if not isinstance(result, dict):
+            return {"value": result}
+        active = self._active(result)
+        if active is None:
+            return result
+        if active is not self:
+            return active.to_obj(result, max_items, tabular_min_rows)
+        if self.spec.cap_all_lists:
+            return {
+                k: tabulate(v[:max_items] if max_items > 0 else v, tabular_min_rows) if isinstance(v, list) else v
+                for k, v in result.items()
+            }
+        out: Dict[str, Any] = {}
+        if self.spec.list_key:
+            items = result.get(self.spec.list_key) or []
+            if isinstance(items, list) and max_items > 0:
+                items = items[:max_items]
+            out[self.spec.list_key] = tabulate(self._project(result)(items), tabular_min_rows) if isinstance(items, list) else items
+        out.update(self._head(result))
         return out
 
-    # Default: if a top-level list exists, cap it; otherwise return as-is
-    for k, v in result.items():
-        if isinstance(v, list):
-            out[k] = _truncate_list(v, max_items)
+    def to_bytes(self, result: Any, max_items: int = 5, max_bytes: Optional[int] = None, tabular_min_rows: int = 0) -> bytes:
+        if not isinstance(result, dict):
+            return dumps_bytes({"value": result})
+        active = self._active(result)
+        if active is not self:
+            return dumps_bytes(result) if active is None else active.to_bytes(result, max_items, max_bytes, tabular_min_rows)
+        if self.spec.cap_all_lists:
+            pairs = [(k, v) for k, v in result.items() if not isinstance(v, list)]
+            lists = [(k, v) for k, v in result.items() if isinstance(v, list)]
         else:
-            out[k] = v
-    return out
+            pairs = self._head(result)
+            items = result.get(self.spec.list_key) if self.spec.list_key else None
+            if self.spec.list_key and not isinstance(items, list):
+                pairs.insert(0, (self.spec.list_key, items or []))
+                items = None
+            lists = [(self.spec.list_key, items)] if isinstance(items, list) else []
+
+        parts = [dumps_bytes(k) + b":" + dumps_bytes(v) for k, v in pairs]
+        used = 2 + sum(len(p) + 1 for p in parts)
+        if max_bytes is not None:
+            # Room for the ',"omitted":N' marker should items have to be dropped
+            used += len(b',"omitted":') + len(str(sum(len(v) for _, v in lists)))
+        omitted = 0
+        list_parts: List[bytes] = []
+        project = self._project(result) if not self.spec.cap_all_lists else (lambda xs: xs)
+        for key, items in lists:
+            capped = items[:max_items] if max_items > 0 else items
+            projected = project(capped)
+            cols = table_columns(projected, tabular_min_rows)
+            if cols is not None:
+                open_bytes = dumps_bytes(key) + b':{"cols":' + dumps_bytes(cols) + b',"rows":['
+                close_bytes = b"]}"
+                projected = [[it.get(c) for c in cols] for it in projected]
+            else:
+                open_bytes, close_bytes = dumps_bytes(key) + b":[", b"]"
+            kept: List[bytes] = []
+            used += len(open_bytes) + len(close_bytes) + 1
+            for it in projected:
+                b = dumps_bytes(it)
+                if max_bytes is not None and used + len(b) + 1 > max_bytes:
+                    break
+                kept.append(b)
+                used += len(b) + 1
+            omitted += len(projected) - len(kept)
+            list_parts.append(open_bytes + b",".join(kept) + close_bytes)
+        if omitted > 0:
+            parts.append(b'"omitted":' + str(omitted).encode())
+        return b"{" + b",".join(list_parts + parts) + b"}"
+
+
+@lru_cache(maxsize=None)
+def compile_spec(spec: SummarySpec) -> CompiledSummarizer:
+    return CompiledSummarizer(spec)
+
+
+def get_summarizer(name: str) -> CompiledSummarizer:
+    """Compiled summarizer for a tool, built once per spec."""
+    return compile_spec(spec_for(name))
+
+
+# ----------------------------------------------------------------- API
+
+
+def summarize_tool_result(name: str, result: Dict[str, Any], *, max_items: int = 5, tabular_min_rows: int = 0) -> Dict[str, Any]:
+    """
+    Deterministic, schema-light summarization to reduce tokens while preserving utility.
+    Keeps top-N items and essential fields per tool family.
+    """
+    return get_summarizer(name).to_obj(result, max_items, tabular_min_rows)
+
+
+def summarize_tool_result_bytes(
+    name: str,
+    result: Any,
+    *,
+    max_items: int = 5,
+    max_bytes: Optional[int] = None,
+    tabular_min_rows: int = 0,
+) -> bytes:
+    """Summary of ``result`` as JSON bytes, list items cut to fit ``max_bytes``."""
+    return get_summarizer(name).to_bytes(result, max_items, max_bytes, tabular_min_rows)
+
+
+def _approx_size(result: Any) -> int:
+    """Cheap size estimate: number of elements in top-level lists/dicts."""
+    if isinstance(result, dict):
+        return sum(len(v) if isinstance(v, (list, dict)) else 1 for v in result.values())
+    if isinstance(result, (list, dict)):
+        return len(result)
+    return 1
 
 
+async def summarize_tool_result_bytes_async(
+    name: str,
+    result: Any,
+    *,
+    max_items: int = 5,
+    max_bytes: Optional[int] = None,
+    offload_min_items: int = 2000,
+    tabular_min_rows: int = 0,
+) -> bytes:
+    """``summarize_tool_result_bytes`` off the event loop for very large results."""
+    kwargs = {"max_items": max_items, "max_bytes": max_bytes, "tabular_min_rows": tabular_min_rows}
+    if offload_min_items > 0 and _approx_size(result) >= offload_min_items:
+        return await asyncio.to_thread(summarize_tool_result_bytes, name, result, **kwargs)
+    return summarize_tool_result_bytes(name, result, **kwargs)
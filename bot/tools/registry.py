@@ -512,6 +512,7 @@ def _define_openai_tools() -> List[Dict[str, Any]]:
         fn("system_health_overview", "Get comprehensive system health overview across all services (Radarr, Sonarr, Plex) in parallel.", {}),
         fn("tmdb_discovery_suite", "Get comprehensive TMDb discovery across multiple methods (trending, popular, top rated, discover) in parallel.", {
             "discovery_types": {"type": ["array", "null"], "items": {"type": "string", "enum": ["trending", "popular", "top_rated", "discover"]}, "description": "Discovery methods to include (default: all)"},
+            "time_window": {"type": ["string", "null"], "enum": ["day", "week"], "description": "Time window for trending discovery (default: week)"},
             "language": {"type": ["string", "null"], "description": "Response language", "default": "en-US"},
             "page": {"type": ["integer", "null"], "description": "Page number", "default": 1},
             "response_level": {"type": ["string", "null"], "description": "Response detail level: minimal, compact, standard, or detailed (default: compact for efficiency)", "enum": ["minimal", "compact", "standard", "detailed"]},
@@ -662,4 +663,19 @@ def build_openai_tools_and_registry(project_root: Path, llm_client=None) -> Tupl
     return openai_tools, tools
 
 
+# Tools that only touch local files and caches (no Plex/TMDb/Radarr/Sonarr)
+LOCAL_TOOL_NAMES = ("read_household_preferences", "search_household_preferences", "agent_early_terminate", "fetch_cached_result")
+
+
+def build_local_tools_and_registry(project_root: Path) -> Tuple[List[Dict[str, Any]], ToolRegistry]:
+    """Registry of ``LOCAL_TOOL_NAMES`` only, for offline agent-loop runs (LLM stand-in benchmarks)."""
+    tools = ToolRegistry()
+    tools.register("read_household_preferences", make_read_household_preferences(project_root))
+    tools.register("search_household_preferences", make_search_household_preferences(project_root))
+    tools.register("agent_early_terminate", make_agent_early_terminate(project_root))
+    tools.register("fetch_cached_result", make_fetch_cached_result(project_root))
+    openai_tools = [t for t in _define_openai_tools() if t["function"]["name"] in LOCAL_TOOL_NAMES]
+    return openai_tools, tools
+
+
 
@@ -44,6 +44,7 @@ class RegistryCache:
         self._base_openai_tools: Optional[List[Dict[str, Any]]] = None
         self._base_registry: Optional[ToolRegistry] = None
         self._llm_registry_cache: Dict[str, ToolRegistry] = {}
+        self._static = False
         self._log = logging.getLogger("moviebot.registry_cache")
         self._initialized = True
     
@@ -67,6 +68,14 @@ class RegistryCache:
         
         self._log.info(f"Tool registry cache initialized with {len(self._base_registry._tools)} tools")
     
+    def install(self, project_root: Path, openai_tools: List[Dict[str, Any]], registry: ToolRegistry) -> None:
+        """Serve a prebuilt registry to every caller (offline runs against stand-in services)."""
+        self._project_root = project_root
+        self._base_openai_tools, self._base_registry = openai_tools, registry
+        self._llm_registry_cache.clear()
+        self._static = True
+        self._log.info(f"Tool registry cache installed with {len(registry._tools)} tools")
+
     def get_registry(self, llm_client: Optional[LLMClient] = None) -> Tuple[List[Dict[str, Any]], ToolRegistry]:
         """
         Get the cached registry, creating an LLM-specific variant if needed.
@@ -80,8 +89,8 @@ class RegistryCache:
         if self._base_registry is None:
             raise RuntimeError("Registry cache not initialized. Call initialize() first.")
         
-        # If no LLM client needed, return base registry
-        if llm_client is None:
+        # If no LLM client needed (or a prebuilt registry was installed), return base registry
+        if llm_client is None or self._static:
             return self._base_openai_tools, self._base_registry
         
         # For LLM client, check if we have a cached variant
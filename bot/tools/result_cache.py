@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+import json
 import uuid
 from typing import Any, Dict, List, Optional
 
 from integrations.ttl_cache import shared_cache
 
 
+def tool_dedup_key(name: str, args: Dict[str, Any]) -> str:
+    """Stable key for a tool call, shared by in-run dedup, the session cache and the cache warmer."""
+    return f"{name}:{json.dumps(args, sort_keys=True, separators=(',', ':'))}"
+
+
 def put_tool_result(value: Any, ttl_sec: int) -> str:
     """Store a raw tool result and return a reference id."""
     ref_id = uuid.uuid4().hex
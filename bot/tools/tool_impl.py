@@ -609,12 +609,14 @@ def make_query_household_preferences(project_root: Path, llm_client) -> Callable
         
         try:
             # Call the async LLM client
-            response = await llm_client.achat(
-                model=model,
-                messages=[system_message, user_message],
-                reasoning=sel.get("reasoningEffort"),
-                **(sel.get("params", {}) or {}),
-            )
+            from llm.governor import Priority, llm_priority
+            with llm_priority(Priority.SUMMARIZATION):
+                response = await llm_client.achat(
+                    model=model,
+                    messages=[system_message, user_message],
+                    reasoning=sel.get("reasoningEffort"),
+                    **(sel.get("params", {}) or {}),
+                )
             print(response)
             # Extract the response content
             content = response.choices[0].message.content or ""
@@ -341,6 +341,7 @@ def make_system_health_overview(project_root: Path) -> Callable[[dict], Awaitabl
         from bot.workers.radarr import RadarrWorker
         from bot.workers.sonarr import SonarrWorker
         from bot.workers.plex import PlexWorker
+        from integrations.circuit_breaker import circuit_registry
         
         # Initialize workers
         radarr_worker = RadarrWorker(project_root)
@@ -397,6 +398,7 @@ def make_system_health_overview(project_root: Path) -> Callable[[dict], Awaitabl
                 "plex": {
                     "library_sections": safe_result(plex_sections, "plex_library_sections"),
                 },
+                "circuits": circuit_registry.snapshot(),
                 "summary": {
                     "radarr_healthy": not isinstance(radarr_status, Exception) and not isinstance(radarr_health, Exception),
                     "sonarr_healthy": not isinstance(sonarr_status, Exception) and not isinstance(sonarr_health, Exception),
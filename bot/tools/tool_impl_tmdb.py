@@ -361,6 +361,9 @@ def make_tmdb_discovery_suite(project_root: Path) -> Callable[[dict], Awaitable[
         language = str(args.get("language", "en-US"))
         page = int(args.get("page", 1))
         response_level = args.get("response_level")
+        time_window = str(args.get("time_window") or "week")
+        if time_window not in ("day", "week"):
+            time_window = "week"
         
         # Get discovery types to include (default to all)
         discovery_types = args.get("discovery_types", ["trending", "popular", "top_rated", "discover"])
@@ -371,8 +374,8 @@ def make_tmdb_discovery_suite(project_root: Path) -> Callable[[dict], Awaitable[
         
         if "trending" in discovery_types:
             tasks.extend([
-                worker.trending(media_type="movie", time_window="week", language=language, response_level=response_level),
-                worker.trending(media_type="tv", time_window="week", language=language, response_level=response_level),
+                worker.trending(media_type="movie", time_window=time_window, language=language, response_level=response_level),
+                worker.trending(media_type="tv", time_window=time_window, language=language, response_level=response_level),
             ])
             task_names.extend(["trending_movies", "trending_tv"])
         
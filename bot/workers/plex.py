@@ -10,6 +10,7 @@ import httpx
 from config.loader import load_settings
 from integrations.plex_client import PlexClient, ResponseLevel
 from integrations.ttl_cache import shared_cache
+from integrations.deadline import clamp_timeout_s, within_deadline
 
 
 class PlexWorker:
@@ -39,7 +40,8 @@ class PlexWorker:
             return None
 
     async def _to_thread(self, fn: Callable, *args, **kwargs):
-        return await asyncio.to_thread(fn, *args, **kwargs)
+        # plexapi calls cannot be cancelled; stop waiting once the request deadline passes
+        return await within_deadline(asyncio.to_thread(fn, *args, **kwargs))
 
     def _cache_key(self, method: str, *args: Any, **kwargs: Any) -> str:
         return f"plex:{method}:{repr(args)}:{repr(sorted(kwargs.items()))}"
@@ -367,7 +369,7 @@ class PlexWorker:
             qp.update(params)
             url = f"{base_url}/library/sections/{sid}/all"
             client = self._http_client()
-            r = await client.get(url, params=qp, headers={'Accept': 'application/xml'})
+            r = await client.get(url, params=qp, headers={'Accept': 'application/xml'}, timeout=clamp_timeout_s(3.0))
             r.raise_for_status()
             return self._parse_videos(r.text, rl)
 
@@ -4,8 +4,9 @@ from typing import Any, Dict, List, Optional
 from pathlib import Path
 import asyncio
 
-from config.loader import load_settings
+from config.loader import load_runtime_config, load_settings
 from integrations.plex_client import PlexClient, ResponseLevel
+from integrations.plex_index import PlexLibraryIndex, get_plex_library_index
 
 
 class PlexSearchWorker:
@@ -22,12 +23,23 @@ class PlexSearchWorker:
         # Reuse a single PlexClient instance for better performance
         self._plex_client: Optional[PlexClient] = None
 
+    def _library_index(self) -> Optional[PlexLibraryIndex]:
+        """Shared library index for this server when ``plex.index.enabled`` is set."""
+        try:
+            cfg = ((load_runtime_config(self.project_root).get("plex", {}) or {}).get("index", {}) or {})
+        except Exception:
+            cfg = {}
+        if not cfg.get("enabled", False):
+            return None
+        return get_plex_library_index(self.settings.plex_base_url, float(cfg.get("maxAgeSec", 900)))
+
     def _get_plex_client(self) -> PlexClient:
         """Get or create a reusable PlexClient instance."""
         if self._plex_client is None:
             self._plex_client = PlexClient(
                 self.settings.plex_base_url, 
-                self.settings.plex_token or ""
+                self.settings.plex_token or "",
+                library_index=self._library_index(),
             )
         return self._plex_client
 
@@ -37,6 +37,11 @@ class RadarrWorker:
         except Exception:
             return None
 
+    @staticmethod
+    def _invalidate_movies() -> None:
+        # Writes change the library: drop cached listings so the next read (and add preflight) sees them
+        shared_cache.delete_where(lambda key: key.startswith("radarr:movies:"))
+
     # --------------------------- operations ---------------------------
     async def lookup(self, term: str) -> Dict[str, Any]:
         data = await self.client.lookup(term)
@@ -60,6 +65,7 @@ class RadarrWorker:
             monitored=self._coerce_bool(monitored, True),
             search_now=self._coerce_bool(search_now, True),
         )
+        self._invalidate_movies()
         
         # If the movie already exists, return a user-friendly response
         if data.get("already_exists"):
@@ -94,6 +100,7 @@ class RadarrWorker:
 
     async def update_movie(self, *, movie_id: int, update_data: Dict[str, Any]) -> Dict[str, Any]:
         data = await self.client.update_movie(int(movie_id), **(update_data or {}))
+        self._invalidate_movies()
         return {"updated_movie": data}
 
     async def delete_movie(self, *, movie_id: int, delete_files: Optional[bool], add_import_list_exclusion: Optional[bool]) -> Dict[str, Any]:
@@ -102,6 +109,7 @@ class RadarrWorker:
             self._coerce_bool(delete_files, False),
             self._coerce_bool(add_import_list_exclusion, False),
         )
+        self._invalidate_movies()
         return {"ok": True, "deleted_movie_id": int(movie_id)}
 
     async def search_movie(self, *, movie_id: int) -> Dict[str, Any]:
@@ -5,6 +5,7 @@ from typing import Any, Dict, List, Optional
 
 from config.loader import load_settings, load_runtime_config
 from integrations.sonarr_client import SonarrClient
+from integrations.ttl_cache import shared_cache
 
 
 class SonarrWorker:
@@ -55,6 +56,11 @@ class SonarrWorker:
         except Exception:
             return None
 
+    @staticmethod
+    def _invalidate_series() -> None:
+        # Writes change the library: drop cached listings so the next read (and add preflight) sees them
+        shared_cache.delete_where(lambda key: key.startswith("sonarr:series:"))
+
     # --------------------------- basic ops ---------------------------
     async def lookup(self, term: str) -> Dict[str, Any]:
         data = await self.client.lookup(term)
@@ -90,14 +96,24 @@ class SonarrWorker:
             episodes_to_monitor=self._coerce_int_list(episodes_to_monitor),
             monitor_new_episodes=self._coerce_bool(monitor_new_episodes, True),
         )
+        self._invalidate_series()
         return data
 
-    async def get_series(self, *, series_id: Optional[int] = None) -> Dict[str, Any]:
+    async def get_series(self, *, series_id: Optional[int] = None, bypass_cache: bool = False) -> Dict[str, Any]:
+        """Get series, caching listings like ``RadarrWorker.get_movies``."""
+        cache_key = f"sonarr:series:{series_id if series_id else 'all'}"
+        if not bypass_cache:
+            cached = shared_cache.get(cache_key)
+            if cached is not None:
+                return cached
         data = await self.client.get_series(series_id)
-        return {"series": data}
+        result = {"series": data}
+        shared_cache.set(cache_key, result, 300 if series_id else 120)
+        return result
 
     async def update_series(self, *, series_id: int, update_data: Dict[str, Any]) -> Dict[str, Any]:
         data = await self.client.update_series(int(series_id), **(update_data or {}))
+        self._invalidate_series()
         return {"updated_series": data}
 
     async def delete_series(self, *, series_id: int, delete_files: Optional[bool], add_import_list_exclusion: Optional[bool]) -> Dict[str, Any]:
@@ -106,6 +122,7 @@ class SonarrWorker:
             self._coerce_bool(delete_files, False),
             self._coerce_bool(add_import_list_exclusion, False),
         )
+        self._invalidate_series()
         return {"ok": True, "deleted_series_id": int(series_id)}
 
     async def get_episodes(self, *, series_id: Optional[int] = None, episode_ids: Optional[List[int]] = None) -> Dict[str, Any]:
@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import Any, Dict, List, Optional
 
 from llm.clients import LLMClient
+from llm.governor import Priority, llm_priority
 from config.loader import resolve_llm_selection
 
 
@@ -26,7 +27,8 @@ class SummarizerWorker:
                 f"Schema hint: {schema_hint or '-'}\nMax chars: {target_chars}\n\nData:\n" + str(obj)
             )[:4000],
         }
-        resp = await self.llm.achat(model=model, messages=[system, user], reasoning=sel.get("reasoningEffort"), **(sel.get("params", {}) or {}))
+        with llm_priority(Priority.SUMMARIZATION):
+            resp = await self.llm.achat(model=model, messages=[system, user], reasoning=sel.get("reasoningEffort"), **(sel.get("params", {}) or {}))
         content = getattr(getattr(resp, "choices", [{}])[0], "message", {}).get("content", "")
         if isinstance(content, str) and len(content) > target_chars:
             return content[: target_chars - 1] + "…"
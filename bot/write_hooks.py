@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+# Runs a read-only tool by name (through the agent's registry) and returns its result
+ReadTool = Callable[[str, Dict[str, Any]], Awaitable[Any]]
+
+log = logging.getLogger("moviebot.write_hooks")
+
+
+@dataclass(frozen=True)
+class WriteHooks:
+    """Deterministic checks around one write tool.
+
+    ``preflight(args, read)`` runs before the write. Returning a dict answers the
+    call without performing the write (duplicate, invalid arguments); ``None``
+    lets it proceed. ``verify(args, result, read)`` runs after a successful
+    write and returns a ``{"verified": bool, "checks": [...], "problems": [...]}``
+    record that the agent attaches to the result, replacing the extra
+    read-only validation turn the model would otherwise spend. ``id_arg`` names
+    the argument identifying the target; the agent only lets the write skip its
+    read phase when that id came from a tool result earlier in the run.
+    """
+
+    id_arg: str
+    preflight: Optional[Callable[[Dict[str, Any], ReadTool], Awaitable[Optional[Dict[str, Any]]]]] = None
+    verify: Optional[Callable[[Dict[str, Any], Any, ReadTool], Awaitable[Dict[str, Any]]]] = None
+
+
+def _as_int(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except Exception:
+        return None
+
+
+def _brief(item: Dict[str, Any]) -> Dict[str, Any]:
+    keys = ("id", "title", "year", "tmdbId", "tvdbId", "monitored", "path")
+    return {k: item[k] for k in keys if k in item}
+
+
+async def _find_existing(read: ReadTool, tool: str, list_key: str, id_field: str, wanted: int) -> Optional[Dict[str, Any]]:
+    """Look ``wanted`` up in the library listing returned by ``tool``; None when absent or unreadable."""
+    try:
+        data = await read(tool, {})
+    except Exception as e:
+        log.debug(f"preflight read {tool} failed: {e}")
+        return None
+    items = data.get(list_key) if isinstance(data, dict) else data
+    for item in items or []:
+        if isinstance(item, dict) and _as_int(item.get(id_field)) == wanted:
+            return item
+    return None
+
+
+def _verify_resource(result: Any, id_field: str, wanted: int, args: Dict[str, Any]) -> Dict[str, Any]:
+    checks: List[str] = []
+    problems: List[str] = []
+    if not isinstance(result, dict):
+        return {"verified": False, "checks": checks, "problems": ["write returned no resource"]}
+    resource = result.get("movie") if result.get("already_exists") and isinstance(result.get("movie"), dict) else result
+    if result.get("already_exists"):
+        checks.append("already in library")
+    if _as_int(resource.get(id_field)) == wanted:
+        checks.append(f"{id_field} {wanted} matches")
+    elif not result.get("already_exists"):
+        problems.append(f"returned {id_field} {resource.get(id_field)!r}, expected {wanted}")
+    if _as_int(resource.get("id")) is not None:
+        checks.append(f"library id {resource.get('id')}")
+    elif not result.get("already_exists"):
+        problems.append("no library id in response")
+    wanted_monitored = args.get("monitored")
+    if isinstance(wanted_monitored, bool) and isinstance(resource.get("monitored"), bool) and resource["monitored"] != wanted_monitored:
+        problems.append(f"monitored is {resource['monitored']}, expected {wanted_monitored}")
+    return {"verified": not problems, "checks": checks, "problems": problems}
+
+
+# --------------------------------------------------------------- radarr
+
+
+async def _radarr_add_preflight(args: Dict[str, Any], read: ReadTool) -> Optional[Dict[str, Any]]:
+    tmdb_id = _as_int(args.get("tmdb_id"))
+    if tmdb_id is None:
+        return {"ok": False, "error": "invalid_arguments", "message": "tmdb_id must be an integer TMDb movie id"}
+    existing = await _find_existing(read, "radarr_get_movies", "movies", "tmdbId", tmdb_id)
+    if existing is None:
+        return None
+    return {
+        "success": True,
+        "already_exists": True,
+        "message": f"{existing.get('title', 'Movie')} is already in Radarr; nothing was added",
+        "movie": _brief(existing),
+        "tmdb_id": tmdb_id,
+        "verification": {"verified": True, "checks": ["already in library (preflight)"], "problems": []},
+    }
+
+
+async def _radarr_add_verify(args: Dict[str, Any], result: Any, read: ReadTool) -> Dict[str, Any]:
+    return _verify_resource(result, "tmdbId", _as_int(args.get("tmdb_id")) or -1, args)
+
+
+# --------------------------------------------------------------- sonarr
+
+
+async def _sonarr_add_preflight(args: Dict[str, Any], read: ReadTool) -> Optional[Dict[str, Any]]:
+    tvdb_id = _as_int(args.get("tvdb_id"))
+    if tvdb_id is None:
+        return {"ok": False, "error": "invalid_arguments", "message": "tvdb_id must be an integer TVDb series id"}
+    existing = await _find_existing(read, "sonarr_get_series", "series", "tvdbId", tvdb_id)
+    if existing is None:
+        return None
+    return {
+        "success": True,
+        "already_exists": True,
+        "message": f"{existing.get('title', 'Series')} is already in Sonarr; nothing was added",
+        "series": _brief(existing),
+        "tvdb_id": tvdb_id,
+        "verification": {"verified": True, "checks": ["already in library (preflight)"], "problems": []},
+    }
+
+
+async def _sonarr_add_verify(args: Dict[str, Any], result: Any, read: ReadTool) -> Dict[str, Any]:
+    return _verify_resource(result, "tvdbId", _as_int(args.get("tvdb_id")) or -1, args)
+
+
+WRITE_HOOKS: Dict[str, WriteHooks] = {
+    "radarr_add_movie": WriteHooks("tmdb_id", _radarr_add_preflight, _radarr_add_verify),
+    "sonarr_add_series": WriteHooks("tvdb_id", _sonarr_add_preflight, _sonarr_add_verify),
+}
+
+
+def get_write_hooks(name: str) -> Optional[WriteHooks]:
+    return WRITE_HOOKS.get(name)
@@ -1,2 +1,3 @@
 from .http_client import SharedHttpClient, HttpConfig  # re-export
 from .ttl_cache import shared_cache, TTLCache  # re-export
+from .circuit_breaker import circuit_registry, CircuitOpenError  # re-export
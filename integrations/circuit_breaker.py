@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from .deadline import DeadlineExceeded
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+logger = logging.getLogger("moviebot.circuit")
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling an upstream whose breaker is open."""
+
+    def __init__(self, key: str, retry_in_ms: int) -> None:
+        super().__init__(f"circuit open for {key}; retry in {retry_in_ms}ms")
+        self.key = key
+        self.retry_in_ms = retry_in_ms
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker for one upstream.
+
+    - closed: calls pass; ``open_after_failures`` consecutive failures open it
+    - open: calls are rejected until ``open_for_ms`` has passed
+    - half-open: exactly one probe call is let through; its success closes the
+      breaker, its failure re-opens it for another ``open_for_ms``. A probe that
+      never reports back (e.g. cancelled) is replaced after ``open_for_ms``.
+    """
+
+    def __init__(self, key: str, open_after_failures: int = 3, open_for_ms: int = 3000) -> None:
+        self.key = key
+        self.open_after_failures = max(1, int(open_after_failures))
+        self.open_for_ms = max(1, int(open_for_ms))
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_started = 0.0
+        self.rejected = 0
+        self.trips = 0
+        self._lock = threading.Lock()
+
+    def _now_ms(self) -> float:
+        return time.monotonic() * 1000
+
+    def _transition(self, state: str) -> None:
+        if state != self.state:
+            logger.info("circuit state change", extra={"circuit": self.key, "from": self.state, "to": state, "failures": self.failures})
+            self.state = state
+
+    def allow(self) -> bool:
+        """Whether a call may go out now; in half-open this claims the single probe slot."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            now = self._now_ms()
+            if self.state == OPEN and now - self.opened_at >= self.open_for_ms:
+                self._transition(HALF_OPEN)
+                self.probe_started = 0.0
+            if self.state == HALF_OPEN and (not self.probe_started or now - self.probe_started >= self.open_for_ms):
+                self.probe_started = now
+                return True
+            self.rejected += 1
+            return False
+
+    def retry_in_ms(self) -> int:
+        with self._lock:
+            if self.state != OPEN:
+                return 0
+            return max(0, int(self.open_for_ms - (self._now_ms() - self.opened_at)))
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.probe_started = 0.0
+            self._transition(CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.open_after_failures:
+                if self.state != OPEN:
+                    self.trips += 1
+                self._transition(OPEN)
+                self.opened_at = self._now_ms()
+                self.probe_started = 0.0
+
+    def record_error(self, error: BaseException) -> None:
+        """Classify a failed call: upstream trouble counts, client errors close, deadline runs free the probe.
+
+        A client error only closes an open breaker when it answers the half-open probe;
+        one from a call already in flight when the breaker opened is ignored.
+        """
+        if isinstance(error, DeadlineExceeded):
+            with self._lock:
+                self.probe_started = 0.0
+        elif is_upstream_failure(error):
+            self.record_failure()
+        else:
+            with self._lock:
+                if self.state == OPEN:
+                    return
+                self.failures = 0
+                self.probe_started = 0.0
+                self._transition(CLOSED)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self.state,
+                "failures": self.failures,
+                "trips": self.trips,
+                "rejected": self.rejected,
+                "retry_in_ms": max(0, int(self.open_for_ms - (self._now_ms() - self.opened_at))) if self.state == OPEN else 0,
+            }
+
+
+class CircuitBreakerRegistry:
+    """Process-wide breakers keyed by upstream (e.g. ``tmdb@api.themoviedb.org``, ``llm:openai``).
+
+    Agents are short-lived (one per message), so breaker state must outlive
+    them for an outage to be detected once and then fail fast everywhere.
+    """
+
+    def __init__(self, open_after_failures: int = 3, open_for_ms: int = 3000) -> None:
+        self.open_after_failures = int(open_after_failures)
+        self.open_for_ms = int(open_for_ms)
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, *, open_after_failures: Optional[int] = None, open_for_ms: Optional[int] = None) -> None:
+        """Update thresholds for new and existing breakers (state is kept)."""
+        with self._lock:
+            if open_after_failures is not None:
+                self.open_after_failures = max(1, int(open_after_failures))
+            if open_for_ms is not None:
+                self.open_for_ms = max(1, int(open_for_ms))
+            for b in self._breakers.values():
+                b.open_after_failures = self.open_after_failures
+                b.open_for_ms = self.open_for_ms
+
+    def get(self, key: str) -> CircuitBreaker:
+        b = self._breakers.get(key)
+        if b is None:
+            with self._lock:
+                b = self._breakers.get(key)
+                if b is None:
+                    b = CircuitBreaker(key, self.open_after_failures, self.open_for_ms)
+                    self._breakers[key] = b
+        return b
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {b.key: b.snapshot() for b in breakers}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._breakers.clear()
+
+
+def is_upstream_failure(error: BaseException) -> bool:
+    """True for errors that say the upstream is unhealthy (timeouts, connection errors, 429/5xx).
+
+    Client errors such as 400/404 mean the service answered, so they do not count;
+    neither does running out of the request's own deadline.
+    """
+    if isinstance(error, DeadlineExceeded):
+        return False
+    status = getattr(error, "status_code", None) or getattr(error, "status", None) or getattr(getattr(error, "response", None), "status_code", None)
+    if isinstance(status, int):
+        return status == 429 or status >= 500
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError, ConnectionError, OSError)):
+        return True
+    name = type(error).__name__.lower()
+    return "timeout" in name or "connection" in name
+
+
+# Singleton registry shared by tools and LLM clients
+circuit_registry = CircuitBreakerRegistry()
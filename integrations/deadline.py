@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Awaitable, Iterator, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """The request's overall latency budget ran out (not an upstream timeout)."""
+
+
+class Deadline:
+    """Absolute point in time by which the current user request must be answered.
+
+    Created once per request and carried implicitly (``contextvars``) through the
+    agent, tools, workers and HTTP/LLM clients, which clamp their own timeouts
+    to what is left instead of each spending a full static timeout.
+    """
+
+    __slots__ = ("expires_at",)
+
+    def __init__(self, budget_ms: float, *, start: Optional[float] = None) -> None:
+        self.expires_at = (time.monotonic() if start is None else start) + float(budget_ms) / 1000
+
+    @classmethod
+    def at(cls, expires_at: float) -> "Deadline":
+        d = cls(0)
+        d.expires_at = expires_at
+        return d
+
+    def remaining_ms(self) -> float:
+        return max(0.0, (self.expires_at - time.monotonic()) * 1000)
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def clamp_ms(self, timeout_ms: float) -> int:
+        return int(max(0.0, min(float(timeout_ms), self.remaining_ms())))
+
+    def reserve(self, ms: float) -> "Deadline":
+        """A deadline ``ms`` earlier, keeping that much time back for the final answer."""
+        return Deadline.at(self.expires_at - float(ms) / 1000)
+
+    def extend(self, ms: float) -> None:
+        """Push this deadline back by ``ms`` (time the request spent waiting, not working)."""
+        self.expires_at += float(ms) / 1000
+
+    def __repr__(self) -> str:
+        return f"Deadline(remaining_ms={self.remaining_ms():.0f})"
+
+
+_current: contextvars.ContextVar[Optional[Deadline]] = contextvars.ContextVar("moviebot_deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _current.get()
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[Deadline]) -> Iterator[Optional[Deadline]]:
+    """Make ``deadline`` current for this block (and every task created inside it)."""
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+
+def clamp_timeout_ms(timeout_ms: float) -> int:
+    """``timeout_ms`` limited to the current deadline's remaining budget (unchanged without one)."""
+    d = _current.get()
+    return int(timeout_ms) if d is None else d.clamp_ms(timeout_ms)
+
+
+def clamp_timeout_s(timeout_s: float) -> float:
+    d = _current.get()
+    return float(timeout_s) if d is None else d.clamp_ms(float(timeout_s) * 1000) / 1000
+
+
+async def within_deadline(aw: Awaitable[T]) -> T:
+    """Await ``aw``, raising ``DeadlineExceeded`` if the current deadline passes first."""
+    d = _current.get()
+    if d is None:
+        return await aw
+    remaining = d.remaining_ms()
+    if remaining <= 0:
+        if asyncio.iscoroutine(aw):
+            aw.close()
+        raise DeadlineExceeded("request deadline exceeded")
+    try:
+        return await asyncio.wait_for(aw, timeout=remaining / 1000)
+    except asyncio.TimeoutError:
+        if d.expired:
+            raise DeadlineExceeded("request deadline exceeded") from None
+        raise
@@ -9,6 +9,8 @@ from pathlib import Path
 
 import aiohttp
 
+from .deadline import DeadlineExceeded, clamp_timeout_s
+
 logger = logging.getLogger(__name__)
 
 
@@ -124,7 +126,14 @@ class SharedHttpClient:
         while True:
             try:
                 t0 = time.time()
-                resp = await self._session.request(method, url, params=params, json=json, headers=headers)
+                # Within a request deadline, never wait longer than the remaining budget
+                remaining_s = clamp_timeout_s(self._cfg.total_timeout_ms / 1000.0)
+                if remaining_s <= 0:
+                    raise DeadlineExceeded(f"request deadline exceeded before {method} {url.split('?')[0]}")
+                extra: Dict[str, Any] = {}
+                if remaining_s < self._cfg.total_timeout_ms / 1000.0:
+                    extra["timeout"] = aiohttp.ClientTimeout(total=remaining_s, connect=min(remaining_s, self._cfg.connect_timeout_ms / 1000.0))
+                resp = await self._session.request(method, url, params=params, json=json, headers=headers, **extra)
                 duration_ms = int((time.time() - t0) * 1000)
                 status = resp.status
                 # Enhanced retry logic for various error conditions
@@ -141,22 +150,24 @@ class SharedHttpClient:
                     body = await resp.text()
                     self._log_req(method, url, status, duration_ms, attempt, retried=True)
                     resp.release()
-                    if attempt < self._cfg.retry_max:
-                        # Use longer backoff for rate limits
-                        backoff_delay = self._backoff(attempt)
-                        if status == 429:
-                            # Rate limit backoff - use longer delay
-                            backoff_delay = min(backoff_delay * 2, 10.0)  # Cap at 10 seconds
+                    # Use longer backoff for rate limits
+                    backoff_delay = self._backoff(attempt)
+                    if status == 429:
+                        # Rate limit backoff - use longer delay
+                        backoff_delay = min(backoff_delay * 2, 10.0)  # Cap at 10 seconds
+                    if attempt < self._cfg.retry_max and clamp_timeout_s(backoff_delay) >= backoff_delay:
                         await asyncio.sleep(backoff_delay)
                         attempt += 1
                         continue
                     raise aiohttp.ClientResponseError(resp.request_info, resp.history, status=status, message=body)
                 self._log_req(method, url, status, duration_ms, attempt, retried=False)
                 return resp
+            except DeadlineExceeded:
+                raise
             except (aiohttp.ClientError, asyncio.TimeoutError) as e:
                 last_exc = e
                 retriable = method.upper() in allow_retry_on_methods
-                if retriable and attempt < self._cfg.retry_max:
+                if retriable and attempt < self._cfg.retry_max and clamp_timeout_s(self._backoff(attempt)) >= self._backoff(attempt):
                     self._log_req(method, url, -1, int((time.time() - start) * 1000), attempt, retried=True, error=str(e))
                     await asyncio.sleep(self._backoff(attempt))
                     attempt += 1
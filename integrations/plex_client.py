@@ -1,12 +1,22 @@
 from __future__ import annotations
 
-from typing import Any, List, Dict, Optional, Literal, Set
+import re
+from contextlib import contextmanager
+from typing import Any, Iterator, List, Dict, Optional, Literal, Set
 from urllib.parse import urlparse
 from enum import Enum
 
+from plexapi.base import PlexPartialObject
 from plexapi.server import PlexServer
 from plexapi.library import MovieSection, ShowSection
 
+from .plex_index import PlexLibraryIndex
+
+
+# Items built from /library/metadata/<key[,key...]> carry every field DETAILED reads
+_METADATA_PATH = re.compile(r"^/library/metadata/\d+(,\d+)*$")
+_BULK_FETCH_SIZE = 100
+
 
 class ResponseLevel(Enum):
     """Response detail levels to control context usage."""
@@ -26,6 +36,8 @@ class PlexClient:
     - COMPACT: Key fields for browsing (title, year, rating, ratingKey) - ~40% context reduction  
     - STANDARD: Common fields (title, year, rating, genres, summary) - ~20% context reduction
     - DETAILED: All available fields (current behavior)
+    - Serialization never lets plexapi reload items one by one: DETAILED pages fetch
+      the full metadata of all partial items in comma-joined batches first
     
     Usage:
         # Default compact responses for efficiency
@@ -38,12 +50,20 @@ class PlexClient:
         overview = client.get_minimal_library_overview()
     """
 
-    def __init__(self, base_url: str, token: str, default_response_level: ResponseLevel = ResponseLevel.COMPACT):
+    def __init__(
+        self,
+        base_url: str,
+        token: str,
+        default_response_level: ResponseLevel = ResponseLevel.COMPACT,
+        library_index: Optional[PlexLibraryIndex] = None,
+    ):
         if not token or token.strip() == "":
             raise ValueError("PLEX_TOKEN is missing. Set it in your .env via the setup wizard.")
         normalized = self._normalize_base_url(base_url)
         self.plex: PlexServer = PlexServer(normalized, token)
         self.default_response_level = default_response_level
+        # Optional local index answering filtered searches without a server round trip
+        self.library_index = library_index
 
     def set_response_level(self, level: ResponseLevel) -> None:
         """Dynamically change the default response level for all subsequent calls."""
@@ -173,7 +193,17 @@ class PlexClient:
           multiple filtered calls and union within the category, then AND'ed across categories
           via set intersection to minimize client-side work while keeping filtering on server.
         - Sorting and limiting are applied on the server when possible.
+        - With a ready ``library_index`` the whole query is answered locally instead.
         """
+        if self.library_index is not None:
+            indexed = self._search_index(
+                title, year_min=year_min, year_max=year_max, genres=genres, actors=actors, directors=directors,
+                content_rating=content_rating, rating_min=rating_min, rating_max=rating_max,
+                sort_by=sort_by, sort_order=sort_order, limit=limit, response_level=response_level,
+            )
+            if indexed is not None:
+                return indexed
+
         section = self.get_movie_library()
 
         # Build base filters
@@ -261,6 +291,63 @@ class PlexClient:
 
         return self._serialize_items(items, response_level)
 
+    def _search_index(
+        self,
+        title: Optional[str],
+        *,
+        genres: Optional[List[str]],
+        actors: Optional[List[str]],
+        directors: Optional[List[str]],
+        sort_by: Optional[str],
+        sort_order: Optional[str],
+        limit: int,
+        response_level: Optional[ResponseLevel],
+        **filters: Any,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Answer search_movies_filtered from the local index; None means use the server.
+
+        A stale index is rebuilt in the background while the current one keeps serving;
+        before the first build completes, searches go to the server.
+        """
+        index = self.library_index
+        if index is None:
+            return None
+        if index.stale:
+            index.rebuild_in_background(self.plex)
+        if not index.ready:
+            return None
+        level = response_level or self.default_response_level
+        try:
+            section = self.get_movie_library()
+            tags = {
+                "genre": [str(g).strip() for g in (genres or []) if str(g).strip()],
+                "actor": [str(a).strip() for a in (actors or []) if str(a).strip()],
+                "director": [str(d).strip() for d in (directors or []) if str(d).strip()],
+            }
+            for field, values in tags.items():
+                for value in index.incomplete(field, values):
+                    index.fetch_posting(self.plex, "movie", field, value)
+            rows = index.search(
+                "movie",
+                section_id=int(section.key),
+                title=title,
+                tags=tags,
+                sort_by=self._map_sort_key(sort_by),
+                descending=str(sort_order or "asc").lower() != "asc",
+                limit=limit,
+                **filters,
+            )
+        except Exception:
+            return None
+        if level != ResponseLevel.DETAILED:
+            return [index.item(row, level.value) for row in rows]
+        keys = [index.rating_key[row] for row in rows]
+        if not keys:
+            return []
+        # Detailed fields are not indexed: fetch the page's items in bulk
+        by_key = self._fetch_full(keys)
+        return self._serialize_items([by_key[k] for k in keys if k in by_key], level)
+
     def _search_with_intersection(
         self, 
         section: Any, 
@@ -314,11 +401,12 @@ class PlexClient:
 
         if current_ids:
             items = [id_to_item[rk] for rk in current_ids if rk in id_to_item]
-            # Ensure deterministic ordering client-side if needed
-            try:
-                items.sort(key=lambda x: getattr(x, sort_key, getattr(x, "title", "")), reverse=(direction == "desc"))
-            except Exception:
-                items.sort(key=lambda x: getattr(x, "title", ""), reverse=(direction == "desc"))
+            # Ensure deterministic ordering client-side if needed (a missing sort value must not reload each item)
+            with self._no_reload(items):
+                try:
+                    items.sort(key=lambda x: getattr(x, sort_key, getattr(x, "title", "")), reverse=(direction == "desc"))
+                except Exception:
+                    items.sort(key=lambda x: getattr(x, "title", ""), reverse=(direction == "desc"))
             return items[:limit]
         else:
             return []
@@ -519,10 +607,62 @@ class PlexClient:
         except Exception:
             return None
 
+    @staticmethod
+    @contextmanager
+    def _no_reload(items: List[Any]) -> Iterator[None]:
+        """Read attributes of plexapi items as loaded, without per-item reloads for missing values."""
+        saved = []
+        for item in items:
+            if isinstance(item, PlexPartialObject):
+                saved.append((item, item._autoReload))
+                item._autoReload = False
+        try:
+            yield
+        finally:
+            for item, auto in saved:
+                item._autoReload = auto
+
+    @staticmethod
+    def _is_full(item: Any) -> bool:
+        if not isinstance(item, PlexPartialObject):
+            return True
+        try:
+            return item.isFullObject() or bool(_METADATA_PATH.match(urlparse(item._initpath or "").path))
+        except Exception:
+            return True
+
+    def _fetch_full(self, rating_keys: List[int]) -> Dict[int, Any]:
+        """Full metadata for many items via comma-joined /library/metadata requests."""
+        out: Dict[int, Any] = {}
+        for n in range(0, len(rating_keys), _BULK_FETCH_SIZE):
+            chunk = [int(k) for k in rating_keys[n : n + _BULK_FETCH_SIZE]]
+            for item in self.plex.fetchItems(chunk, container_size=len(chunk)):
+                out[int(item.ratingKey)] = item
+        return out
+
+    def _hydrate(self, items: List[Any], level: ResponseLevel) -> List[Any]:
+        """Swap partial listing items for full ones when the level needs detail-only fields."""
+        if level != ResponseLevel.DETAILED:
+            return items
+        partial = [int(item.ratingKey) for item in items if not self._is_full(item) and getattr(item, "ratingKey", None) is not None]
+        if not partial:
+            return items
+        try:
+            full = self._fetch_full(partial)
+        except Exception:
+            return items
+        return [full.get(int(item.ratingKey), item) if not self._is_full(item) else item for item in items]
+
     def _serialize_items(self, items: List[Any], response_level: Optional[ResponseLevel] = None) -> List[Dict[str, Any]]:
-        """Serialize a list of Plex items to dictionaries with configurable detail level."""
+        """Serialize a list of Plex items to dictionaries with configurable detail level.
+
+        Listings already carry every MINIMAL/COMPACT/STANDARD field; DETAILED swaps in
+        bulk-fetched full items. Either way no item is reloaded on its own.
+        """
         level = response_level or self.default_response_level
-        return [self._serialize_item(item, level) for item in items]
+        items = self._hydrate(list(items), level)
+        with self._no_reload(items):
+            return [self._serialize_item(item, level) for item in items]
 
     def _serialize_item(self, item: Any, response_level: Optional[ResponseLevel] = None) -> Dict[str, Any]:
         """Serialize a single Plex item to a dictionary with configurable detail level."""
@@ -0,0 +1,519 @@
+from __future__ import annotations
+
+import heapq
+import logging
+import threading
+import time
+import xml.etree.ElementTree as ET
+from array import array
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+# Listing elements that carry tags, and the Plex filter field each one feeds
+_TAG_ELEMENTS = {"Genre": "genre", "Role": "actor", "Director": "director", "Collection": "collection", "Label": "label", "Country": "country"}
+TAG_FIELDS = tuple(_TAG_ELEMENTS.values())
+_KINDS = {"movie": 0, "show": 1}
+_PLEX_TYPES = {"movie": 1, "show": 2}
+_HEIGHTS = {"8k": 4320, "4k": 2160, "2160": 2160, "1080": 1080, "720": 720, "576": 576, "480": 480, "sd": 480}
+_HDR_MARKERS = ("hdr", "dolby vision", "dovi", "hlg", "smpte2084", "pq")
+# Sort names PlexClient accepts (after _map_sort_key) -> column
+_SORT_COLUMNS = {
+    "titleSort": "title_sort",
+    "title": "title_sort",
+    "year": "year",
+    "rating": "rating",
+    "contentRating": "content_rating",
+    "duration": "duration",
+    "addedAt": "added_at",
+    "updatedAt": "updated_at",
+    "lastViewedAt": "last_viewed_at",
+}
+
+
+def _int(raw: Optional[str], default: int = 0) -> int:
+    try:
+        return int(raw) if raw not in (None, "") else default
+    except ValueError:
+        try:
+            return int(float(raw))  # type: ignore[arg-type]
+        except Exception:
+            return default
+
+
+def _float(raw: Optional[str], default: float = -1.0) -> float:
+    try:
+        return float(raw) if raw not in (None, "") else default
+    except ValueError:
+        return default
+
+
+def _height(resolution: Optional[str], media: Optional[ET.Element]) -> int:
+    h = _HEIGHTS.get((resolution or "").lower())
+    if h is None and media is not None:
+        h = _int(media.get("height"))
+    return h or 0
+
+
+def _has_hdr(media: Optional[ET.Element]) -> bool:
+    if media is None:
+        return False
+    if any(m in (media.get("videoDynamicRange") or "").lower() for m in _HDR_MARKERS) or (media.get("hdr") or "").lower() in ("1", "true"):
+        return True
+    for stream in media.iter("Stream"):
+        if stream.get("DOVIPresent") in ("1", "true") or any(m in " ".join(stream.attrib.values()).lower() for m in _HDR_MARKERS):
+            return True
+    return False
+
+
+def parse_item(el: ET.Element) -> Optional[Dict[str, Any]]:
+    """One movie/show element of a listing as index fields (None for other types)."""
+    kind = el.get("type")
+    if kind not in _KINDS or not el.get("ratingKey"):
+        return None
+    media = el.find("Media")
+    resolution = media.get("videoResolution") if media is not None else None
+    tags: Dict[str, List[str]] = {f: [] for f in TAG_FIELDS}
+    for child in el:
+        field = _TAG_ELEMENTS.get(child.tag)
+        name = child.get("tag")
+        if field and name:
+            tags[field].append(name)
+    title = el.get("title") or ""
+    return {
+        "rating_key": _int(el.get("ratingKey")),
+        "kind": kind,
+        "section_id": _int(el.get("librarySectionID")),
+        "title": title,
+        "title_sort": (el.get("titleSort") or title).lower(),
+        "year": _int(el.get("year")),
+        "rating": _float(el.get("rating")),
+        "content_rating": el.get("contentRating") or "",
+        "duration": _int(el.get("duration")),
+        "added_at": _int(el.get("addedAt")),
+        "updated_at": _int(el.get("updatedAt")),
+        "last_viewed_at": _int(el.get("lastViewedAt")),
+        "summary": el.get("summary") or "",
+        "resolution": resolution or "",
+        "height": _height(resolution, media),
+        "hdr": _has_hdr(media),
+        "video_codec": media.get("videoCodec") if media is not None else None,
+        "audio_codec": media.get("audioCodec") if media is not None else None,
+        "tags": tags,
+    }
+
+
+class PlexLibraryIndex:
+    """In-memory columnar index of a Plex server's movies and shows.
+
+    - Numeric fields (year, rating, duration, addedAt/updatedAt/lastViewedAt,
+      resolution height, HDR) live in ``array`` columns indexed by row; titles,
+      content rating and media info in parallel lists
+    - Genres, actors, directors, collections, labels and countries are inverted
+      postings (lowercased tag -> row set): OR within a field is a set union,
+      AND across fields an intersection
+    - Sorted row orders per sort column are built lazily and reused until the
+      next change, so a top-N walks at most as many rows as it has to reject
+    - Listings return partial tags (the first genres and top-billed cast), so a
+      tag value is completed once from the server the first time it is queried
+      (``complete_posting``) and is exact from then on
+    - ``load`` rebuilds from section listings; ``upsert``/``remove`` change single
+      items, for callers that keep the index in sync incrementally
+    """
+
+    def __init__(self, max_age_s: float = 900.0) -> None:
+        self.max_age_s = float(max_age_s)
+        self.built_at: Optional[float] = None
+        self.version = 0
+        self._lock = threading.RLock()
+        self._building = False
+        self._log = logging.getLogger("moviebot.plex.index")
+        self._reset()
+
+    def _reset(self) -> None:
+        self.rating_key = array("q")
+        self.kind = bytearray()
+        self.alive = bytearray()
+        self.section_id = array("i")
+        self.year = array("i")
+        self.rating = array("d")
+        self.duration = array("q")
+        self.added_at = array("q")
+        self.updated_at = array("q")
+        self.last_viewed_at = array("q")
+        self.height = array("i")
+        self.hdr = bytearray()
+        self.title: List[str] = []
+        self.title_sort: List[str] = []
+        self.content_rating: List[str] = []
+        self.summary: List[str] = []
+        self.resolution: List[str] = []
+        self.video_codec: List[Optional[str]] = []
+        self.audio_codec: List[Optional[str]] = []
+        self.tags: List[Dict[str, List[str]]] = []
+        self._rows: Dict[int, int] = {}
+        self._postings: Dict[str, Dict[str, Set[int]]] = {f: {} for f in TAG_FIELDS}
+        self._complete: Set[Tuple[str, str]] = set()
+        self._choices: Dict[Tuple[int, str], Dict[str, str]] = {}
+        self._orders: Dict[str, List[int]] = {}
+        self._live = 0
+
+    # ------------------------------------------------------------ state
+
+    @property
+    def ready(self) -> bool:
+        return self.built_at is not None
+
+    @property
+    def stale(self) -> bool:
+        return self.built_at is None or time.monotonic() - self.built_at > self.max_age_s
+
+    def __len__(self) -> int:
+        return self._live
+
+    def section_stamps(self, section_id: int) -> Dict[int, int]:
+        """ratingKey -> updatedAt of every live item in a section."""
+        with self._lock:
+            sid = int(section_id)
+            return {self.rating_key[r]: self.updated_at[r] for r in range(len(self.kind)) if self.alive[r] and self.section_id[r] == sid}
+
+    def max_stamp(self) -> int:
+        """Newest addedAt/updatedAt in the index (0 when empty): the starting sync watermark."""
+        with self._lock:
+            return max(max(self.updated_at, default=0), max(self.added_at, default=0))
+
+    def row_for(self, rating_key: int) -> Optional[int]:
+        with self._lock:
+            r = self._rows.get(int(rating_key))
+            return r if r is not None and self.alive[r] else None
+
+    # -------------------------------------------------------- mutation
+
+    def _index_tags(self, row: int, tags: Dict[str, List[str]]) -> None:
+        for field, names in tags.items():
+            postings = self._postings[field]
+            for name in names:
+                postings.setdefault(name.lower(), set()).add(row)
+
+    def _unindex_tags(self, row: int) -> None:
+        for field, names in self.tags[row].items():
+            postings = self._postings[field]
+            for name in names:
+                rows = postings.get(name.lower())
+                if rows is not None:
+                    rows.discard(row)
+
+    def _append(self, item: Dict[str, Any]) -> int:
+        row = len(self.rating_key)
+        self.rating_key.append(item["rating_key"])
+        self.kind.append(_KINDS[item["kind"]])
+        self.alive.append(1)
+        self.section_id.append(item["section_id"])
+        self.year.append(item["year"])
+        self.rating.append(item["rating"])
+        self.duration.append(item["duration"])
+        self.added_at.append(item["added_at"])
+        self.updated_at.append(item["updated_at"])
+        self.last_viewed_at.append(item["last_viewed_at"])
+        self.height.append(item["height"])
+        self.hdr.append(1 if item["hdr"] else 0)
+        self.title.append(item["title"])
+        self.title_sort.append(item["title_sort"])
+        self.content_rating.append(item["content_rating"])
+        self.summary.append(item["summary"])
+        self.resolution.append(item["resolution"])
+        self.video_codec.append(item["video_codec"])
+        self.audio_codec.append(item["audio_codec"])
+        self.tags.append({f: list(v) for f, v in item["tags"].items()})
+        self._rows[item["rating_key"]] = row
+        self._index_tags(row, item["tags"])
+        self._live += 1
+        return row
+
+    def _overwrite(self, row: int, item: Dict[str, Any]) -> None:
+        self._unindex_tags(row)
+        if not self.alive[row]:
+            self.alive[row] = 1
+            self._live += 1
+        self.kind[row] = _KINDS[item["kind"]]
+        for col in ("section_id", "year", "rating", "duration", "added_at", "updated_at", "last_viewed_at", "height",
+                    "title", "title_sort", "content_rating", "summary", "resolution", "video_codec", "audio_codec"):
+            getattr(self, col)[row] = item[col]
+        self.hdr[row] = 1 if item["hdr"] else 0
+        # A listing may omit tags the row really has (completed earlier): those postings
+        # lose their completeness and are fetched again on next use
+        for field, names in self.tags[row].items():
+            kept = {n.lower() for n in item["tags"].get(field, [])}
+            for name in names:
+                if name.lower() not in kept:
+                    self._complete.discard((field, name.lower()))
+        self.tags[row] = {f: list(v) for f, v in item["tags"].items()}
+        self._index_tags(row, self.tags[row])
+
+    def load(self, items: Iterable[Dict[str, Any]]) -> int:
+        """Replace the whole index with ``items`` (``parse_item`` dicts); returns the row count."""
+        with self._lock:
+            self._reset()
+            for item in items:
+                if item["rating_key"] in self._rows:
+                    self._overwrite(self._rows[item["rating_key"]], item)
+                else:
+                    self._append(item)
+            self.built_at = time.monotonic()
+            self.version += 1
+            return self._live
+
+    def upsert(self, item: Dict[str, Any]) -> None:
+        with self._lock:
+            row = self._rows.get(item["rating_key"])
+            if row is None:
+                self._append(item)
+            else:
+                self._overwrite(row, item)
+            self._orders.clear()
+            self.version += 1
+
+    def remove(self, rating_key: int) -> bool:
+        with self._lock:
+            row = self._rows.get(int(rating_key))
+            if row is None or not self.alive[row]:
+                return False
+            self._unindex_tags(row)
+            self.alive[row] = 0
+            self._live -= 1
+            self._orders.clear()
+            self.version += 1
+            return True
+
+    def touch(self) -> None:
+        """Mark the index fresh without reloading (an incremental sync just caught up)."""
+        with self._lock:
+            self.built_at = time.monotonic()
+
+    # ------------------------------------------------------ completion
+
+    def incomplete(self, field: str, values: Iterable[str]) -> List[str]:
+        with self._lock:
+            return [v for v in values if (field, str(v).lower()) not in self._complete]
+
+    def complete_posting(self, field: str, value: str, rating_keys: Optional[Iterable[int]]) -> None:
+        """Record the server's full member list for a tag (None: the server has no such tag)."""
+        name = str(value)
+        key = name.lower()
+        with self._lock:
+            postings = self._postings[field].setdefault(key, set())
+            for rk in rating_keys or ():
+                row = self._rows.get(int(rk))
+                if row is None or row in postings:
+                    continue
+                postings.add(row)
+                if all(t.lower() != key for t in self.tags[row][field]):
+                    self.tags[row][field].append(name)
+            self._complete.add((field, key))
+
+    # ----------------------------------------------------------- query
+
+    def _order(self, column: str) -> List[int]:
+        order = self._orders.get(column)
+        if order is None:
+            col = getattr(self, column)
+            ts = self.title_sort
+            order = sorted(range(len(col)), key=lambda r: (col[r], ts[r]))
+            self._orders[column] = order
+        return order
+
+    def _tag_rows(self, field: str, values: List[str]) -> Set[int]:
+        postings = self._postings[field]
+        out: Set[int] = set()
+        for v in values:
+            out |= postings.get(str(v).lower(), set())
+        return out
+
+    def search(
+        self,
+        kind: str = "movie",
+        *,
+        section_id: Optional[int] = None,
+        title: Optional[str] = None,
+        year_min: Optional[int] = None,
+        year_max: Optional[int] = None,
+        rating_min: Optional[float] = None,
+        rating_max: Optional[float] = None,
+        content_rating: Optional[str] = None,
+        min_height: Optional[int] = None,
+        hdr: Optional[bool] = None,
+        tags: Optional[Dict[str, List[str]]] = None,
+        sort_by: str = "titleSort",
+        descending: bool = False,
+        limit: int = 20,
+    ) -> List[int]:
+        """Rows matching every filter (tag lists OR'ed within a field), sorted, at most ``limit``."""
+        code = _KINDS[kind]
+        column = _SORT_COLUMNS.get(sort_by, "title_sort")
+        with self._lock:
+            candidates: Optional[Set[int]] = None
+            for field, values in (tags or {}).items():
+                if not values:
+                    continue
+                rows = self._tag_rows(field, values)
+                candidates = rows if candidates is None else candidates & rows
+                if not candidates:
+                    return []
+
+            preds: List[Callable[[int], bool]] = []
+            if section_id is not None:
+                preds.append(lambda r: self.section_id[r] == int(section_id))  # type: ignore[arg-type]
+            if title:
+                needle = title.lower()
+                preds.append(lambda r: needle in self.title[r].lower())
+            if year_min is not None:
+                preds.append(lambda r: self.year[r] >= int(year_min))  # type: ignore[arg-type]
+            if year_max is not None:
+                preds.append(lambda r: 0 < self.year[r] <= int(year_max))  # type: ignore[arg-type]
+            if rating_min is not None:
+                preds.append(lambda r: self.rating[r] >= float(rating_min))  # type: ignore[arg-type]
+            if rating_max is not None:
+                preds.append(lambda r: 0 <= self.rating[r] <= float(rating_max))  # type: ignore[arg-type]
+            if content_rating:
+                wanted = content_rating.lower()
+                preds.append(lambda r: self.content_rating[r].lower() == wanted)
+            if min_height:
+                preds.append(lambda r: self.height[r] >= int(min_height))  # type: ignore[arg-type]
+            if hdr is not None:
+                preds.append(lambda r: bool(self.hdr[r]) == bool(hdr))
+
+            alive, kinds = self.alive, self.kind
+
+            def ok(r: int) -> bool:
+                return alive[r] and kinds[r] == code and all(p(r) for p in preds)
+
+            limit = max(0, int(limit))
+            if candidates is not None and len(candidates) * 8 < max(1, self._live):
+                # Selective tag filter: rank the few candidates directly
+                col, ts = getattr(self, column), self.title_sort
+                rows = [r for r in candidates if ok(r)]
+                pick = heapq.nlargest if descending else heapq.nsmallest
+                return pick(limit, rows, key=lambda r: (col[r], ts[r]))
+            out: List[int] = []
+            order = self._order(column)
+            for r in (reversed(order) if descending else order):
+                if (candidates is None or r in candidates) and ok(r):
+                    out.append(r)
+                    if len(out) >= limit:
+                        break
+            return out
+
+    # ---------------------------------------------------------- output
+
+    def item(self, row: int, detail: str = "compact") -> Dict[str, Any]:
+        """A row shaped like ``PlexClient._serialize_item`` at minimal/compact/standard detail."""
+        with self._lock:
+            kind = "movie" if self.kind[row] == _KINDS["movie"] else "show"
+            if detail == "minimal":
+                return {"title": self.title[row], "ratingKey": self.rating_key[row], "type": kind}
+            rating = self.rating[row] if self.rating[row] >= 0 else None
+            year = self.year[row] or None
+            if detail == "compact":
+                return {"title": self.title[row], "year": year, "rating": rating, "ratingKey": self.rating_key[row], "type": kind}
+            data: Dict[str, Any] = {
+                "title": self.title[row],
+                "year": year,
+                "ratingKey": self.rating_key[row],
+                "rating": rating,
+                "contentRating": self.content_rating[row] or None,
+                "duration": self.duration[row] or None,
+                "genres": list(self.tags[row]["genre"]),
+                "summary": self.summary[row] or None,
+                "type": kind,
+            }
+            if self.resolution[row]:
+                data["videoResolution"] = self.resolution[row]
+            if self.video_codec[row] is not None:
+                data["videoCodec"] = self.video_codec[row]
+            if self.audio_codec[row] is not None:
+                data["audioCodec"] = self.audio_codec[row]
+            return data
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "items": self._live,
+                "movies": sum(1 for r in range(len(self.kind)) if self.alive[r] and self.kind[r] == 0),
+                "shows": sum(1 for r in range(len(self.kind)) if self.alive[r] and self.kind[r] == 1),
+                "tags": {f: len(p) for f, p in self._postings.items()},
+                "completed_tags": len(self._complete),
+                "age_s": round(time.monotonic() - self.built_at, 1) if self.built_at is not None else None,
+                "version": self.version,
+            }
+
+    # --------------------------------------------------- server access
+
+    def rebuild(self, server: Any) -> int:
+        """Reload every movie and show section with one listing request per section."""
+        t0 = time.monotonic()
+        items: List[Dict[str, Any]] = []
+        for section in server.library.sections():
+            if getattr(section, "type", None) not in _PLEX_TYPES:
+                continue
+            root = server.query(f"/library/sections/{section.key}/all?type={_PLEX_TYPES[section.type]}")
+            for el in root:
+                item = parse_item(el)
+                if item is not None:
+                    item["section_id"] = item["section_id"] or _int(str(section.key))
+                    items.append(item)
+        count = self.load(items)
+        self._log.info("plex index rebuilt", extra={"items": count, "duration_ms": int((time.monotonic() - t0) * 1000)})
+        return count
+
+    def rebuild_in_background(self, server: Any) -> bool:
+        """Start a rebuild on a daemon thread unless one is running; queries keep using the current data."""
+        with self._lock:
+            if self._building:
+                return False
+            self._building = True
+
+        def run() -> None:
+            try:
+                self.rebuild(server)
+            except Exception as e:
+                self._log.warning(f"plex index rebuild failed: {e}")
+            finally:
+                with self._lock:
+                    self._building = False
+
+        threading.Thread(target=run, name="plex-index-rebuild", daemon=True).start()
+        return True
+
+    def fetch_posting(self, server: Any, kind: str, field: str, value: str) -> None:
+        """Complete one tag's posting from the server: resolve its id in each section, list its members."""
+        type_id = _PLEX_TYPES[kind]
+        with self._lock:
+            sections = sorted({self.section_id[r] for r in range(len(self.kind)) if self.alive[r] and self.kind[r] == _KINDS[kind]})
+        keys: List[int] = []
+        found = False
+        for sid in sections:
+            choices = self._choices.get((sid, field))
+            if choices is None:
+                root = server.query(f"/library/sections/{sid}/{field}?type={type_id}")
+                choices = {(d.get("title") or "").lower(): d.get("key") for d in root if d.get("key")}
+                with self._lock:
+                    self._choices[(sid, field)] = choices
+            tag_id = choices.get(str(value).lower())
+            if tag_id is None:
+                continue
+            found = True
+            root = server.query(f"/library/sections/{sid}/all?type={type_id}&{field}={tag_id}")
+            keys.extend(_int(el.get("ratingKey")) for el in root if el.get("ratingKey"))
+        self.complete_posting(field, value, keys if found else None)
+
+
+_indexes: Dict[str, PlexLibraryIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_plex_library_index(base_url: str, max_age_s: float = 900.0) -> PlexLibraryIndex:
+    """Process-wide index for one Plex server, shared by every PlexClient pointed at it."""
+    key = (base_url or "").rstrip("/")
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = PlexLibraryIndex(max_age_s)
+        return index
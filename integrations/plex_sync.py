@@ -0,0 +1,320 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import aiohttp
+from plexapi.exceptions import NotFound
+
+from .plex_index import PlexLibraryIndex, get_plex_library_index, parse_item
+from .ttl_cache import shared_cache
+
+# Plex search type ids of the sections the index mirrors
+_SECTION_TYPES = {"movie": 1, "show": 2}
+# Timeline notification states: 0 created, 5 metadata done, 9 deleted
+_CHANGED_STATES = {0, 5}
+_DELETED_STATE = 9
+_FETCH_CHUNK = 100
+
+
+@dataclass
+class SyncResult:
+    upserted: int = 0
+    removed: int = 0
+    # Sections re-listed because their item count disagreed with the index
+    relisted: int = 0
+    full: bool = False
+    duration_ms: int = 0
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.upserted or self.removed)
+
+
+def invalidate_plex_caches() -> int:
+    """Drop cached Plex reads: PlexWorker entries and stored results of Plex tools."""
+    def is_plex(key: str) -> bool:
+        if key.startswith("plex:"):
+            return True
+        return key.startswith("tool:") and "plex" in key.split(":", 2)[1]
+
+    return shared_cache.delete_where(is_plex)
+
+
+class PlexSyncEngine:
+    """Keeps a ``PlexLibraryIndex`` (and Plex read caches) in step with the server.
+
+    - ``sync_once`` pulls only items whose ``updatedAt``/``addedAt`` is past the
+      watermark, then fetches their full metadata in comma-joined batches so tag
+      postings stay exact
+    - Deletions are detected from per-section item counts (an empty page with
+      ``totalSize``); only a section whose count disagrees is re-listed and diffed
+    - ``start()`` polls every ``interval_s`` and, with ``websocket``, listens on
+      ``/:/websockets/notifications`` and applies timeline events after a short
+      debounce, so changes land within seconds without waiting for the next poll
+    - ``on_change`` callbacks run after every sync that changed the index
+    """
+
+    def __init__(
+        self,
+        server: Any,
+        index: PlexLibraryIndex,
+        *,
+        interval_s: float = 60.0,
+        websocket: bool = True,
+        debounce_s: float = 0.5,
+        overlap_s: int = 1,
+        on_change: Optional[List[Callable[[SyncResult], None]]] = None,
+    ) -> None:
+        self.server = server
+        self.index = index
+        self.interval_s = float(interval_s)
+        self.websocket = bool(websocket)
+        self.debounce_s = float(debounce_s)
+        # Plex timestamps are whole seconds: re-read the watermark second itself
+        self.overlap_s = int(overlap_s)
+        self.on_change: List[Callable[[SyncResult], None]] = list(on_change or [])
+        self.watermark = 0
+        self._sections: Optional[List[Tuple[int, str]]] = None
+        self._lock = threading.Lock()
+        self._tasks: List[asyncio.Task] = []
+        self._pending: Dict[int, bool] = {}
+        self._flush: Optional[asyncio.Task] = None
+        self._stats = {"syncs": 0, "events": 0, "upserted": 0, "removed": 0, "relisted": 0, "failures": 0, "ws_connects": 0}
+        self._log = logging.getLogger("moviebot.plex.sync")
+
+    # ------------------------------------------------------ server reads
+
+    def _section_list(self) -> List[Tuple[int, str]]:
+        if self._sections is None:
+            self._sections = [
+                (int(s.key), s.type) for s in self.server.library.sections() if getattr(s, "type", None) in _SECTION_TYPES
+            ]
+        return self._sections
+
+    def _fetch_items(self, keys: Iterable[int]) -> Tuple[List[Dict[str, Any]], Set[int]]:
+        """Full metadata for ``keys`` in comma-joined batches; also returns keys the server no longer has."""
+        wanted = sorted(set(keys))
+        items: List[Dict[str, Any]] = []
+        for n in range(0, len(wanted), _FETCH_CHUNK):
+            chunk = wanted[n : n + _FETCH_CHUNK]
+            try:
+                root = self.server.query(f"/library/metadata/{','.join(map(str, chunk))}")
+            except NotFound:
+                continue
+            for el in root:
+                item = parse_item(el)
+                if item is not None:
+                    items.append(item)
+        found = {item["rating_key"] for item in items}
+        return items, set(wanted) - found
+
+    def _count(self, section_id: int, kind: str) -> int:
+        root = self.server.query(
+            f"/library/sections/{section_id}/all?type={_SECTION_TYPES[kind]}",
+            headers={"X-Plex-Container-Start": "0", "X-Plex-Container-Size": "0"},
+        )
+        return int(root.get("totalSize") or root.get("size") or 0)
+
+    def _stamps(self, path: str) -> Dict[int, int]:
+        return {int(el.get("ratingKey")): int(el.get("updatedAt") or 0) for el in self.server.query(path) if el.get("ratingKey")}
+
+    # ------------------------------------------------------------- sync
+
+    def _apply(self, items: List[Dict[str, Any]], removed: Iterable[int], result: SyncResult) -> None:
+        for item in items:
+            self.index.upsert(item)
+            result.upserted += 1
+            self.watermark = max(self.watermark, item["updated_at"], item["added_at"])
+        for key in removed:
+            if self.index.remove(key):
+                result.removed += 1
+
+    def _finish(self, result: SyncResult, t0: float) -> SyncResult:
+        result.duration_ms = int((time.monotonic() - t0) * 1000)
+        self.index.touch()
+        self._stats["syncs"] += 1
+        self._stats["upserted"] += result.upserted
+        self._stats["removed"] += result.removed
+        self._stats["relisted"] += result.relisted
+        if result.changed:
+            self._log.info("plex sync applied", extra={
+                "upserted": result.upserted, "removed": result.removed, "relisted": result.relisted,
+                "full": result.full, "duration_ms": result.duration_ms,
+            })
+            for cb in self.on_change:
+                try:
+                    cb(result)
+                except Exception as e:
+                    self._log.warning(f"plex sync callback failed: {e}")
+        return result
+
+    def sync_once(self) -> SyncResult:
+        """One incremental pass (a full build when the index is empty). Blocking."""
+        t0 = time.monotonic()
+        with self._lock:
+            result = SyncResult()
+            if not self.index.ready:
+                result.upserted = self.index.rebuild(self.server)
+                result.full = True
+                self.watermark = self.index.max_stamp()
+                return self._finish(result, t0)
+            if not self.watermark:
+                # Index built elsewhere (a search-triggered rebuild): start from its newest item
+                self.watermark = self.index.max_stamp()
+            since = max(0, self.watermark - self.overlap_s)
+            changed: Set[int] = set()
+            for sid, kind in self._section_list():
+                t = _SECTION_TYPES[kind]
+                known = self.index.section_stamps(sid)
+                for field in ("updatedAt", "addedAt"):
+                    for key, stamp in self._stamps(f"/library/sections/{sid}/all?type={t}&{field}>>={since}").items():
+                        if known.get(key) != stamp:
+                            changed.add(key)
+            items, gone = self._fetch_items(changed)
+            self._apply(items, gone, result)
+
+            for sid, kind in self._section_list():
+                known = self.index.section_stamps(sid)
+                if self._count(sid, kind) == len(known):
+                    continue
+                # Something was deleted (or missed): diff the section's keys and stamps
+                result.relisted += 1
+                current = self._stamps(f"/library/sections/{sid}/all?type={_SECTION_TYPES[kind]}")
+                stale = [k for k, stamp in current.items() if known.get(k) != stamp]
+                items, gone = self._fetch_items(stale)
+                self._apply(items, set(known) - set(current) | gone, result)
+            return self._finish(result, t0)
+
+    def apply_events(self, keys: Dict[int, bool]) -> SyncResult:
+        """Apply notified items (ratingKey -> deleted?) without a section scan. Blocking."""
+        t0 = time.monotonic()
+        with self._lock:
+            result = SyncResult()
+            if not self.index.ready:
+                return result
+            deleted = {k for k, d in keys.items() if d}
+            items, gone = self._fetch_items(k for k, d in keys.items() if not d)
+            self._apply(items, deleted | gone, result)
+            return self._finish(result, t0)
+
+    # ------------------------------------------------------- background
+
+    def _ws_url(self) -> str:
+        base = str(getattr(self.server, "_baseurl", "")).rstrip("/")
+        return base.replace("https://", "wss://", 1).replace("http://", "ws://", 1) + "/:/websockets/notifications"
+
+    def _on_message(self, raw: str) -> None:
+        try:
+            container = json.loads(raw).get("NotificationContainer") or {}
+        except Exception:
+            return
+        if container.get("type") != "timeline":
+            return
+        for entry in container.get("TimelineEntry") or []:
+            if entry.get("identifier") not in (None, "com.plexapp.plugins.library") or int(entry.get("type") or 0) not in _SECTION_TYPES.values():
+                continue
+            state = int(entry.get("state", -1))
+            if state != _DELETED_STATE and state not in _CHANGED_STATES:
+                continue
+            try:
+                key = int(entry.get("itemID"))
+            except (TypeError, ValueError):
+                continue
+            self._stats["events"] += 1
+            self._pending[key] = state == _DELETED_STATE
+        if self._pending and (self._flush is None or self._flush.done()):
+            self._flush = asyncio.create_task(self._flush_pending())
+
+    async def _flush_pending(self) -> None:
+        # Let a burst (created + done, a whole scan) collapse into one batched fetch
+        await asyncio.sleep(self.debounce_s)
+        keys, self._pending = self._pending, {}
+        try:
+            await asyncio.to_thread(self.apply_events, keys)
+        except Exception as e:
+            self._stats["failures"] += 1
+            self._log.warning(f"plex sync event apply failed: {e}")
+
+    async def _listen(self) -> None:
+        backoff = 1.0
+        token = str(getattr(self.server, "_token", "") or "")
+        while True:
+            try:
+                async with aiohttp.ClientSession() as session:
+                    async with session.ws_connect(self._ws_url(), headers={"X-Plex-Token": token}, heartbeat=30) as ws:
+                        self._stats["ws_connects"] += 1
+                        backoff = 1.0
+                        # Anything missed while disconnected is caught up by the watermark
+                        if self._stats["ws_connects"] > 1:
+                            await asyncio.to_thread(self.sync_once)
+                        async for msg in ws:
+                            if msg.type == aiohttp.WSMsgType.TEXT:
+                                self._on_message(msg.data)
+                            elif msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                                break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._log.debug(f"plex notification socket failed: {e}")
+            await asyncio.sleep(backoff)
+            backoff = min(30.0, backoff * 2)
+
+    async def _poll(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.sync_once)
+            except Exception as e:
+                self._stats["failures"] += 1
+                self._log.warning(f"plex sync failed: {e}")
+            await asyncio.sleep(self.interval_s)
+
+    def start(self) -> None:
+        """Start polling (and the notification listener); safe to call more than once."""
+        if self._tasks:
+            return
+        self._tasks.append(asyncio.create_task(self._poll()))
+        if self.websocket:
+            self._tasks.append(asyncio.create_task(self._listen()))
+
+    async def stop(self) -> None:
+        tasks = self._tasks + ([self._flush] if self._flush is not None else [])
+        self._tasks, self._flush = [], None
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self._stats, watermark=self.watermark, index=self.index.get_stats())
+
+
+async def start_plex_sync(project_root: Path) -> Optional[PlexSyncEngine]:
+    """Start the process-wide sync for the configured server when ``plex.sync.enabled`` is set."""
+    from config.loader import load_runtime_config, load_settings
+
+    plex_cfg = load_runtime_config(project_root).get("plex", {}) or {}
+    cfg = plex_cfg.get("sync", {}) or {}
+    if not cfg.get("enabled", False):
+        return None
+    settings = load_settings(project_root)
+    from .plex_client import PlexClient
+
+    client = await asyncio.to_thread(PlexClient, settings.plex_base_url, settings.plex_token or "")
+    index = get_plex_library_index(settings.plex_base_url, float((plex_cfg.get("index", {}) or {}).get("maxAgeSec", 900)))
+    engine = PlexSyncEngine(
+        client.plex,
+        index,
+        interval_s=float(cfg.get("intervalSec", 60)),
+        websocket=bool(cfg.get("websocket", True)),
+        debounce_s=float(cfg.get("debounceMs", 500)) / 1000,
+        on_change=[lambda _result: invalidate_plex_caches()],
+    )
+    engine.start()
+    return engine
@@ -5,6 +5,8 @@ import asyncio
 
 import httpx
 
+from integrations.deadline import clamp_timeout_s, current_deadline
+
 
 class RadarrClient:
     def __init__(self, base_url: str, api_key: str):
@@ -45,9 +47,14 @@ class RadarrClient:
                         )
         return self._client
 
+    @staticmethod
+    def _deadline_timeout() -> Dict[str, Any]:
+        """Per-request timeout for the pooled client, clamped to the request deadline when one is set."""
+        return {"timeout": clamp_timeout_s(20.0)} if current_deadline() is not None else {}
+
     def _new_client(self) -> httpx.AsyncClient:
         """Legacy method for backward compatibility - prefer _get_client() for better performance."""
-        return httpx.AsyncClient(base_url=self.base_url, headers={"X-Api-Key": self.api_key}, timeout=20.0)
+        return httpx.AsyncClient(base_url=self.base_url, headers={"X-Api-Key": self.api_key}, timeout=clamp_timeout_s(20.0))
 
     def _is_movie_exists_error(self, error: httpx.HTTPStatusError) -> bool:
         """Check if the error indicates the movie already exists in Radarr."""
@@ -159,9 +166,9 @@ class RadarrClient:
         """Get movies with optimized connection pooling and caching."""
         client = await self._get_client()
         if movie_id:
-            r = await client.get(f"/api/v3/movie/{movie_id}")
+            r = await client.get(f"/api/v3/movie/{movie_id}", **self._deadline_timeout())
         else:
-            r = await client.get("/api/v3/movie")
+            r = await client.get("/api/v3/movie", **self._deadline_timeout())
         r.raise_for_status()
         return r.json()
 
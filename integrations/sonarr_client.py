@@ -4,6 +4,8 @@ from typing import Any, Dict, List, Optional, Union
 
 import httpx
 
+from integrations.deadline import clamp_timeout_s
+
 
 class SonarrClient:
     def __init__(self, base_url: str, api_key: str):
@@ -26,7 +28,7 @@ class SonarrClient:
         return httpx.AsyncClient(
             base_url=self.base_url,
             headers={"X-Api-Key": self.api_key},
-            timeout=20.0,
+            timeout=clamp_timeout_s(20.0),
         )
 
     async def close(self) -> None:
@@ -0,0 +1,36 @@
+"""Run the service stand-ins until interrupted and print the env that points the bot at them.
+
+    python -m integrations.stand_ins --scale large --faults latency_ms=20,jitter_ms=10,rate_limit_rps=40
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+
+from . import FaultProfile, LibraryScale, ServiceStandIns
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    stand_ins = ServiceStandIns(LibraryScale.parse(args.scale), FaultProfile.parse(args.faults))
+    lib = stand_ins.library
+    async with stand_ins:
+        print(f"# {lib.scale.movies} movies, {lib.scale.series} series, {lib.episode_count} episodes (seed {lib.scale.seed})")
+        for key, value in stand_ins.env().items():
+            print(f"export {key}={value}")
+        await asyncio.Event().wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve synthetic Plex/TMDb/Radarr/Sonarr stand-ins")
+    parser.add_argument("--scale", default="medium", help="small|medium|large or MOVIES:SERIES:EPISODES")
+    parser.add_argument("--faults", default="", help="e.g. latency_ms=20,jitter_ms=10,error_rate=0.01,rate_limit_rps=40")
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,459 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, Optional, Set
+
+from aiohttp import web
+
+from .base import FaultProfile, StandInService, int_param, json_response
+from .library import EPOCH, MISSING_EPISODE_EVERY, MOVIE_GENRES, TV_GENRES, SyntheticLibrary, iso_date, iso_datetime
+
+QUALITY_PROFILES = [{"id": 1, "name": "Any"}, {"id": 4, "name": "HD-1080p"}, {"id": 5, "name": "Ultra-HD"}, {"id": 6, "name": "HD - 720p/1080p"}]
+_RESOLUTION_QUALITY = {"4k": "Bluray-2160p", "1080": "Bluray-1080p", "720": "WEBDL-720p", "sd": "DVD"}
+
+
+def _missing_between(start: int, end: int) -> int:
+    """Episodes without a file among global indices [start, end); see ``SyntheticLibrary._build_episode``."""
+    return end // MISSING_EPISODE_EVERY - start // MISSING_EPISODE_EVERY
+
+
+def _slug(title: str, year: int) -> str:
+    return "-".join("".join(c if c.isalnum() else " " for c in title.lower()).split()) + f"-{year}"
+
+
+class _ArrStandIn(StandInService):
+    """Shared *arr v3 surface: ``X-Api-Key`` auth, system/profile/tag/command/queue endpoints,
+    and the ``[{propertyName, errorMessage}]`` validation error shape both apps use."""
+
+    root_folder = "/data"
+    app_name = "Arr"
+    version = "5.0.0.0"
+
+    def __init__(self, library: SyntheticLibrary, faults: Optional[FaultProfile] = None, *, api_key: str = "stand-in-arr-key", seed: int = 7) -> None:
+        super().__init__(faults, seed=seed)
+        self.library = library
+        self.api_key = api_key
+        self._tags: List[Dict[str, Any]] = [{"id": 1, "label": "kids"}, {"id": 2, "label": "4k"}]
+        self._commands: List[Dict[str, Any]] = []
+
+    def _authorized(self, request: web.Request) -> bool:
+        return (request.headers.get("X-Api-Key") or request.query.get("apikey")) == self.api_key
+
+    def _error_body(self, status: int) -> web.Response:
+        messages = {401: "Unauthorized", 404: "NotFound", 429: "Too Many Requests"}
+        return json_response({"message": messages.get(status, "Internal Server Error"), "description": f"stand-in {status}"}, status=status)
+
+    def _common_routes(self, app: web.Application) -> None:
+        r = app.router
+        r.add_get("/api/v3/system/status", self._status)
+        r.add_get("/api/v3/health", self._empty_list)
+        r.add_get("/api/v3/diskspace", self._diskspace)
+        r.add_get("/api/v3/qualityprofile", self._profiles)
+        r.add_get("/api/v3/rootfolder", self._root_folders)
+        r.add_get("/api/v3/tag", self._get_tags)
+        r.add_post("/api/v3/tag", self._create_tag)
+        r.add_delete("/api/v3/tag/{id:\\d+}", self._delete_tag)
+        r.add_get("/api/v3/command", self._get_commands)
+        r.add_post("/api/v3/command", self._post_command)
+        r.add_get("/api/v3/queue", self._queue)
+        r.add_delete("/api/v3/queue/{id:\\d+}", self._ok)
+        r.add_get("/api/v3/blocklist", self._empty_page)
+        r.add_delete("/api/v3/blocklist", self._ok)
+        r.add_delete("/api/v3/blocklist/{id:\\d+}", self._ok)
+        for name in ("importlist", "notification", "indexer", "downloadclient", "metadataprofile"):
+            r.add_get(f"/api/v3/{name}", self._empty_list)
+            r.add_post(f"/api/v3/{name}/test", self._ok)
+        for name in ("naming", "ui"):
+            r.add_get(f"/api/v3/config/{name}", self._config)
+            r.add_put(f"/api/v3/config/{name}", self._echo)
+
+    async def _status(self, request: web.Request) -> web.Response:
+        return json_response({"appName": self.app_name, "instanceName": self.app_name, "version": self.version, "isDebug": False,
+                              "isProduction": True, "startTime": iso_datetime(EPOCH - 86400), "urlBase": "", "osName": "linux"})
+
+    async def _empty_list(self, request: web.Request) -> web.Response:
+        return json_response([])
+
+    async def _empty_page(self, request: web.Request) -> web.Response:
+        return json_response({"page": 1, "pageSize": 20, "totalRecords": 0, "records": []})
+
+    async def _ok(self, request: web.Request) -> web.Response:
+        return json_response({})
+
+    async def _config(self, request: web.Request) -> web.Response:
+        return json_response({"id": 1})
+
+    async def _echo(self, request: web.Request) -> web.Response:
+        return json_response(await request.json())
+
+    async def _diskspace(self, request: web.Request) -> web.Response:
+        return json_response([{"path": self.root_folder, "label": "data", "freeSpace": 4 * 1024**4, "totalSpace": 16 * 1024**4}])
+
+    async def _profiles(self, request: web.Request) -> web.Response:
+        return json_response(QUALITY_PROFILES)
+
+    async def _root_folders(self, request: web.Request) -> web.Response:
+        return json_response([{"id": 1, "path": self.root_folder, "accessible": True, "freeSpace": 4 * 1024**4, "unmappedFolders": []}])
+
+    async def _get_tags(self, request: web.Request) -> web.Response:
+        return json_response(self._tags)
+
+    async def _create_tag(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        tag = {"id": max([t["id"] for t in self._tags] or [0]) + 1, "label": str(body.get("label", ""))}
+        self._tags.append(tag)
+        return json_response(tag, status=201)
+
+    async def _delete_tag(self, request: web.Request) -> web.Response:
+        self._tags = [t for t in self._tags if t["id"] != int(request.match_info["id"])]
+        return json_response({})
+
+    async def _get_commands(self, request: web.Request) -> web.Response:
+        return json_response(self._commands[-50:])
+
+    async def _post_command(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        cmd = {"id": len(self._commands) + 1, "name": body.get("name"), "commandName": body.get("name"), "body": body,
+               "status": "queued", "queued": iso_datetime(EPOCH), "trigger": "manual"}
+        self._commands.append(cmd)
+        return json_response(cmd, status=201)
+
+    async def _queue(self, request: web.Request) -> web.Response:
+        return json_response({"page": 1, "pageSize": 10, "totalRecords": 0, "records": []})
+
+    @staticmethod
+    def _paged(request: web.Request, records: List[Dict[str, Any]], sort_key: str) -> web.Response:
+        page = int_param(request, "page", 1, lo=1)
+        size = int_param(request, "pageSize", 20, lo=1, hi=1000)
+        start = (page - 1) * size
+        return json_response({"page": page, "pageSize": size, "sortKey": request.query.get("sortKey", sort_key),
+                              "sortDirection": request.query.get("sortDirection", "descending"),
+                              "totalRecords": len(records), "records": records[start : start + size]})
+
+    @staticmethod
+    def _validation_error(field: str, message: str, code: str) -> web.Response:
+        return json_response([{"propertyName": field, "errorMessage": message, "errorCode": code, "severity": "error"}], status=400)
+
+
+class RadarrStandIn(_ArrStandIn):
+    """Radarr v3 stand-in: the owned movies plus a monitored-but-missing tail (``wanted/missing``).
+
+    Movie ids are catalog index + 1; ``POST /movie`` adds any catalog movie and answers
+    ``MovieExistsValidator`` for ones already present, as the real server does.
+    """
+
+    name = "radarr"
+    app_name = "Radarr"
+    root_folder = "/data/movies"
+
+    def __init__(self, library: SyntheticLibrary, faults: Optional[FaultProfile] = None, *, api_key: str = "stand-in-radarr-key", seed: int = 7) -> None:
+        super().__init__(library, faults, api_key=api_key, seed=seed)
+        s = library.scale
+        self._present: Set[int] = set(range(s.movies + library.wanted_movies))
+        self._edits: Dict[int, Dict[str, Any]] = {}
+        self._list_body: Optional[bytes] = None
+
+    def _routes(self, app: web.Application) -> None:
+        self._common_routes(app)
+        r = app.router
+        r.add_get("/api/v3/movie", self._movies)
+        r.add_post("/api/v3/movie", self._add_movie)
+        r.add_get("/api/v3/movie/lookup", self._lookup)
+        r.add_get("/api/v3/movie/{id:\\d+}", self._movie)
+        r.add_put("/api/v3/movie/{id:\\d+}", self._update_movie)
+        r.add_delete("/api/v3/movie/{id:\\d+}", self._delete_movie)
+        r.add_get("/api/v3/history", self._history)
+        r.add_get("/api/v3/calendar", self._calendar)
+        r.add_get("/api/v3/wanted/missing", self._wanted)
+        r.add_get("/api/v3/wanted/cutoff", self._cutoff)
+
+    def _resource(self, i: int) -> Dict[str, Any]:
+        m = self.library.movies[i]
+        has_file = m["owned"]
+        data = {
+            "title": m["title"], "originalTitle": m["title"], "sortTitle": m["title_sort"].lower(), "year": m["year"],
+            "tmdbId": m["tmdb_id"], "imdbId": m["imdb_id"], "titleSlug": _slug(m["title"], m["year"]), "overview": m["summary"],
+            "runtime": m["runtime"], "studio": m["studio"], "certification": m["content_rating"], "status": "released",
+            "genres": [MOVIE_GENRES[g][1] for g in m["genres"]], "inCinemas": iso_datetime(m["release"]),
+            "ratings": {"tmdb": {"votes": m["vote_count"], "value": m["audience_rating"]}},
+            "images": [{"coverType": "poster", "remoteUrl": f"https://image.tmdb.org/t/p/original/p{m['tmdb_id']}.jpg"}],
+            "minimumAvailability": "released", "isAvailable": True,
+        }
+        if i in self._present:
+            data.update({
+                "id": i + 1, "monitored": True, "hasFile": has_file, "qualityProfileId": 4, "rootFolderPath": self.root_folder,
+                "path": f"{self.root_folder}/{m['title']} ({m['year']})", "added": iso_datetime(m["added_at"] or EPOCH),
+                "sizeOnDisk": m["size"] if has_file else 0, "tags": [],
+            })
+            if has_file:
+                data["movieFile"] = {"id": i + 1, "movieId": i + 1, "size": m["size"], "quality": {"quality": {"name": _RESOLUTION_QUALITY[m["resolution"]]}}}
+            data.update(self._edits.get(i, {}))
+        return data
+
+    def _index(self, request: web.Request) -> int:
+        i = int(request.match_info["id"]) - 1
+        if i not in self._present:
+            raise web.HTTPNotFound()
+        return i
+
+    async def _movies(self, request: web.Request) -> web.Response:
+        tmdb = request.query.get("tmdbId")
+        if tmdb:
+            m = self.library.movie_by_tmdb(int(tmdb))
+            return json_response([self._resource(m["i"])] if m and m["i"] in self._present else [])
+        if self._list_body is None:
+            # The full list is the biggest payload the bot fetches; serialise it once per mutation
+            self._list_body = json.dumps([self._resource(i) for i in sorted(self._present)], separators=(",", ":")).encode("utf-8")
+        return web.Response(body=self._list_body, content_type="application/json")
+
+    async def _movie(self, request: web.Request) -> web.Response:
+        return json_response(self._resource(self._index(request)))
+
+    async def _lookup(self, request: web.Request) -> web.Response:
+        term = request.query.get("term", "").strip()
+        if term.startswith("tmdb:") or term.isdigit():
+            m = self.library.movie_by_tmdb(int(term.split(":", 1)[-1]))
+            hits = [m] if m else []
+        elif term.startswith("imdb:"):
+            hits = [m for m in self.library.movies if m["imdb_id"] == term[5:]]
+        else:
+            hits = self.library.search_movies(term, owned_only=False)[:20]
+        return json_response([self._resource(m["i"]) for m in hits])
+
+    async def _add_movie(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        m = self.library.movie_by_tmdb(int(body.get("tmdbId") or 0))
+        if m is None:
+            return self._validation_error("TmdbId", "Invalid movie TMDb ID", "TmdbIdValidator")
+        if m["i"] in self._present:
+            return self._validation_error("TmdbId", "This movie has already been added", "MovieExistsValidator")
+        if body.get("qualityProfileId") not in {p["id"] for p in QUALITY_PROFILES}:
+            return self._validation_error("QualityProfileId", "Quality Profile does not exist", "QualityProfileExistsValidator")
+        self._present.add(m["i"])
+        self._edits[m["i"]] = {"monitored": bool(body.get("monitored", True)), "qualityProfileId": body["qualityProfileId"],
+                               "rootFolderPath": body.get("rootFolderPath", self.root_folder), "hasFile": False, "sizeOnDisk": 0}
+        self._list_body = None
+        return json_response(self._resource(m["i"]), status=201)
+
+    async def _update_movie(self, request: web.Request) -> web.Response:
+        i = self._index(request)
+        body = await request.json()
+        self._edits.setdefault(i, {}).update({k: v for k, v in body.items() if k in ("monitored", "qualityProfileId", "minimumAvailability", "tags", "rootFolderPath")})
+        self._list_body = None
+        return json_response(self._resource(i), status=202)
+
+    async def _delete_movie(self, request: web.Request) -> web.Response:
+        i = self._index(request)
+        self._present.discard(i)
+        self._edits.pop(i, None)
+        self._list_body = None
+        return json_response({})
+
+    async def _history(self, request: web.Request) -> web.Response:
+        movie_id = request.query.get("movieId")
+        owned = [i for i in sorted(self._present, reverse=True) if self.library.movies[i]["owned"]]
+        if movie_id:
+            owned = [i for i in owned if i + 1 == int(movie_id)]
+        records = [{"id": i + 1, "movieId": i + 1, "eventType": "downloadFolderImported", "sourceTitle": self.library.movies[i]["title"],
+                    "date": iso_datetime(self.library.movies[i]["added_at"])} for i in owned[:1000]]
+        return self._paged(request, records, "date")
+
+    async def _calendar(self, request: web.Request) -> web.Response:
+        lib = self.library
+        upcoming = [i for i in sorted(self._present) if not lib.movies[i]["owned"]][:25]
+        return json_response([self._resource(i) for i in upcoming])
+
+    async def _wanted(self, request: web.Request) -> web.Response:
+        missing = [self._resource(i) for i in sorted(self._present) if not self.library.movies[i]["owned"]]
+        return self._paged(request, missing, "releaseDate")
+
+    async def _cutoff(self, request: web.Request) -> web.Response:
+        lib = self.library
+        unmet = [self._resource(i) for i in sorted(self._present) if lib.movies[i]["owned"] and lib.movies[i]["resolution"] == "sd"]
+        return self._paged(request, unmet, "releaseDate")
+
+
+class SonarrStandIn(_ArrStandIn):
+    """Sonarr v3 stand-in: owned series with every episode (one in ``MISSING_EPISODE_EVERY`` has
+    no file, which is what ``wanted/missing`` pages over). Series ids are catalog index + 1,
+    episode ids are global episode index + 1.
+    """
+
+    name = "sonarr"
+    app_name = "Sonarr"
+    version = "4.0.0.0"
+    root_folder = "/data/tv"
+
+    def __init__(self, library: SyntheticLibrary, faults: Optional[FaultProfile] = None, *, api_key: str = "stand-in-sonarr-key", seed: int = 7) -> None:
+        super().__init__(library, faults, api_key=api_key, seed=seed)
+        self._present: Set[int] = set(range(library.scale.series))
+        self._edits: Dict[int, Dict[str, Any]] = {}
+        self._episode_monitored: Dict[int, bool] = {}
+        self._missing: Optional[List[int]] = None
+
+    def _routes(self, app: web.Application) -> None:
+        self._common_routes(app)
+        r = app.router
+        r.add_get("/api/v3/series", self._series_list)
+        r.add_post("/api/v3/series", self._add_series)
+        r.add_get("/api/v3/series/lookup", self._lookup)
+        r.add_get("/api/v3/series/{id:\\d+}", self._series)
+        r.add_put("/api/v3/series/{id:\\d+}", self._update_series)
+        r.add_delete("/api/v3/series/{id:\\d+}", self._delete_series)
+        r.add_get("/api/v3/episode", self._episodes)
+        r.add_put("/api/v3/episode", self._update_episodes)
+        r.add_get("/api/v3/episodefile/{id:\\d+}", self._episode_file)
+        r.add_get("/api/v3/history", self._history)
+        r.add_get("/api/v3/calendar", self._calendar)
+        r.add_get("/api/v3/wanted/missing", self._wanted)
+        r.add_get("/api/v3/wanted/cutoff", self._empty_page)
+
+    def _resource(self, j: int) -> Dict[str, Any]:
+        lib = self.library
+        s = lib.series[j]
+        have = s["episodes"] - _missing_between(s["ep_start"], s["ep_start"] + s["episodes"]) if s["owned"] else 0
+        seasons = [{"seasonNumber": n + 1, "monitored": True, "statistics": {"episodeCount": size, "totalEpisodeCount": size}}
+                   for n, size in enumerate(s["seasons"])]
+        data = {
+            "title": s["title"], "sortTitle": s["title_sort"].lower(), "year": s["year"], "tvdbId": s["tvdb_id"],
+            "tmdbId": s["tmdb_id"], "imdbId": s["imdb_id"], "titleSlug": _slug(s["title"], s["year"]), "overview": s["summary"],
+            "network": s["network"], "status": s["status"].lower(), "runtime": s["runtime"], "certification": s["content_rating"],
+            "genres": [TV_GENRES[g][1] for g in s["genres"]], "firstAired": iso_datetime(s["first_air"]), "seasons": seasons,
+            "ratings": {"votes": s["vote_count"], "value": s["rating"]}, "seriesType": "standard",
+            "images": [{"coverType": "poster", "remoteUrl": f"https://artworks.thetvdb.com/banners/posters/{s['tvdb_id']}.jpg"}],
+        }
+        if j in self._present:
+            data.update({
+                "id": j + 1, "monitored": True, "seasonFolder": True, "qualityProfileId": 4, "rootFolderPath": self.root_folder,
+                "path": f"{self.root_folder}/{s['title']}", "added": iso_datetime(s["added_at"] or EPOCH), "tags": [],
+                "statistics": {"seasonCount": len(s["seasons"]), "episodeCount": s["episodes"], "episodeFileCount": have,
+                               "totalEpisodeCount": s["episodes"], "percentOfEpisodes": round(100.0 * have / max(1, s["episodes"]), 1)},
+            })
+            data.update(self._edits.get(j, {}))
+        return data
+
+    def _index(self, request: web.Request) -> int:
+        j = int(request.match_info["id"]) - 1
+        if j not in self._present:
+            raise web.HTTPNotFound()
+        return j
+
+    def _episode_resource(self, e: Dict[str, Any]) -> Dict[str, Any]:
+        g = e["g"]
+        return {
+            "id": g + 1, "seriesId": e["show"]["j"] + 1, "tvdbId": 9_000_000 + g, "seasonNumber": e["season"], "episodeNumber": e["index"],
+            "title": e["title"], "overview": e["summary"], "airDate": iso_date(e["aired"]), "airDateUtc": iso_datetime(e["aired"]),
+            "runtime": e["duration"] // 60_000, "hasFile": e["has_file"], "episodeFileId": g + 1 if e["has_file"] else 0,
+            "monitored": self._episode_monitored.get(g, True),
+        }
+
+    async def _series_list(self, request: web.Request) -> web.Response:
+        tvdb = request.query.get("tvdbId")
+        if tvdb:
+            s = self.library.show_by_tvdb(int(tvdb))
+            return json_response([self._resource(s["j"])] if s and s["j"] in self._present else [])
+        return json_response([self._resource(j) for j in sorted(self._present)])
+
+    async def _series(self, request: web.Request) -> web.Response:
+        return json_response(self._resource(self._index(request)))
+
+    async def _lookup(self, request: web.Request) -> web.Response:
+        term = request.query.get("term", "").strip()
+        if term.startswith("tvdb:") or term.isdigit():
+            s = self.library.show_by_tvdb(int(term.split(":", 1)[-1]))
+            hits = [s] if s else []
+        else:
+            hits = self.library.search_series(term, owned_only=False)[:20]
+        return json_response([self._resource(s["j"]) for s in hits])
+
+    async def _add_series(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        s = self.library.show_by_tvdb(int(body.get("tvdbId") or 0))
+        if s is None:
+            return self._validation_error("TvdbId", "Invalid TVDB ID", "TvdbIdValidator")
+        if s["j"] in self._present:
+            return self._validation_error("TvdbId", "This series has already been added", "SeriesExistsValidator")
+        self._present.add(s["j"])
+        self._edits[s["j"]] = {"monitored": bool(body.get("monitored", True)), "qualityProfileId": body.get("qualityProfileId"),
+                               "rootFolderPath": body.get("rootFolderPath", self.root_folder)}
+        return json_response(self._resource(s["j"]), status=201)
+
+    async def _update_series(self, request: web.Request) -> web.Response:
+        j = self._index(request)
+        body = await request.json()
+        self._edits.setdefault(j, {}).update({k: v for k, v in body.items() if k in ("monitored", "qualityProfileId", "seasonFolder", "tags", "seasons")})
+        return json_response(self._resource(j), status=202)
+
+    async def _delete_series(self, request: web.Request) -> web.Response:
+        j = self._index(request)
+        self._present.discard(j)
+        self._edits.pop(j, None)
+        return json_response({})
+
+    async def _episodes(self, request: web.Request) -> web.Response:
+        lib = self.library
+        ids = request.query.getall("episodeIds", [])
+        if ids:
+            out = []
+            for raw in ",".join(ids).split(","):
+                g = int(raw) - 1 if raw.strip().isdigit() else -1
+                if 0 <= g < lib.episode_count:
+                    out.append(self._episode_resource(lib.episode(g)))
+            return json_response(out)
+        series_id = request.query.get("seriesId")
+        if not series_id:
+            return self._validation_error("SeriesId", "seriesId or episodeIds must be provided", "NotEmptyValidator")
+        j = int(series_id) - 1
+        if j not in self._present:
+            raise web.HTTPNotFound()
+        return json_response([self._episode_resource(e) for e in lib.show_episodes(lib.series[j])])
+
+    async def _update_episodes(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        out = []
+        for ep in body if isinstance(body, list) else [body]:
+            g = int(ep.get("id", 0)) - 1
+            if 0 <= g < self.library.episode_count:
+                self._episode_monitored[g] = bool(ep.get("monitored", True))
+                out.append(self._episode_resource(self.library.episode(g)))
+        return json_response(out, status=202)
+
+    async def _episode_file(self, request: web.Request) -> web.Response:
+        g = int(request.match_info["id"]) - 1
+        if not 0 <= g < self.library.episode_count or not self.library.episode(g)["has_file"]:
+            raise web.HTTPNotFound()
+        e = self.library.episode(g)
+        return json_response({"id": g + 1, "seriesId": e["show"]["j"] + 1, "seasonNumber": e["season"], "size": 900 * 1024**2,
+                              "relativePath": f"Season {e['season']:02d}/S{e['season']:02d}E{e['index']:02d}.mkv",
+                              "quality": {"quality": {"name": "WEBDL-1080p"}}, "dateAdded": iso_datetime(e["added_at"])})
+
+    async def _history(self, request: web.Request) -> web.Response:
+        lib = self.library
+        series_id = request.query.get("seriesId")
+        if series_id:
+            j = int(series_id) - 1
+            gs = range(lib.series[j]["ep_start"], lib.series[j]["ep_start"] + lib.series[j]["episodes"]) if j in self._present else range(0)
+        else:
+            gs = range(lib.episode_count - 1, max(-1, lib.episode_count - 1001), -1)
+        records = [{"id": g + 1, "episodeId": g + 1, "seriesId": lib.episode(g)["show"]["j"] + 1, "eventType": "downloadFolderImported",
+                    "sourceTitle": lib.episode(g)["title"], "date": iso_datetime(lib.episode(g)["added_at"])}
+                   for g in gs if lib.episode(g)["has_file"]]
+        return self._paged(request, records, "date")
+
+    async def _calendar(self, request: web.Request) -> web.Response:
+        lib = self.library
+        lib.series
+        latest = sorted(range(max(0, lib.episode_count - 200), lib.episode_count), key=lambda g: -lib.episode(g)["aired"])[:25]
+        return json_response([self._episode_resource(lib.episode(g)) for g in latest])
+
+    async def _wanted(self, request: web.Request) -> web.Response:
+        lib = self.library
+        if self._missing is None:
+            lib.series
+            self._missing = list(range(MISSING_EPISODE_EVERY - 1, lib.episode_count, MISSING_EPISODE_EVERY))
+        page = int_param(request, "page", 1, lo=1)
+        size = int_param(request, "pageSize", 20, lo=1, hi=1000)
+        window = self._missing[(page - 1) * size : page * size]
+        return json_response({"page": page, "pageSize": size, "sortKey": request.query.get("sortKey", "airDateUtc"),
+                              "sortDirection": request.query.get("sortDirection", "descending"), "totalRecords": len(self._missing),
+                              "records": [dict(self._episode_resource(lib.episode(g)), series=self._resource(lib.episode(g)["show"]["j"])) for g in window]})
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import random
+import time
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Optional
+
+from aiohttp import web
+
+
+@dataclass
+class FaultProfile:
+    """Latency and failures a stand-in injects in front of every request.
+
+    - ``latency_ms`` (+ uniform ``jitter_ms``) is slept before answering
+    - ``error_rate``: fraction of requests answered 500/503
+    - ``throttle_rate``: fraction answered 429 regardless of load
+    - ``rate_limit_rps``: token bucket (burst = one second of traffic); over it, 429
+      with ``Retry-After: retry_after_s``
+    """
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    rate_limit_rps: float = 0.0
+    retry_after_s: float = 1.0
+
+    @classmethod
+    def parse(cls, spec: str) -> "FaultProfile":
+        """``"latency_ms=20,jitter_ms=10,error_rate=0.01,rate_limit_rps=40"``."""
+        known = {f.name for f in fields(cls)}
+        values: Dict[str, float] = {}
+        for part in (spec or "").split(","):
+            if not part.strip():
+                continue
+            key, _, raw = part.partition("=")
+            key = key.strip()
+            if key not in known:
+                raise ValueError(f"unknown fault setting {key!r}; expected one of {sorted(known)}")
+            values[key] = float(raw)
+        return cls(**values)
+
+
+class StandInService:
+    """Base for the local service stand-ins: lifecycle, auth, fault injection and request stats.
+
+    Subclasses register routes in ``_routes`` and implement ``_authorized``. ``stats``
+    counts requests per route template (``"GET /library/metadata/{keys}"``) and per
+    status, so tests can assert how many calls a client made.
+    """
+
+    name = "service"
+
+    def __init__(self, faults: Optional[FaultProfile] = None, *, seed: int = 7) -> None:
+        self.faults = faults or FaultProfile()
+        self.base_url: Optional[str] = None
+        self.stats: Dict[str, Any] = {}
+        self.injected_ms = 0.0
+        self._rng = random.Random(seed)
+        self._runner: Optional[web.AppRunner] = None
+        self._log = logging.getLogger(f"moviebot.stand_in.{self.name}")
+        self.reset_stats()
+
+    # ---------------------------------------------------------- lifecycle
+
+    def build_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._middleware])
+        self._routes(app)
+        return app
+
+    def _routes(self, app: web.Application) -> None:  # pragma: no cover - abstract
+        raise NotImplementedError
+
+    def _authorized(self, request: web.Request) -> bool:  # pragma: no cover - abstract
+        raise NotImplementedError
+
+    def _url(self, host: str, port: int) -> str:
+        return f"http://{host}:{port}"
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self._runner = web.AppRunner(self.build_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound = site._server.sockets[0].getsockname()  # type: ignore[union-attr]
+        self.base_url = self._url(bound[0], bound[1])
+        self._log.info("stand-in listening", extra={"service": self.name, "base_url": self.base_url})
+        return self.base_url
+
+    async def close(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "StandInService":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    def reset_stats(self) -> None:
+        self.stats = {"requests": 0, "routes": {}, "status": {}}
+        self.injected_ms = 0.0
+        self._tokens = self.faults.rate_limit_rps
+        self._refilled = time.monotonic()
+
+    def route_count(self, route: str) -> int:
+        return int(self.stats["routes"].get(route, 0))
+
+    # ------------------------------------------------------------- faults
+
+    def _take_token(self) -> bool:
+        rps = self.faults.rate_limit_rps
+        if rps <= 0:
+            return True
+        now = time.monotonic()
+        self._tokens = min(rps, self._tokens + (now - self._refilled) * rps)
+        self._refilled = now
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return True
+        return False
+
+    def _error_body(self, status: int) -> web.Response:
+        """Service-shaped error payload; subclasses mimic the real API's format."""
+        return web.json_response({"message": f"stand-in injected {status}"}, status=status)
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        route = f"{request.method} {request.match_info.route.resource.canonical}" if request.match_info.route.resource else f"{request.method} {request.path}"
+        self.stats["requests"] += 1
+        self.stats["routes"][route] = self.stats["routes"].get(route, 0) + 1
+        f = self.faults
+        delay = f.latency_ms + (self._rng.random() * f.jitter_ms if f.jitter_ms else 0.0)
+        if delay > 0:
+            self.injected_ms += delay
+            await asyncio.sleep(delay / 1000.0)
+        if not self._authorized(request):
+            resp: web.StreamResponse = self._error_body(401)
+        elif not self._take_token() or (f.throttle_rate and self._rng.random() < f.throttle_rate):
+            resp = self._error_body(429)
+            resp.headers["Retry-After"] = str(max(1, int(round(f.retry_after_s))))
+        elif f.error_rate and self._rng.random() < f.error_rate:
+            resp = self._error_body(self._rng.choice((500, 503)))
+        else:
+            try:
+                resp = await handler(request)
+            except web.HTTPException as e:
+                resp = self._error_body(e.status) if e.status >= 400 else e
+        self.stats["status"][resp.status] = self.stats["status"].get(resp.status, 0) + 1
+        return resp
+
+
+def json_response(data: Any, status: int = 200) -> web.Response:
+    return web.Response(body=json.dumps(data, separators=(",", ":")).encode("utf-8"), status=status, content_type="application/json")
+
+
+def int_param(request: web.Request, name: str, default: int, *, lo: int = 0, hi: int = 10**9) -> int:
+    try:
+        return max(lo, min(hi, int(request.query.get(name, default))))
+    except (TypeError, ValueError):
+        return default
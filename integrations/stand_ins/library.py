@@ -0,0 +1,406 @@
+from __future__ import annotations
+
+import bisect
+import random
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Plex rating-key ranges per item kind; Radarr/Sonarr/TMDb ids are derived the same way
+MOVIE_KEY_BASE = 1
+SHOW_KEY_BASE = 1_000_000
+SEASON_KEY_BASE = 2_000_000
+EPISODE_KEY_BASE = 3_000_000
+TMDB_MOVIE_BASE = 100_000
+TMDB_TV_BASE = 500_000
+TMDB_PERSON_BASE = 900_000
+TVDB_BASE = 70_000
+
+# Library "now"; every timestamp is derived from it so runs are reproducible
+EPOCH = 1_700_000_000
+
+# Every Nth episode (by global index) has no file: Sonarr reports it missing
+MISSING_EPISODE_EVERY = 25
+
+MOVIE_GENRES: List[Tuple[int, str]] = [
+    (28, "Action"), (12, "Adventure"), (16, "Animation"), (35, "Comedy"), (80, "Crime"),
+    (99, "Documentary"), (18, "Drama"), (10751, "Family"), (14, "Fantasy"), (36, "History"),
+    (27, "Horror"), (10402, "Music"), (9648, "Mystery"), (10749, "Romance"),
+    (878, "Science Fiction"), (53, "Thriller"), (10752, "War"), (37, "Western"),
+]
+TV_GENRES: List[Tuple[int, str]] = [
+    (10759, "Action & Adventure"), (16, "Animation"), (35, "Comedy"), (80, "Crime"),
+    (99, "Documentary"), (18, "Drama"), (10751, "Family"), (10762, "Kids"), (9648, "Mystery"),
+    (10764, "Reality"), (10765, "Sci-Fi & Fantasy"), (10768, "War & Politics"), (37, "Western"),
+]
+CONTENT_RATINGS = ["G", "PG", "PG-13", "R", "NC-17"]
+TV_CONTENT_RATINGS = ["TV-Y", "TV-G", "TV-PG", "TV-14", "TV-MA"]
+RESOLUTIONS = [("4k", 2160, 3840), ("1080", 1080, 1920), ("720", 720, 1280), ("sd", 480, 720)]
+STUDIOS = ["Paramount", "Warner Bros.", "Universal", "A24", "Neon", "Lionsgate", "Focus Features", "Searchlight", "Legendary", "Blumhouse"]
+NETWORKS = ["HBO", "Netflix", "AMC", "BBC One", "FX", "Apple TV+", "Hulu", "NBC", "Showtime", "Prime Video"]
+COUNTRIES = ["United States of America", "United Kingdom", "France", "Japan", "South Korea", "Canada", "Germany"]
+LANGUAGES = ["en", "en", "en", "fr", "ja", "ko", "es", "de"]
+
+_ADJ = ["Silent", "Broken", "Hidden", "Crimson", "Last", "Electric", "Burning", "Frozen", "Hollow", "Golden",
+        "Midnight", "Savage", "Quiet", "Endless", "Wicked", "Lost", "Iron", "Velvet", "Distant", "Shattered",
+        "Northern", "Restless", "Secret", "Bitter", "Wild", "Pale", "Dark", "Brave", "Fallen", "Neon"]
+_NOUN = ["Harbor", "Empire", "Signal", "Garden", "Frontier", "Witness", "Orchard", "Protocol", "Horizon", "Kingdom",
+         "Lighthouse", "Machine", "River", "Covenant", "Heist", "Summer", "Circuit", "Ghost", "Tide", "Station",
+         "Canyon", "Archive", "Carnival", "Dynasty", "Engine", "Labyrinth", "Meridian", "Outpost", "Paradox", "Reckoning"]
+_SUFFIX = ["", "", "", "", " II", " III", ": Reborn", ": The Return", " Rising", " Redux"]
+_FIRST = ["James", "Maria", "Robert", "Aiko", "Michael", "Sofia", "David", "Amara", "Daniel", "Chloe", "Kenji", "Laura",
+          "Samuel", "Ingrid", "Omar", "Grace", "Lucas", "Priya", "Henry", "Elena", "Mateo", "Nora", "Felix", "Zara",
+          "Victor", "Hannah", "Tobias", "Leila", "Oscar", "Mira"]
+_LAST = ["Hart", "Moreno", "Okafor", "Lindqvist", "Tanaka", "Brennan", "Costa", "Whitfield", "Novak", "Reyes", "Sato",
+         "Adeyemi", "Fischer", "Laurent", "Kowalski", "Duarte", "Vance", "Holloway", "Park", "Ibarra", "Quinn",
+         "Marsh", "Ashford", "Keller", "Rinaldi", "Castellanos", "Weber", "Dalton", "Mercer", "Ferris"]
+_VERB = ["outrun", "expose", "protect", "unravel", "escape", "rebuild", "confront", "decode", "survive", "steal"]
+_OBJ = ["a family secret", "a rogue AI", "the syndicate", "a vanished sister", "the last train", "a forgotten map",
+        "the city's darkest night", "an impossible vault", "a war of succession", "the storm"]
+
+# Recognisable titles placed in the catalog so the usual benchmark searches return hits
+ANCHOR_MOVIES = ["Inception", "The Matrix", "Pirates of the Caribbean", "Heat", "Alien", "Arrival", "Parasite",
+                 "The Dark Knight", "Spirited Away", "Interstellar", "Mad Max: Fury Road", "Knives Out"]
+ANCHOR_SHOWS = ["The Office", "Breaking Bad", "Severance", "The Expanse", "Slow Horses", "Dark", "Succession", "Fargo"]
+ANCHOR_PEOPLE = ["Tom Hanks", "Cate Blanchett", "Denis Villeneuve", "Florence Pugh", "Christopher Nolan", "Viola Davis"]
+
+
+@dataclass
+class LibraryScale:
+    """Synthetic library size; ``catalog_factor`` sizes TMDb beyond what is owned."""
+
+    movies: int = 2_000
+    series: int = 300
+    episodes: int = 20_000
+    seed: int = 7
+    catalog_factor: float = 1.5
+
+    @classmethod
+    def parse(cls, spec: str) -> "LibraryScale":
+        """``"20000:3000:200000"`` (movies:series:episodes), or a preset: small, medium, large."""
+        presets = {"small": cls(200, 30, 1_500), "medium": cls(), "large": cls(20_000, 3_000, 200_000)}
+        spec = (spec or "").strip().lower()
+        if spec in presets:
+            return presets[spec]
+        parts = [int(p) for p in spec.split(":")]
+        if len(parts) != 3:
+            raise ValueError(f"expected MOVIES:SERIES:EPISODES or a preset, got {spec!r}")
+        return cls(*parts)
+
+
+def iso_date(ts: int) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+def iso_datetime(ts: int) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _rng(*parts: int) -> random.Random:
+    # Seeded per item so any item can be rebuilt on its own, in any order
+    h = 0
+    for p in parts:
+        h = (h * 1_000_003 + int(p)) & 0xFFFFFFFFFFFF
+    return random.Random(h)
+
+
+class SyntheticLibrary:
+    """Deterministic movie/series/episode catalog shared by the Plex, TMDb, Radarr and Sonarr stand-ins.
+
+    Movies and series are built once on first use; episodes are rebuilt on demand from
+    their global index, so 200k episodes cost nothing until they are requested. The
+    first ``scale.movies`` catalog movies and ``scale.series`` series are "owned"
+    (in Plex and Radarr/Sonarr); the rest of the catalog exists only on TMDb, except
+    for a tail of monitored-but-missing movies Radarr reports as wanted.
+    """
+
+    def __init__(self, scale: Optional[LibraryScale] = None) -> None:
+        self.scale = scale or LibraryScale()
+        s = self.scale
+        self.catalog_movies = max(s.movies, int(s.movies * s.catalog_factor))
+        self.catalog_series = max(s.series, int(s.series * s.catalog_factor))
+        self.wanted_movies = min(self.catalog_movies - s.movies, max(1, s.movies // 20)) if self.catalog_movies > s.movies else 0
+        self.people_count = max(len(ANCHOR_PEOPLE) + 1, max(500, (s.movies + s.series) // 3))
+        self._movies: Optional[List[Dict[str, Any]]] = None
+        self._series: Optional[List[Dict[str, Any]]] = None
+        self._episode_starts: List[int] = []
+        self._season_starts: List[int] = []
+        self.episode_count = 0
+        self.season_count = 0
+        self._episode_cache = lru_cache(maxsize=8192)(self._build_episode)
+
+    # ---------------------------------------------------------------- people
+
+    def person_name(self, p: int) -> str:
+        if p < len(ANCHOR_PEOPLE):
+            return ANCHOR_PEOPLE[p]
+        q = p - len(ANCHOR_PEOPLE)
+        name = f"{_FIRST[q % len(_FIRST)]} {_LAST[(q // len(_FIRST)) % len(_LAST)]}"
+        rounds = q // (len(_FIRST) * len(_LAST))
+        return f"{name} {chr(ord('A') + rounds % 26)}." if rounds else name
+
+    def _pick_people(self, rng: random.Random, k: int) -> List[int]:
+        # Popularity skew: low indices (incl. the anchors) appear in many credits
+        out: List[int] = []
+        while len(out) < k:
+            p = int(self.people_count * rng.random() ** 2.5)
+            if p not in out:
+                out.append(p)
+        return out
+
+    # ---------------------------------------------------------------- movies
+
+    @property
+    def movies(self) -> List[Dict[str, Any]]:
+        if self._movies is None:
+            self._movies = [self._build_movie(i) for i in range(self.catalog_movies)]
+        return self._movies
+
+    def _title(self, rng: random.Random, i: int, anchors: List[str], count: int) -> str:
+        step = max(1, count // max(1, len(anchors)))
+        if i % step == step // 2 and i // step < len(anchors):
+            return anchors[i // step]
+        title = f"{rng.choice(_ADJ)} {rng.choice(_NOUN)}{rng.choice(_SUFFIX)}"
+        return f"The {title}" if rng.random() < 0.3 else title
+
+    def _build_movie(self, i: int) -> Dict[str, Any]:
+        s = self.scale
+        rng = _rng(s.seed, 1, i)
+        owned = i < s.movies
+        title = self._title(rng, i, ANCHOR_MOVIES, self.catalog_movies)
+        year = 1950 + int(75 * rng.random() ** 0.6)
+        release = int(datetime(year, 1 + rng.randrange(12), 1 + rng.randrange(28), tzinfo=timezone.utc).timestamp())
+        spacing = max(60, (6 * 365 * 86400) // max(1, s.movies))
+        added_at = EPOCH - (s.movies - i) * spacing if owned else 0
+        watched = owned and rng.random() < 0.35
+        res_name, height, width = RESOLUTIONS[min(3, int(4 * rng.random() ** 1.4))]
+        genres = sorted(rng.sample(range(len(MOVIE_GENRES)), 1 + rng.randrange(3)))
+        return {
+            "i": i,
+            "owned": owned,
+            "title": title,
+            "title_sort": title[4:] if title.startswith("The ") else title,
+            "year": year,
+            "release": release,
+            "genres": genres,
+            "directors": self._pick_people(rng, 1),
+            "writers": self._pick_people(rng, 1 + rng.randrange(2)),
+            "cast": self._pick_people(rng, 4 + rng.randrange(8)),
+            "content_rating": rng.choice(CONTENT_RATINGS),
+            "rating": round(3 + 6.5 * rng.random(), 1),
+            "audience_rating": round(3 + 6.5 * rng.random(), 1),
+            "vote_count": int(50 + 30_000 * rng.random() ** 3),
+            "popularity": round(1 + 400 * rng.random() ** 4, 3),
+            "runtime": 80 + rng.randrange(80),
+            "studio": rng.choice(STUDIOS),
+            "country": rng.choice(COUNTRIES),
+            "language": rng.choice(LANGUAGES),
+            "summary": f"A {rng.choice(_ADJ).lower()} {rng.choice(_NOUN).lower()} keeper must {rng.choice(_VERB)} {rng.choice(_OBJ)}.",
+            "tagline": f"Nobody can {rng.choice(_VERB)} {rng.choice(_OBJ)} forever.",
+            "added_at": added_at,
+            "updated_at": min(EPOCH, added_at + rng.randrange(30 * 86400)) if owned else 0,
+            "view_count": (1 + rng.randrange(4)) if watched else 0,
+            "last_viewed_at": min(EPOCH, added_at + rng.randrange(400 * 86400)) if watched else None,
+            "resolution": res_name,
+            "height": height,
+            "width": width,
+            "hdr": res_name == "4k" and rng.random() < 0.6,
+            "video_codec": "hevc" if res_name == "4k" or rng.random() < 0.3 else "h264",
+            "audio_codec": rng.choice(["eac3", "ac3", "truehd", "aac", "dca"]),
+            "size": int((4 if res_name == "4k" else 1) * (2 + 12 * rng.random()) * 1024**3),
+            "tmdb_id": TMDB_MOVIE_BASE + i,
+            "imdb_id": f"tt{1_000_000 + i * 7:07d}",
+        }
+
+    def movie_by_key(self, key: int) -> Optional[Dict[str, Any]]:
+        i = key - MOVIE_KEY_BASE
+        return self.movies[i] if 0 <= i < self.scale.movies else None
+
+    def movie_by_tmdb(self, tmdb_id: int) -> Optional[Dict[str, Any]]:
+        i = tmdb_id - TMDB_MOVIE_BASE
+        return self.movies[i] if 0 <= i < self.catalog_movies else None
+
+    # ---------------------------------------------------------------- series
+
+    @property
+    def series(self) -> List[Dict[str, Any]]:
+        if self._series is None:
+            self._series = self._build_series()
+        return self._series
+
+    def _build_series(self) -> List[Dict[str, Any]]:
+        s = self.scale
+        out: List[Dict[str, Any]] = []
+        weights = [min(15.0, _rng(s.seed, 2, j).paretovariate(1.6)) for j in range(s.series)]
+        total_w = sum(weights) or 1.0
+        budget = max(s.episodes, s.series)
+        counts = [max(1, int(w * budget / total_w)) for w in weights]
+        if counts:
+            counts[0] += budget - sum(counts)
+            if counts[0] < 1:  # heavy rounding; spread the deficit
+                deficit, counts[0] = 1 - counts[0], 1
+                for j in range(len(counts) - 1, 0, -1):
+                    take = min(deficit, counts[j] - 1)
+                    counts[j] -= take
+                    deficit -= take
+        ep_start = season_start = 0
+        for j in range(self.catalog_series):
+            rng = _rng(s.seed, 3, j)
+            owned = j < s.series
+            title = self._title(rng, j, ANCHOR_SHOWS, self.catalog_series)
+            n_eps = counts[j] if owned else 8 + rng.randrange(40)
+            seasons: List[int] = []
+            left = n_eps
+            while left > 0:
+                take = min(left, rng.choice([6, 8, 10, 10, 13, 22, 24]))
+                seasons.append(take)
+                left -= take
+            year = 1985 + int(40 * rng.random() ** 0.5)
+            genres = sorted(rng.sample(range(len(TV_GENRES)), 1 + rng.randrange(2)))
+            spacing = max(60, (6 * 365 * 86400) // max(1, s.series))
+            added_at = EPOCH - (s.series - j) * spacing if owned else 0
+            out.append({
+                "j": j,
+                "owned": owned,
+                "title": title,
+                "title_sort": title[4:] if title.startswith("The ") else title,
+                "year": year,
+                "first_air": int(datetime(year, 1 + rng.randrange(12), 1 + rng.randrange(28), tzinfo=timezone.utc).timestamp()),
+                "genres": genres,
+                "cast": self._pick_people(rng, 4 + rng.randrange(6)),
+                "creators": self._pick_people(rng, 1),
+                "content_rating": rng.choice(TV_CONTENT_RATINGS),
+                "rating": round(4 + 5.5 * rng.random(), 1),
+                "vote_count": int(20 + 10_000 * rng.random() ** 3),
+                "popularity": round(1 + 300 * rng.random() ** 4, 3),
+                "network": rng.choice(NETWORKS),
+                "status": "Ended" if rng.random() < 0.55 else "Continuing",
+                "runtime": rng.choice([22, 30, 45, 50, 60]),
+                "language": rng.choice(LANGUAGES),
+                "summary": f"Season after season, {rng.choice(_FIRST)} tries to {rng.choice(_VERB)} {rng.choice(_OBJ)}.",
+                "seasons": seasons,
+                "episodes": n_eps,
+                "ep_start": ep_start if owned else -1,
+                "season_start": season_start if owned else -1,
+                "added_at": added_at,
+                "tvdb_id": TVDB_BASE + j,
+                "tmdb_id": TMDB_TV_BASE + j,
+                "imdb_id": f"tt{5_000_000 + j * 11:07d}",
+            })
+            if owned:
+                self._episode_starts.append(ep_start)
+                self._season_starts.append(season_start)
+                ep_start += n_eps
+                season_start += len(seasons)
+        self.episode_count = ep_start
+        self.season_count = season_start
+        return out
+
+    def show_by_key(self, key: int) -> Optional[Dict[str, Any]]:
+        j = key - SHOW_KEY_BASE
+        return self.series[j] if 0 <= j < self.scale.series else None
+
+    def show_by_tvdb(self, tvdb_id: int) -> Optional[Dict[str, Any]]:
+        j = tvdb_id - TVDB_BASE
+        return self.series[j] if 0 <= j < self.catalog_series else None
+
+    def show_by_tmdb(self, tmdb_id: int) -> Optional[Dict[str, Any]]:
+        j = tmdb_id - TMDB_TV_BASE
+        return self.series[j] if 0 <= j < self.catalog_series else None
+
+    # --------------------------------------------------------- seasons/episodes
+
+    def season(self, show: Dict[str, Any], number: int) -> Dict[str, Any]:
+        """Season ``number`` (1-based) of an owned show."""
+        sizes = show["seasons"]
+        first = show["ep_start"] + sum(sizes[: number - 1])
+        return {
+            "key": SEASON_KEY_BASE + show["season_start"] + number - 1,
+            "show": show,
+            "index": number,
+            "episodes": sizes[number - 1],
+            "first_episode": first,
+            "added_at": show["added_at"] + (number - 1) * 86400,
+        }
+
+    def season_by_key(self, key: int) -> Optional[Dict[str, Any]]:
+        g = key - SEASON_KEY_BASE
+        self.series  # ensure the index is built
+        if not 0 <= g < self.season_count:
+            return None
+        j = bisect.bisect_right(self._season_starts, g) - 1
+        return self.season(self.series[j], g - self._season_starts[j] + 1)
+
+    def episode(self, g: int) -> Dict[str, Any]:
+        """Episode by global index (0 <= g < episode_count)."""
+        return self._episode_cache(g)
+
+    def _build_episode(self, g: int) -> Dict[str, Any]:
+        self.series  # ensure the index is built
+        j = bisect.bisect_right(self._episode_starts, g) - 1
+        show = self.series[j]
+        offset = g - show["ep_start"]
+        season_no = 1
+        for size in show["seasons"]:
+            if offset < size:
+                break
+            offset -= size
+            season_no += 1
+        rng = _rng(self.scale.seed, 4, g)
+        aired = show["first_air"] + ((season_no - 1) * 365 + offset * 7) * 86400
+        watched = rng.random() < 0.4
+        added_at = max(show["added_at"], min(EPOCH, aired + 86400))
+        return {
+            "g": g,
+            "key": EPISODE_KEY_BASE + g,
+            "show": show,
+            "season": season_no,
+            "index": offset + 1,
+            "title": f"{rng.choice(_ADJ)} {rng.choice(_NOUN)}",
+            "summary": f"{rng.choice(_FIRST)} has to {rng.choice(_VERB)} {rng.choice(_OBJ)}.",
+            "aired": aired,
+            "added_at": added_at,
+            "duration": show["runtime"] * 60_000,
+            "has_file": g % MISSING_EPISODE_EVERY != MISSING_EPISODE_EVERY - 1,
+            "view_count": 1 if watched else 0,
+            "last_viewed_at": min(EPOCH, added_at + rng.randrange(200 * 86400)) if watched else None,
+            "rating": round(5 + 4.5 * rng.random(), 1),
+        }
+
+    def episode_by_key(self, key: int) -> Optional[Dict[str, Any]]:
+        g = key - EPISODE_KEY_BASE
+        self.series  # ensure the index is built
+        return self.episode(g) if 0 <= g < self.episode_count else None
+
+    def show_episodes(self, show: Dict[str, Any]) -> List[Dict[str, Any]]:
+        if not show["owned"]:
+            return []
+        return [self.episode(g) for g in range(show["ep_start"], show["ep_start"] + show["episodes"])]
+
+    # ------------------------------------------------------------------ search
+
+    def search_movies(self, query: str, *, owned_only: bool = True) -> List[Dict[str, Any]]:
+        q = query.strip().lower()
+        pool = self.movies[: self.scale.movies] if owned_only else self.movies
+        hits = [m for m in pool if q in m["title"].lower()]
+        hits.sort(key=lambda m: (not m["title"].lower().startswith(q), -m["popularity"]))
+        return hits
+
+    def search_series(self, query: str, *, owned_only: bool = True) -> List[Dict[str, Any]]:
+        q = query.strip().lower()
+        pool = self.series[: self.scale.series] if owned_only else self.series
+        hits = [s for s in pool if q in s["title"].lower()]
+        hits.sort(key=lambda s: (not s["title"].lower().startswith(q), -s["popularity"]))
+        return hits
+
+    def search_people(self, query: str, limit: int = 200) -> List[int]:
+        q = query.strip().lower()
+        return [p for p in range(self.people_count) if q in self.person_name(p).lower()][:limit]
+
+    def credits_for(self, p: int) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """(movies, series) a person is credited in, cast or crew."""
+        movies = [m for m in self.movies if p in m["cast"] or p in m["directors"] or p in m["writers"]]
+        series = [s for s in self.series if p in s["cast"] or p in s["creators"]]
+        return movies, series
@@ -0,0 +1,654 @@
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from xml.sax.saxutils import quoteattr
+
+from aiohttp import web
+
+from .base import FaultProfile, StandInService
+from .library import (
+    COUNTRIES,
+    EPOCH,
+    MOVIE_GENRES,
+    MOVIE_KEY_BASE,
+    RESOLUTIONS,
+    SEASON_KEY_BASE,
+    SHOW_KEY_BASE,
+    TV_GENRES,
+    SyntheticLibrary,
+    iso_date,
+)
+
+MOVIE_SECTION = 1
+SHOW_SECTION = 2
+# Plex search type ids (plexapi.utils.SEARCHTYPES)
+TYPE_MOVIE, TYPE_SHOW, TYPE_SEASON, TYPE_EPISODE, TYPE_COLLECTION = 1, 2, 3, 4, 18
+_TYPE_NAMES = {TYPE_MOVIE: "movie", TYPE_SHOW: "show", TYPE_SEASON: "season", TYPE_EPISODE: "episode", TYPE_COLLECTION: "collection"}
+PERSON_TAG_BASE = 200_000
+COUNTRY_TAG_BASE = 300
+
+# Operators per field type, as the real server advertises them in the filter Meta
+_FIELD_TYPES: Dict[str, List[Tuple[str, str]]] = {
+    "tag": [("=", "is"), ("!=", "is not")],
+    "resolution": [("=", "is"), ("!=", "is not")],
+    "integer": [("=", "is"), ("!=", "is not"), (">>=", "is greater than"), ("<<=", "is less than")],
+    "string": [("=", "contains"), ("!=", "does not contain"), ("==", "is"), ("!==", "is not"), ("<=", "begins with"), (">=", "ends with")],
+    "boolean": [("=", "is true"), ("!=", "is false")],
+    "date": [("<<=", "is before"), (">>=", "is after")],
+}
+# (field, type) filterable per libtype; tag fields also get a filter-choice endpoint
+_FIELDS: Dict[str, List[Tuple[str, str]]] = {
+    "movie": [("title", "string"), ("studio", "string"), ("contentRating", "tag"), ("year", "integer"), ("rating", "integer"),
+              ("audienceRating", "integer"), ("viewCount", "integer"), ("duration", "integer"), ("addedAt", "date"),
+              ("updatedAt", "date"), ("lastViewedAt", "date"), ("originallyAvailableAt", "date"), ("genre", "tag"),
+              ("actor", "tag"), ("director", "tag"), ("writer", "tag"), ("country", "tag"), ("resolution", "resolution"),
+              ("unwatched", "boolean")],
+    "show": [("title", "string"), ("studio", "string"), ("contentRating", "tag"), ("year", "integer"), ("rating", "integer"),
+             ("addedAt", "date"), ("updatedAt", "date"), ("lastViewedAt", "date"), ("originallyAvailableAt", "date"),
+             ("genre", "tag"), ("actor", "tag"), ("unwatched", "boolean")],
+    "season": [("title", "string"), ("addedAt", "date"), ("unwatched", "boolean")],
+    "episode": [("title", "string"), ("year", "integer"), ("rating", "integer"), ("viewCount", "integer"), ("addedAt", "date"),
+                ("updatedAt", "date"), ("lastViewedAt", "date"), ("originallyAvailableAt", "date"), ("unwatched", "boolean")],
+    "collection": [("title", "string"), ("addedAt", "date")],
+}
+_SORTS = ["titleSort", "title", "year", "originallyAvailableAt", "rating", "audienceRating", "contentRating", "duration",
+          "viewCount", "addedAt", "updatedAt", "lastViewedAt", "random"]
+_FILTER_KEY = re.compile(r"^(?:[a-zA-Z]+\.)?([a-zA-Z]+)(!=|!|>>|<<|=|<|>)?$")
+_RELATIVE = re.compile(r"^-?(\d+)(mon|[smhdwy])$")
+_UNIT_S = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 7 * 86400, "mon": 30 * 86400, "y": 365 * 86400}
+
+
+def _attrs(**kw: Any) -> str:
+    return "".join(f" {k}={quoteattr(str(int(v) if isinstance(v, bool) else v))}" for k, v in kw.items() if v is not None)
+
+
+def _el(_name: str, _children: str = "", **kw: Any) -> str:
+    return f"<{_name}{_attrs(**kw)}>{_children}</{_name}>" if _children else f"<{_name}{_attrs(**kw)}/>"
+
+
+def _container(children: str = "", **kw: Any) -> web.Response:
+    body = f'<?xml version="1.0" encoding="UTF-8"?>\n{_el("MediaContainer", children, **kw) if children else _el("MediaContainer", **kw)}'
+    return web.Response(body=body.encode("utf-8"), content_type="text/xml", charset="utf-8")
+
+
+class PlexStandIn(StandInService):
+    """Plex Media Server stand-in speaking the XML API plexapi uses.
+
+    Two sections (1 = Movies, 2 = TV Shows) over a ``SyntheticLibrary``. Listings are
+    partial the way the real server's are (a few tags, no tagline or full cast), and
+    ``/library/metadata/{keys}`` returns the complete item, so plexapi's reload-on-access
+    behaviour shows up in ``stats`` just as it does against a real server. Section
+    ``all`` supports the filter Meta, tag filter choices, operators, sorting and
+    ``X-Plex-Container-Start/Size`` paging that ``LibrarySection.search`` relies on.
+
+    ``add_movie``/``touch_movie``/``delete_movie`` change the movie section the way a
+    scan or metadata refresh would and push the matching timeline notifications to
+    clients of ``/:/websockets/notifications``.
+    """
+
+    name = "plex"
+
+    def __init__(self, library: SyntheticLibrary, faults: Optional[FaultProfile] = None, *, token: str = "stand-in-plex-token", seed: int = 7) -> None:
+        super().__init__(faults, seed=seed)
+        self.library = library
+        self.token = token
+        self.machine_id = f"standin{seed:04d}"
+        self._choices: Dict[Tuple[int, str, int], str] = {}
+        self._movie_count = library.scale.movies
+        self._deleted: Set[int] = set()
+        self._clock = EPOCH
+        self._sockets: Set[web.WebSocketResponse] = set()
+
+    def _authorized(self, request: web.Request) -> bool:
+        return (request.headers.get("X-Plex-Token") or request.query.get("X-Plex-Token")) == self.token
+
+    def _error_body(self, status: int) -> web.Response:
+        reason = {401: "Unauthorized", 404: "Not Found", 429: "Too Many Requests"}.get(status, "Internal Server Error")
+        return web.Response(text=f"<html><head><title>{reason}</title></head><body><h1>{status} {reason}</h1></body></html>", status=status, content_type="text/html")
+
+    def _routes(self, app: web.Application) -> None:
+        r = app.router
+        r.add_get("/", self._root)
+        r.add_get("/identity", self._identity)
+        r.add_get("/library", self._library)
+        r.add_get("/library/", self._library)
+        r.add_get("/library/sections", self._sections)
+        r.add_get("/library/sections/", self._sections)
+        r.add_get("/library/sections/{section}/all", self._section_all)
+        r.add_get("/library/sections/{section}/collections", self._section_collections)
+        r.add_get("/library/sections/{section}/recentlyAdded", self._section_recently_added)
+        r.add_get("/library/sections/{section}/{filter}", self._filter_choices)
+        r.add_get("/library/metadata/{keys}", self._metadata)
+        r.add_get("/library/metadata/{key}/children", self._children)
+        r.add_get("/library/metadata/{key}/allLeaves", self._all_leaves)
+        r.add_get("/library/onDeck", self._on_deck)
+        r.add_get("/library/recentlyAdded", self._recently_added)
+        r.add_get("/hubs/search", self._hub_search)
+        r.add_get("/hubs/search/", self._hub_search)
+        r.add_get("/hubs/continueWatching/items", self._on_deck)
+        r.add_get("/status/sessions", self._empty)
+        r.add_get("/playlists", self._empty)
+        r.add_put("/:/rate", self._ok)
+        r.add_get("/:/scrobble", self._ok)
+        r.add_get("/:/unscrobble", self._ok)
+        r.add_get("/:/websockets/notifications", self._notifications)
+
+    # ------------------------------------------------------------- server
+
+    async def close(self) -> None:
+        for ws in list(self._sockets):
+            await ws.close()
+        await super().close()
+
+    async def _notifications(self, request: web.Request) -> web.StreamResponse:
+        ws = web.WebSocketResponse(heartbeat=30)
+        await ws.prepare(request)
+        self._sockets.add(ws)
+        try:
+            async for _ in ws:
+                pass
+        finally:
+            self._sockets.discard(ws)
+        return ws
+
+    # ---------------------------------------------------------- mutations
+
+    def _tick(self) -> int:
+        self._clock += 1
+        return self._clock
+
+    async def _notify(self, key: int, title: str, *states: int) -> None:
+        entries = [
+            {"identifier": "com.plexapp.plugins.library", "sectionID": str(MOVIE_SECTION), "itemID": str(key),
+             "type": TYPE_MOVIE, "title": title, "state": state, "updatedAt": self._clock}
+            for state in states
+        ]
+        msg = json.dumps({"NotificationContainer": {"type": "timeline", "size": len(entries), "TimelineEntry": entries}})
+        for ws in list(self._sockets):
+            try:
+                await ws.send_str(msg)
+            except Exception:
+                self._sockets.discard(ws)
+
+    async def add_movie(self, *, notify: bool = True) -> int:
+        """Bring the next catalog movie into the library; returns its ratingKey."""
+        lib = self.library
+        if self._movie_count >= lib.catalog_movies:
+            raise ValueError("synthetic catalog has no movies left to add")
+        m = lib.movies[self._movie_count]
+        self._movie_count += 1
+        m["owned"] = True
+        m["added_at"] = m["updated_at"] = self._tick()
+        self._choices.clear()
+        if notify:
+            # Created, then metadata done, as the real server reports a scan
+            await self._notify(MOVIE_KEY_BASE + m["i"], m["title"], 0, 5)
+        return MOVIE_KEY_BASE + m["i"]
+
+    async def touch_movie(self, key: int, *, notify: bool = True, **fields: Any) -> None:
+        """Change fields of a library movie (a metadata refresh) and bump its updatedAt."""
+        m = self._movie_by_key(key)
+        if m is None:
+            raise KeyError(key)
+        m.update(fields)
+        m["updated_at"] = self._tick()
+        self._choices.clear()
+        if notify:
+            await self._notify(key, m["title"], 5)
+
+    async def delete_movie(self, key: int, *, notify: bool = True) -> None:
+        m = self._movie_by_key(key)
+        if m is None:
+            raise KeyError(key)
+        self._deleted.add(m["i"])
+        self._tick()
+        self._choices.clear()
+        if notify:
+            await self._notify(key, m["title"], 9)
+
+    async def _root(self, request: web.Request) -> web.Response:
+        return _container(
+            friendlyName="Stand-in Plex", machineIdentifier=self.machine_id, version="1.40.2.8395-c67dce28e",
+            platform="Linux", platformVersion="6.1", myPlex=False, multiuser=True, transcoderActiveVideoSessions=0,
+            updatedAt=EPOCH, size=0,
+        )
+
+    async def _identity(self, request: web.Request) -> web.Response:
+        return _container(machineIdentifier=self.machine_id, version="1.40.2.8395-c67dce28e", size=0)
+
+    async def _library(self, request: web.Request) -> web.Response:
+        return _container(_el("Directory", key="sections", title="Library Sections"), identifier="com.plexapp.plugins.library", title1="Plex Library", size=1)
+
+    def _section_xml(self, key: int) -> str:
+        movie = key == MOVIE_SECTION
+        return _el(
+            "Directory",
+            _el("Location", id=key, path="/data/movies" if movie else "/data/tv"),
+            key=key, type="movie" if movie else "show", title="Movies" if movie else "TV Shows",
+            agent="tv.plex.agents.movie" if movie else "tv.plex.agents.series",
+            scanner="Plex Movie" if movie else "Plex TV Series", language="en-US",
+            uuid=f"{self.machine_id}-{key}", filters=True, refreshing=False, allowSync=True,
+            createdAt=EPOCH - 6 * 365 * 86400, updatedAt=EPOCH, scannedAt=EPOCH, content=True, directory=True,
+        )
+
+    async def _sections(self, request: web.Request) -> web.Response:
+        return _container(self._section_xml(MOVIE_SECTION) + self._section_xml(SHOW_SECTION), size=2, title1="Plex Library")
+
+    async def _empty(self, request: web.Request) -> web.Response:
+        return _container(size=0)
+
+    async def _ok(self, request: web.Request) -> web.Response:
+        return web.Response(status=200)
+
+    # -------------------------------------------------------- item fields
+
+    def _tag_name(self, field: str, tag_id: Any) -> str:
+        if field in ("actor", "director", "writer"):
+            return self.library.person_name(int(tag_id) - PERSON_TAG_BASE)
+        return str(tag_id)
+
+    def _values(self, kind: str, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Filterable/sortable values of an item, keyed by Plex field name."""
+        if kind == "movie":
+            return {
+                "title": item["title"], "titleSort": item["title_sort"], "studio": item["studio"],
+                "contentRating": item["content_rating"], "year": item["year"], "rating": item["rating"],
+                "audienceRating": item["audience_rating"], "viewCount": item["view_count"], "duration": item["runtime"] * 60_000,
+                "addedAt": item["added_at"], "updatedAt": item["updated_at"], "lastViewedAt": item["last_viewed_at"],
+                "originallyAvailableAt": item["release"], "genre": [g + 1 for g in item["genres"]],
+                "actor": [PERSON_TAG_BASE + p for p in item["cast"]], "director": [PERSON_TAG_BASE + p for p in item["directors"]],
+                "writer": [PERSON_TAG_BASE + p for p in item["writers"]], "country": [COUNTRY_TAG_BASE + COUNTRIES.index(item["country"])],
+                "resolution": [item["resolution"]], "unwatched": item["view_count"] == 0,
+            }
+        if kind == "show":
+            return {
+                "title": item["title"], "titleSort": item["title_sort"], "studio": item["network"],
+                "contentRating": item["content_rating"], "year": item["year"], "rating": item["rating"],
+                "addedAt": item["added_at"], "updatedAt": item["added_at"], "lastViewedAt": None,
+                "originallyAvailableAt": item["first_air"], "genre": [g + 1 for g in item["genres"]],
+                "actor": [PERSON_TAG_BASE + p for p in item["cast"]], "unwatched": True,
+            }
+        if kind == "season":
+            return {"title": f"Season {item['index']}", "titleSort": f"Season {item['index']:04d}", "addedAt": item["added_at"], "unwatched": True}
+        return {
+            "title": item["title"], "titleSort": item["title"], "year": int(iso_date(item["aired"])[:4]),
+            "rating": item["rating"], "viewCount": item["view_count"], "duration": item["duration"],
+            "addedAt": item["added_at"], "updatedAt": item["added_at"], "lastViewedAt": item["last_viewed_at"],
+            "originallyAvailableAt": item["aired"], "unwatched": item["view_count"] == 0,
+        }
+
+    def _owned_movies(self) -> Iterable[Dict[str, Any]]:
+        movies = self.library.movies[: self._movie_count]
+        return (m for m in movies if m["i"] not in self._deleted) if self._deleted else movies
+
+    def _movie_by_key(self, key: int) -> Optional[Dict[str, Any]]:
+        i = key - MOVIE_KEY_BASE
+        return self.library.movies[i] if 0 <= i < self._movie_count and i not in self._deleted else None
+
+    # ------------------------------------------------------------ item XML
+
+    def _movie_xml(self, m: Dict[str, Any], detail: bool) -> str:
+        lib = self.library
+        key = MOVIE_KEY_BASE + m["i"]
+        streams = ""
+        if detail:
+            streams = (
+                _el("Stream", id=key * 10 + 1, streamType=1, codec=m["video_codec"], height=m["height"], width=m["width"],
+                    DOVIPresent=m["hdr"] or None, colorTrc="smpte2084" if m["hdr"] else None, default=True)
+                + _el("Stream", id=key * 10 + 2, streamType=2, codec=m["audio_codec"], channels=6, language="English", languageCode="eng", default=True)
+            )
+        part = _el("Part", streams, id=key, key=f"/library/parts/{key}/file.mkv", file=f"/data/movies/{m['title']} ({m['year']}).mkv",
+                   size=m["size"], duration=m["runtime"] * 60_000, container="mkv")
+        media = _el("Media", part, id=key, videoResolution=m["resolution"], videoCodec=m["video_codec"], audioCodec=m["audio_codec"],
+                    height=m["height"], width=m["width"], container="mkv", duration=m["runtime"] * 60_000, audioChannels=6,
+                    bitrate=int(m["size"] * 8 / (m["runtime"] * 60) / 1000))
+        genres = [(g + 1, MOVIE_GENRES[g][1]) for g in m["genres"]]
+        cast = m["cast"] if detail else m["cast"][:3]
+        tags = "".join(_el("Genre", id=gid if detail else None, tag=name) for gid, name in (genres if detail else genres[:2]))
+        tags += _el("Country", id=COUNTRY_TAG_BASE + COUNTRIES.index(m["country"]) if detail else None, tag=m["country"])
+        tags += "".join(_el("Director", id=PERSON_TAG_BASE + p if detail else None, tag=lib.person_name(p)) for p in m["directors"])
+        if detail:
+            tags += "".join(_el("Writer", id=PERSON_TAG_BASE + p, tag=lib.person_name(p)) for p in m["writers"])
+            tags += "".join(_el("Guid", id=g) for g in (f"imdb://{m['imdb_id']}", f"tmdb://{m['tmdb_id']}"))
+        tags += "".join(_el("Role", id=PERSON_TAG_BASE + p if detail else None, tag=lib.person_name(p), role="Lead" if detail and n == 0 else None) for n, p in enumerate(cast))
+        return _el(
+            "Video", media + tags,
+            ratingKey=key, key=f"/library/metadata/{key}", guid=f"plex://movie/{key:024x}", type="movie", title=m["title"],
+            titleSort=m["title_sort"] if m["title_sort"] != m["title"] else None, librarySectionID=MOVIE_SECTION,
+            librarySectionTitle="Movies", studio=m["studio"], contentRating=m["content_rating"], summary=m["summary"],
+            rating=m["rating"], audienceRating=m["audience_rating"], year=m["year"], tagline=m["tagline"] if detail else None,
+            duration=m["runtime"] * 60_000, originallyAvailableAt=iso_date(m["release"]), addedAt=m["added_at"],
+            updatedAt=m["updated_at"], viewCount=m["view_count"] or None, lastViewedAt=m["last_viewed_at"],
+            thumb=f"/library/metadata/{key}/thumb/{m['updated_at']}",
+        )
+
+    def _show_xml(self, s: Dict[str, Any], detail: bool) -> str:
+        lib = self.library
+        key = SHOW_KEY_BASE + s["j"]
+        genres = [(g + 1, TV_GENRES[g][1]) for g in s["genres"]]
+        tags = "".join(_el("Genre", id=gid if detail else None, tag=name) for gid, name in genres)
+        tags += "".join(_el("Role", id=PERSON_TAG_BASE + p if detail else None, tag=lib.person_name(p)) for p in (s["cast"] if detail else s["cast"][:3]))
+        if detail:
+            tags += "".join(_el("Guid", id=g) for g in (f"imdb://{s['imdb_id']}", f"tmdb://{s['tmdb_id']}", f"tvdb://{s['tvdb_id']}"))
+        return _el(
+            "Directory", tags,
+            ratingKey=key, key=f"/library/metadata/{key}/children", guid=f"plex://show/{key:024x}", type="show",
+            title=s["title"], titleSort=s["title_sort"] if s["title_sort"] != s["title"] else None, librarySectionID=SHOW_SECTION,
+            librarySectionTitle="TV Shows", studio=s["network"], contentRating=s["content_rating"], summary=s["summary"],
+            rating=s["rating"], year=s["year"], duration=s["runtime"] * 60_000, originallyAvailableAt=iso_date(s["first_air"]),
+            leafCount=s["episodes"], viewedLeafCount=0, childCount=len(s["seasons"]), addedAt=s["added_at"], updatedAt=s["added_at"],
+            thumb=f"/library/metadata/{key}/thumb/{s['added_at']}",
+        )
+
+    def _season_xml(self, season: Dict[str, Any], detail: bool) -> str:
+        show = season["show"]
+        return _el(
+            "Directory",
+            ratingKey=season["key"], key=f"/library/metadata/{season['key']}/children", parentRatingKey=SHOW_KEY_BASE + show["j"],
+            parentTitle=show["title"], parentKey=f"/library/metadata/{SHOW_KEY_BASE + show['j']}", type="season",
+            title=f"Season {season['index']}", index=season["index"], librarySectionID=SHOW_SECTION, leafCount=season["episodes"],
+            viewedLeafCount=0, addedAt=season["added_at"], updatedAt=season["added_at"],
+        )
+
+    def _episode_xml(self, e: Dict[str, Any], detail: bool) -> str:
+        show = e["show"]
+        show_key = SHOW_KEY_BASE + show["j"]
+        season_key = SEASON_KEY_BASE + show["season_start"] + e["season"] - 1
+        part = _el("Part", id=e["key"], key=f"/library/parts/{e['key']}/file.mkv", duration=e["duration"], container="mkv",
+                   file=f"/data/tv/{show['title']}/Season {e['season']:02d}/S{e['season']:02d}E{e['index']:02d}.mkv")
+        media = _el("Media", part, id=e["key"], videoResolution="1080", videoCodec="h264", audioCodec="eac3", duration=e["duration"], container="mkv")
+        return _el(
+            "Video", media,
+            ratingKey=e["key"], key=f"/library/metadata/{e['key']}", type="episode", title=e["title"],
+            grandparentRatingKey=show_key, grandparentTitle=show["title"], grandparentKey=f"/library/metadata/{show_key}",
+            parentRatingKey=season_key, parentTitle=f"Season {e['season']}", parentKey=f"/library/metadata/{season_key}",
+            parentIndex=e["season"], index=e["index"], librarySectionID=SHOW_SECTION, summary=e["summary"], rating=e["rating"],
+            contentRating=show["content_rating"], duration=e["duration"], originallyAvailableAt=iso_date(e["aired"]),
+            year=int(iso_date(e["aired"])[:4]), addedAt=e["added_at"], updatedAt=e["added_at"],
+            viewCount=e["view_count"] or None, lastViewedAt=e["last_viewed_at"],
+        )
+
+    def _xml(self, kind: str, item: Dict[str, Any], detail: bool = False) -> str:
+        return {"movie": self._movie_xml, "show": self._show_xml, "season": self._season_xml, "episode": self._episode_xml}[kind](item, detail)
+
+    def _by_key(self, key: int) -> Optional[Tuple[str, Dict[str, Any]]]:
+        lib = self.library
+        for kind, lookup in (("movie", self._movie_by_key), ("show", lib.show_by_key), ("season", lib.season_by_key), ("episode", lib.episode_by_key)):
+            item = lookup(key)
+            if item is not None:
+                return kind, item
+        return None
+
+    # ------------------------------------------------------- section listing
+
+    def _section_items(self, section: int, type_id: int) -> Tuple[str, Callable[[], Iterable[Dict[str, Any]]], int]:
+        """(kind, item iterator factory, total count) for a section/type pair."""
+        lib = self.library
+        if section == MOVIE_SECTION and type_id == TYPE_MOVIE:
+            return "movie", lambda: self._owned_movies(), self._movie_count - len(self._deleted)
+        if section == SHOW_SECTION and type_id == TYPE_SHOW:
+            return "show", lambda: lib.series[: lib.scale.series], lib.scale.series
+        if section == SHOW_SECTION and type_id == TYPE_SEASON:
+            lib.series
+            return "season", lambda: (lib.season_by_key(SEASON_KEY_BASE + g) for g in range(lib.season_count)), lib.season_count
+        if section == SHOW_SECTION and type_id == TYPE_EPISODE:
+            lib.series
+            return "episode", lambda: (lib.episode(g) for g in range(lib.episode_count)), lib.episode_count
+        if type_id == TYPE_COLLECTION:
+            return "collection", lambda: [], 0
+        raise web.HTTPBadRequest()
+
+    @staticmethod
+    def _paging(request: web.Request) -> Tuple[int, Optional[int]]:
+        def read(name: str) -> Optional[int]:
+            raw = request.headers.get(name) or request.query.get(name)
+            try:
+                return int(raw) if raw not in (None, "") else None
+            except ValueError:
+                return None
+
+        return max(0, read("X-Plex-Container-Start") or 0), read("X-Plex-Container-Size")
+
+    def _date_value(self, raw: str) -> float:
+        m = _RELATIVE.match(raw.strip())
+        if m:
+            return EPOCH - int(m.group(1)) * _UNIT_S[m.group(2)]
+        return float(raw)
+
+    def _predicate(self, field: str, op: str, raw: str, ftype: str) -> Callable[[Dict[str, Any]], bool]:
+        values = raw.split(",")
+        if ftype in ("tag", "resolution"):
+            wanted = {v.lower() for v in values}
+            hit = lambda vals: bool(vals) and any(str(v).lower() in wanted for v in (vals if isinstance(vals, list) else [vals]))  # noqa: E731
+            return (lambda d: not hit(d.get(field))) if op.startswith("!") else (lambda d: hit(d.get(field)))
+        if ftype == "boolean":
+            want = values[0] not in ("0", "false")
+            if op.startswith("!"):
+                want = not want
+            return lambda d: bool(d.get(field)) == want
+        if ftype == "string":
+            needles = [v.lower() for v in values]
+
+            def test(d: Dict[str, Any]) -> bool:
+                s = str(d.get(field) or "").lower()
+                checks = {
+                    "": lambda n: n in s, "!": lambda n: n not in s, "=": lambda n: s == n, "!=": lambda n: s != n,
+                    "<": lambda n: s.startswith(n), ">": lambda n: s.endswith(n),
+                }[op]
+                return all(checks(n) for n in needles) if op.startswith("!") else any(checks(n) for n in needles)
+
+            return test
+        conv = self._date_value if ftype == "date" else float
+        nums = [conv(v) for v in values]
+
+        def compare(d: Dict[str, Any]) -> bool:
+            v = d.get(field)
+            if v is None:
+                return op == "!"
+            if op == ">>":
+                return v > nums[0]
+            if op == "<<":
+                return v < nums[0]
+            return (v not in nums) if op == "!" else (v in nums)
+
+        return compare
+
+    def _filters(self, request: web.Request, kind: str) -> List[Callable[[Dict[str, Any]], bool]]:
+        types = dict(_FIELDS.get(kind, []))
+        preds = []
+        for key, raw in request.query.items():
+            if key in ("type", "sort", "includeGuids", "includeMeta", "includeAdvanced", "includeCollections",
+                       "includeExternalMedia", "X-Plex-Token", "X-Plex-Container-Start", "X-Plex-Container-Size", "limit"):
+                continue
+            m = _FILTER_KEY.match(key)
+            if not m or m.group(1) not in types:
+                continue
+            preds.append(self._predicate(m.group(1), m.group(2) or "", raw, types[m.group(1)]))
+        return preds
+
+    def _sorter(self, request: web.Request, kind: str) -> Optional[Callable[[List[Tuple[Dict[str, Any], Dict[str, Any]]]], None]]:
+        spec = request.query.get("sort")
+        if not spec:
+            return None
+        keys: List[Tuple[str, bool]] = []
+        for part in spec.split(","):
+            field, _, direction = part.strip().partition(":")
+            keys.append((field.split(".")[-1], direction == "desc"))
+
+        def apply(rows: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> None:
+            for field, desc in reversed(keys):
+                if field == "random":
+                    self._rng.shuffle(rows)
+                    continue
+                # None sorts last either way, like the real server's default
+                present = [r for r in rows if r[1].get(field) is not None]
+                missing = [r for r in rows if r[1].get(field) is None]
+                present.sort(key=lambda r: (str(r[1][field]).lower() if isinstance(r[1][field], str) else r[1][field]), reverse=desc)
+                rows[:] = present + missing
+
+        return apply
+
+    def _listing(self, request: web.Request, kind: str, items: Iterable[Dict[str, Any]], total: Optional[int], meta: str = "", **container: Any) -> web.Response:
+        preds = self._filters(request, kind)
+        sorter = self._sorter(request, kind)
+        if "title" in request.query and not any(k.startswith("title") and k != "title" for k in request.query):
+            needle = request.query["title"].lower()
+            preds.append(lambda d: needle in str(d.get("title", "")).lower())
+        start, size = self._paging(request)
+        if not preds and sorter is None and total is not None:
+            # Fast path: default order, slice without touching every item
+            rows = []
+            end = total if size is None else min(total, start + size)
+            for n, item in enumerate(items):
+                if n >= end:
+                    break
+                if n >= start:
+                    rows.append(item)
+            body = meta + "".join(self._xml(kind, it) for it in rows)
+            return _container(body, size=len(rows), totalSize=total, offset=start, **container)
+        matched = [(it, v) for it in items for v in (self._values(kind, it),) if all(p(v) for p in preds)]
+        if sorter is not None:
+            sorter(matched)
+        page = matched[start:] if size is None else matched[start : start + size]
+        body = meta + "".join(self._xml(kind, it) for it, _ in page)
+        return _container(body, size=len(page), totalSize=len(matched), offset=start, **container)
+
+    def _meta_xml(self, section: int) -> str:
+        type_ids = [TYPE_MOVIE] if section == MOVIE_SECTION else [TYPE_SHOW, TYPE_SEASON, TYPE_EPISODE]
+        out = []
+        for type_id in type_ids:
+            kind = _TYPE_NAMES[type_id]
+            filters = "".join(
+                _el("Filter", filter=f, filterType="string" if t in ("tag", "resolution") else t, key=f"/library/sections/{section}/{f}?type={type_id}",
+                    title=f[:1].upper() + f[1:], type="filter")
+                for f, t in _FIELDS[kind] if t in ("tag", "resolution", "boolean")
+            )
+            sorts = "".join(_el("Sort", key=k, title=k, defaultDirection="desc" if k in ("addedAt", "rating", "lastViewedAt") else "asc",
+                                descKey=f"{k}:desc", default="asc" if k == "titleSort" else None) for k in _SORTS)
+            flds = "".join(_el("Field", key=f, title=f, type=t) for f, t in _FIELDS[kind])
+            out.append(_el("Type", filters + sorts + flds, key=f"/library/sections/{section}/all?type={type_id}", type=kind,
+                           title=kind.title() + "s", active=type_id == type_ids[0]))
+        out.append("".join(_el("FieldType", "".join(_el("Operator", key=k, title=t) for k, t in ops), type=ft) for ft, ops in _FIELD_TYPES.items()))
+        return _el("Meta", "".join(out))
+
+    async def _section_all(self, request: web.Request) -> web.Response:
+        section = int(request.match_info["section"])
+        if section not in (MOVIE_SECTION, SHOW_SECTION):
+            raise web.HTTPNotFound()
+        default_type = TYPE_MOVIE if section == MOVIE_SECTION else TYPE_SHOW
+        type_id = int(request.query.get("type") or default_type)
+        kind, items, total = self._section_items(section, type_id)
+        meta = self._meta_xml(section) if request.query.get("includeMeta") == "1" else ""
+        return self._listing(request, kind, items(), total, meta, librarySectionID=section, librarySectionTitle="Movies" if section == MOVIE_SECTION else "TV Shows")
+
+    async def _section_collections(self, request: web.Request) -> web.Response:
+        section = int(request.match_info["section"])
+        meta = ""
+        if request.query.get("includeMeta") == "1":
+            flds = "".join(_el("Field", key=f, title=f, type=t) for f, t in _FIELDS["collection"])
+            meta = _el("Meta", _el("Type", flds, key=f"/library/sections/{section}/collections?type={TYPE_COLLECTION}", type="collection", title="Collections", active=False))
+        return _container(meta, size=0, totalSize=0, librarySectionID=section)
+
+    async def _section_recently_added(self, request: web.Request) -> web.Response:
+        section = int(request.match_info["section"])
+        kind, items, _ = self._section_items(section, TYPE_MOVIE if section == MOVIE_SECTION else TYPE_SHOW)
+        rows = sorted(items(), key=lambda it: it["added_at"], reverse=True)
+        start, size = self._paging(request)
+        page = rows[start : start + (size or 50)]
+        return _container("".join(self._xml(kind, it) for it in page), size=len(page), totalSize=len(rows), librarySectionID=section)
+
+    async def _filter_choices(self, request: web.Request) -> web.Response:
+        section = int(request.match_info["section"])
+        field = request.match_info["filter"]
+        type_id = int(request.query.get("type") or (TYPE_MOVIE if section == MOVIE_SECTION else TYPE_SHOW))
+        cache_key = (section, field, type_id)
+        if cache_key not in self._choices:
+            kind, items, _ = self._section_items(section, type_id)
+            if field not in dict(_FIELDS.get(kind, [])):
+                raise web.HTTPNotFound()
+            seen: Dict[Any, str] = {}
+            for it in items():
+                vals = self._values(kind, it).get(field)
+                for v in vals if isinstance(vals, list) else [vals]:
+                    if v is None or v in seen:
+                        continue
+                    if field == "genre":
+                        seen[v] = (MOVIE_GENRES if kind == "movie" else TV_GENRES)[v - 1][1]
+                    elif field == "country":
+                        seen[v] = COUNTRIES[v - COUNTRY_TAG_BASE]
+                    elif field == "resolution":
+                        seen[v] = {r[0]: r[0].upper() if r[0] in ("4k", "sd") else f"{r[0]}p" for r in RESOLUTIONS}[v]
+                    elif field == "unwatched":
+                        continue
+                    else:
+                        seen[v] = self._tag_name(field, v)
+            self._choices[cache_key] = "".join(
+                _el("Directory", key=k, title=t, type=field, fastKey=f"/library/sections/{section}/all?{field}={k}")
+                for k, t in sorted(seen.items(), key=lambda kv: kv[1].lower())
+            )
+        body = self._choices[cache_key]
+        return _container(body, size=body.count("<Directory"))
+
+    # ------------------------------------------------------------- metadata
+
+    async def _metadata(self, request: web.Request) -> web.Response:
+        parts = []
+        for raw in request.match_info["keys"].split(","):
+            try:
+                found = self._by_key(int(raw))
+            except ValueError:
+                found = None
+            if found is not None:
+                parts.append(self._xml(found[0], found[1], detail=True))
+        if not parts:
+            raise web.HTTPNotFound()
+        return _container("".join(parts), size=len(parts))
+
+    async def _children(self, request: web.Request) -> web.Response:
+        found = self._by_key(int(request.match_info["key"]))
+        if found is None:
+            raise web.HTTPNotFound()
+        kind, item = found
+        if kind == "show":
+            rows = [self.library.season(item, n) for n in range(1, len(item["seasons"]) + 1)]
+            return self._listing(request, "season", rows, len(rows), key=f"/library/metadata/{SHOW_KEY_BASE + item['j']}/children")
+        if kind == "season":
+            rows = [self.library.episode(g) for g in range(item["first_episode"], item["first_episode"] + item["episodes"])]
+            return self._listing(request, "episode", rows, len(rows), parentIndex=item["index"])
+        return _container(size=0)
+
+    async def _all_leaves(self, request: web.Request) -> web.Response:
+        found = self._by_key(int(request.match_info["key"]))
+        if found is None or found[0] != "show":
+            raise web.HTTPNotFound()
+        rows = self.library.show_episodes(found[1])
+        return self._listing(request, "episode", rows, len(rows))
+
+    async def _on_deck(self, request: web.Request) -> web.Response:
+        lib = self.library
+        lib.series
+        picks = []
+        for show in lib.series[: min(lib.scale.series, 12)]:
+            e = lib.episode(show["ep_start"] + min(show["episodes"] - 1, 1))
+            picks.append(self._episode_xml(e, False).replace("<Video ", f'<Video viewOffset="{e["duration"] // 3}" ', 1))
+        return _container("".join(picks), size=len(picks))
+
+    async def _recently_added(self, request: web.Request) -> web.Response:
+        lib = self.library
+        rows = sorted(self._owned_movies(), key=lambda m: m["added_at"], reverse=True)[:50]
+        return _container("".join(self._movie_xml(m, False) for m in rows), size=len(rows))
+
+    async def _hub_search(self, request: web.Request) -> web.Response:
+        query = request.query.get("query", "")
+        limit = int(request.query.get("limit") or 10)
+        section = request.query.get("sectionId")
+        hubs = []
+        if section in (None, str(MOVIE_SECTION)):
+            movies = self.library.search_movies(query)[:limit]
+            hubs.append(_el("Hub", "".join(self._movie_xml(m, False) for m in movies), hubIdentifier="movie", type="movie", title="Movies", size=len(movies), more=False))
+        if section in (None, str(SHOW_SECTION)):
+            shows = self.library.search_series(query)[:limit]
+            hubs.append(_el("Hub", "".join(self._show_xml(s, False) for s in shows), hubIdentifier="show", type="show", title="Shows", size=len(shows), more=False))
+        return _container("".join(hubs), size=len(hubs))
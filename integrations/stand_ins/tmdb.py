@@ -0,0 +1,438 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Optional
+
+from aiohttp import web
+
+from .base import FaultProfile, StandInService, json_response
+from .library import (
+    EPOCH,
+    MOVIE_GENRES,
+    TMDB_PERSON_BASE,
+    TV_GENRES,
+    SyntheticLibrary,
+    _rng,
+    iso_date,
+    iso_datetime,
+)
+
+PAGE_SIZE = 20
+MAX_PAGES = 500  # TMDb refuses page > 500
+_DEPARTMENTS = {"directors": ("Directing", "Director"), "writers": ("Writing", "Screenplay")}
+
+
+class TMDbStandIn(StandInService):
+    """TMDb v3 stand-in over the whole ``SyntheticLibrary`` catalog (owned and not).
+
+    Answers every path ``TMDbClient`` calls with TMDb-shaped JSON: 20-item pages,
+    ``append_to_response`` sub-objects, and TMDb's ``status_code``/``status_message``
+    error bodies (7 = bad key, 34 = not found, 25 = rate limited).
+    """
+
+    name = "tmdb"
+
+    def __init__(self, library: SyntheticLibrary, faults: Optional[FaultProfile] = None, *, api_key: str = "stand-in-tmdb-key", seed: int = 7) -> None:
+        super().__init__(faults, seed=seed)
+        self.library = library
+        self.api_key = api_key
+        self._popular: Dict[str, List[Dict[str, Any]]] = {}
+        self._keywords: Optional[List[str]] = None
+
+    def _authorized(self, request: web.Request) -> bool:
+        if request.query.get("api_key") == self.api_key:
+            return True
+        return request.headers.get("Authorization", "") == f"Bearer {self.api_key}"
+
+    def _url(self, host: str, port: int) -> str:
+        return f"http://{host}:{port}/3"
+
+    def _error_body(self, status: int) -> web.Response:
+        code, message = {
+            401: (7, "Invalid API key: You must be granted a valid key."),
+            404: (34, "The resource you requested could not be found."),
+            422: (22, "Invalid page: Pages start at 1 and max at 500. They are expected to be an integer."),
+            429: (25, "Your request count (#) is over the allowed limit of (40)."),
+        }.get(status, (11, "Internal error: Something went wrong, contact TMDb."))
+        return json_response({"success": False, "status_code": code, "status_message": message}, status=status)
+
+    def _routes(self, app: web.Application) -> None:
+        r = app.router
+        r.add_get("/3/configuration", self._configuration)
+        r.add_get("/3/search/movie", self._search_movie)
+        r.add_get("/3/search/tv", self._search_tv)
+        r.add_get("/3/search/multi", self._search_multi)
+        r.add_get("/3/search/person", self._search_person)
+        r.add_get("/3/search/keyword", self._search_keyword)
+        r.add_get("/3/genre/{media}/list", self._genres)
+        r.add_get("/3/discover/movie", self._discover_movie)
+        r.add_get("/3/discover/tv", self._discover_tv)
+        r.add_get("/3/trending/{media}/{window}", self._trending)
+        for name, key in (("popular", "popularity"), ("top_rated", "vote_average"), ("upcoming", "release"), ("now_playing", "recent")):
+            r.add_get(f"/3/movie/{name}", self._movie_list(key))
+        for name, key in (("popular", "popularity"), ("top_rated", "vote_average"), ("on_the_air", "recent"), ("airing_today", "recent")):
+            r.add_get(f"/3/tv/{name}", self._tv_list(key))
+        r.add_get("/3/movie/{id:\\d+}", self._movie_details)
+        r.add_get("/3/movie/{id:\\d+}/{sub}", self._movie_sub)
+        r.add_get("/3/movie/{id:\\d+}/watch/providers", self._providers)
+        r.add_get("/3/tv/{id:\\d+}", self._tv_details)
+        r.add_get("/3/tv/{id:\\d+}/{sub}", self._tv_sub)
+        r.add_get("/3/tv/{id:\\d+}/watch/providers", self._providers)
+        r.add_get("/3/collection/{id:\\d+}", self._collection)
+        r.add_get("/3/person/{id:\\d+}", self._person)
+        r.add_get("/3/person/{id:\\d+}/{sub}", self._person_sub)
+
+    # ---------------------------------------------------------------- shapes
+
+    def _movie(self, m: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "id": m["tmdb_id"], "title": m["title"], "original_title": m["title"], "media_type": "movie",
+            "overview": m["summary"], "release_date": iso_date(m["release"]), "genre_ids": [MOVIE_GENRES[g][0] for g in m["genres"]],
+            "vote_average": m["audience_rating"], "vote_count": m["vote_count"], "popularity": m["popularity"],
+            "original_language": m["language"], "adult": False, "video": False,
+            "poster_path": f"/p{m['tmdb_id']}.jpg", "backdrop_path": f"/b{m['tmdb_id']}.jpg",
+        }
+
+    def _tv(self, s: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "id": s["tmdb_id"], "name": s["title"], "original_name": s["title"], "media_type": "tv",
+            "overview": s["summary"], "first_air_date": iso_date(s["first_air"]), "genre_ids": [TV_GENRES[g][0] for g in s["genres"]],
+            "vote_average": s["rating"], "vote_count": s["vote_count"], "popularity": s["popularity"],
+            "original_language": s["language"], "origin_country": ["US"],
+            "poster_path": f"/p{s['tmdb_id']}.jpg", "backdrop_path": f"/b{s['tmdb_id']}.jpg",
+        }
+
+    def _person_item(self, p: int) -> Dict[str, Any]:
+        movies, _ = self.library.credits_for(p) if p < 50 else ([], [])
+        return {
+            "id": TMDB_PERSON_BASE + p, "name": self.library.person_name(p), "media_type": "person",
+            "known_for_department": "Acting", "popularity": round(100.0 / (1 + p), 3), "adult": False,
+            "profile_path": f"/h{p}.jpg", "known_for": [self._movie(m) for m in movies[:3]],
+        }
+
+    def _page(self, request: web.Request, items: List[Dict[str, Any]]) -> web.Response:
+        try:
+            page = int(request.query.get("page", 1))
+        except ValueError:
+            page = 0
+        if not 1 <= page <= MAX_PAGES:
+            raise web.HTTPUnprocessableEntity()
+        start = (page - 1) * PAGE_SIZE
+        total_pages = min(MAX_PAGES, (len(items) + PAGE_SIZE - 1) // PAGE_SIZE)
+        return json_response({"page": page, "results": items[start : start + PAGE_SIZE], "total_pages": total_pages, "total_results": len(items)})
+
+    def _movie_for(self, request: web.Request) -> Dict[str, Any]:
+        m = self.library.movie_by_tmdb(int(request.match_info["id"]))
+        if m is None:
+            raise web.HTTPNotFound()
+        return m
+
+    def _show_for(self, request: web.Request) -> Dict[str, Any]:
+        s = self.library.show_by_tmdb(int(request.match_info["id"]))
+        if s is None:
+            raise web.HTTPNotFound()
+        return s
+
+    def _ranked(self, kind: str, key: str) -> List[Dict[str, Any]]:
+        cache_key = f"{kind}:{key}"
+        if cache_key not in self._popular:
+            pool = self.library.movies if kind == "movie" else self.library.series
+            if key == "popularity":
+                ranked = sorted(pool, key=lambda x: -x["popularity"])
+            elif key == "vote_average":
+                ranked = sorted((x for x in pool if x["vote_count"] >= 200), key=lambda x: -(x.get("audience_rating") or x["rating"]))
+            elif key == "release":
+                ranked = sorted(pool, key=lambda x: -x["release"])[: 5 * PAGE_SIZE]
+            else:
+                field = "release" if kind == "movie" else "first_air"
+                ranked = sorted(pool, key=lambda x: -x[field])[: 3 * PAGE_SIZE]
+            self._popular[cache_key] = [self._movie(x) if kind == "movie" else self._tv(x) for x in ranked]
+        return self._popular[cache_key]
+
+    # ------------------------------------------------------------- handlers
+
+    async def _configuration(self, request: web.Request) -> web.Response:
+        return json_response({
+            "images": {
+                "base_url": "http://image.tmdb.org/t/p/", "secure_base_url": "https://image.tmdb.org/t/p/",
+                "poster_sizes": ["w92", "w154", "w185", "w342", "w500", "w780", "original"],
+                "backdrop_sizes": ["w300", "w780", "w1280", "original"], "profile_sizes": ["w45", "w185", "h632", "original"],
+            },
+            "change_keys": ["genres", "overview", "release_dates", "title"],
+        })
+
+    async def _search_movie(self, request: web.Request) -> web.Response:
+        hits = self.library.search_movies(request.query.get("query", ""), owned_only=False)
+        year = request.query.get("primary_release_year") or request.query.get("year")
+        if year:
+            hits = [m for m in hits if str(m["year"]) == year]
+        return self._page(request, [self._movie(m) for m in hits])
+
+    async def _search_tv(self, request: web.Request) -> web.Response:
+        hits = self.library.search_series(request.query.get("query", ""), owned_only=False)
+        year = request.query.get("first_air_date_year")
+        if year:
+            hits = [s for s in hits if str(s["year"]) == year]
+        return self._page(request, [self._tv(s) for s in hits])
+
+    async def _search_person(self, request: web.Request) -> web.Response:
+        return self._page(request, [self._person_item(p) for p in self.library.search_people(request.query.get("query", ""))])
+
+    async def _search_multi(self, request: web.Request) -> web.Response:
+        q = request.query.get("query", "")
+        items = [self._movie(m) for m in self.library.search_movies(q, owned_only=False)]
+        items += [self._tv(s) for s in self.library.search_series(q, owned_only=False)]
+        items.sort(key=lambda x: -x["popularity"])
+        items += [self._person_item(p) for p in self.library.search_people(q, limit=20)]
+        return self._page(request, items)
+
+    async def _search_keyword(self, request: web.Request) -> web.Response:
+        q = request.query.get("query", "").strip().lower()
+        if self._keywords is None:
+            self._keywords = sorted({w for m in self.library.movies[:500] for w in m["summary"].lower().rstrip(".").split() if len(w) > 3})
+        return self._page(request, [{"id": 10_000 + n, "name": w} for n, w in enumerate(self._keywords) if q in w])
+
+    async def _genres(self, request: web.Request) -> web.Response:
+        table = MOVIE_GENRES if request.match_info["media"] == "movie" else TV_GENRES
+        return json_response({"genres": [{"id": gid, "name": name} for gid, name in table]})
+
+    def _discover(self, request: web.Request, kind: str) -> List[Dict[str, Any]]:
+        q = request.query
+        lib = self.library
+        pool = lib.movies if kind == "movie" else lib.series
+        table = MOVIE_GENRES if kind == "movie" else TV_GENRES
+        gid_to_idx = {gid: n for n, (gid, _) in enumerate(table)}
+        preds: List[Callable[[Dict[str, Any]], bool]] = []
+
+        def ids(name: str) -> List[int]:
+            raw = q.get(name, "")
+            return [int(v) for v in raw.replace("|", ",").split(",") if v.strip().isdigit()]
+
+        if ids("with_genres"):
+            wanted = {gid_to_idx.get(g, -1) for g in ids("with_genres")}
+            any_of = "|" in q.get("with_genres", "")
+            preds.append(lambda x: (bool(wanted & set(x["genres"])) if any_of else wanted <= set(x["genres"])))
+        if ids("without_genres"):
+            banned = {gid_to_idx.get(g, -1) for g in ids("without_genres")}
+            preds.append(lambda x: not banned & set(x["genres"]))
+        if ids("with_cast"):
+            cast = {p - TMDB_PERSON_BASE for p in ids("with_cast")}
+            preds.append(lambda x: bool(cast & set(x["cast"])))
+        if ids("with_crew"):
+            crew = {p - TMDB_PERSON_BASE for p in ids("with_crew")}
+            preds.append(lambda x: bool(crew & set(x.get("directors", []) + x.get("writers", []) + x.get("creators", []))))
+        year = q.get("primary_release_year") or q.get("year") or q.get("first_air_date_year")
+        if year:
+            preds.append(lambda x: str(x["year"]) == year)
+        if q.get("with_runtime.gte") or q.get("with_runtime_gte"):
+            lo = int(q.get("with_runtime.gte") or q.get("with_runtime_gte"))
+            preds.append(lambda x: x["runtime"] >= lo)
+        if q.get("with_runtime.lte") or q.get("with_runtime_lte"):
+            hi = int(q.get("with_runtime.lte") or q.get("with_runtime_lte"))
+            preds.append(lambda x: x["runtime"] <= hi)
+        if q.get("with_original_language"):
+            lang = q["with_original_language"]
+            preds.append(lambda x: x["language"] == lang)
+        if q.get("vote_count.gte"):
+            votes = int(q["vote_count.gte"])
+            preds.append(lambda x: x["vote_count"] >= votes)
+        hits = [x for x in pool if all(p(x) for p in preds)]
+        field, _, direction = q.get("sort_by", "popularity.desc").rpartition(".")
+        key = {
+            "popularity": lambda x: x["popularity"], "vote_average": lambda x: x.get("audience_rating") or x["rating"],
+            "vote_count": lambda x: x["vote_count"], "primary_release_date": lambda x: x.get("release") or x.get("first_air"),
+            "release_date": lambda x: x.get("release") or x.get("first_air"), "first_air_date": lambda x: x.get("first_air") or 0,
+            "title": lambda x: x["title"].lower(), "original_title": lambda x: x["title"].lower(), "name": lambda x: x["title"].lower(),
+        }.get(field, lambda x: x["popularity"])
+        hits.sort(key=key, reverse=direction != "asc")
+        return [self._movie(x) if kind == "movie" else self._tv(x) for x in hits]
+
+    async def _discover_movie(self, request: web.Request) -> web.Response:
+        return self._page(request, self._discover(request, "movie"))
+
+    async def _discover_tv(self, request: web.Request) -> web.Response:
+        return self._page(request, self._discover(request, "tv"))
+
+    async def _trending(self, request: web.Request) -> web.Response:
+        media = request.match_info["media"]
+        if media not in ("all", "movie", "tv", "person"):
+            raise web.HTTPNotFound()
+        salt = 1 if request.match_info["window"] == "day" else 2
+        items: List[Dict[str, Any]] = []
+        if media in ("all", "movie"):
+            items += self._ranked("movie", "popularity")[: 10 * PAGE_SIZE]
+        if media in ("all", "tv"):
+            items += self._ranked("tv", "popularity")[: 5 * PAGE_SIZE]
+        if media == "person":
+            items = [self._person_item(p) for p in range(min(self.library.people_count, 5 * PAGE_SIZE))]
+        _rng(self.library.scale.seed, 9, salt).shuffle(items)
+        return self._page(request, items)
+
+    def _movie_list(self, key: str):
+        async def handler(request: web.Request) -> web.Response:
+            return self._page(request, self._ranked("movie", key))
+
+        return handler
+
+    def _tv_list(self, key: str):
+        async def handler(request: web.Request) -> web.Response:
+            return self._page(request, self._ranked("tv", key))
+
+        return handler
+
+    # --------------------------------------------------------------- details
+
+    def _credits(self, x: Dict[str, Any]) -> Dict[str, Any]:
+        lib = self.library
+        cast = [
+            {"id": TMDB_PERSON_BASE + p, "name": lib.person_name(p), "character": f"Character {n + 1}", "order": n,
+             "known_for_department": "Acting", "profile_path": f"/h{p}.jpg"}
+            for n, p in enumerate(x["cast"])
+        ]
+        crew = []
+        for field, (dept, job) in _DEPARTMENTS.items():
+            crew += [{"id": TMDB_PERSON_BASE + p, "name": lib.person_name(p), "department": dept, "job": job} for p in x.get(field, [])]
+        crew += [{"id": TMDB_PERSON_BASE + p, "name": lib.person_name(p), "department": "Creator", "job": "Creator"} for p in x.get("creators", [])]
+        return {"id": x["tmdb_id"], "cast": cast, "crew": crew}
+
+    def _videos(self, x: Dict[str, Any]) -> Dict[str, Any]:
+        return {"id": x["tmdb_id"], "results": [{"id": f"v{x['tmdb_id']}", "key": f"yt{x['tmdb_id']:x}", "site": "YouTube", "type": "Trailer", "name": "Official Trailer", "official": True}]}
+
+    def _images(self, x: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "id": x["tmdb_id"],
+            "posters": [{"file_path": f"/p{x['tmdb_id']}.jpg", "width": 2000, "height": 3000, "iso_639_1": "en"}],
+            "backdrops": [{"file_path": f"/b{x['tmdb_id']}.jpg", "width": 3840, "height": 2160, "iso_639_1": None}],
+        }
+
+    def _similar(self, x: Dict[str, Any], kind: str) -> List[Dict[str, Any]]:
+        pool = self.library.movies if kind == "movie" else self.library.series
+        genres = set(x["genres"])
+        hits = [y for y in pool if y is not x and genres & set(y["genres"])]
+        hits.sort(key=lambda y: (-len(genres & set(y["genres"])), -y["popularity"]))
+        return [self._movie(y) if kind == "movie" else self._tv(y) for y in hits[: 2 * PAGE_SIZE]]
+
+    def _appended(self, request: web.Request, x: Dict[str, Any], kind: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        for part in (request.query.get("append_to_response") or "").split(","):
+            part = part.strip()
+            sub = self._sub_payload(request, x, kind, part)
+            if sub is not None:
+                data[part] = sub
+        return data
+
+    def _sub_payload(self, request: web.Request, x: Dict[str, Any], kind: str, sub: str) -> Optional[Dict[str, Any]]:
+        page1 = lambda items: {"page": 1, "results": items[:PAGE_SIZE], "total_pages": (len(items) + PAGE_SIZE - 1) // PAGE_SIZE, "total_results": len(items)}  # noqa: E731
+        if sub == "credits":
+            return self._credits(x)
+        if sub == "videos":
+            return self._videos(x)
+        if sub == "images":
+            return self._images(x)
+        if sub in ("similar", "recommendations"):
+            return page1(self._similar(x, kind))
+        if sub == "reviews":
+            return {"id": x["tmdb_id"], **page1([{"id": f"r{x['tmdb_id']}", "author": "stand-in", "content": "Solid.", "created_at": iso_datetime(EPOCH)}])}
+        if sub == "keywords":
+            return {"id": x["tmdb_id"], "keywords" if kind == "movie" else "results": [{"id": 10_000 + g, "name": f"keyword {g}"} for g in x["genres"]]}
+        if sub == "external_ids":
+            ext = {"id": x["tmdb_id"], "imdb_id": x["imdb_id"]}
+            if kind == "tv":
+                ext["tvdb_id"] = x["tvdb_id"]
+            return ext
+        if sub == "changes":
+            return {"changes": []}
+        return None
+
+    async def _movie_details(self, request: web.Request) -> web.Response:
+        m = self._movie_for(request)
+        data = self._movie(m)
+        data.pop("genre_ids")
+        data.pop("media_type")
+        data.update({
+            "genres": [{"id": MOVIE_GENRES[g][0], "name": MOVIE_GENRES[g][1]} for g in m["genres"]],
+            "runtime": m["runtime"], "tagline": m["tagline"], "status": "Released", "imdb_id": m["imdb_id"],
+            "budget": (m["i"] % 97) * 1_000_000, "revenue": (m["i"] % 89) * 3_000_000, "homepage": "",
+            "production_companies": [{"id": 1000 + len(m["studio"]), "name": m["studio"]}],
+            "production_countries": [{"name": m["country"]}], "spoken_languages": [{"iso_639_1": m["language"]}],
+            "belongs_to_collection": {"id": 90_000 + m["i"] // 3, "name": f"{m['title_sort']} Collection"} if m["i"] % 7 == 0 else None,
+        })
+        return json_response(self._appended(request, m, "movie", data))
+
+    async def _movie_sub(self, request: web.Request) -> web.Response:
+        m = self._movie_for(request)
+        payload = self._sub_payload(request, m, "movie", request.match_info["sub"])
+        if payload is None:
+            raise web.HTTPNotFound()
+        if request.match_info["sub"] in ("similar", "recommendations"):
+            return self._page(request, self._similar(m, "movie"))
+        return json_response(payload)
+
+    async def _tv_details(self, request: web.Request) -> web.Response:
+        s = self._show_for(request)
+        data = self._tv(s)
+        data.pop("genre_ids")
+        data.pop("media_type")
+        data.update({
+            "genres": [{"id": TV_GENRES[g][0], "name": TV_GENRES[g][1]} for g in s["genres"]],
+            "episode_run_time": [s["runtime"]], "status": s["status"], "number_of_seasons": len(s["seasons"]),
+            "number_of_episodes": s["episodes"], "networks": [{"id": 200 + len(s["network"]), "name": s["network"]}],
+            "created_by": [{"id": TMDB_PERSON_BASE + p, "name": self.library.person_name(p)} for p in s["creators"]],
+            "seasons": [{"season_number": n + 1, "episode_count": size, "name": f"Season {n + 1}"} for n, size in enumerate(s["seasons"])],
+            "in_production": s["status"] == "Continuing",
+        })
+        return json_response(self._appended(request, s, "tv", data))
+
+    async def _tv_sub(self, request: web.Request) -> web.Response:
+        s = self._show_for(request)
+        payload = self._sub_payload(request, s, "tv", request.match_info["sub"])
+        if payload is None:
+            raise web.HTTPNotFound()
+        if request.match_info["sub"] in ("similar", "recommendations"):
+            return self._page(request, self._similar(s, "tv"))
+        return json_response(payload)
+
+    async def _providers(self, request: web.Request) -> web.Response:
+        tmdb_id = int(request.match_info["id"])
+        providers = [{"provider_id": 8, "provider_name": "Netflix"}, {"provider_id": 9, "provider_name": "Amazon Prime Video"},
+                     {"provider_id": 337, "provider_name": "Disney Plus"}]
+        return json_response({"id": tmdb_id, "results": {"US": {"link": f"https://www.themoviedb.org/{tmdb_id}/watch", "flatrate": [providers[tmdb_id % 3]]}}})
+
+    async def _collection(self, request: web.Request) -> web.Response:
+        cid = int(request.match_info["id"])
+        first = (cid - 90_000) * 3
+        parts = [self.library.movies[i] for i in range(first, first + 3) if 0 <= i < self.library.catalog_movies]
+        if not parts:
+            raise web.HTTPNotFound()
+        return json_response({"id": cid, "name": f"{parts[0]['title_sort']} Collection", "overview": "", "parts": [self._movie(m) for m in parts]})
+
+    def _person_index(self, request: web.Request) -> int:
+        p = int(request.match_info["id"]) - TMDB_PERSON_BASE
+        if not 0 <= p < self.library.people_count:
+            raise web.HTTPNotFound()
+        return p
+
+    def _person_credits(self, p: int, kind: str) -> Dict[str, Any]:
+        movies, series = self.library.credits_for(p)
+        pool, shape = (movies, self._movie) if kind == "movie" else (series, self._tv)
+        cast = [dict(shape(x), character=f"Character {x['cast'].index(p) + 1}") for x in pool if p in x["cast"]]
+        crew = [dict(shape(x), job="Director" if p in x.get("directors", []) else "Writer") for x in pool if p not in x["cast"]]
+        return {"id": TMDB_PERSON_BASE + p, "cast": cast, "crew": crew}
+
+    async def _person(self, request: web.Request) -> web.Response:
+        p = self._person_index(request)
+        rng = _rng(self.library.scale.seed, 8, p)
+        data = dict(self._person_item(p))
+        data.pop("media_type")
+        data.pop("known_for")
+        data.update({"biography": f"{data['name']} is a stand-in performer.", "birthday": f"{1940 + rng.randrange(60)}-0{1 + rng.randrange(9)}-1{rng.randrange(10)}",
+                     "place_of_birth": "Somewhere", "imdb_id": f"nm{p:07d}", "also_known_as": []})
+        for part in (request.query.get("append_to_response") or "").split(","):
+            if part.strip() in ("movie_credits", "tv_credits"):
+                data[part.strip()] = self._person_credits(p, "movie" if part.strip() == "movie_credits" else "tv")
+        return json_response(data)
+
+    async def _person_sub(self, request: web.Request) -> web.Response:
+        p = self._person_index(request)
+        sub = request.match_info["sub"]
+        if sub not in ("movie_credits", "tv_credits"):
+            raise web.HTTPNotFound()
+        return json_response(self._person_credits(p, "movie" if sub == "movie_credits" else "tv"))
@@ -5,6 +5,7 @@ from datetime import date, datetime
 from enum import Enum
 from integrations.http_client import SharedHttpClient
 import json
+import os
 
 
 class TMDbResponseLevel(Enum):
@@ -19,7 +20,8 @@ class TMDbClient:
     def __init__(self, api_key: str, default_response_level: TMDbResponseLevel = TMDbResponseLevel.COMPACT):
         self.api_key = api_key
         self._client = SharedHttpClient.instance()
-        self._base = "https://api.themoviedb.org/3"
+        # TMDB_BASE_URL (like OPENAI_BASE_URL) can point at a local stand-in
+        self._base = (os.getenv("TMDB_BASE_URL") or "https://api.themoviedb.org/3").rstrip("/")
         self.default_response_level = default_response_level
 
     async def close(self) -> None:
@@ -27,6 +27,16 @@ class TTLCache:
     def set(self, key: str, value: Any, ttl_sec: int) -> None:
         self._store[key] = CacheEntry(value=value, expires_at=time.time() + ttl_sec)
 
+    def delete(self, key: str) -> None:
+        self._store.pop(key, None)
+
+    def delete_where(self, predicate: Callable[[str], bool]) -> int:
+        """Drop every entry whose key matches; returns how many were dropped."""
+        keys = [k for k in list(self._store) if predicate(k)]
+        for k in keys:
+            self._store.pop(k, None)
+        return len(keys)
+
     def cached(self, key_builder: Callable[[], str], ttl_sec: int, loader: Callable[[], Any]) -> Any:
         key = key_builder()
         v = self.get(key)
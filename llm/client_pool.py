@@ -0,0 +1,440 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+from openai import (
+    APIConnectionError,
+    APIStatusError,
+    AsyncOpenAI,
+    DefaultAsyncHttpxClient,
+    DefaultHttpxClient,
+    OpenAI,
+)
+
+from integrations.deadline import clamp_timeout_s
+
+from .governor import GovernorConfig, GovernorPermit, LLMGovernor, Priority, default_priority
+
+# Newer SDKs are built on the httpx2 fork; limits/timeouts must be its own types
+try:
+    import httpx2 as httpx
+except ImportError:  # pragma: no cover
+    import httpx
+
+try:
+    import h2  # type: ignore  # noqa: F401
+    _HAS_H2 = True
+except Exception:  # pragma: no cover
+    _HAS_H2 = False
+
+T = TypeVar("T")
+
+_RETRY_STATUS = (408, 409, 429, 500, 502, 503, 504)
+
+
+@dataclass
+class ClientPoolConfig:
+    max_connections: int = 20
+    max_keepalive: int = 10
+    keepalive_expiry_s: float = 90.0
+    connect_timeout_s: float = 3.0
+    read_timeout_s: float = 60.0
+    http2: bool = True
+    retry_max: int = 2
+    retry_ratio: float = 0.2
+    retry_min_per_sec: float = 0.5
+    backoff_base_ms: int = 250
+    governor: GovernorConfig = field(default_factory=GovernorConfig)
+
+
+class RetryBudget:
+    """Token bucket limiting retries to a fraction of traffic.
+
+    Every request deposits ``ratio`` tokens and every retry spends one, so
+    retries stay at roughly ``ratio`` of requests; ``min_per_sec`` keeps a
+    trickle of retries available at low traffic. During an outage the budget
+    drains and calls fail fast instead of multiplying load on the provider.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_per_sec: float = 0.5, max_tokens: float = 10.0) -> None:
+        self.ratio = max(0.0, float(ratio))
+        self.min_per_sec = max(0.0, float(min_per_sec))
+        self.max_tokens = max(1.0, float(max_tokens))
+        self._tokens = self.max_tokens
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.max_tokens, self._tokens + (now - self._updated) * self.min_per_sec)
+        self._updated = now
+
+    def record_request(self) -> None:
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            return False
+
+    @property
+    def tokens(self) -> float:
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+
+class _ProviderStats:
+    def __init__(self) -> None:
+        self.requests = 0
+        self.connections = 0
+        self.tls_handshakes = 0
+        self.retries = 0
+        self.retries_denied = 0
+
+    def on_trace(self, name: str) -> None:
+        if name == "connection.connect_tcp.complete":
+            self.connections += 1
+        elif name == "connection.start_tls.complete":
+            self.tls_handshakes += 1
+
+
+class GovernedStream:
+    """A streaming response that holds its governor slot until consumed or closed."""
+
+    def __init__(self, stream: Any, permit: GovernorPermit) -> None:
+        self._stream = stream
+        self._it: Any = None
+        self._permit = permit
+
+    def __aiter__(self) -> "GovernedStream":
+        return self
+
+    async def __anext__(self) -> Any:
+        if self._it is None:
+            self._it = self._stream.__aiter__()
+        try:
+            return await self._it.__anext__()
+        except BaseException:
+            # StopAsyncIteration included: the stream is done either way
+            self._permit.release()
+            raise
+
+    async def close(self) -> None:
+        self._permit.release()
+        close = getattr(self._stream, "close", None)
+        if close is not None:
+            result = close()
+            if asyncio.iscoroutine(result):
+                await result
+
+
+class LLMClientPool:
+    """Process-wide OpenAI SDK clients shared by every LLM consumer.
+
+    - One sync and one async client per (provider, base URL, API key), built on
+      httpx pools with keep-alive and HTTP/2 (when ``h2`` is installed), so the
+      agent, sub-agents, summarizer worker, preference queries and the Discord
+      quick path all reuse the same few warm connections
+    - Async clients are bound to the event loop that first used them and are
+      rebuilt if a different loop asks (tests, scripts calling ``asyncio.run``)
+    - SDK retries are disabled; ``call``/``acall`` retry transient errors with
+      backoff, bounded by the request deadline and a per-provider ``RetryBudget``
+    - Every attempt first takes a slot from the provider's ``LLMGovernor``, which
+      orders waiting calls by ``Priority`` and shrinks concurrency on 429s
+    - New TCP connections and TLS handshakes are counted through httpx trace
+      hooks; ``get_stats()`` reports them against requests to show reuse
+    """
+
+    def __init__(self, config: Optional[ClientPoolConfig] = None) -> None:
+        self.config = config or ClientPoolConfig()
+        self.http2 = bool(self.config.http2 and _HAS_H2)
+        self._sync: Dict[Tuple[str, Optional[str], str], OpenAI] = {}
+        self._async: Dict[Tuple[str, Optional[str], str], Tuple[Optional[asyncio.AbstractEventLoop], AsyncOpenAI]] = {}
+        self._stats: Dict[str, _ProviderStats] = {}
+        self._budgets: Dict[str, RetryBudget] = {}
+        self._governors: Dict[str, LLMGovernor] = {}
+        self._lock = threading.Lock()
+        self._log = logging.getLogger("moviebot.llm.pool")
+        if self.config.http2 and not _HAS_H2:
+            self._log.debug("h2 not installed; LLM clients use HTTP/1.1 keep-alive")
+
+    # ------------------------------------------------------------- clients
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.config.max_connections,
+            max_keepalive_connections=self.config.max_keepalive,
+            keepalive_expiry=self.config.keepalive_expiry_s,
+        )
+
+    def _timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(self.config.read_timeout_s, connect=self.config.connect_timeout_s)
+
+    def _provider_stats(self, provider: str) -> _ProviderStats:
+        with self._lock:
+            return self._stats.setdefault(provider, _ProviderStats())
+
+    def budget(self, provider: str) -> RetryBudget:
+        with self._lock:
+            b = self._budgets.get(provider)
+            if b is None:
+                b = self._budgets[provider] = RetryBudget(self.config.retry_ratio, self.config.retry_min_per_sec)
+            return b
+
+    def governor(self, provider: str) -> LLMGovernor:
+        with self._lock:
+            g = self._governors.get(provider)
+            if g is None:
+                g = self._governors[provider] = LLMGovernor(provider, self.config.governor)
+            return g
+
+    def sync_client(self, provider: str, api_key: str, base_url: Optional[str] = None) -> OpenAI:
+        key = (provider, base_url, api_key)
+        with self._lock:
+            client = self._sync.get(key)
+        if client is not None:
+            return client
+        stats = self._provider_stats(provider)
+
+        def trace(name: str, info: Dict[str, Any]) -> None:
+            stats.on_trace(name)
+
+        def on_request(request: httpx.Request) -> None:
+            stats.requests += 1
+            request.extensions["trace"] = trace
+
+        http_client = DefaultHttpxClient(
+            limits=self._limits(),
+            timeout=self._timeout(),
+            http2=self.http2,
+            event_hooks={"request": [on_request]},
+        )
+        client = OpenAI(api_key=api_key, base_url=base_url, http_client=http_client, max_retries=0)
+        with self._lock:
+            return self._sync.setdefault(key, client)
+
+    def async_client(self, provider: str, api_key: str, base_url: Optional[str] = None) -> AsyncOpenAI:
+        key = (provider, base_url, api_key)
+        try:
+            loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        with self._lock:
+            entry = self._async.get(key)
+            if entry is not None:
+                bound, client = entry
+                if bound is None or loop is None or bound is loop:
+                    if bound is None and loop is not None:
+                        self._async[key] = (loop, client)
+                    return client
+        stats = self._provider_stats(provider)
+
+        async def trace(name: str, info: Dict[str, Any]) -> None:
+            stats.on_trace(name)
+
+        async def on_request(request: httpx.Request) -> None:
+            stats.requests += 1
+            request.extensions["trace"] = trace
+
+        http_client = DefaultAsyncHttpxClient(
+            limits=self._limits(),
+            timeout=self._timeout(),
+            http2=self.http2,
+            event_hooks={"request": [on_request]},
+        )
+        client = AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=http_client, max_retries=0)
+        with self._lock:
+            self._async[key] = (loop, client)
+        return client
+
+    # ------------------------------------------------------------- retries
+
+    @staticmethod
+    def is_retryable(exc: BaseException) -> bool:
+        if isinstance(exc, APIConnectionError):  # includes APITimeoutError
+            return True
+        return isinstance(exc, APIStatusError) and exc.status_code in _RETRY_STATUS
+
+    @staticmethod
+    def is_throttle(exc: BaseException) -> bool:
+        return isinstance(exc, APIStatusError) and exc.status_code == 429
+
+    @staticmethod
+    def _retry_after_s(exc: BaseException) -> Optional[float]:
+        try:
+            raw = exc.response.headers.get("retry-after")  # type: ignore[attr-defined]
+            return float(raw) if raw is not None else None
+        except Exception:
+            return None
+
+    def _backoff_s(self, attempt: int, exc: BaseException) -> float:
+        retry_after = self._retry_after_s(exc)
+        if retry_after is not None and 0 <= retry_after <= 10:
+            return retry_after
+        base = self.config.backoff_base_ms / 1000.0 * (2 ** attempt)
+        return min(8.0, base) * (0.5 + random.random() / 2)
+
+    def _should_retry(self, provider: str, attempt: int, exc: BaseException) -> Optional[float]:
+        """Delay before the next attempt, or None to give up."""
+        if attempt >= self.config.retry_max or not self.is_retryable(exc):
+            return None
+        stats = self._provider_stats(provider)
+        delay = self._backoff_s(attempt, exc)
+        # Never sleep past the request deadline, and never beyond the shared budget
+        if clamp_timeout_s(delay) < delay or not self.budget(provider).try_spend():
+            stats.retries_denied += 1
+            self._log.info("llm retry denied", extra={"provider": provider, "attempt": attempt, "error": type(exc).__name__})
+            return None
+        stats.retries += 1
+        self._log.info("llm retry", extra={"provider": provider, "attempt": attempt, "delay_ms": int(delay * 1000), "error": type(exc).__name__})
+        return delay
+
+    def _release_failed(self, permit: GovernorPermit, exc: BaseException) -> None:
+        throttled = self.is_throttle(exc)
+        permit.release(throttled=throttled, retry_after_s=self._retry_after_s(exc) if throttled else None)
+
+    async def acall(self, provider: str, fn: Callable[[], Awaitable[T]], *, priority: Optional[Priority] = None, stream: bool = False) -> T:
+        """Await ``fn()`` under the provider's governor, with budgeted retries on transient errors.
+
+        ``priority`` defaults to the current ``llm_priority`` scope. With ``stream=True``
+        the result is wrapped in a ``GovernedStream`` that keeps the slot until the
+        stream is exhausted or closed.
+        """
+        budget = self.budget(provider)
+        governor = self.governor(provider)
+        prio = default_priority() if priority is None else priority
+        attempt = 0
+        while True:
+            budget.record_request()
+            permit = await governor.acquire(prio)
+            started = time.monotonic()
+            try:
+                result = await fn()
+            except Exception as e:
+                self._release_failed(permit, e)
+                delay = self._should_retry(provider, attempt, e)
+                if delay is None:
+                    raise
+            except BaseException:
+                permit.release()
+                raise
+            else:
+                if stream:
+                    return GovernedStream(result, permit)  # type: ignore[return-value]
+                permit.release(latency_s=time.monotonic() - started)
+                return result
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def call(self, provider: str, fn: Callable[[], T], *, priority: Optional[Priority] = None) -> T:
+        """Blocking counterpart of ``acall``."""
+        budget = self.budget(provider)
+        governor = self.governor(provider)
+        prio = default_priority() if priority is None else priority
+        attempt = 0
+        while True:
+            budget.record_request()
+            permit = governor.acquire_sync(prio)
+            started = time.monotonic()
+            try:
+                result = fn()
+            except Exception as e:
+                self._release_failed(permit, e)
+                delay = self._should_retry(provider, attempt, e)
+                if delay is None:
+                    raise
+            except BaseException:
+                permit.release()
+                raise
+            else:
+                permit.release(latency_s=time.monotonic() - started)
+                return result
+            time.sleep(delay)
+            attempt += 1
+
+    # --------------------------------------------------------------- stats
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per provider: HTTP requests, new connections/TLS handshakes, reuse, retries and governor state."""
+        out: Dict[str, Any] = {}
+        with self._lock:
+            items = list(self._stats.items())
+            clients = {p: sum(1 for k in self._sync if k[0] == p) + sum(1 for k in self._async if k[0] == p) for p, _ in items}
+        for provider, st in items:
+            reused = max(0, st.requests - st.connections)
+            out[provider] = {
+                "requests": st.requests,
+                "connections_opened": st.connections,
+                "tls_handshakes": st.tls_handshakes,
+                "reused_requests": reused,
+                "reuse_ratio": round(reused / st.requests, 3) if st.requests else 0.0,
+                "retries": st.retries,
+                "retries_denied": st.retries_denied,
+                "retry_tokens": round(self.budget(provider).tokens, 2),
+                "clients": clients.get(provider, 0),
+                "http2": self.http2,
+                "governor": self.governor(provider).get_stats(),
+            }
+        return out
+
+
+_pool: Optional[LLMClientPool] = None
+_pool_lock = threading.Lock()
+
+
+def _config_from_runtime(project_root: Path) -> ClientPoolConfig:
+    try:
+        from config.loader import load_runtime_config
+        cfg = ((load_runtime_config(project_root).get("llm", {}) or {}).get("clientPool", {}) or {})
+        gov = ((load_runtime_config(project_root).get("llm", {}) or {}).get("governor", {}) or {})
+    except Exception:
+        cfg, gov = {}, {}
+    g = GovernorConfig()
+    d = ClientPoolConfig()
+    return ClientPoolConfig(
+        max_connections=int(cfg.get("maxConnections", d.max_connections)),
+        max_keepalive=int(cfg.get("maxKeepalive", d.max_keepalive)),
+        keepalive_expiry_s=float(cfg.get("keepaliveExpirySec", d.keepalive_expiry_s)),
+        connect_timeout_s=float(cfg.get("connectTimeoutMs", d.connect_timeout_s * 1000)) / 1000.0,
+        read_timeout_s=float(cfg.get("readTimeoutMs", d.read_timeout_s * 1000)) / 1000.0,
+        http2=bool(cfg.get("http2", d.http2)),
+        retry_max=int(cfg.get("retryMax", d.retry_max)),
+        retry_ratio=float(cfg.get("retryBudgetRatio", d.retry_ratio)),
+        retry_min_per_sec=float(cfg.get("retryMinPerSec", d.retry_min_per_sec)),
+        backoff_base_ms=int(cfg.get("backoffBaseMs", d.backoff_base_ms)),
+        governor=GovernorConfig(
+            enabled=bool(gov.get("enabled", g.enabled)),
+            initial_limit=int(gov.get("initialConcurrency", g.initial_limit)),
+            min_limit=int(gov.get("minConcurrency", g.min_limit)),
+            max_limit=int(gov.get("maxConcurrency", g.max_limit)),
+            reserved_final=int(gov.get("reservedFinalSlots", g.reserved_final)),
+            background_share=float(gov.get("backgroundShare", g.background_share)),
+            decrease_factor=float(gov.get("decreaseFactor", g.decrease_factor)),
+            latency_factor=float(gov.get("latencyFactor", g.latency_factor)),
+            cooldown_s=float(gov.get("cooldownMs", g.cooldown_s * 1000)) / 1000.0,
+            max_pause_s=float(gov.get("maxPauseMs", g.max_pause_s * 1000)) / 1000.0,
+        ),
+    )
+
+
+def get_llm_client_pool() -> LLMClientPool:
+    """Process-wide pool built from ``llm.clientPool`` config."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = LLMClientPool(_config_from_runtime(Path(__file__).resolve().parents[1]))
+    return _pool
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Union
 import os
 
@@ -11,6 +12,30 @@ except Exception:  # pragma: no cover
     BadRequestError = Exception  # fallback if SDK changes
 import tiktoken
 
+from integrations.circuit_breaker import CircuitOpenError, circuit_registry
+from integrations.deadline import clamp_timeout_s, within_deadline
+
+from .client_pool import get_llm_client_pool
+from .governor import default_priority
+from .hedging import get_llm_hedger
+
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+
+
+class _ApproxEncoding:
+    """~4 characters per token; stands in when the tiktoken vocabulary cannot be downloaded (offline)."""
+
+    def encode(self, text: str) -> List[int]:
+        return [0] * ((len(text) + 3) // 4)
+
+
+@lru_cache(maxsize=1)
+def _load_encoding() -> Any:
+    try:
+        return tiktoken.get_encoding("cl100k_base")  # GPT-4/5 family encoding
+    except Exception:
+        return _ApproxEncoding()
+
 
 @dataclass
 class LLMConfig:
@@ -23,17 +48,14 @@ class OpenRouterClient:
     """OpenRouter client that provides OpenAI-compatible API interface."""
     
     def __init__(self, api_key: str):
-        self.client = OpenAI(
-            base_url="https://openrouter.ai/api/v1",
-            api_key=api_key,
-        )
-        # Initialize async client for async operations
-        self.async_client = AsyncOpenAI(
-            base_url="https://openrouter.ai/api/v1",
-            api_key=api_key,
-        )
+        # SDK clients come from the process-wide pool (shared connections and retry budget)
+        self._pool = get_llm_client_pool()
+        self._api_key = api_key
+        # OPENROUTER_BASE_URL (like OPENAI_BASE_URL for OpenAI) can point at a local stand-in
+        self._base_url = os.getenv("OPENROUTER_BASE_URL") or OPENROUTER_BASE_URL
+        self.client: OpenAI = self._pool.sync_client("openrouter", api_key, base_url=self._base_url)
         # Initialize tiktoken for token counting
-        self._encoding = tiktoken.get_encoding("cl100k_base")  # GPT-4/5 family encoding
+        self._encoding = _load_encoding()
 
         # Default OpenRouter tracking headers (optional but recommended by OpenRouter docs)
         referer = os.getenv("OPENROUTER_SITE_URL") or "https://github.com/your-repo/moviebot"
@@ -43,6 +65,11 @@ class OpenRouterClient:
             "X-Title": app_title,
         }
 
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        """Pooled async client for the running event loop."""
+        return self._pool.async_client("openrouter", self._api_key, base_url=self._base_url)
+
     def count_tokens(self, messages: List[Dict[str, Any]]) -> int:
         """Count the total number of tokens in a conversation.
         
@@ -102,7 +129,7 @@ class OpenRouterClient:
         params["extra_headers"] = extra_headers
         params.update(kwargs)
         
-        return self.client.chat.completions.create(**params)  # type: ignore[no-any-return]
+        return self._pool.call("openrouter", lambda: self.client.chat.completions.create(**params), priority=default_priority(tools))  # type: ignore[no-any-return]
 
     async def achat(self, *, model: str, messages: List[Dict[str, Any]], tools: Optional[List[Dict[str, Any]]] = None, reasoning: Optional[str] = None, tool_choice: Optional[str] = None, **kwargs: Any) -> Dict[str, Any]:
         """Async version of chat method."""
@@ -122,13 +149,24 @@ class OpenRouterClient:
         params["extra_headers"] = extra_headers
         params.update(kwargs)
         
-        return await self.async_client.chat.completions.create(**params)  # type: ignore[no-any-return]
+        return await self._pool.acall("openrouter", lambda: self.async_client.chat.completions.create(**params), priority=default_priority(tools))  # type: ignore[no-any-return]
 
     async def astream_chat(self, *, model: str, messages: List[Dict[str, Any]], tools: Optional[List[Dict[str, Any]]] = None, reasoning: Optional[str] = None, tool_choice: Optional[str] = None, **kwargs: Any):
         """Async generator that yields content deltas for streaming responses.
 
         Intended for finalization-only turns (no tool calls). Yields plain text chunks.
         """
+        async for delta in self.astream_chat_deltas(model=model, messages=messages, tools=tools, reasoning=reasoning, tool_choice=tool_choice, **kwargs):
+            part = getattr(delta, "content", None)
+            if part:
+                yield part
+
+    async def astream_chat_deltas(self, *, model: str, messages: List[Dict[str, Any]], tools: Optional[List[Dict[str, Any]]] = None, reasoning: Optional[str] = None, tool_choice: Optional[str] = None, **kwargs: Any):
+        """Async generator that yields raw ``choices[0].delta`` objects.
+
+        Unlike ``astream_chat`` this keeps ``tool_calls`` fragments so callers can
+        act on tool calls before the completion finishes.
+        """
         params: Dict[str, Any] = {"model": model, "messages": messages}
         if tools is not None:
             params["tools"] = tools
@@ -142,37 +180,50 @@ class OpenRouterClient:
             extra_headers.update(provided_headers)
         params["extra_headers"] = extra_headers
         params.update(kwargs)
+        # Connect/read timeouts stay within the request deadline (the OpenAI branch does the same)
+        params.setdefault("timeout", clamp_timeout_s(60.0))
 
-        stream = await self.async_client.chat.completions.create(stream=True, **params)
-        async for event in stream:  # type: ignore[attr-defined]
-            try:
-                # New SDK returns delta under choices[0].delta.content
-                delta = getattr(event.choices[0], "delta", None)
-                if delta is not None:
-                    part = getattr(delta, "content", None)
-                    if part:
-                        yield part
-                else:
-                    # Older event shape fallbacks
-                    part = getattr(event.choices[0], "message", None)
-                    if part and getattr(part, "content", None):
-                        yield part.content
-            except Exception:
-                # Ignore malformed events; continue streaming
-                continue
+        stream = await self._pool.acall("openrouter", lambda: self.async_client.chat.completions.create(stream=True, **params), priority=default_priority(tools), stream=True)
+        try:
+            async for event in stream:  # type: ignore[attr-defined]
+                try:
+                    # New SDK returns delta under choices[0].delta
+                    delta = getattr(event.choices[0], "delta", None)
+                    if delta is None:
+                        # Older event shape fallbacks
+                        delta = getattr(event.choices[0], "message", None)
+                    if delta is not None:
+                        yield delta
+                except Exception:
+                    # Ignore malformed events; continue streaming
+                    continue
+        finally:
+            # Frees the governor slot (and the connection) if the caller stops early
+            await stream.close()  # type: ignore[attr-defined]
 
 
 class LLMClient:
     def __init__(self, api_key: str, provider: str = "openai"):
         self.provider = provider
+        self._pool = get_llm_client_pool()
+        self._api_key = api_key
+        # Read per client so a stand-in server set up after import is honoured
+        self._base_url = os.getenv("OPENAI_BASE_URL") or None
         if provider == "openrouter":
             self.client = OpenRouterClient(api_key)
         else:
-            self.client = OpenAI(api_key=api_key)
-            # Initialize async client for async operations with retry configuration
-            self.async_client = AsyncOpenAI(api_key=api_key, max_retries=3)
+            self.client = self._pool.sync_client("openai", api_key, base_url=self._base_url)
         # Initialize tiktoken for token counting
-        self._encoding = tiktoken.get_encoding("cl100k_base")  # GPT-4/5 family encoding
+        self._encoding = _load_encoding()
+        self._hedger = get_llm_hedger()
+        self._secondaries: Dict[str, Optional["LLMClient"]] = {}
+
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        """Pooled async client for the running event loop (OpenRouter: the wrapped client's)."""
+        if self.provider == "openrouter":
+            return self.client.async_client
+        return self._pool.async_client("openai", self._api_key, base_url=self._base_url)
 
     def count_tokens(self, messages: List[Dict[str, Any]]) -> int:
         """Count the total number of tokens in a conversation.
@@ -268,9 +319,48 @@ class LLMClient:
             if (tools is not None) and (tool_choice is not None):
                 params["tool_choice"] = tool_choice
             params.update(self._normalize_params_openai(model, kwargs))
-            return self.client.chat.completions.create(**params)  # type: ignore[no-any-return]
+            return self._pool.call("openai", lambda: self.client.chat.completions.create(**params), priority=default_priority(tools))  # type: ignore[no-any-return]
+
+    def _breaker(self):
+        """Process-wide breaker for this provider; an outage fails fast instead of timing out per call."""
+        breaker = circuit_registry.get(f"llm:{self.provider}")
+        if not breaker.allow():
+            raise CircuitOpenError(breaker.key, breaker.retry_in_ms())
+        return breaker
+
+    def _secondary(self, provider: str) -> Optional["LLMClient"]:
+        """Client for a hedge/failover provider (None without an API key for it)."""
+        if provider not in self._secondaries:
+            api_key = os.getenv("OPENROUTER_API_KEY" if provider == "openrouter" else "OPENAI_API_KEY")
+            self._secondaries[provider] = LLMClient(api_key, provider=provider) if api_key else None
+        return self._secondaries[provider]
 
     async def achat(self, *, model: str, messages: List[Dict[str, Any]], tools: Optional[List[Dict[str, Any]]] = None, reasoning: Optional[str] = None, tool_choice: Optional[str] = None, **kwargs: Any) -> Dict[str, Any]:
+        target = self._hedger.secondary_for(self.provider, model, default_priority(tools))
+        secondary = self._secondary(target[0]) if target is not None else None
+        if target is None or secondary is None:
+            return await self._achat_guarded(model=model, messages=messages, tools=tools, reasoning=reasoning, tool_choice=tool_choice, **kwargs)
+        sec_provider, sec_model = target
+        return await self._hedger.run(
+            self.provider,
+            model,
+            lambda: self._achat_guarded(model=model, messages=messages, tools=tools, reasoning=reasoning, tool_choice=tool_choice, **kwargs),
+            lambda: secondary._achat_guarded(model=sec_model, messages=messages, tools=tools, reasoning=reasoning, tool_choice=tool_choice, **kwargs),
+            f"{sec_provider}:{sec_model}",
+        )
+
+    async def _achat_guarded(self, *, model: str, messages: List[Dict[str, Any]], tools: Optional[List[Dict[str, Any]]] = None, reasoning: Optional[str] = None, tool_choice: Optional[str] = None, **kwargs: Any) -> Dict[str, Any]:
+        breaker = self._breaker()
+        try:
+            # Bounded by the request deadline, SDK retries included
+            resp = await within_deadline(self._achat(model=model, messages=messages, tools=tools, reasoning=reasoning, tool_choice=tool_choice, **kwargs))
+        except Exception as e:
+            breaker.record_error(e)
+            raise
+        breaker.record_success()
+        return resp
+
+    async def _achat(self, *, model: str, messages: List[Dict[str, Any]], tools: Optional[List[Dict[str, Any]]] = None, reasoning: Optional[str] = None, tool_choice: Optional[str] = None, **kwargs: Any) -> Dict[str, Any]:
         """Ultra-optimized async chat method with connection pooling and request optimization."""
         # Do not force reasoning; rely on selection providers
         # For OpenRouter, we need to handle the model name differently
@@ -298,19 +388,67 @@ class LLMClient:
             params.update(self._normalize_params_openai(model, kwargs))
             
             # Add connection optimization parameters
-            params["timeout"] = 60.0  # Increased timeout for better reliability
+            params["timeout"] = clamp_timeout_s(60.0)  # Increased timeout for better reliability, within the request deadline
             
-            return await self.async_client.chat.completions.create(**params)  # type: ignore[no-any-return]
+            return await self._pool.acall("openai", lambda: self.async_client.chat.completions.create(**params), priority=default_priority(tools))  # type: ignore[no-any-return]
 
     async def astream_chat(self, *, model: str, messages: List[Dict[str, Any]], tools: Optional[List[Dict[str, Any]]] = None, reasoning: Optional[str] = None, tool_choice: Optional[str] = None, **kwargs: Any):
         """Async generator that yields content deltas for streaming responses.
 
         This works for both OpenAI and OpenRouter-backed clients. Yields plain text chunks.
         """
+        async for delta in self.astream_chat_deltas(model=model, messages=messages, tools=tools, reasoning=reasoning, tool_choice=tool_choice, **kwargs):
+            part = getattr(delta, "content", None)
+            if part:
+                yield part
+
+    async def astream_chat_deltas(self, *, model: str, messages: List[Dict[str, Any]], tools: Optional[List[Dict[str, Any]]] = None, reasoning: Optional[str] = None, tool_choice: Optional[str] = None, **kwargs: Any):
+        """Async generator that yields raw ``choices[0].delta`` objects (content and tool_calls fragments).
+
+        Hedged and failed over like ``achat`` until the first delta arrives.
+        """
+        target = self._hedger.secondary_for(self.provider, model, default_priority(tools))
+        secondary = self._secondary(target[0]) if target is not None else None
+        if target is None or secondary is None:
+            stream = self._astream_guarded(model=model, messages=messages, tools=tools, reasoning=reasoning, tool_choice=tool_choice, **kwargs)
+        else:
+            sec_provider, sec_model = target
+            stream = self._hedger.stream(
+                self.provider,
+                model,
+                lambda: self._astream_guarded(model=model, messages=messages, tools=tools, reasoning=reasoning, tool_choice=tool_choice, **kwargs),
+                lambda: secondary._astream_guarded(model=sec_model, messages=messages, tools=tools, reasoning=reasoning, tool_choice=tool_choice, **kwargs),
+                f"{sec_provider}:{sec_model}",
+            )
+        try:
+            async for delta in stream:
+                yield delta
+        finally:
+            await stream.aclose()  # type: ignore[attr-defined]
+
+    async def _astream_guarded(self, *, model: str, messages: List[Dict[str, Any]], tools: Optional[List[Dict[str, Any]]] = None, reasoning: Optional[str] = None, tool_choice: Optional[str] = None, **kwargs: Any):
+        breaker = self._breaker()
+        stream = self._astream_chat_deltas(model=model, messages=messages, tools=tools, reasoning=reasoning, tool_choice=tool_choice, **kwargs)
+        try:
+            while True:
+                # Like _achat_guarded: waiting on the stream never outlives the request deadline
+                try:
+                    delta = await within_deadline(stream.__anext__())
+                except StopAsyncIteration:
+                    break
+                yield delta
+        except Exception as e:
+            breaker.record_error(e)
+            raise
+        finally:
+            await stream.aclose()
+        breaker.record_success()
+
+    async def _astream_chat_deltas(self, *, model: str, messages: List[Dict[str, Any]], tools: Optional[List[Dict[str, Any]]] = None, reasoning: Optional[str] = None, tool_choice: Optional[str] = None, **kwargs: Any):
         if self.provider == "openrouter":
             # Delegate to OpenRouter client's streaming method
-            async for chunk in self.client.astream_chat(model=model, messages=messages, tools=tools, reasoning=reasoning, tool_choice=tool_choice, **self._normalize_params(kwargs)):
-                yield chunk
+            async for delta in self.client.astream_chat_deltas(model=model, messages=messages, tools=tools, reasoning=reasoning, tool_choice=tool_choice, **self._normalize_params(kwargs)):
+                yield delta
             return
 
         # OpenAI async client
@@ -323,19 +461,21 @@ class LLMClient:
             params["tool_choice"] = tool_choice
         params.update(self._normalize_params_openai(model, kwargs))
 
-        stream = await self.async_client.chat.completions.create(stream=True, **params)
-        async for event in stream:  # type: ignore[attr-defined]
-            try:
-                delta = getattr(event.choices[0], "delta", None)
-                if delta is not None:
-                    part = getattr(delta, "content", None)
-                    if part:
-                        yield part
-                else:
-                    part = getattr(event.choices[0], "message", None)
-                    if part and getattr(part, "content", None):
-                        yield part.content
-            except Exception:
-                continue
+        params["timeout"] = clamp_timeout_s(60.0)
+
+        stream = await self._pool.acall("openai", lambda: self.async_client.chat.completions.create(stream=True, **params), priority=default_priority(tools), stream=True)
+        try:
+            async for event in stream:  # type: ignore[attr-defined]
+                try:
+                    delta = getattr(event.choices[0], "delta", None)
+                    if delta is None:
+                        delta = getattr(event.choices[0], "message", None)
+                    if delta is not None:
+                        yield delta
+                except Exception:
+                    continue
+        finally:
+            # Frees the governor slot (and the connection) if the caller stops early
+            await stream.close()  # type: ignore[attr-defined]
 
 
@@ -0,0 +1,331 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+
+class Priority(IntEnum):
+    """LLM call classes, most urgent first."""
+
+    FINAL_ANSWER = 0
+    TOOL_SELECTION = 1
+    SUMMARIZATION = 2
+    CLASSIFICATION = 3
+
+
+_current: contextvars.ContextVar[Optional[Priority]] = contextvars.ContextVar("moviebot_llm_priority", default=None)
+
+
+def current_priority() -> Optional[Priority]:
+    return _current.get()
+
+
+@contextmanager
+def llm_priority(priority: Optional[Priority]) -> Iterator[Optional[Priority]]:
+    """Make ``priority`` the class of every LLM call made in this block (and tasks created inside it)."""
+    token = _current.set(priority)
+    try:
+        yield priority
+    finally:
+        _current.reset(token)
+
+
+def default_priority(tools: Any = None) -> Priority:
+    """The current scope's priority, else inferred: turns offering tools select tools, the rest answer."""
+    p = _current.get()
+    if p is not None:
+        return p
+    return Priority.TOOL_SELECTION if tools else Priority.FINAL_ANSWER
+
+
+@dataclass
+class GovernorConfig:
+    enabled: bool = True
+    initial_limit: int = 8
+    min_limit: int = 1
+    max_limit: int = 32
+    # Slots only final answers may take, so a user never waits behind background work
+    reserved_final: int = 1
+    # Summarization + classification together use at most this share of the limit
+    background_share: float = 0.5
+    decrease_factor: float = 0.5
+    # Completions slower than this multiple of the running baseline count as congestion
+    latency_factor: float = 2.5
+    latency_min_samples: int = 10
+    cooldown_s: float = 2.0
+    max_pause_s: float = 10.0
+
+
+class _Waiter:
+    __slots__ = ("priority", "wake", "granted", "cancelled", "queued_at")
+
+    def __init__(self, priority: Priority, wake: Callable[[], None]) -> None:
+        self.priority = priority
+        self.wake = wake
+        self.granted = False
+        self.cancelled = False
+        self.queued_at = time.monotonic()
+
+
+class _ClassStats:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.queued = 0
+        self.in_flight = 0
+        self.throttled = 0
+        self.max_wait_ms = 0.0
+        self.waits_ms: Deque[float] = deque(maxlen=512)
+
+    def snapshot(self) -> Dict[str, Any]:
+        waits = sorted(self.waits_ms)
+
+        def pct(p: float) -> float:
+            return round(waits[min(len(waits) - 1, int(p * len(waits)))], 1) if waits else 0.0
+
+        return {
+            "calls": self.calls,
+            "queued": self.queued,
+            "in_flight": self.in_flight,
+            "throttled": self.throttled,
+            "wait_p50_ms": pct(0.50),
+            "wait_p95_ms": pct(0.95),
+            "wait_max_ms": round(self.max_wait_ms, 1),
+        }
+
+
+class GovernorPermit:
+    """One admitted LLM call; ``release`` reports how it went and frees the slot (idempotent)."""
+
+    __slots__ = ("_governor", "priority", "_released")
+
+    def __init__(self, governor: "LLMGovernor", priority: Priority) -> None:
+        self._governor = governor
+        self.priority = priority
+        self._released = False
+
+    def release(self, *, latency_s: Optional[float] = None, throttled: bool = False, retry_after_s: Optional[float] = None) -> None:
+        if self._released:
+            return
+        self._released = True
+        self._governor._release(self.priority, latency_s=latency_s, throttled=throttled, retry_after_s=retry_after_s)
+
+
+class LLMGovernor:
+    """Per-provider admission control for LLM calls.
+
+    - Calls wait in one priority queue (final answer > tool selection >
+      summarization > classification, FIFO within a class) for one of ``limit``
+      concurrent slots; ``reserved_final`` slots are kept for final answers and
+      background classes share at most ``background_share`` of the limit
+    - The limit adapts AIMD-style: a 429 cuts it by ``decrease_factor`` and pauses
+      admissions for the provider's Retry-After, completions far slower than the
+      latency baseline shrink it slightly, and successes while saturated grow it
+      by about one slot per limit's worth of calls
+    - Works across threads and event loops (sync ``call`` and async ``acall``
+      share the same slots); ``get_stats()`` reports queue times per class
+    """
+
+    def __init__(self, provider: str, config: Optional[GovernorConfig] = None) -> None:
+        self.provider = provider
+        self.config = config or GovernorConfig()
+        c = self.config
+        self._limit = float(max(c.min_limit, min(c.max_limit, c.initial_limit)))
+        self._in_flight = 0
+        self._background = 0
+        self._heap: List[Any] = []
+        self._seq = itertools.count()
+        self._paused_until = 0.0
+        self._pause_timer: Optional[threading.Timer] = None
+        self._last_decrease = 0.0
+        self._latency_baseline: Optional[float] = None
+        self._latency_samples = 0
+        self._decreases = 0
+        self._classes: Dict[Priority, _ClassStats] = {p: _ClassStats() for p in Priority}
+        self._lock = threading.Lock()
+        self._log = logging.getLogger("moviebot.llm.governor")
+
+    # ----------------------------------------------------------- admission
+
+    @property
+    def limit(self) -> int:
+        return max(self.config.min_limit, int(self._limit))
+
+    def _admissible(self, priority: Priority) -> bool:
+        if time.monotonic() < self._paused_until:
+            return False
+        limit = self.limit
+        if self._in_flight >= limit:
+            return False
+        if priority == Priority.FINAL_ANSWER:
+            return True
+        if self._in_flight >= limit - min(self.config.reserved_final, limit - 1):
+            return False
+        if priority >= Priority.SUMMARIZATION:
+            return self._background < max(1, int(limit * self.config.background_share))
+        return True
+
+    def _grant_locked(self, priority: Priority, queued_at: float) -> None:
+        self._in_flight += 1
+        if priority >= Priority.SUMMARIZATION:
+            self._background += 1
+        st = self._classes[priority]
+        st.calls += 1
+        st.in_flight += 1
+        wait_ms = (time.monotonic() - queued_at) * 1000
+        st.waits_ms.append(wait_ms)
+        st.max_wait_ms = max(st.max_wait_ms, wait_ms)
+
+    def _dispatch_locked(self) -> None:
+        # Strict priority: a waiter that cannot be admitted blocks every lower class too
+        while self._heap:
+            waiter: _Waiter = self._heap[0][2]
+            if waiter.cancelled:
+                heapq.heappop(self._heap)
+                continue
+            if not self._admissible(waiter.priority):
+                break
+            heapq.heappop(self._heap)
+            waiter.granted = True
+            self._grant_locked(waiter.priority, waiter.queued_at)
+            try:
+                waiter.wake()
+            except Exception:
+                # The waiter's loop is gone; hand the slot straight back
+                self._release_slot_locked(waiter.priority)
+
+    def _try_enter(self, priority: Priority, wake: Callable[[], None]) -> Optional[_Waiter]:
+        """Take a slot now (returns None) or enqueue and return the waiter."""
+        with self._lock:
+            if not self._heap and self._admissible(priority):
+                self._grant_locked(priority, time.monotonic())
+                return None
+            # Waiters of a lower class (or a capped background class) must not hold this one back
+            waiter = _Waiter(priority, lambda: None)
+            heapq.heappush(self._heap, (int(priority), next(self._seq), waiter))
+            self._dispatch_locked()
+            if waiter.granted:
+                return None
+            waiter.wake = wake
+            self._classes[priority].queued += 1
+            return waiter
+
+    def _abandon(self, waiter: _Waiter) -> None:
+        with self._lock:
+            if waiter.granted:
+                self._release_slot_locked(waiter.priority)
+                self._dispatch_locked()
+            else:
+                waiter.cancelled = True
+
+    async def acquire(self, priority: Priority = Priority.FINAL_ANSWER) -> GovernorPermit:
+        if not self.config.enabled:
+            return GovernorPermit(self, priority)
+        loop = asyncio.get_running_loop()
+        fut: asyncio.Future = loop.create_future()
+
+        def _resolve() -> None:
+            if not fut.done():
+                fut.set_result(None)
+
+        waiter = self._try_enter(priority, lambda: loop.call_soon_threadsafe(_resolve))
+        if waiter is not None:
+            try:
+                await fut
+            except BaseException:
+                self._abandon(waiter)
+                raise
+        return GovernorPermit(self, priority)
+
+    def acquire_sync(self, priority: Priority = Priority.FINAL_ANSWER) -> GovernorPermit:
+        if not self.config.enabled:
+            return GovernorPermit(self, priority)
+        event = threading.Event()
+        waiter = self._try_enter(priority, event.set)
+        if waiter is not None:
+            try:
+                event.wait()
+            except BaseException:
+                self._abandon(waiter)
+                raise
+        return GovernorPermit(self, priority)
+
+    # ------------------------------------------------------------- release
+
+    def _release_slot_locked(self, priority: Priority) -> None:
+        self._in_flight = max(0, self._in_flight - 1)
+        if priority >= Priority.SUMMARIZATION:
+            self._background = max(0, self._background - 1)
+        st = self._classes[priority]
+        st.in_flight = max(0, st.in_flight - 1)
+
+    def _decrease_locked(self, factor: float, now: float, reason: str) -> None:
+        if now - self._last_decrease < self.config.cooldown_s:
+            return
+        before = self.limit
+        self._limit = max(float(self.config.min_limit), self._limit * factor)
+        self._last_decrease = now
+        self._decreases += 1
+        self._log.info("llm concurrency decreased", extra={"provider": self.provider, "reason": reason, "from": before, "to": self.limit})
+
+    def _pause_locked(self, seconds: float, now: float) -> None:
+        until = now + min(seconds, self.config.max_pause_s)
+        if until <= self._paused_until:
+            return
+        self._paused_until = until
+        if self._pause_timer is not None:
+            self._pause_timer.cancel()
+        timer = threading.Timer(until - now, self._resume)
+        timer.daemon = True
+        self._pause_timer = timer
+        timer.start()
+
+    def _resume(self) -> None:
+        with self._lock:
+            self._pause_timer = None
+            self._dispatch_locked()
+
+    def _release(self, priority: Priority, *, latency_s: Optional[float], throttled: bool, retry_after_s: Optional[float]) -> None:
+        if not self.config.enabled:
+            return
+        now = time.monotonic()
+        with self._lock:
+            saturated = bool(self._heap) or self._in_flight >= self.limit
+            self._release_slot_locked(priority)
+            if throttled:
+                self._classes[priority].throttled += 1
+                self._decrease_locked(self.config.decrease_factor, now, "429")
+                if retry_after_s:
+                    self._pause_locked(float(retry_after_s), now)
+            elif latency_s is not None:
+                base = self._latency_baseline
+                self._latency_samples += 1
+                if base is not None and self._latency_samples >= self.config.latency_min_samples and latency_s > base * self.config.latency_factor:
+                    self._decrease_locked(0.9, now, "latency")
+                elif saturated:
+                    self._limit = min(float(self.config.max_limit), self._limit + 1.0 / max(1.0, self._limit))
+                self._latency_baseline = latency_s if base is None else base * 0.9 + latency_s * 0.1
+            self._dispatch_locked()
+
+    # --------------------------------------------------------------- stats
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "in_flight": self._in_flight,
+                "queue_depth": sum(1 for _, _, w in self._heap if not w.cancelled),
+                "decreases": self._decreases,
+                "paused_ms": int(max(0.0, self._paused_until - time.monotonic()) * 1000),
+                "latency_baseline_ms": round(self._latency_baseline * 1000, 1) if self._latency_baseline is not None else None,
+                "classes": {p.name.lower(): st.snapshot() for p, st in self._classes.items() if st.calls or st.queued},
+            }
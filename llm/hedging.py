@@ -0,0 +1,362 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+from bot.latency_tracker import LatencySketch
+from integrations.circuit_breaker import CircuitOpenError
+
+from .client_pool import LLMClientPool, RetryBudget
+from .governor import Priority
+
+T = TypeVar("T")
+
+# Streams are hedged on time to first chunk, kept in its own sketch next to the model's call latency
+_FIRST_CHUNK = "#first-chunk"
+
+
+@dataclass
+class HedgeConfig:
+    enabled: bool = False
+    quantile: float = 0.9
+    min_samples: int = 20
+    floor_ms: int = 500
+    ceiling_ms: int = 20000
+    # Hedges (and failovers) stay under this fraction of hedgeable calls
+    budget_ratio: float = 0.1
+    budget_min_per_sec: float = 0.02
+    failover: bool = True
+    priorities: Tuple[Priority, ...] = (Priority.FINAL_ANSWER, Priority.TOOL_SELECTION)
+    # primary provider -> {"provider": secondary, "models": {primary model: secondary model}}
+    secondary: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+
+class _HedgeStats:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.primary_wins = 0
+        self.denied = 0
+        self.failovers = 0
+        self.hedge_tokens = 0
+
+
+def _total_tokens(resp: Any) -> int:
+    try:
+        usage = getattr(resp, "usage", None)
+        return int(getattr(usage, "total_tokens", 0) or 0)
+    except Exception:
+        return 0
+
+
+async def _head(stream: AsyncIterator[T]) -> Tuple[bool, Optional[T]]:
+    try:
+        return True, await stream.__anext__()
+    except StopAsyncIteration:
+        return False, None
+
+
+async def _discard(head: "asyncio.Future", stream: Any) -> None:
+    """Cancel a losing stream and close it so its governor slot and connection are released."""
+    head.cancel()
+    await asyncio.wait({head}, timeout=1.0)
+    try:
+        await stream.aclose()
+    except Exception:
+        pass
+
+
+class LLMHedger:
+    """Tail-latency hedging and failover for LLM calls.
+
+    - Each primary ``provider:model`` keeps a latency sketch of its completed
+      calls; once ``min_samples`` are in, a call still running after the live
+      ``quantile`` (clamped to floor/ceiling) gets a duplicate on the configured
+      secondary provider/model. The first success wins and the other is cancelled
+    - A primary failing fast with a transient provider error (or an open circuit)
+      fails over to the secondary instead (``failover``)
+    - Hedges and failovers spend from a ``RetryBudget`` sized to ``budget_ratio``
+      of calls, so a slow provider cannot double traffic
+    - Every hedge is logged with its winner and the secondary's token usage for
+      cost accounting; ``get_stats()`` has the totals
+    - ``stream`` does the same for streamed calls up to the first chunk: the
+      delay comes from a time-to-first-chunk sketch, the first stream to yield
+      wins and the other is closed; once a chunk is out there is no switching
+    """
+
+    def __init__(self, config: Optional[HedgeConfig] = None) -> None:
+        self.config = config or HedgeConfig()
+        self.budget = RetryBudget(self.config.budget_ratio, self.config.budget_min_per_sec)
+        self._sketches: Dict[str, LatencySketch] = {}
+        self._stats: Dict[str, _HedgeStats] = {}
+        self._lock = threading.Lock()
+        self._log = logging.getLogger("moviebot.llm.hedging")
+
+    @staticmethod
+    def key(provider: str, model: str) -> str:
+        return f"{provider}:{model}"
+
+    def secondary_for(self, provider: str, model: str, priority: Priority) -> Optional[Tuple[str, str]]:
+        """(provider, model) to hedge a call with, or None when this call is not hedged."""
+        if not self.config.enabled or priority not in self.config.priorities:
+            return None
+        target = self.config.secondary.get(provider) or {}
+        secondary = target.get("provider")
+        if not secondary:
+            return None
+        return str(secondary), str((target.get("models") or {}).get(model) or model)
+
+    def record(self, provider: str, model: str, duration_ms: float) -> None:
+        with self._lock:
+            self._sketches.setdefault(self.key(provider, model), LatencySketch()).add(duration_ms)
+
+    def delay_ms(self, provider: str, model: str) -> Optional[int]:
+        """Live hedge delay for this model, or None until enough calls were seen."""
+        with self._lock:
+            sk = self._sketches.get(self.key(provider, model))
+            if sk is None or sk.count < self.config.min_samples:
+                return None
+            q = sk.quantile(self.config.quantile) or 0.0
+        return int(max(self.config.floor_ms, min(self.config.ceiling_ms, q)))
+
+    def _stats_for(self, provider: str, model: str) -> _HedgeStats:
+        with self._lock:
+            return self._stats.setdefault(self.key(provider, model), _HedgeStats())
+
+    @staticmethod
+    def _fails_over(exc: BaseException) -> bool:
+        return isinstance(exc, CircuitOpenError) or LLMClientPool.is_retryable(exc)
+
+    async def run(
+        self,
+        provider: str,
+        model: str,
+        primary: Callable[[], Awaitable[T]],
+        secondary: Callable[[], Awaitable[T]],
+        secondary_name: str = "",
+    ) -> T:
+        """Await ``primary()``, hedging or failing over to ``secondary()`` as configured."""
+        st = self._stats_for(provider, model)
+        st.calls += 1
+        self.budget.record_request()
+        delay = self.delay_ms(provider, model)
+        t0 = time.monotonic()
+        first = asyncio.ensure_future(primary())
+        try:
+            done, _ = await asyncio.wait({first}, timeout=None if delay is None else delay / 1000)
+        except BaseException:
+            first.cancel()
+            raise
+        if done:
+            try:
+                resp = first.result()
+            except Exception as e:
+                if not (self.config.failover and self._fails_over(e)) or not self.budget.try_spend():
+                    raise
+                st.failovers += 1
+                self._log.warning("llm failover", extra={"provider": provider, "model": model, "secondary": secondary_name, "error": type(e).__name__})
+                resp = await secondary()
+                st.hedge_tokens += _total_tokens(resp)
+                return resp
+            self.record(provider, model, (time.monotonic() - t0) * 1000)
+            return resp
+
+        if not self.budget.try_spend():
+            st.denied += 1
+            resp = await first
+            self.record(provider, model, (time.monotonic() - t0) * 1000)
+            return resp
+
+        st.hedged += 1
+        hedge = asyncio.ensure_future(secondary())
+        pending = {first, hedge}
+        winner: Optional[asyncio.Future] = None
+        error: Optional[BaseException] = None
+        try:
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for fut in done:
+                    if fut.exception() is None:
+                        winner = fut if winner is None or fut is first else winner
+                    elif error is None or fut is first:
+                        error = fut.exception()
+        finally:
+            for fut in pending:
+                fut.cancel()
+        if pending:
+            # Let the loser unwind so its governor slot and connection are back before we return
+            await asyncio.wait(pending, timeout=1.0)
+        elapsed_ms = (time.monotonic() - t0) * 1000
+        # A cancelled primary still ran at least this long, so its sketch keeps the slow tail
+        self.record(provider, model, elapsed_ms)
+        hedge_tokens = _total_tokens(hedge.result()) if hedge.done() and not hedge.cancelled() and hedge.exception() is None else 0
+        st.hedge_tokens += hedge_tokens
+        if winner is first:
+            st.primary_wins += 1
+        elif winner is hedge:
+            st.hedge_wins += 1
+        self._log.info("llm hedge", extra={
+            "provider": provider,
+            "model": model,
+            "secondary": secondary_name,
+            "delay_ms": delay,
+            "elapsed_ms": int(elapsed_ms),
+            "winner": "primary" if winner is first else ("secondary" if winner is hedge else "none"),
+            "hedge_tokens": hedge_tokens,
+        })
+        if winner is None:
+            raise error  # type: ignore[misc]
+        return winner.result()
+
+    async def stream(
+        self,
+        provider: str,
+        model: str,
+        primary: Callable[[], AsyncIterator[T]],
+        secondary: Callable[[], AsyncIterator[T]],
+        secondary_name: str = "",
+    ) -> AsyncIterator[T]:
+        """Yield from ``primary()``, hedging or failing over to ``secondary()`` until the first chunk."""
+        st = self._stats_for(provider, model)
+        st.calls += 1
+        self.budget.record_request()
+        sketch_model = model + _FIRST_CHUNK
+        delay = self.delay_ms(provider, sketch_model)
+        t0 = time.monotonic()
+        streams: Dict[str, AsyncIterator[T]] = {"primary": primary()}
+        heads: Dict[str, asyncio.Future] = {"primary": asyncio.ensure_future(_head(streams["primary"]))}
+        winner: Optional[str] = None
+        error: Optional[BaseException] = None
+        hedged = False
+        try:
+            done, _ = await asyncio.wait({heads["primary"]}, timeout=None if delay is None else delay / 1000)
+            if not done:
+                if self.budget.try_spend():
+                    hedged = True
+                    st.hedged += 1
+                    streams["secondary"] = secondary()
+                    heads["secondary"] = asyncio.ensure_future(_head(streams["secondary"]))
+                else:
+                    st.denied += 1
+            pending = set(heads.values())
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for name in ("primary", "secondary"):
+                    fut = heads.get(name)
+                    if fut is None or fut not in done:
+                        continue
+                    if fut.exception() is None:
+                        winner = winner or name
+                    elif error is None or name == "primary":
+                        error = fut.exception()
+            if winner is None and "secondary" not in heads and self.config.failover and error is not None and self._fails_over(error) and self.budget.try_spend():
+                st.failovers += 1
+                self._log.warning("llm failover", extra={"provider": provider, "model": model, "secondary": secondary_name, "error": type(error).__name__, "stream": True})
+                streams["secondary"] = secondary()
+                heads["secondary"] = asyncio.ensure_future(_head(streams["secondary"]))
+                await asyncio.wait({heads["secondary"]})
+                if heads["secondary"].exception() is None:
+                    winner = "secondary"
+                else:
+                    error = heads["secondary"].exception()
+        except BaseException:
+            for name, fut in heads.items():
+                await _discard(fut, streams[name])
+            raise
+        for name, fut in heads.items():
+            if name != winner:
+                await _discard(fut, streams[name])
+        elapsed_ms = (time.monotonic() - t0) * 1000
+        if winner == "primary" or hedged:
+            # As with run(): a hedged-away primary was at least this slow to its first chunk
+            self.record(provider, sketch_model, elapsed_ms)
+        if hedged:
+            if winner == "primary":
+                st.primary_wins += 1
+            elif winner == "secondary":
+                st.hedge_wins += 1
+            self._log.info("llm hedge", extra={
+                "provider": provider,
+                "model": model,
+                "secondary": secondary_name,
+                "delay_ms": delay,
+                "elapsed_ms": int(elapsed_ms),
+                "winner": winner or "none",
+                "stream": True,
+            })
+        if winner is None:
+            raise error  # type: ignore[misc]
+        has_chunk, chunk = heads[winner].result()
+        if not has_chunk:
+            return
+        stream = streams[winner]
+        try:
+            yield chunk  # type: ignore[misc]
+            async for chunk in stream:
+                yield chunk
+        finally:
+            await stream.aclose()  # type: ignore[attr-defined]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per primary provider:model: calls, hedges fired/won, failovers, budget denials and live delay."""
+        with self._lock:
+            items = list(self._stats.items())
+        out: Dict[str, Any] = {}
+        for k, st in items:
+            provider, _, model = k.partition(":")
+            out[k] = {
+                "calls": st.calls,
+                "hedged": st.hedged,
+                "hedge_wins": st.hedge_wins,
+                "primary_wins": st.primary_wins,
+                "failovers": st.failovers,
+                "denied": st.denied,
+                "hedge_tokens": st.hedge_tokens,
+                "delay_ms": self.delay_ms(provider, model),
+                "stream_delay_ms": self.delay_ms(provider, model + _FIRST_CHUNK),
+            }
+        return out
+
+
+_hedger: Optional[LLMHedger] = None
+_hedger_lock = threading.Lock()
+
+
+def _config_from_runtime(project_root: Path) -> HedgeConfig:
+    try:
+        from config.loader import load_runtime_config
+        cfg = ((load_runtime_config(project_root).get("llm", {}) or {}).get("hedging", {}) or {})
+    except Exception:
+        cfg = {}
+    d = HedgeConfig()
+    priorities = d.priorities
+    if cfg.get("classes"):
+        priorities = tuple(Priority[str(c).upper()] for c in cfg["classes"] if str(c).upper() in Priority.__members__)
+    return HedgeConfig(
+        enabled=bool(cfg.get("enabled", d.enabled)),
+        quantile=float(cfg.get("quantile", d.quantile)),
+        min_samples=int(cfg.get("minSamples", d.min_samples)),
+        floor_ms=int(cfg.get("floorMs", d.floor_ms)),
+        ceiling_ms=int(cfg.get("ceilingMs", d.ceiling_ms)),
+        budget_ratio=float(cfg.get("budgetRatio", d.budget_ratio)),
+        budget_min_per_sec=float(cfg.get("budgetMinPerSec", d.budget_min_per_sec)),
+        failover=bool(cfg.get("failover", d.failover)),
+        priorities=priorities,
+        secondary=dict(cfg.get("secondary") or {}),
+    )
+
+
+def get_llm_hedger() -> LLMHedger:
+    """Process-wide hedger built from ``llm.hedging`` config (inactive unless enabled)."""
+    global _hedger
+    if _hedger is None:
+        with _hedger_lock:
+            if _hedger is None:
+                _hedger = LLMHedger(_config_from_runtime(Path(__file__).resolve().parents[1]))
+    return _hedger
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+
+_WS_RE = re.compile(r"\s+")
+_TRAILING_PUNCT_RE = re.compile(r"[\s\.\!\?,;:]+$")
+
+
+def normalize_input(text: str) -> str:
+    """Normalize text so trivially different phrasings share a cache entry.
+
+    Lowercases, collapses whitespace, unifies curly quotes and strips trailing
+    punctuation ("What's new?" == "what's new").
+    """
+    t = (text or "").replace("’", "'").replace("‘", "'").replace("“", '"').replace("”", '"')
+    t = _WS_RE.sub(" ", t.strip().lower())
+    return _TRAILING_PUNCT_RE.sub("", t)
+
+
+class LLMResponseCache:
+    """Exact-match cache for small deterministic LLM calls (e.g. classification).
+
+    Keys combine role, model, prompt template version and a hash of the
+    normalized input, so a prompt change only needs a version bump to
+    invalidate old entries. Entries live in an in-memory LRU and, when
+    ``persist_path`` is set, in a small SQLite file that survives restarts.
+    Each entry remembers the latency of the call that produced it so hits can
+    report the milliseconds they saved.
+    """
+
+    def __init__(self, *, max_entries: int = 2048, ttl_sec: int = 86400, persist_path: Optional[Path] = None) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_sec = int(ttl_sec)
+        self._mem: "OrderedDict[str, Tuple[str, float, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # One connection shared with worker threads: every statement runs under this lock
+        self._db_lock = threading.Lock()
+        self._log = logging.getLogger("moviebot.llm.response_cache")
+        self._db: Optional[sqlite3.Connection] = None
+        self._hits = 0
+        self._misses = 0
+        self._saved_ms = 0
+        self._by_role: Dict[str, Dict[str, int]] = {}
+        if persist_path is not None:
+            try:
+                Path(persist_path).parent.mkdir(parents=True, exist_ok=True)
+                self._db = sqlite3.connect(str(persist_path), check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, latency_ms INTEGER NOT NULL)"
+                )
+                self._db.commit()
+            except Exception as e:
+                self._log.warning(f"Persistent LLM cache unavailable, using memory only: {e}")
+                self._db = None
+
+    @staticmethod
+    def make_key(role: str, model: str, template_version: str, text: str) -> str:
+        digest = hashlib.sha256(normalize_input(text).encode("utf-8")).hexdigest()
+        return f"{role}:{model}:{template_version}:{digest}"
+
+    def _role_stats(self, role: str) -> Dict[str, int]:
+        return self._by_role.setdefault(role, {"hits": 0, "misses": 0, "saved_ms": 0})
+
+    def get(self, role: str, model: str, template_version: str, text: str) -> Optional[str]:
+        key = self.make_key(role, model, template_version, text)
+        now = time.time()
+        with self._lock:
+            entry = self._mem.get(key)
+            if entry is not None and entry[1] < now:
+                self._mem.pop(key, None)
+                entry = None
+            if entry is None and self._db is not None:
+                try:
+                    with self._db_lock:
+                        row = self._db.execute("SELECT value, expires_at, latency_ms FROM llm_cache WHERE key = ?", (key,)).fetchone()
+                except Exception:
+                    row = None
+                if row is not None and row[1] >= now:
+                    entry = (row[0], float(row[1]), int(row[2]))
+                    self._mem[key] = entry
+            rs = self._role_stats(role)
+            if entry is None:
+                self._misses += 1
+                rs["misses"] += 1
+                return None
+            self._mem.move_to_end(key)
+            self._hits += 1
+            self._saved_ms += entry[2]
+            rs["hits"] += 1
+            rs["saved_ms"] += entry[2]
+        self._log.debug("llm response cache hit", extra={"role": role, "model": model, "saved_ms": entry[2]})
+        return entry[0]
+
+    def _remember(self, role: str, model: str, template_version: str, text: str, value: str, latency_ms: int) -> Optional[Tuple[str, str, float, int]]:
+        """Store the entry in memory; returns the row still to be persisted (None when there is nothing to write)."""
+        if not value:
+            return None
+        key = self.make_key(role, model, template_version, text)
+        expires_at = time.time() + self.ttl_sec
+        with self._lock:
+            self._mem[key] = (value, expires_at, int(latency_ms))
+            self._mem.move_to_end(key)
+            while len(self._mem) > self.max_entries:
+                self._mem.popitem(last=False)
+        return (key, value, expires_at, int(latency_ms)) if self._db is not None else None
+
+    def _persist(self, row: Tuple[str, str, float, int]) -> None:
+        try:
+            with self._db_lock:
+                self._db.execute("INSERT OR REPLACE INTO llm_cache (key, value, expires_at, latency_ms) VALUES (?, ?, ?, ?)", row)  # type: ignore[union-attr]
+                self._db.commit()  # type: ignore[union-attr]
+        except Exception as e:
+            self._log.debug(f"Failed to persist LLM cache entry: {e}")
+
+    def put(self, role: str, model: str, template_version: str, text: str, value: str, latency_ms: int = 0) -> None:
+        """Store a response; the SQLite write runs on the calling thread (use ``aput`` on the event loop)."""
+        row = self._remember(role, model, template_version, text, value, latency_ms)
+        if row is not None:
+            self._persist(row)
+
+    async def aput(self, role: str, model: str, template_version: str, text: str, value: str, latency_ms: int = 0) -> None:
+        """``put`` for async callers: the entry is served from memory at once, the SQLite write and commit run in a worker thread."""
+        row = self._remember(role, model, template_version, text, value, latency_ms)
+        if row is not None:
+            await asyncio.to_thread(self._persist, row)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._mem.clear()
+            if self._db is not None:
+                try:
+                    with self._db_lock:
+                        self._db.execute("DELETE FROM llm_cache")
+                        self._db.commit()
+                except Exception:
+                    pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit rate and saved latency, overall and per role."""
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": (self._hits / total) if total else 0.0,
+                "saved_ms": self._saved_ms,
+                "entries": len(self._mem),
+                "persistent": self._db is not None,
+                "by_role": {k: dict(v) for k, v in self._by_role.items()},
+            }
+
+
+_cache: Optional[LLMResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_response_cache(project_root: Path) -> Optional[LLMResponseCache]:
+    """Process-wide cache built from ``llm.responseCache`` config; None when disabled."""
+    global _cache
+    if _cache is not None:
+        return _cache
+    from config.loader import load_runtime_config
+    cfg = ((load_runtime_config(project_root).get("llm", {}) or {}).get("responseCache", {}) or {})
+    if not bool(cfg.get("enabled", True)):
+        return None
+    with _cache_lock:
+        if _cache is None:
+            persist = cfg.get("persistPath")
+            persist_path = None
+            if persist:
+                persist_path = Path(persist)
+                if not persist_path.is_absolute():
+                    persist_path = project_root / persist_path
+            _cache = LLMResponseCache(
+                max_entries=int(cfg.get("maxEntries", 2048)),
+                ttl_sec=int(cfg.get("ttlSec", 86400)),
+                persist_path=persist_path,
+            )
+    return _cache
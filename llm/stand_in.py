@@ -0,0 +1,437 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import itertools
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiohttp
+from aiohttp import web
+
+try:
+    import yaml  # type: ignore
+except Exception:  # pragma: no cover
+    yaml = None
+
+
+MODE_RECORD = "record"
+MODE_REPLAY = "replay"
+MODE_SCRIPT = "script"
+
+DEFAULT_UPSTREAM = "https://api.openai.com/v1"
+
+
+# ------------------------------------------------------------ completions
+
+
+def make_completion(model: str, content: Optional[str] = None, tool_calls: Optional[List[Dict[str, Any]]] = None, *, ids: Optional[Any] = None) -> Dict[str, Any]:
+    """Chat Completions response with ``content`` and/or ``tool_calls`` ({name, arguments})."""
+    ids = ids or itertools.count()
+    message: Dict[str, Any] = {"role": "assistant", "content": content}
+    if tool_calls:
+        message["tool_calls"] = [
+            {
+                "id": tc.get("id") or f"call_{next(ids)}",
+                "type": "function",
+                "function": {
+                    "name": tc["name"],
+                    "arguments": tc["arguments"] if isinstance(tc.get("arguments"), str) else json.dumps(tc.get("arguments") or {}),
+                },
+            }
+            for tc in tool_calls
+        ]
+    return {
+        "id": f"chatcmpl-standin-{next(ids)}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "finish_reason": "tool_calls" if tool_calls else "stop", "message": message}],
+        "usage": {"prompt_tokens": 0, "completion_tokens": len(content or "") // 4, "total_tokens": len(content or "") // 4},
+    }
+
+
+def completion_to_chunks(resp: Dict[str, Any], chunk_chars: int = 24) -> List[Dict[str, Any]]:
+    """Split a completion into the stream events the API would have sent."""
+    head = {"id": resp.get("id", "chatcmpl-standin"), "object": "chat.completion.chunk", "created": resp.get("created", 0), "model": resp.get("model", "")}
+    choice = (resp.get("choices") or [{}])[0]
+    msg = choice.get("message") or {}
+
+    def chunk(delta: Dict[str, Any], finish: Optional[str] = None) -> Dict[str, Any]:
+        return {**head, "choices": [{"index": 0, "delta": delta, "finish_reason": finish}]}
+
+    out = [chunk({"role": "assistant", "content": ""})]
+    text = msg.get("content") or ""
+    for i in range(0, len(text), chunk_chars):
+        out.append(chunk({"content": text[i:i + chunk_chars]}))
+    for idx, tc in enumerate(msg.get("tool_calls") or []):
+        fn = tc.get("function") or {}
+        out.append(chunk({"tool_calls": [{"index": idx, "id": tc.get("id"), "type": "function", "function": {"name": fn.get("name"), "arguments": ""}}]}))
+        args = fn.get("arguments") or ""
+        for i in range(0, len(args), chunk_chars):
+            out.append(chunk({"tool_calls": [{"index": idx, "function": {"arguments": args[i:i + chunk_chars]}}]}))
+    out.append(chunk({}, choice.get("finish_reason") or "stop"))
+    return out
+
+
+def chunks_to_completion(chunks: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Reassemble streamed events into one completion."""
+    content: List[str] = []
+    calls: Dict[int, Dict[str, Any]] = {}
+    finish = "stop"
+    head: Dict[str, Any] = {}
+    for ev in chunks:
+        head = head or ev
+        for choice in ev.get("choices") or []:
+            delta = choice.get("delta") or {}
+            if delta.get("content"):
+                content.append(delta["content"])
+            for frag in delta.get("tool_calls") or []:
+                tc = calls.setdefault(int(frag.get("index", 0)), {"id": None, "type": "function", "function": {"name": "", "arguments": ""}})
+                tc["id"] = frag.get("id") or tc["id"]
+                fn = frag.get("function") or {}
+                tc["function"]["name"] += fn.get("name") or ""
+                tc["function"]["arguments"] += fn.get("arguments") or ""
+            finish = choice.get("finish_reason") or finish
+    message: Dict[str, Any] = {"role": "assistant", "content": "".join(content) or None}
+    if calls:
+        message["tool_calls"] = [calls[i] for i in sorted(calls)]
+    return {
+        "id": head.get("id", "chatcmpl-standin"),
+        "object": "chat.completion",
+        "created": head.get("created", 0),
+        "model": head.get("model", ""),
+        "choices": [{"index": 0, "finish_reason": finish, "message": message}],
+    }
+
+
+# ---------------------------------------------------------------- matching
+
+
+def _hash(obj: Any) -> str:
+    return hashlib.sha256(json.dumps(obj, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")).hexdigest()[:24]
+
+
+def request_keys(body: Dict[str, Any]) -> Tuple[str, str]:
+    """(exact, shape) keys for a chat request.
+
+    The exact key covers the whole request. The shape key ignores system
+    prompts (they embed the current time) and tool result contents (live data
+    differ between runs), keeping the model, user text, tool names and the
+    tool-call structure of the conversation.
+    """
+    exact = _hash({k: body.get(k) for k in ("model", "messages", "tools", "tool_choice")})
+    shape = []
+    for m in body.get("messages") or []:
+        role = m.get("role")
+        if role == "user":
+            shape.append(("user", m.get("content")))
+        elif role == "assistant":
+            shape.append(("assistant", [((tc.get("function") or {}).get("name")) for tc in m.get("tool_calls") or []]))
+        elif role == "tool":
+            shape.append(("tool", m.get("tool_call_id")))
+    tools = sorted(((t.get("function") or {}).get("name") or "") for t in body.get("tools") or [])
+    return exact, _hash({"model": body.get("model"), "shape": shape, "tools": tools})
+
+
+class Cassette:
+    """Recorded exchanges in a JSONL file, one request/response per line.
+
+    ``match`` prefers an unplayed entry with the same exact key, then one with
+    the same shape key, then the next unplayed entry in recording order.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.entries: List[Dict[str, Any]] = []
+        self._played: set = set()
+        if self.path.exists():
+            for line in self.path.read_text(encoding="utf-8").splitlines():
+                if line.strip():
+                    self.entries.append(json.loads(line))
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        self.entries.append(entry)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def rewind(self) -> None:
+        self._played.clear()
+
+    def match(self, body: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], str]:
+        exact, shape = request_keys(body)
+        unplayed = [(i, e) for i, e in enumerate(self.entries) if i not in self._played]
+        for level, pred in (
+            ("exact", lambda e: e.get("exact_key") == exact),
+            ("shape", lambda e: e.get("shape_key") == shape),
+            ("order", lambda e: True),
+        ):
+            for i, e in unplayed:
+                if pred(e):
+                    self._played.add(i)
+                    return e, level
+        return None, "miss"
+
+
+def load_script(path: Path) -> Dict[str, Any]:
+    """Scripted session from YAML or JSON: ``{turns: [...], fallback: "..."}``."""
+    text = Path(path).read_text(encoding="utf-8")
+    if path.suffix in (".yaml", ".yml") and yaml is not None:
+        return yaml.safe_load(text) or {}
+    return json.loads(text)
+
+
+# ------------------------------------------------------------------ server
+
+
+class StandInServer:
+    """Local OpenAI-compatible ``/v1/chat/completions`` endpoint for offline runs.
+
+    Modes:
+    - ``record``: forward to ``upstream`` (the caller's Authorization header is
+      passed through) and append every exchange, with its timing and, for
+      streams, per-chunk offsets, to the cassette
+    - ``replay``: answer from the cassette; ``latency_ms=None`` reproduces the
+      recorded timing (times ``latency_scale``), a number fixes time to first
+      byte, with ``chunk_ms`` between stream events
+    - ``script``: answer from scripted turns. Each turn is ``{content}`` or
+      ``{tool_calls: [{name, arguments}]}``, optionally with ``match``
+      (``tools``: whether the request offered tools, ``contains``: substring of
+      any message, ``model``), ``latency_ms``/``chunk_ms`` and ``repeat: true``
+      to serve it every time it matches. A request takes the first unused
+      matching turn; unmatched requests get ``fallback`` text
+
+    Streaming and non-streaming requests are served from either kind of
+    recording (completions are split into chunks, chunks reassembled).
+    ``injected_ms`` accumulates the delay the server added, so callers can
+    subtract it and report their own overhead.
+    """
+
+    def __init__(
+        self,
+        mode: str = MODE_SCRIPT,
+        *,
+        cassette: Optional[Path] = None,
+        script: Optional[Dict[str, Any]] = None,
+        upstream: str = DEFAULT_UPSTREAM,
+        latency_ms: Optional[float] = None,
+        latency_scale: float = 1.0,
+        chunk_ms: float = 0.0,
+    ) -> None:
+        if mode not in (MODE_RECORD, MODE_REPLAY, MODE_SCRIPT):
+            raise ValueError(f"unknown stand-in mode: {mode}")
+        if mode in (MODE_RECORD, MODE_REPLAY) and cassette is None:
+            raise ValueError(f"{mode} mode needs a cassette path")
+        self.mode = mode
+        self.cassette = Cassette(cassette) if cassette is not None else None
+        self.script = script or {}
+        self.upstream = upstream.rstrip("/")
+        self.latency_ms = latency_ms
+        self.latency_scale = float(latency_scale)
+        self.chunk_ms = float(chunk_ms)
+        self.base_url: Optional[str] = None
+        self.injected_ms = 0.0
+        self.stats: Dict[str, int] = {}
+        self._used_turns: set = set()
+        self._ids = itertools.count(1)
+        self._runner: Optional[web.AppRunner] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._log = logging.getLogger("moviebot.llm.stand_in")
+
+    # ---------------------------------------------------------- lifecycle
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        for prefix in ("/v1", ""):
+            app.router.add_post(f"{prefix}/chat/completions", self._handle)
+            app.router.add_get(f"{prefix}/models", self._models)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound = site._server.sockets[0].getsockname()  # type: ignore[union-attr]
+        self.base_url = f"http://{bound[0]}:{bound[1]}/v1"
+        self._log.info("llm stand-in listening", extra={"mode": self.mode, "base_url": self.base_url})
+        return self.base_url
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "StandInServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    def reset(self) -> None:
+        """Start a new session: scripted turns and cassette entries can be served again."""
+        self._used_turns.clear()
+        if self.cassette is not None:
+            self.cassette.rewind()
+        self.injected_ms = 0.0
+
+    def _count(self, key: str) -> None:
+        self.stats[key] = self.stats.get(key, 0) + 1
+
+    # ------------------------------------------------------------ handlers
+
+    async def _models(self, request: web.Request) -> web.Response:
+        return web.json_response({"object": "list", "data": []})
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        body = await request.json()
+        self._count("requests")
+        if self.mode == MODE_RECORD:
+            return await self._record(request, body)
+        if self.mode == MODE_REPLAY:
+            entry, level = self.cassette.match(body)  # type: ignore[union-attr]
+            self._count(f"match_{level}")
+            if entry is None:
+                return web.json_response({"error": {"message": "no recorded exchange left in cassette", "type": "stand_in_miss"}}, status=404)
+            return await self._replay(request, body, entry)
+        completion, turn = self._scripted(body)
+        return await self._serve(
+            request,
+            body,
+            completion,
+            ttfb_ms=float(turn.get("latency_ms", self.latency_ms or 0.0)),
+            chunk_ms=float(turn.get("chunk_ms", self.chunk_ms)),
+        )
+
+    # -------------------------------------------------------------- script
+
+    def _turn_matches(self, turn: Dict[str, Any], body: Dict[str, Any]) -> bool:
+        cond = turn.get("match") or {}
+        if "tools" in cond and bool(cond["tools"]) != bool(body.get("tools")):
+            return False
+        if "model" in cond and cond["model"] != body.get("model"):
+            return False
+        if "contains" in cond:
+            needle = str(cond["contains"]).lower()
+            if not any(needle in str(m.get("content") or "").lower() for m in body.get("messages") or []):
+                return False
+        return True
+
+    def _scripted(self, body: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        model = str(body.get("model", ""))
+        for i, turn in enumerate(self.script.get("turns") or []):
+            if i in self._used_turns or not self._turn_matches(turn, body):
+                continue
+            if not turn.get("repeat"):
+                self._used_turns.add(i)
+            self._count("script_turns")
+            return make_completion(model, turn.get("content"), turn.get("tool_calls"), ids=self._ids), turn
+        self._count("script_fallback")
+        return make_completion(model, str(self.script.get("fallback", "OK")), ids=self._ids), {}
+
+    # -------------------------------------------------------------- replay
+
+    async def _sleep(self, ms: float) -> None:
+        if ms > 0:
+            self.injected_ms += ms
+            await asyncio.sleep(ms / 1000.0)
+
+    async def _replay(self, request: web.Request, body: Dict[str, Any], entry: Dict[str, Any]) -> web.StreamResponse:
+        status = int(entry.get("status", 200))
+        if status != 200:
+            await self._sleep(self._scaled(entry.get("total_ms", 0)))
+            return web.json_response(entry.get("error") or {"error": {"message": "recorded error"}}, status=status)
+        chunks = entry.get("chunks")
+        if body.get("stream") and chunks and self.latency_ms is None:
+            # Recorded stream: same events, same spacing
+            resp = await self._open_stream(request)
+            last = 0.0
+            for offset_ms, data in chunks:
+                await self._sleep(self._scaled(offset_ms - last))
+                last = offset_ms
+                await resp.write(f"data: {json.dumps(data)}\n\n".encode("utf-8"))
+            await resp.write(b"data: [DONE]\n\n")
+            await resp.write_eof()
+            return resp
+        completion = entry.get("response") or chunks_to_completion([c[1] for c in chunks or []])
+        if self.latency_ms is not None:
+            ttfb, chunk_gap = self.latency_ms, self.chunk_ms
+        elif body.get("stream"):
+            # Recorded as one response: spread the time after the first byte over the synthesized events
+            ttfb = self._scaled(entry.get("ttfb_ms", 0))
+            events = len(completion_to_chunks(completion))
+            chunk_gap = self._scaled(max(0.0, float(entry.get("total_ms", 0)) - float(entry.get("ttfb_ms", 0)))) / max(1, events - 1)
+        else:
+            ttfb, chunk_gap = self._scaled(entry.get("total_ms", 0)), 0.0
+        return await self._serve(request, body, completion, ttfb_ms=ttfb, chunk_ms=chunk_gap)
+
+    def _scaled(self, ms: Any) -> float:
+        try:
+            return max(0.0, float(ms) * self.latency_scale)
+        except Exception:
+            return 0.0
+
+    async def _open_stream(self, request: web.Request) -> web.StreamResponse:
+        resp = web.StreamResponse(status=200, headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"})
+        await resp.prepare(request)
+        return resp
+
+    async def _serve(self, request: web.Request, body: Dict[str, Any], completion: Dict[str, Any], *, ttfb_ms: float, chunk_ms: float) -> web.StreamResponse:
+        await self._sleep(ttfb_ms)
+        if not body.get("stream"):
+            return web.json_response(completion)
+        resp = await self._open_stream(request)
+        for i, data in enumerate(completion_to_chunks(completion)):
+            if i:
+                await self._sleep(chunk_ms)
+            await resp.write(f"data: {json.dumps(data)}\n\n".encode("utf-8"))
+        await resp.write(b"data: [DONE]\n\n")
+        await resp.write_eof()
+        return resp
+
+    # -------------------------------------------------------------- record
+
+    async def _record(self, request: web.Request, body: Dict[str, Any]) -> web.StreamResponse:
+        if self._session is None:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=300))
+        headers = {k: v for k, v in request.headers.items() if k.lower() in ("authorization", "openai-organization", "http-referer", "x-title")}
+        exact, shape = request_keys(body)
+        entry: Dict[str, Any] = {"v": 1, "model": body.get("model"), "stream": bool(body.get("stream")), "exact_key": exact, "shape_key": shape, "request": body}
+        t0 = time.perf_counter()
+        async with self._session.post(f"{self.upstream}/chat/completions", json=body, headers=headers) as up:
+            entry["status"] = up.status
+            if up.status != 200 or not body.get("stream"):
+                payload = await up.json(content_type=None)
+                entry["ttfb_ms"] = entry["total_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+                entry["response" if up.status == 200 else "error"] = payload
+                self.cassette.append(entry)  # type: ignore[union-attr]
+                return web.json_response(payload, status=up.status)
+            resp = await self._open_stream(request)
+            chunks: List[Tuple[float, Any]] = []
+            async for raw in up.content:
+                line = raw.decode("utf-8").strip()
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                offset = round((time.perf_counter() - t0) * 1000, 1)
+                if data != "[DONE]":
+                    chunks.append((offset, json.loads(data)))
+                await resp.write(f"data: {data}\n\n".encode("utf-8"))
+            await resp.write_eof()
+        entry["chunks"] = chunks
+        entry["ttfb_ms"] = chunks[0][0] if chunks else 0.0
+        entry["total_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+        self.cassette.append(entry)  # type: ignore[union-attr]
+        return resp
+
+
+def stand_in_from_args(mode: str, path: Optional[str], *, upstream: str = DEFAULT_UPSTREAM, latency_ms: Optional[float] = None, latency_scale: float = 1.0, chunk_ms: float = 0.0) -> StandInServer:
+    """Build a server for ``mode`` from a cassette (record/replay) or script file path."""
+    if mode == MODE_SCRIPT:
+        return StandInServer(MODE_SCRIPT, script=load_script(Path(path)) if path else {}, latency_ms=latency_ms, chunk_ms=chunk_ms)
+    return StandInServer(mode, cassette=Path(path) if path else None, upstream=upstream, latency_ms=latency_ms, latency_scale=latency_scale, chunk_ms=chunk_ms)
@@ -142,6 +142,8 @@ class BenchmarkResult:
     start_ns: Optional[int] = None
     end_ns: Optional[int] = None
     cpu_ms: Optional[float] = None
+    # Time until the first answer token is visible to the user (streaming ops)
+    ttft_ms: Optional[float] = None
 
     def to_dict(self) -> Dict[str, Any]:
         d = asdict(self)
@@ -182,6 +184,13 @@ class BenchmarkSuite:
                 "failure_count": len(self.results),
             }
         durations_sorted = sorted(durations)
+        ttfts = sorted(r.ttft_ms for r in self.results if r.success and r.ttft_ms is not None)
+        ttft_stats: Dict[str, Any] = {}
+        if ttfts:
+            ttft_stats = {
+                "ttft_mean_ms": round(statistics.mean(ttfts), 2),
+                "ttft_p95_ms": round(self._percentile(ttfts, 0.95), 2),
+            }
         return {
             "success_count": len(durations),
             "failure_count": len(self.results) - len(durations),
@@ -195,6 +204,7 @@ class BenchmarkSuite:
             "p90_ms": round(self._percentile(durations_sorted, 0.9), 2),
             "p95_ms": round(self._percentile(durations_sorted, 0.95), 2),
             "p99_ms": round(self._percentile(durations_sorted, 0.99), 2),
+            **ttft_stats,
         }
 
 
@@ -276,6 +286,7 @@ class PerformanceBenchmarker:
         success = True
         error = None
         metadata: Dict[str, Any] = {}
+        ttft_ms: Optional[float] = None
 
         async def _run_call():
             if asyncio.iscoroutinefunction(func):
@@ -300,6 +311,8 @@ class PerformanceBenchmarker:
                 metadata["result_type"] = type(result).__name__
                 if isinstance(result, dict):
                     metadata["result_keys"] = list(result.keys())
+                    if result.get("ttft_ms") is not None:
+                        ttft_ms = float(result["ttft_ms"])
                 elif isinstance(result, (list, tuple, set)):
                     metadata["result_len"] = len(result)  # non-breaking
             except asyncio.TimeoutError:
@@ -331,6 +344,7 @@ class PerformanceBenchmarker:
             start_ns=start_ns,
             end_ns=end_ns,
             cpu_ms=cpu_ms,
+            ttft_ms=ttft_ms,
         )
 
     def print_result(self, result: BenchmarkResult) -> None:
@@ -355,10 +369,14 @@ class PerformanceBenchmarker:
                 )
                 slow_note += f" (>{complexity} threshold)"
 
+        ttft_note = ""
+        if result.ttft_ms is not None:
+            ttft_note = f" (first token visible at {result.ttft_ms:.1f}ms)"
+
         if result.success:
             msg = (
                 f"  {status} {result.operation} [{result.service}]: "
-                f"{s.green(duration_str)}{slow_note}"
+                f"{s.green(duration_str)}{ttft_note}{slow_note}"
             )
         else:
             msg = (
@@ -398,6 +416,11 @@ class PerformanceBenchmarker:
                 f"p99 {stats['p99_ms']:.1f}ms"
             )
             print(f"  Timing: {timing}")
+            if "ttft_mean_ms" in stats:
+                print(
+                    f"  Time to first visible token: {stats['ttft_mean_ms']:.1f}ms avg, "
+                    f"p95 {stats['ttft_p95_ms']:.1f}ms"
+                )
             if stats["stdev_ms"] > 0:
                 print(f"  Variability: ±{stats['stdev_ms']:.1f}ms stdev")
 
@@ -563,6 +586,23 @@ Examples:
   # Increase concurrency and parallelize services
   python scripts/benchmark_performance.py --concurrency 24 --parallel-services
 
+  # Measure streaming tool dispatch against a local mock provider
+  python scripts/benchmark_performance.py --mock-llm-only
+
+  # Intent router match cost and fast-path coverage on a query corpus
+  python scripts/benchmark_performance.py --router-only
+
+  # Tool-result summarizer cost on realistic payload sizes
+  python scripts/benchmark_performance.py --summarizers-only
+
+  # Agent-loop overhead against the local LLM stand-in (scripted, or a recorded cassette)
+  python scripts/benchmark_performance.py --stand-in-only
+  python scripts/benchmark_performance.py --stand-in-only --stand-in-cassette data/cassettes/add.jsonl
+
+  # Service suites against local synthetic Plex/TMDb/Radarr/Sonarr at 20k-movie scale, with faults
+  python scripts/benchmark_performance.py --synthetic-services --synthetic-scale large \
+    --synthetic-faults latency_ms=15,jitter_ms=10,rate_limit_rps=40
+
   # Emit JSON and JUnit reports
   python scripts/benchmark_performance.py --output-json out.json \
     --junit out-junit.xml
@@ -585,6 +625,46 @@ Examples:
     parser.add_argument(
         "--agent-only", action="store_true", help="Run only agent benchmarks"
     )
+    parser.add_argument(
+        "--mock-llm-only",
+        action="store_true",
+        help="Run only local mock LLM benchmarks (no services or API keys needed)",
+    )
+    parser.add_argument(
+        "--router-only",
+        action="store_true",
+        help="Run only intent router match-cost/coverage benchmarks (offline)",
+    )
+    parser.add_argument(
+        "--summarizers-only",
+        action="store_true",
+        help="Run only tool-result summarizer benchmarks (offline)",
+    )
+    parser.add_argument(
+        "--stand-in-only",
+        action="store_true",
+        help="Run only agent-loop benchmarks against the local LLM stand-in (offline)",
+    )
+    parser.add_argument(
+        "--stand-in-cassette",
+        default=None,
+        help="Replay this recorded cassette (see scripts/trace_agent.py --llm-record) instead of the built-in scripts",
+    )
+    parser.add_argument(
+        "--synthetic-services",
+        action="store_true",
+        help="Point the Plex/Radarr/Sonarr/TMDb suites at local synthetic stand-ins (offline; agent suite skipped)",
+    )
+    parser.add_argument(
+        "--synthetic-scale",
+        default="medium",
+        help="Stand-in library size: small|medium|large or MOVIES:SERIES:EPISODES (default: medium)",
+    )
+    parser.add_argument(
+        "--synthetic-faults",
+        default="",
+        help="Stand-in fault profile, e.g. latency_ms=20,jitter_ms=10,error_rate=0.01,throttle_rate=0.02,rate_limit_rps=40",
+    )
 
     # Benchmark configuration (enhanced)
     parser.add_argument(
@@ -2258,6 +2338,601 @@ async def run_summarizer_worker_benchmarks(
         print(f"  {s.fail()} Summarizer worker benchmarks failed: {e}")
 
 
+# --------------------------- Mock LLM benchmarks -----------------------
+
+
+class MockStreamingLLM:
+    """Local stand-in for a streaming chat provider.
+
+    Emits each tool call's id/name first, then its JSON arguments in small
+    fragments with a fixed per-fragment delay, like a model generating tokens.
+    """
+
+    def __init__(
+        self,
+        tool_calls: List[Tuple[str, Dict[str, Any]]],
+        *,
+        content: str = "",
+        fragment_delay_ms: float = 15.0,
+        fragment_chars: int = 4,
+    ):
+        self.tool_calls = tool_calls
+        self.content = content
+        self.fragment_delay_ms = fragment_delay_ms
+        self.fragment_chars = max(1, fragment_chars)
+
+    async def astream_chat_deltas(self, **kwargs):
+        for index, (name, args) in enumerate(self.tool_calls):
+            yield {"tool_calls": [{"index": index, "id": f"call_{index}", "function": {"name": name, "arguments": ""}}]}
+            payload = json.dumps(args)
+            for i in range(0, len(payload), self.fragment_chars):
+                await asyncio.sleep(self.fragment_delay_ms / 1000.0)
+                yield {"tool_calls": [{"index": index, "function": {"arguments": payload[i:i + self.fragment_chars]}}]}
+        for i in range(0, len(self.content), self.fragment_chars):
+            await asyncio.sleep(self.fragment_delay_ms / 1000.0)
+            yield {"content": self.content[i:i + self.fragment_chars]}
+
+
+async def run_mock_llm_benchmarks(benchmarker: PerformanceBenchmarker, args) -> None:
+    """Benchmarks against local mock providers; no network or credentials needed."""
+    s = benchmarker.style
+    print(f"\n{s.gear()} Running Mock LLM Benchmarks...")
+    try:
+        from bot.streaming_tools import ToolCallAssembler
+
+        # Earlier calls are the slow detail lookups; later ones are cheap reads
+        tool_latency_ms = [600.0, 400.0, 250.0, 120.0]
+        calls = [
+            ("tmdb_search", {"query": f"title {i}", "year": 2000 + i, "response_level": "compact"})
+            for i in range(len(tool_latency_ms))
+        ]
+
+        async def _mock_tool(tc) -> Dict[str, Any]:
+            idx = int(str(tc.id).rsplit("_", 1)[-1])
+            await asyncio.sleep(tool_latency_ms[idx] / 1000.0)
+            return {"id": tc.id, "ok": True}
+
+        async def buffered_dispatch() -> Dict[str, Any]:
+            # Baseline: wait for the full completion, then run all tools in parallel
+            asm = ToolCallAssembler()
+            async for delta in MockStreamingLLM(calls).astream_chat_deltas():
+                asm.feed(delta)
+            asm.close()
+            results = await asyncio.gather(*[_mock_tool(tc) for tc in asm.tool_calls])
+            return {"tool_calls": len(results)}
+
+        async def streaming_dispatch() -> Dict[str, Any]:
+            # Each tool starts as soon as its arguments JSON closes
+            tasks: List[asyncio.Task] = []
+            asm = ToolCallAssembler(lambda tc: tasks.append(asyncio.create_task(_mock_tool(tc))))
+            async for delta in MockStreamingLLM(calls).astream_chat_deltas():
+                asm.feed(delta)
+            asm.close()
+            results = await asyncio.gather(*tasks)
+            return {"tool_calls": len(results)}
+
+        ops = [
+            (f"Buffered tool dispatch ({len(calls)} calls)", "MockLLM", buffered_dispatch, (), {}),
+            (f"Streaming tool dispatch ({len(calls)} calls)", "MockLLM", streaming_dispatch, (), {}),
+        ]
+        await benchmarker.run_benchmark_suite(
+            "Mock LLM Streaming Tool Dispatch",
+            ops,
+            parallel=False,
+            warmup=args.warmup,
+        )
+
+        # Final answer delivery: time to first visible token, buffered vs streamed
+        from ux.streaming import StreamingMessageEditor
+
+        answer = (
+            "Here are three picks for tonight: Heat (1995), a tense LA crime epic; "
+            "Collateral (2004), a taut one-night thriller; and Thief (1981), "
+            "Michael Mann's stylish debut."
+        )
+        chat_api_ms = 60.0  # simulated Discord send/edit round trip
+
+        async def _fake_send(text: str) -> Dict[str, Any]:
+            await asyncio.sleep(chat_api_ms / 1000.0)
+            return {"content": text}
+
+        async def _fake_edit(sent: Dict[str, Any], text: str) -> Dict[str, Any]:
+            await asyncio.sleep(chat_api_ms / 1000.0)
+            sent["content"] = text
+            return sent
+
+        async def buffered_answer() -> Dict[str, Any]:
+            t0 = time.perf_counter()
+            parts: List[str] = []
+            async for delta in MockStreamingLLM([], content=answer).astream_chat_deltas():
+                parts.append(delta.get("content") or "")
+            await _fake_send("".join(parts))
+            return {"ttft_ms": (time.perf_counter() - t0) * 1000.0}
+
+        async def streamed_answer() -> Dict[str, Any]:
+            editor = StreamingMessageEditor(_fake_send, _fake_edit, min_interval_s=0.3)
+            async for delta in MockStreamingLLM([], content=answer).astream_chat_deltas():
+                await editor(delta.get("content") or "")
+            await editor.finalize(answer)
+            metrics = editor.metrics()
+            return {"ttft_ms": metrics["first_visible_ms"], "edits": metrics["edits"]}
+
+        await benchmarker.run_benchmark_suite(
+            "Mock LLM Final Answer Streaming",
+            [
+                ("Buffered final answer", "MockLLM", buffered_answer, (), {}),
+                ("Streamed final answer", "MockLLM", streamed_answer, (), {}),
+            ],
+            parallel=False,
+            warmup=args.warmup,
+        )
+
+        # Multi-hop request: one model turn per dependency level vs one planned DAG
+        from bot.tool_plan import PlanExecutor, parse_plan
+
+        llm_turn_ms = 300.0
+        hop_latency_ms = {
+            "tmdb_search": 150.0,
+            "radarr_quality_profiles": 80.0,
+            "radarr_root_folders": 80.0,
+            "radarr_lookup": 120.0,
+            "radarr_add_movie": 200.0,
+            "radarr_get_movies": 100.0,
+        }
+        plan_json = json.dumps({"steps": [
+            {"id": 1, "tool": "tmdb_search", "args": {"query": "Dune Part Two"}},
+            {"id": 2, "tool": "radarr_quality_profiles", "args": {}},
+            {"id": 3, "tool": "radarr_root_folders", "args": {}},
+            {"id": 4, "tool": "radarr_lookup", "args": {"term": "tmdb:$1.results[0].id"}},
+            {"id": 5, "tool": "radarr_add_movie", "args": {"tmdb_id": "$1.results[0].id", "quality_profile_id": "$2[0].id", "root_folder_path": "$3[0].path"}, "depends_on": [4]},
+            {"id": 6, "tool": "radarr_get_movies", "args": {}, "depends_on": [5]},
+        ]})
+        # Dependency levels a tool loop needs one model turn each for (best case: parallel within a level)
+        loop_levels = [["tmdb_search", "radarr_quality_profiles", "radarr_root_folders"], ["radarr_lookup"], ["radarr_add_movie"], ["radarr_get_movies"]]
+
+        async def _mock_hop(name: str) -> Any:
+            await asyncio.sleep(hop_latency_ms[name] / 1000.0)
+            if name == "tmdb_search":
+                return {"results": [{"id": 693134, "title": "Dune: Part Two"}]}
+            if name == "radarr_quality_profiles":
+                return [{"id": 1, "name": "HD-1080p"}]
+            if name == "radarr_root_folders":
+                return [{"path": "/movies"}]
+            return {"ok": True}
+
+        async def loop_multi_hop() -> Dict[str, Any]:
+            llm_calls = 0
+            for level in loop_levels:
+                await asyncio.sleep(llm_turn_ms / 1000.0)
+                llm_calls += 1
+                await asyncio.gather(*[_mock_hop(n) for n in level])
+            await asyncio.sleep(llm_turn_ms / 1000.0)  # final synthesis
+            return {"llm_calls": llm_calls + 1}
+
+        async def plan_multi_hop() -> Dict[str, Any]:
+            await asyncio.sleep(llm_turn_ms / 1000.0)  # planning turn
+            steps = parse_plan(plan_json)
+            run = await PlanExecutor(lambda step, args: _mock_hop(step.tool)).run(steps)
+            if not run.ok:
+                raise RuntimeError(f"plan failed: {[r.error for r in run.failed]}")
+            await asyncio.sleep(llm_turn_ms / 1000.0)  # final synthesis
+            return {"llm_calls": 2}
+
+        await benchmarker.run_benchmark_suite(
+            "Mock LLM Multi-hop (search -> lookup -> add -> confirm)",
+            [
+                ("Tool loop, one turn per dependency level (5 LLM calls)", "MockLLM", loop_multi_hop, (), {}),
+                ("Plan-then-execute DAG (2 LLM calls)", "MockLLM", plan_multi_hop, (), {}),
+            ],
+            parallel=False,
+            warmup=args.warmup,
+        )
+
+        # Add flows: model-driven duplicate check + validation turn vs code-driven write hooks
+        from bot.write_hooks import get_write_hooks
+
+        add_flows = {
+            "movie": ("radarr_add_movie", "radarr_get_movies", "movies", "tmdbId", "tmdb_id", 693134),
+            "series": ("sonarr_add_series", "sonarr_get_series", "series", "tvdbId", "tvdb_id", 371980),
+        }
+
+        def _flow_ops(kind: str):
+            write_tool, list_tool, list_key, id_field, arg_key, media_id = add_flows[kind]
+            library: List[Dict[str, Any]] = [{"id": i, "title": f"Title {i}", id_field: 1000 + i} for i in range(200)]
+
+            async def _mock_tool(name: str, tool_args: Dict[str, Any]) -> Any:
+                await asyncio.sleep(hop_latency_ms.get(name, 100.0) / 1000.0)
+                if name == list_tool:
+                    return {list_key: library}
+                if name == write_tool:
+                    return {"id": 999, "title": "Added", id_field: media_id, "monitored": True}
+                return {"results": [{"id": media_id}]}
+
+            async def model_driven() -> Dict[str, Any]:
+                # search -> library read (duplicate check) -> add -> validation read -> answer
+                llm_calls = 0
+                for name in ("tmdb_search", list_tool, write_tool, list_tool):
+                    await asyncio.sleep(llm_turn_ms / 1000.0)
+                    llm_calls += 1
+                    await _mock_tool(name, {})
+                await asyncio.sleep(llm_turn_ms / 1000.0)
+                return {"llm_calls": llm_calls + 1}
+
+            async def hooked() -> Dict[str, Any]:
+                # search -> add (preflight + verify in code) -> answer
+                hooks = get_write_hooks(write_tool)
+                write_args = {arg_key: media_id, "monitored": True}
+                await asyncio.sleep(llm_turn_ms / 1000.0)
+                await _mock_tool("tmdb_search", {})
+                await asyncio.sleep(llm_turn_ms / 1000.0)
+                pre = await hooks.preflight(write_args, _mock_tool)
+                if pre is not None:
+                    raise RuntimeError(f"unexpected preflight answer: {pre}")
+                result = await _mock_tool(write_tool, write_args)
+                verification = await hooks.verify(write_args, result, _mock_tool)
+                if not verification["verified"]:
+                    raise RuntimeError(f"verification failed: {verification['problems']}")
+                await asyncio.sleep(llm_turn_ms / 1000.0)
+                return {"llm_calls": 3}
+
+            return [
+                (f"Add {kind}, model-driven checks (5 LLM calls)", "MockLLM", model_driven, (), {}),
+                (f"Add {kind}, write hooks (3 LLM calls)", "MockLLM", hooked, (), {}),
+            ]
+
+        hop_latency_ms.setdefault("sonarr_get_series", 100.0)
+        hop_latency_ms.setdefault("sonarr_add_series", 200.0)
+        await benchmarker.run_benchmark_suite(
+            "Mock LLM Add Flows (write preflight/verify hooks)",
+            _flow_ops("movie") + _flow_ops("series"),
+            parallel=False,
+            warmup=args.warmup,
+        )
+    except Exception as e:
+        print(f"  {s.fail()} Mock LLM benchmarks failed: {e}")
+
+
+# Representative Discord messages for intent routing coverage
+ROUTER_QUERY_CORPUS: List[str] = [
+    "what's trending this week?",
+    "whats new in my library",
+    "what's new",
+    "recently added movies",
+    "anything on deck?",
+    "continue watching",
+    "show me my library",
+    "do I have Heat on my plex?",
+    "is Dune on plex",
+    "do we have The Bear in our library",
+    "movies with Tom Hanks",
+    "shows starring Bryan Cranston",
+    "with Keanu Reeves movies",
+    "hi",
+    "hello there!",
+    "what can you do?",
+    "thanks!",
+    "how to use this bot",
+    "add Dune Part Two to radarr",
+    "add Severance to sonarr",
+    "recommend something like Arrival",
+    "find sci-fi movies from the 80s",
+    "similar to Inception",
+    "synchronic (2020)",
+    "rate Heat 5 stars",
+    "what's the radarr queue status",
+    "upcoming horror movies",
+    "tell me about the director of Parasite",
+    "best thrillers of the 90s I haven't seen",
+    "who directed Zodiac",
+]
+
+
+def _legacy_route(text: str) -> Optional[str]:
+    """Piecewise keyword/regex loops the router replaced, kept for comparison."""
+    import re as _re
+
+    tl = text.lower()
+    if any(k in tl for k in ("trending", "what's trending", "whats trending")):
+        return "trending"
+    if any(k in tl for k in ("recently added", "what's new", "whats new", "on deck", "continue watching", "library")):
+        return "library"
+    if _re.search(r"(?:movies?|shows?)\s+(?:with|featuring|starring)\s+([A-Za-z][A-Za-z\.'\-]+(?:\s+[A-Za-z][A-Za-z\.'\-]+){1,3})", text, flags=_re.IGNORECASE):
+        return "actor"
+    if _re.search(r"(?:with|featuring|starring)\s+([A-Za-z][A-Za-z\.'\-]+(?:\s+[A-Za-z][A-Za-z\.'\-]+){1,3})\s+(?:movies?|shows?)", text, flags=_re.IGNORECASE):
+        return "actor"
+    blocklist = [
+        "search", "find", "recommend", "recommendation", "trending", "popular",
+        "add", "queue", "status", "recent", "on deck", "continue", "rate", "rating",
+        "unwatched", "collection", "details", "similar", "top rated", "upcoming",
+        "now playing", "watch providers", "providers", "plex", "radarr", "sonarr", "tmdb",
+    ]
+    for term in blocklist:
+        if _re.search(r"\b" + _re.escape(term) + r"\b", tl):
+            return None
+    if _re.search(r"\((19|20)\d{2}\)", text):
+        return None
+    quick = [
+        "hi", "hello", "hey", "how are you", "what can you do", "help", "capabilities",
+        "who are you", "what is moviebot", "explain yourself", "about you", "commands",
+        "format", "how to use", "usage", "examples", "tips", "thanks", "thank you",
+    ]
+    for phrase in quick:
+        if _re.search(r"\b" + _re.escape(phrase) + r"\b", tl):
+            return "quick"
+    return None
+
+
+async def run_intent_router_benchmarks(benchmarker: PerformanceBenchmarker, args) -> None:
+    """Match cost per message and fast-path coverage of the compiled intent router."""
+    s = benchmarker.style
+    print(f"\n{s.gear()} Running Intent Router Benchmarks...")
+    try:
+        from bot.intent_router import get_intent_router
+
+        router = get_intent_router()
+        corpus = ROUTER_QUERY_CORPUS
+        passes = 200
+
+        def legacy_pass() -> Dict[str, Any]:
+            t0 = time.perf_counter()
+            for _ in range(passes):
+                for q in corpus:
+                    _legacy_route(q)
+            return {"us_per_message": (time.perf_counter() - t0) * 1e6 / (passes * len(corpus))}
+
+        def router_pass() -> Dict[str, Any]:
+            t0 = time.perf_counter()
+            for _ in range(passes):
+                for q in corpus:
+                    router.classify(q)
+            return {"us_per_message": (time.perf_counter() - t0) * 1e6 / (passes * len(corpus))}
+
+        await benchmarker.run_benchmark_suite(
+            f"Intent Routing ({len(corpus)} msgs x {passes})",
+            [
+                ("Legacy keyword/regex loops", "Router", legacy_pass, (), {}),
+                ("Compiled intent router", "Router", router_pass, (), {}),
+            ],
+            parallel=False,
+            warmup=args.warmup,
+        )
+
+        for label, fn in (("Legacy", legacy_pass), ("Router", router_pass)):
+            print(f"  {label:<7} match cost: {fn()['us_per_message']:.1f}us per message")
+
+        routed = [router.classify(q) for q in corpus]
+        fast_hits = sum(1 for m, _ in routed if m is not None)
+        templated = sum(1 for m, _ in routed if m is not None and m.intent.template)
+        quick_hits = sum(1 for m, quick in routed if m is None and quick)
+        legacy_hits = sum(1 for q in corpus if _legacy_route(q) is not None)
+        n = len(corpus)
+        print(f"  Fast-path coverage: {fast_hits}/{n} ({fast_hits / n:.0%}), {templated} answerable from templates (0 LLM calls)")
+        print(f"  Quick-path coverage: {quick_hits}/{n}; total zero-planning coverage {(fast_hits + quick_hits) / n:.0%} (legacy {legacy_hits / n:.0%})")
+    except Exception as e:
+        print(f"  {s.fail()} Intent router benchmarks failed: {e}")
+
+
+def _legacy_summarize(name: str, result: Dict[str, Any], max_items: int) -> Dict[str, Any]:
+    """Per-call branch-and-walk summarizer the compiled specs replaced (benchmarked shapes only)."""
+    def keep(items: List[Any], fields: List[str]) -> List[Dict[str, Any]]:
+        return [{k: it.get(k) for k in fields if k in it} for it in items[:max_items] if isinstance(it, dict)]
+
+    if name == "search_plex":
+        level = str(result.get("response_level", "compact")).lower()
+        fields = {"minimal": ["title", "ratingKey", "type"], "compact": ["title", "year", "rating", "ratingKey", "type"]}.get(
+            level, ["title", "year", "rating", "contentRating", "duration", "genres", "summary", "ratingKey", "type"]
+        )
+        return {"items": keep(result.get("items") or [], fields), "total_found": result.get("total_found")}
+    if name.startswith("tmdb_"):
+        return {"page": result.get("page"), "total_pages": result.get("total_pages"), "total_results": result.get("total_results"), "results": (result.get("results") or [])[:max_items]}
+    if name == "radarr_get_movies":
+        return {"movies": keep(result.get("movies") or [], ["id", "title", "tmdbId", "year", "hasFile"])}
+    if name == "sonarr_get_episodes":
+        return {"episodes": keep(result.get("episodes") or [], ["id", "seasonNumber", "episodeNumber", "hasFile", "airDateUtc"])}
+    return {k: (v[:max_items] if isinstance(v, list) else v) for k, v in result.items()}
+
+
+def _summary_payloads() -> List[Tuple[str, str, Dict[str, Any]]]:
+    """Realistic tool results: a large Radarr library, a season-heavy Sonarr show, Plex and TMDb pages."""
+    movies = [
+        {"id": i, "title": f"Movie {i}", "originalTitle": f"Movie {i}", "tmdbId": 10000 + i, "imdbId": f"tt{i:07d}", "year": 1980 + i % 45,
+         "hasFile": i % 3 != 0, "monitored": True, "path": f"/movies/Movie {i} ({1980 + i % 45})", "qualityProfileId": 1,
+         "runtime": 90 + i % 60, "genres": ["Drama", "Thriller"], "overview": "A long overview sentence about the plot. " * 4,
+         "images": [{"coverType": "poster", "url": f"/MediaCover/{i}/poster.jpg"}], "ratings": {"imdb": {"value": 7.1, "votes": 1200}}}
+        for i in range(3000)
+    ]
+    episodes = [
+        {"id": i, "seriesId": 7, "seasonNumber": 1 + i // 24, "episodeNumber": 1 + i % 24, "title": f"Episode {i}", "hasFile": i % 5 != 0,
+         "monitored": True, "airDateUtc": "2019-01-01T00:00:00Z", "overview": "Episode overview text. " * 5}
+        for i in range(1200)
+    ]
+    plex = {"items": [
+        {"title": f"Title {i}", "year": 2000 + i % 25, "rating": 7.5, "contentRating": "PG-13", "duration": 7200000, "genres": ["Action"],
+         "summary": "Plex summary text. " * 8, "ratingKey": str(i), "type": "movie", "addedAt": 1700000000 + i}
+        for i in range(200)
+    ], "total_found": 200, "response_level": "standard"}
+    tmdb = {"page": 1, "total_pages": 50, "total_results": 1000, "results": [
+        {"id": i, "title": f"Result {i}", "overview": "TMDb overview text. " * 6, "vote_average": 7.2, "release_date": "2024-01-01", "media_type": "movie", "poster_path": "/p.jpg"}
+        for i in range(20)
+    ]}
+    return [
+        ("Radarr library (3000 movies)", "radarr_get_movies", {"movies": movies}),
+        ("Sonarr episodes (1200)", "sonarr_get_episodes", {"episodes": episodes}),
+        ("Plex search (200)", "search_plex", plex),
+        ("TMDb search page (20)", "tmdb_search", tmdb),
+    ]
+
+
+async def run_summarizer_benchmarks(benchmarker: PerformanceBenchmarker, args) -> None:
+    """Tool-result summarize + serialize cost: legacy walk + json.dumps vs compiled spec -> bytes."""
+    s = benchmarker.style
+    print(f"\n{s.gear()} Running Tool Summarizer Benchmarks...")
+    try:
+        from bot.tool_summarizers import dumps_bytes, summarize_tool_result_bytes
+
+        max_items, max_bytes, passes = 6, 6000, 500
+        payloads = _summary_payloads()
+
+        def legacy_pass(name: str, result: Dict[str, Any]) -> Dict[str, Any]:
+            t0 = time.perf_counter()
+            for _ in range(passes):
+                content = json.dumps({"ref_id": "r", "summary": _legacy_summarize(name, result, max_items)}, separators=(",", ":"))
+            return {"us_per_result": (time.perf_counter() - t0) * 1e6 / passes, "bytes": len(content)}
+
+        def compiled_pass(name: str, result: Dict[str, Any]) -> Dict[str, Any]:
+            t0 = time.perf_counter()
+            for _ in range(passes):
+                body = summarize_tool_result_bytes(name, result, max_items=max_items, max_bytes=max_bytes)
+                content = (b'{"ref_id":' + dumps_bytes("r") + b',"summary":' + body + b"}").decode("utf-8")
+            return {"us_per_result": (time.perf_counter() - t0) * 1e6 / passes, "bytes": len(content)}
+
+        ops = []
+        for label, name, result in payloads:
+            ops.append((f"{label}: legacy + json.dumps", "Summarizer", legacy_pass, (name, result), {}))
+            ops.append((f"{label}: compiled -> bytes", "Summarizer", compiled_pass, (name, result), {}))
+        await benchmarker.run_benchmark_suite(
+            f"Tool Summarizers ({passes} results per op)",
+            ops,
+            parallel=False,
+            warmup=args.warmup,
+        )
+        for label, name, result in payloads:
+            old, new = legacy_pass(name, result), compiled_pass(name, result)
+            print(f"  {label:<30} legacy {old['us_per_result']:7.1f}us/{old['bytes']}B  compiled {new['us_per_result']:7.1f}us/{new['bytes']}B")
+        _print_tabular_token_report(payloads)
+    except Exception as e:
+        print(f"  {s.fail()} Summarizer benchmarks failed: {e}")
+
+
+def _print_tabular_token_report(payloads: List[Tuple[str, str, Dict[str, Any]]]) -> None:
+    """Prompt tokens of the tool message content: JSON object lists vs cols/rows tables."""
+    from bot.context_compaction import _default_token_counter
+    from bot.tool_summarizers import summarize_tool_result_bytes
+
+    # cl100k_base when tiktoken can load it, else the ~4 chars/token estimate
+    count = _default_token_counter()
+    print("\n  Tool result tokens: JSON lists vs tabular")
+    for label, name, result in payloads:
+        for level in ("compact", "standard"):
+            if level != "standard" and "response_level" not in result:
+                continue
+            res = dict(result, response_level=level) if "response_level" in result else result
+            for max_items in (6, 12):
+                plain = summarize_tool_result_bytes(name, res, max_items=max_items).decode("utf-8")
+                table = summarize_tool_result_bytes(name, res, max_items=max_items, tabular_min_rows=3).decode("utf-8")
+                a, b = count(plain), count(table)
+                tag = f"{label} [{level}]" if "response_level" in result else label
+                print(f"  {tag:<40} {max_items:>2} items  json {a:5d}  tabular {b:5d}  ({(a - b) / a:6.1%} fewer)")
+
+
+def _stand_in_scripts() -> List[Tuple[str, str, Dict[str, Any]]]:
+    """Scripted sessions using local-only tools: (label, user message, script)."""
+    classify = {
+        "match": {"tools": False},
+        "repeat": True,
+        "content": json.dumps({"complexity": "simple", "confidence": 0.9, "reasoning": "preferences lookup", "requires_write": False, "suggested_tools": ["read_household_preferences"], "estimated_iterations": 2}),
+    }
+    answer = "You mostly enjoy slow-burn heist thrillers and smart sci-fi; gory horror is a hard no."
+    return [
+        ("Direct answer (1 turn)", "hi, what can you do?", {"turns": [classify, {"content": "I can search Plex, TMDb, Radarr and Sonarr for you."}]}),
+        ("Tool turn + answer (2 turns)", "what do we like to watch?", {"turns": [
+            classify,
+            {"tool_calls": [{"name": "read_household_preferences", "arguments": {"compact": True}}]},
+            {"content": answer},
+        ]}),
+        ("Parallel tools + answer (2 turns)", "what do we like and avoid?", {"turns": [
+            classify,
+            {"tool_calls": [
+                {"name": "read_household_preferences", "arguments": {"compact": True}},
+                {"name": "search_household_preferences", "arguments": {"query": "horror"}},
+                {"name": "search_household_preferences", "arguments": {"query": "heist"}},
+            ]},
+            {"content": answer},
+        ]}),
+    ]
+
+
+async def run_stand_in_agent_benchmarks(benchmarker: PerformanceBenchmarker, args) -> None:
+    """The real Agent loop against the local LLM stand-in; overhead = wall time - latency the stand-in injected."""
+    s = benchmarker.style
+    print(f"\n{s.gear()} Running Agent Loop vs LLM Stand-in Benchmarks...")
+    saved_env = {k: os.environ.get(k) for k in ("OPENAI_BASE_URL", "OPENROUTER_BASE_URL")}
+    servers: List[Any] = []
+    try:
+        from bot.agent import Agent
+        from bot.tools.registry import build_local_tools_and_registry
+        from bot.tools.registry_cache import get_registry_cache
+        from llm.stand_in import MODE_REPLAY, MODE_SCRIPT, Cassette, StandInServer
+
+        root = benchmarker.project_root
+        cache = get_registry_cache()
+        if not cache.is_initialized():
+            try:
+                cache.initialize(root)
+            except Exception:
+                # No live services: local tools are enough for scripted sessions
+                cache.install(root, *build_local_tools_and_registry(root))
+
+        if args.stand_in_cassette:
+            entries = Cassette(Path(args.stand_in_cassette)).entries
+            users = [m for m in ((entries[0].get("request") or {}).get("messages") or []) if m.get("role") == "user"] if entries else []
+            if not users:
+                print(f"  {s.warn()} Cassette has no recorded user message: {args.stand_in_cassette}")
+                return
+            sessions = [("Recorded session", str(users[-1].get("content")), None)]
+            profiles = [("recorded timing", {"latency_ms": None}), ("instant", {"latency_ms": 0.0})]
+        else:
+            sessions = _stand_in_scripts()
+            profiles = [("instant", {"latency_ms": 0.0}), ("150ms TTFB, 10ms/chunk", {"latency_ms": 150.0, "chunk_ms": 10.0})]
+
+        overhead: Dict[str, List[float]] = {}
+        for profile_label, timing in profiles:
+            ops = []
+            for label, message, script in sessions:
+                if script is None:
+                    server = StandInServer(MODE_REPLAY, cassette=Path(args.stand_in_cassette), **timing)
+                else:
+                    server = StandInServer(MODE_SCRIPT, script=script, **timing)
+                servers.append(server)
+                base_url = await server.start()
+
+                async def one_run(server=server, base_url=base_url, message=message, key=f"{label} [{profile_label}]") -> Dict[str, Any]:
+                    os.environ["OPENAI_BASE_URL"] = base_url
+                    os.environ["OPENROUTER_BASE_URL"] = base_url
+                    server.reset()
+                    agent = Agent(api_key="stand-in", project_root=root, provider="openai")
+                    t0 = time.perf_counter()
+                    try:
+                        await agent.aconverse([{"role": "user", "content": message}])
+                    finally:
+                        await agent.aclose()
+                    wall_ms = (time.perf_counter() - t0) * 1000
+                    overhead.setdefault(key, []).append(wall_ms - server.injected_ms)
+                    return {"wall_ms": round(wall_ms, 1), "llm_ms": round(server.injected_ms, 1), "overhead_ms": round(wall_ms - server.injected_ms, 1)}
+
+                ops.append((f"{label} [{profile_label}]", "StandIn", one_run, (), {}))
+            await benchmarker.run_benchmark_suite(
+                f"Agent Loop vs LLM Stand-in ({profile_label})",
+                ops,
+                parallel=False,
+                warmup=args.warmup,
+            )
+        print("\n  Agent-loop overhead (wall time minus stand-in latency):")
+        for key, vals in overhead.items():
+            vals = sorted(vals)
+            print(f"  {key:<60} p50 {vals[len(vals) // 2]:7.1f}ms  max {vals[-1]:7.1f}ms  (n={len(vals)})")
+    except Exception as e:
+        print(f"  {s.fail()} Stand-in agent benchmarks failed: {e}")
+    finally:
+        for server in servers:
+            await server.close()
+        for k, v in saved_env.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+
+
 # ------------------------------- Reporting -----------------------------
 
 
@@ -2409,6 +3084,46 @@ def print_final_summary(benchmarker: PerformanceBenchmarker) -> None:
         benchmarker.print_suite_summary(suite)
 
 
+def _print_llm_pool_stats() -> None:
+    """Connection reuse of the shared LLM client pool across every suite that called a model."""
+    try:
+        from llm.client_pool import get_llm_client_pool
+
+        stats = get_llm_client_pool().get_stats()
+    except Exception:
+        return
+    stats = {p: st for p, st in stats.items() if st["requests"]}
+    if not stats:
+        return
+    print("\nLLM client pool:")
+    for provider, st in sorted(stats.items()):
+        print(
+            f"  - {provider}: {st['requests']} requests over {st['connections_opened']} connections "
+            f"({st['tls_handshakes']} TLS handshakes, {st['reuse_ratio']:.0%} reused), "
+            f"{st['retries']} retries, {st['retries_denied']} denied, http2={st['http2']}"
+        )
+        gov = st.get("governor") or {}
+        if gov:
+            print(f"    governor: limit {gov['limit']}, {gov['decreases']} decreases")
+            for name, cls in gov.get("classes", {}).items():
+                print(
+                    f"      {name}: {cls['calls']} calls, {cls['queued']} queued, "
+                    f"wait p50 {cls['wait_p50_ms']}ms p95 {cls['wait_p95_ms']}ms max {cls['wait_max_ms']}ms, "
+                    f"{cls['throttled']} x 429"
+                )
+    try:
+        from llm.hedging import get_llm_hedger
+
+        hedges = get_llm_hedger().get_stats()
+    except Exception:
+        hedges = {}
+    for key, h in sorted(hedges.items()):
+        print(
+            f"  - hedging {key}: {h['hedged']}/{h['calls']} hedged ({h['hedge_wins']} won by the secondary), "
+            f"{h['failovers']} failovers, {h['denied']} denied, {h['hedge_tokens']} secondary tokens, delay {h['delay_ms']}ms"
+        )
+
+
 def _emit_json(
     benchmarker: PerformanceBenchmarker, path: str, meta: Dict[str, Any]
 ) -> None:
@@ -2444,6 +3159,7 @@ def _emit_csv(benchmarker: PerformanceBenchmarker, path: str) -> None:
                 "start_ns": r.start_ns or 0,
                 "end_ns": r.end_ns or 0,
                 "cpu_ms": f"{(r.cpu_ms or 0.0):.3f}",
+                "ttft_ms": f"{r.ttft_ms:.3f}" if r.ttft_ms is not None else "",
                 "iteration": r.metadata.get("iteration", ""),
             }
             rows.append(row)
@@ -2458,6 +3174,7 @@ def _emit_csv(benchmarker: PerformanceBenchmarker, path: str) -> None:
         "start_ns",
         "end_ns",
         "cpu_ms",
+        "ttft_ms",
         "iteration",
     ]
     with open(path, "w", newline="") as f:
@@ -2506,6 +3223,38 @@ def _emit_junit(benchmarker: PerformanceBenchmarker, path: str) -> None:
 # --------------------------------- Main --------------------------------
 
 
+def _start_synthetic_services(args):
+    """Serve synthetic Plex/TMDb/Radarr/Sonarr on a background loop and point the env at them.
+
+    A background loop rather than the benchmark's own, because plexapi is synchronous
+    and would otherwise block the loop serving its own requests.
+    """
+    from integrations.stand_ins import FaultProfile, LibraryScale, ServiceStandIns
+
+    stand_ins = ServiceStandIns(LibraryScale.parse(args.synthetic_scale), FaultProfile.parse(args.synthetic_faults))
+    t0 = time.perf_counter()
+    env = stand_ins.start_background()
+    os.environ.update(env)
+    lib = stand_ins.library
+    print(
+        f"Synthetic services: {lib.scale.movies} movies, {lib.scale.series} series, {lib.episode_count} episodes "
+        f"(built in {(time.perf_counter() - t0) * 1000:.0f}ms), faults: {args.synthetic_faults or 'none'}"
+    )
+    return stand_ins
+
+
+def _print_stand_in_stats(stand_ins) -> None:
+    """Requests each stand-in served, by status, and the busiest routes (e.g. plexapi reloads)."""
+    print("\nSynthetic service traffic:")
+    for name, st in stand_ins.stats().items():
+        if not st["requests"]:
+            continue
+        statuses = ", ".join(f"{code}: {n}" for code, n in sorted(st["status"].items()))
+        print(f"  - {name}: {st['requests']} requests ({statuses}), {st['injected_ms']:.0f}ms injected latency")
+        for route, n in sorted(st["routes"].items(), key=lambda kv: -kv[1])[:4]:
+            print(f"      {n:>6}  {route}")
+
+
 async def _run_selected_services(benchmarker: PerformanceBenchmarker, args) -> None:
     """Run selected service benchmark groups, optionally in parallel."""
     tasks = []
@@ -2605,6 +3354,15 @@ async def main() -> int:
 
     s = Style(color=_supports_color() and not args.no_color, emoji=not args.no_emoji)
 
+    stand_ins = None
+    if args.synthetic_services:
+        # Started before the benchmarker so load_settings() picks up the stand-in URLs and keys
+        try:
+            stand_ins = _start_synthetic_services(args)
+        except ValueError as e:
+            print(f"❌ Error: {e}")
+            return 1
+
     print(f"{s.film()} MovieBot Performance Benchmarking Tool")
     print("=" * 50)
     print(f"Project root: {_PROJECT_ROOT}")
@@ -2661,27 +3419,44 @@ async def main() -> int:
     print(", ".join(services))
 
     try:
-        # Validate environment and configuration
-        print("\n🔧 Validating environment and configuration...")
-        validation_result = await validate_environment(benchmarker)
-        if not validation_result:
-            print(
-                "❌ Environment validation failed. Please check your .env and configuration."
-            )
-            return 1
+        if args.mock_llm_only or args.router_only or args.summarizers_only or args.stand_in_only:
+            # Local/offline suites only; nothing external to validate
+            if args.mock_llm_only:
+                await run_mock_llm_benchmarks(benchmarker, args)
+            if args.router_only:
+                await run_intent_router_benchmarks(benchmarker, args)
+            if args.summarizers_only:
+                await run_summarizer_benchmarks(benchmarker, args)
+            if args.stand_in_only:
+                await run_stand_in_agent_benchmarks(benchmarker, args)
+        elif stand_ins is not None:
+            # Synthetic services need no validation, and there is no LLM behind them
+            args.skip_agent = True
+            await _run_selected_services(benchmarker, args)
+            _print_stand_in_stats(stand_ins)
+        else:
+            # Validate environment and configuration
+            print("\n🔧 Validating environment and configuration...")
+            validation_result = await validate_environment(benchmarker)
+            if not validation_result:
+                print(
+                    "❌ Environment validation failed. Please check your .env and configuration."
+                )
+                return 1
 
-        # Run service-specific benchmarks (with optional parallelism)
-        await _run_selected_services(benchmarker, args)
+            # Run service-specific benchmarks (with optional parallelism)
+            await _run_selected_services(benchmarker, args)
 
-        # Run tool and worker integration tests
-        if not args.skip_tools:
-            await run_tool_integration_benchmarks(benchmarker, args)
+            # Run tool and worker integration tests
+            if not args.skip_tools:
+                await run_tool_integration_benchmarks(benchmarker, args)
 
-        if not args.skip_workers:
-            await run_worker_integration_benchmarks(benchmarker, args)
+            if not args.skip_workers:
+                await run_worker_integration_benchmarks(benchmarker, args)
 
         # Print final summary
         print_final_summary(benchmarker)
+        _print_llm_pool_stats()
 
         # Optional outputs
         meta = {
@@ -2747,6 +3522,9 @@ async def main() -> int:
             traceback.print_exc()
         await benchmarker.cleanup()
         return 1
+    finally:
+        if stand_ins is not None:
+            stand_ins.stop()
 
 
 if __name__ == "__main__":
@@ -8,6 +8,7 @@ from integrations.plex_client import PlexClient
 from integrations.radarr_client import RadarrClient
 from integrations.sonarr_client import SonarrClient
 from integrations.tmdb_client import TMDbClient
+from bot.latency_tracker import get_latency_tracker
 
 
 async def diagnostics() -> int:
@@ -57,6 +58,15 @@ async def diagnostics() -> int:
     print(f"- Sonarr profile id: {config.get('sonarr', {}).get('qualityProfileId')}")
     print(f"- Sonarr root: {config.get('sonarr', {}).get('rootFolderPath')}")
 
+    print("\nLearned tool latencies (tool@host):")
+    tracker = get_latency_tracker(project_root)
+    stats = tracker.get_stats() if tracker is not None else {}
+    if not stats:
+        print("- none recorded")
+    for key, st in sorted(stats.items()):
+        learned = f"timeout {st['learned_timeout_ms']}ms, hedge {st['learned_hedge_ms']}ms" if st["learned_timeout_ms"] else "warming up"
+        print(f"- {key}: n={st['samples']} p50={st['p50_ms']}ms p90={st['p90_ms']}ms p99={st['p99_ms']}ms ({learned})")
+
     return 0
 
 
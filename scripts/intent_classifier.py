@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Train and evaluate the local intent classifier.
+
+The agent logs every LLM query classification (query, complexity, write
+intent, tool families, latency) to ``data/intent_training.jsonl`` when
+``llm.intentClassifier.logTrainingData`` is on. This tool turns that log into
+``data/intent_model.json`` and reports how closely the local model agrees with
+the LLM labels and how much classification latency it removes.
+
+Usage:
+  python scripts/intent_classifier.py train
+  python scripts/intent_classifier.py evaluate --holdout 0.2
+  python scripts/intent_classifier.py evaluate --model data/intent_model.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Ensure project root is on sys.path
+_PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(_PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(_PROJECT_ROOT))
+
+from bot.intent_classifier import FAMILIES, IntentClassifier, read_training_examples
+
+
+def _path(value: str) -> Path:
+    p = Path(value)
+    return p if p.is_absolute() else _PROJECT_ROOT / p
+
+
+def evaluate(clf: IntentClassifier, examples: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Agreement with the logged LLM labels plus per-query latency comparison."""
+    n = len(examples)
+    if n == 0:
+        return {"examples": 0}
+    complexity_ok = write_ok = families_exact = 0
+    tp = {f: 0 for f in FAMILIES}
+    fp = {f: 0 for f in FAMILIES}
+    fn = {f: 0 for f in FAMILIES}
+    local_us: List[float] = []
+    for ex in examples:
+        t0 = time.perf_counter()
+        pred = clf.predict(str(ex.get("query", "")))
+        local_us.append((time.perf_counter() - t0) * 1e6)
+        complexity_ok += int(pred.complexity == str(ex.get("complexity", "")).lower())
+        write_ok += int(pred.requires_write == bool(ex.get("requires_write", False)))
+        truth = set(ex.get("families") or [])
+        got = set(pred.families)
+        families_exact += int(truth == got)
+        for f in FAMILIES:
+            tp[f] += int(f in truth and f in got)
+            fp[f] += int(f not in truth and f in got)
+            fn[f] += int(f in truth and f not in got)
+    f1: Dict[str, float] = {}
+    for f in FAMILIES:
+        denom = 2 * tp[f] + fp[f] + fn[f]
+        f1[f] = (2 * tp[f] / denom) if denom else 1.0
+    llm_ms = [float(ex["latency_ms"]) for ex in examples if ex.get("latency_ms")]
+    llm_mean = statistics.mean(llm_ms) if llm_ms else 0.0
+    local_mean_ms = statistics.mean(local_us) / 1000
+    return {
+        "examples": n,
+        "complexity_accuracy": complexity_ok / n,
+        "write_accuracy": write_ok / n,
+        "families_exact_match": families_exact / n,
+        "family_f1": f1,
+        "local_mean_us": statistics.mean(local_us),
+        "local_p95_us": sorted(local_us)[int(0.95 * (n - 1))],
+        "llm_mean_ms": llm_mean,
+        "saved_ms_per_query": max(0.0, llm_mean - local_mean_ms),
+    }
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    if not report.get("examples"):
+        print("No examples to evaluate.")
+        return
+    print(f"Examples:              {report['examples']}")
+    print(f"Complexity accuracy:   {report['complexity_accuracy']:.1%}")
+    print(f"Write-intent accuracy: {report['write_accuracy']:.1%}")
+    print(f"Families exact match:  {report['families_exact_match']:.1%}")
+    print("Family F1:             " + ", ".join(f"{f}={v:.2f}" for f, v in report["family_f1"].items()))
+    print(f"Local latency:         mean {report['local_mean_us']:.0f}us, p95 {report['local_p95_us']:.0f}us")
+    print(f"LLM latency (logged):  mean {report['llm_mean_ms']:.0f}ms")
+    print(f"Saved per query:       ~{report['saved_ms_per_query']:.0f}ms")
+
+
+def cmd_train(args: argparse.Namespace) -> int:
+    examples = read_training_examples(_path(args.data))
+    if not examples:
+        print(f"No training examples in {args.data}")
+        return 1
+    clf = IntentClassifier(n_features=args.features).fit(examples, epochs=args.epochs, lr=args.lr)
+    out = _path(args.out)
+    clf.save(out)
+    print(f"Trained on {len(examples)} examples -> {out} ({out.stat().st_size / 1024:.0f} KiB)")
+    if args.report:
+        _print_report(evaluate(clf, examples))
+    return 0
+
+
+def cmd_evaluate(args: argparse.Namespace) -> int:
+    examples = read_training_examples(_path(args.data))
+    if not examples:
+        print(f"No examples in {args.data}")
+        return 1
+    if args.holdout:
+        # Train on a shuffled split and score the unseen remainder
+        rng = random.Random(args.seed)
+        shuffled = list(examples)
+        rng.shuffle(shuffled)
+        cut = max(1, int(len(shuffled) * (1.0 - args.holdout)))
+        train, test = shuffled[:cut], shuffled[cut:]
+        clf = IntentClassifier(n_features=args.features).fit(train, epochs=args.epochs, lr=args.lr)
+        print(f"Holdout evaluation: trained on {len(train)}, testing on {len(test)}")
+    else:
+        clf = IntentClassifier.load(_path(args.model))
+        test = examples
+    report = evaluate(clf, test)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report)
+    return 0
+
+
+def build_argparser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Train/evaluate the local intent classifier")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def common(p: argparse.ArgumentParser) -> None:
+        p.add_argument("--data", default="data/intent_training.jsonl", help="Logged LLM classifications (JSONL)")
+        p.add_argument("--features", type=int, default=1 << 18, help="Hashed feature space size")
+        p.add_argument("--epochs", type=int, default=12)
+        p.add_argument("--lr", type=float, default=0.5)
+
+    p_train = sub.add_parser("train", help="Fit a model from the training log")
+    common(p_train)
+    p_train.add_argument("--out", default="data/intent_model.json")
+    p_train.add_argument("--report", action="store_true", help="Print training-set agreement after fitting")
+    p_train.set_defaults(func=cmd_train)
+
+    p_eval = sub.add_parser("evaluate", help="Compare predictions to the LLM labels")
+    common(p_eval)
+    p_eval.add_argument("--model", default="data/intent_model.json")
+    p_eval.add_argument("--holdout", type=float, default=0.0, help="Train on (1-holdout) and test on the rest instead of loading --model")
+    p_eval.add_argument("--seed", type=int, default=7)
+    p_eval.add_argument("--json", action="store_true")
+    p_eval.set_defaults(func=cmd_evaluate)
+    return parser
+
+
+def main() -> int:
+    args = build_argparser().parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,11 +6,15 @@ Runs multiple test queries with detailed timing analysis.
 
 import asyncio
 import subprocess
+import sys
 import time
 import json
 from pathlib import Path
 from typing import List, Dict, Any
 
+# Extra trace_agent.py flags forwarded from our command line (--llm-record/--llm-replay/--llm-script ...)
+TRACE_ARGS: List[str] = []
+
 # Test queries of varying complexity
 SIMPLE_QUERIES = [
     "Add The Matrix (1999) to my Radarr",
@@ -36,6 +40,8 @@ async def run_profiled_query(query: str, profile: bool = True) -> Dict[str, Any]
     
     if profile:
         cmd.append("--profile")
+    # e.g. --llm-replay cassette.jsonl: every query runs against the local LLM stand-in
+    cmd.extend(TRACE_ARGS)
     
     start_time = time.perf_counter()
     
@@ -161,4 +167,5 @@ async def run_performance_benchmark():
     print("   python scripts/trace_agent.py --profile --message 'your query here'")
 
 if __name__ == "__main__":
+    TRACE_ARGS.extend(sys.argv[1:])
     asyncio.run(run_performance_benchmark())
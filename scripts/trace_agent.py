@@ -57,9 +57,40 @@ def _build_argparser() -> argparse.ArgumentParser:
         action="store_true",
         help="Enable detailed performance profiling and timing analysis",
     )
+    llm = p.add_mutually_exclusive_group()
+    llm.add_argument("--llm-record", metavar="CASSETTE", help="Proxy LLM calls to the real provider and record them to a cassette (JSONL)")
+    llm.add_argument("--llm-replay", metavar="CASSETTE", help="Serve LLM calls from a recorded cassette (no network)")
+    llm.add_argument("--llm-script", metavar="FILE", help="Serve LLM calls from a scripted turn file (YAML/JSON, no network)")
+    p.add_argument("--llm-upstream", default=None, help="Provider base URL for --llm-record (default: OpenAI)")
+    p.add_argument("--llm-latency-ms", type=float, default=None, help="Replay/script: fixed time to first byte instead of the recorded timing")
+    p.add_argument("--llm-latency-scale", type=float, default=1.0, help="Replay: multiply recorded timing (0 = as fast as possible)")
+    p.add_argument("--llm-chunk-ms", type=float, default=0.0, help="Replay/script: delay between stream events with --llm-latency-ms")
     return p
 
 
+async def _start_llm_stand_in(args: argparse.Namespace):
+    """Start the local OpenAI-compatible stand-in when a --llm-* mode was given; returns it or None."""
+    from llm.stand_in import DEFAULT_UPSTREAM, MODE_RECORD, MODE_REPLAY, MODE_SCRIPT, stand_in_from_args
+
+    for mode, path in ((MODE_RECORD, args.llm_record), (MODE_REPLAY, args.llm_replay), (MODE_SCRIPT, args.llm_script)):
+        if path:
+            server = stand_in_from_args(
+                mode,
+                path,
+                upstream=args.llm_upstream or DEFAULT_UPSTREAM,
+                latency_ms=args.llm_latency_ms,
+                latency_scale=args.llm_latency_scale,
+                chunk_ms=args.llm_chunk_ms,
+            )
+            base_url = await server.start()
+            # Every LLM client built from here on talks to the stand-in
+            os.environ["OPENAI_BASE_URL"] = base_url
+            os.environ["OPENROUTER_BASE_URL"] = base_url
+            print(f"[llm] stand-in ({mode}) at {base_url} using {path}")
+            return server
+    return None
+
+
 def _print_event(kind: str, detail: str) -> None:
     # Single-line humanized progress output for live visibility
     try:
@@ -235,7 +266,8 @@ class PerformanceProfiler:
         print("="*80)
 
 
-async def run_once(user_message: str, max_events: int, pretty: bool, profile: bool = False) -> int:
+async def run_once(user_message: str, max_events: int, pretty: bool, profile: bool = False, args: argparse.Namespace | None = None) -> int:
+    stand_in = await _start_llm_stand_in(args) if args is not None else None
     # Initialize profiler
     profiler = PerformanceProfiler(enable_profiling=profile)
     profiler.mark("startup")
@@ -246,7 +278,7 @@ async def run_once(user_message: str, max_events: int, pretty: bool, profile: bo
     settings = load_settings(project_root)
     profiler.mark("settings_load")
     
-    api_key = settings.openai_api_key or settings.openrouter_api_key or ""
+    api_key = settings.openai_api_key or settings.openrouter_api_key or ("stand-in" if stand_in is not None else "")
 
     # Initialize the registry cache
     initialize_registry_cache(project_root)
@@ -345,6 +377,10 @@ async def run_once(user_message: str, max_events: int, pretty: bool, profile: bo
     except Exception:
         pass
     
+    if stand_in is not None:
+        print(f"\n=== LLM STAND-IN ===\n{json.dumps(stand_in.stats)} injected {stand_in.injected_ms:.0f}ms")
+        await stand_in.close()
+
     profiler.mark("cleanup")
     
     # Print performance summary if profiling enabled
@@ -356,7 +392,7 @@ async def run_once(user_message: str, max_events: int, pretty: bool, profile: bo
 
 def main(argv: List[str]) -> int:
     args = _build_argparser().parse_args(argv)
-    return asyncio.run(run_once(args.message, args.max_events, args.pretty, args.profile))
+    return asyncio.run(run_once(args.message, args.max_events, args.pretty, args.profile, args))
 
 
 if __name__ == "__main__":
@@ -2,6 +2,7 @@ import pytest
 import sys
 from pathlib import Path
 import os
+from types import SimpleNamespace
 from dotenv import load_dotenv
 
 # Add the project root to the Python path for imports
@@ -87,6 +88,27 @@ def sonarr_config(integration_config):
         pytest.skip("Sonarr URL or API key not provided (set .env or pass CLI options)")
     return {"url": integration_config["sonarr_url"], "api_key": integration_config["sonarr_key"]}
 
+@pytest.fixture
+def make_agent(monkeypatch, tmp_path):
+    """Build an ``Agent`` around a fake LLM and tool map, without provider clients or the real registry.
+
+    Process-wide latency tracker and model router are off unless passed in.
+    """
+    def build(llm=None, tools=None, *, registry=None, project_root=None, latency_tracker=None, model_router=None):
+        from bot.agent import Agent
+
+        impls = tools or {}
+        reg = registry if registry is not None else SimpleNamespace(get=lambda name: impls[name])
+        monkeypatch.setattr("bot.agent.LLMClient", lambda api_key, provider="openai": llm if llm is not None else SimpleNamespace())
+        monkeypatch.setattr("bot.agent.initialize_registry_cache", lambda project_root: None)
+        monkeypatch.setattr("bot.agent.get_cached_registry", lambda llm=None: ([], reg))
+        monkeypatch.setattr("bot.agent.get_latency_tracker", lambda project_root: latency_tracker)
+        monkeypatch.setattr("bot.agent.get_model_router", lambda project_root: model_router)
+        return Agent(api_key="x", project_root=project_root or tmp_path)
+
+    return build
+
+
 @pytest.fixture
 def mock_paths(monkeypatch, tmp_path):
     """Mock file system paths for testing."""
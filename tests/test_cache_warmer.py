@@ -0,0 +1,83 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from bot.cache_warmer import CacheWarmer, WarmJob
+from bot.tools.result_cache import tool_dedup_key
+from integrations.ttl_cache import shared_cache
+
+
+class FakeRegistry:
+    def __init__(self, impls):
+        self._impls = impls
+
+    def get(self, name):
+        return self._impls[name]
+
+
+@pytest.mark.asyncio
+async def test_warm_all_populates_agent_session_keys_and_stats(tmp_path: Path):
+    calls = []
+
+    async def trending(args):
+        calls.append(args)
+        return {"trending_movies": [{"title": "Dune"}]}
+
+    async def broken(args):
+        return {"ok": False, "error": "boom"}
+
+    job_ok = WarmJob(name="trend", tool="tmdb_discovery_suite", args={"discovery_types": ["trending"]}, ttl_sec=60)
+    job_bad = WarmJob(name="bad", tool="radarr_root_folders", args={}, ttl_sec=60)
+    warmer = CacheWarmer(tmp_path, registry=FakeRegistry({"tmdb_discovery_suite": trending, "radarr_root_folders": broken}), jobs=[job_ok, job_bad])
+
+    out = await warmer.warm_all()
+
+    assert out == {"trend": True, "bad": False}
+    key = f"tool:{tool_dedup_key('tmdb_discovery_suite', {'discovery_types': ['trending']})}"
+    assert shared_cache.get(key) == {"trending_movies": [{"title": "Dune"}]}
+    stats = warmer.get_stats()["jobs"]
+    assert stats["trend"]["runs"] == 1 and stats["trend"]["failures"] == 0
+    assert stats["bad"]["failures"] == 1 and stats["bad"]["last_error"] == "boom"
+
+
+@pytest.mark.asyncio
+async def test_concurrency_cap_is_respected(tmp_path: Path):
+    active = 0
+    peak = 0
+
+    async def slow(args):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return {"items": []}
+
+    jobs = [WarmJob(name=f"j{i}", tool="slow", args={"i": i}, ttl_sec=60) for i in range(6)]
+    warmer = CacheWarmer(tmp_path, registry=FakeRegistry({"slow": slow}), jobs=jobs, concurrency=2)
+    await warmer.warm_all()
+    assert peak == 2
+
+
+def test_refresh_happens_before_expiry(tmp_path: Path):
+    warmer = CacheWarmer(tmp_path, registry=FakeRegistry({}), jobs=[], refresh_ahead_pct=0.2, jitter_pct=0.1)
+    job = WarmJob(name="x", tool="x", ttl_sec=100)
+    delays = [warmer._refresh_delay_s(job) for _ in range(50)]
+    assert all(70.0 <= d < 100.0 for d in delays)
+
+
+def test_default_jobs_match_fastpath_calls(tmp_path: Path):
+    warmer = CacheWarmer(tmp_path, registry=FakeRegistry({}))
+    names = {job.tool for job in warmer.jobs}
+    assert {"plex_library_overview", "search_plex", "tmdb_discovery_suite"} <= names
+
+
+def test_default_jobs_warm_weekly_and_daily_trending(tmp_path: Path):
+    warmer = CacheWarmer(tmp_path, registry=FakeRegistry({}))
+    windows = {
+        job.args.get("time_window", "week")
+        for job in warmer.jobs
+        if job.tool == "tmdb_discovery_suite" and job.args.get("discovery_types") == ["trending"]
+    }
+    assert windows == {"week", "day"}
@@ -0,0 +1,124 @@
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from bot.agent import Agent
+from integrations.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, circuit_registry, is_upstream_failure
+
+
+def test_breaker_opens_then_admits_a_single_probe(monkeypatch):
+    now = [0.0]
+    b = CircuitBreaker("tmdb@api.themoviedb.org", open_after_failures=2, open_for_ms=1000)
+    monkeypatch.setattr(b, "_now_ms", lambda: now[0])
+
+    b.record_failure()
+    assert b.state == CLOSED and b.allow()
+    b.record_failure()
+    assert b.state == OPEN and not b.allow()
+
+    now[0] = 1000
+    assert b.allow() and b.state == HALF_OPEN
+    assert not b.allow()  # only one probe in flight
+    b.record_failure()
+    assert b.state == OPEN and b.trips == 2
+
+    now[0] = 2000
+    assert b.allow()
+    b.record_success()
+    assert b.state == CLOSED and b.allow() and b.allow()
+
+
+def test_stale_probe_is_replaced(monkeypatch):
+    now = [0.0]
+    b = CircuitBreaker("plex@plex:32400", open_after_failures=1, open_for_ms=500)
+    monkeypatch.setattr(b, "_now_ms", lambda: now[0])
+    b.record_failure()
+    now[0] = 500
+    assert b.allow()
+    now[0] = 700
+    assert not b.allow()
+    now[0] = 1000  # the first probe never reported back
+    assert b.allow()
+
+
+def test_client_error_closes_only_from_the_probe(monkeypatch):
+    now = [0.0]
+    b = CircuitBreaker("tmdb@api.themoviedb.org", open_after_failures=1, open_for_ms=1000)
+    monkeypatch.setattr(b, "_now_ms", lambda: now[0])
+    not_found = type("E", (Exception,), {"status_code": 404})()
+    b.record_failure()
+    # A 404 from a call that was in flight when the breaker opened says nothing about recovery
+    b.record_error(not_found)
+    assert b.state == OPEN and not b.allow()
+    now[0] = 1000
+    assert b.allow() and b.state == HALF_OPEN
+    b.record_error(not_found)
+    assert b.state == CLOSED
+
+
+def test_upstream_failure_classification():
+    assert is_upstream_failure(asyncio.TimeoutError())
+    assert is_upstream_failure(type("E", (Exception,), {"status_code": 503})())
+    assert not is_upstream_failure(type("E", (Exception,), {"status_code": 404})())
+    assert not is_upstream_failure(ValueError("bad input"))
+
+
+@pytest.mark.asyncio
+async def test_outage_is_shared_across_agents(tmp_path: Path, make_agent):
+    (tmp_path / "config").mkdir()
+    (tmp_path / "config" / "config.yaml").write_text("tools:\n  timeoutMs: 50\n", encoding="utf-8")
+    circuit_registry.reset()
+    calls = []
+
+    async def slow_tool(args):
+        calls.append(args)
+        await asyncio.sleep(1)
+
+    registry = SimpleNamespace(get=lambda name: slow_tool)
+    cfg = {"tools": {"timeoutMs": 50, "retryMax": 0, "circuit": {"openAfterFailures": 1, "openForMs": 60000}}}
+    circuit_registry.configure(open_after_failures=1, open_for_ms=60000)
+    try:
+        first = make_agent(registry=registry)
+        first._tuning_cfg = cfg
+        _, _, result, _, _ = await first._execute_single_tool(first._build_tool_call("tmdb_search", {"query": "a"}), 50, 0, 1)
+        assert result["error"] == "timeout"
+
+        # A fresh Agent (next message) and a different tmdb tool fail fast
+        second = make_agent(registry=registry)
+        second._tuning_cfg = cfg
+        _, _, result, _, _ = await second._execute_single_tool(second._build_tool_call("tmdb_movie_details", {"movie_id": 1}), 50, 0, 1)
+        assert result["error"] == "circuit_breaker_open"
+        assert result["upstream"] == "tmdb@api.themoviedb.org"
+        assert len(calls) == 1
+        assert circuit_registry.snapshot()["tmdb@api.themoviedb.org"]["state"] == OPEN
+    finally:
+        circuit_registry.reset()
+        circuit_registry.configure(open_after_failures=3, open_for_ms=3000)
+
+
+@pytest.mark.asyncio
+async def test_late_client_error_from_a_tool_keeps_the_breaker_open(tmp_path: Path, make_agent):
+    circuit_registry.reset()
+    circuit_registry.configure(open_after_failures=1, open_for_ms=60000)
+    opened = asyncio.Event()
+
+    async def details(args):
+        # The breaker opens while this call is still in flight
+        await opened.wait()
+        raise type("NotFound", (Exception,), {"status_code": 404})("movie not found")
+
+    agent = make_agent(registry=SimpleNamespace(get=lambda name: details))
+    agent._tuning_cfg = {"tools": {"timeoutMs": 2000, "retryMax": 0}}
+    try:
+        call = asyncio.create_task(agent._execute_single_tool(agent._build_tool_call("tmdb_movie_details", {"movie_id": 1}), 2000, 0, 1))
+        await asyncio.sleep(0.01)
+        circuit_registry.get("tmdb@api.themoviedb.org").record_failure()
+        opened.set()
+        _, _, result, _, _ = await call
+        assert result["status"] == 404
+        assert circuit_registry.snapshot()["tmdb@api.themoviedb.org"]["state"] == OPEN
+    finally:
+        circuit_registry.reset()
+        circuit_registry.configure(open_after_failures=3, open_for_ms=3000)
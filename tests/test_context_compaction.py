@@ -0,0 +1,75 @@
+import json
+
+from bot.context_compaction import ContextCompactor
+from bot.tools.result_cache import put_tool_result
+
+
+def _count(s: str) -> int:
+    return len(s)
+
+
+def _tool_turn(n: int, name: str, raw: dict, content: dict) -> list:
+    call_id = f"call_{n}"
+    ref_id = put_tool_result(raw, 300)
+    return [
+        {"role": "assistant", "content": "", "tool_calls": [{"id": call_id, "type": "function", "function": {"name": name, "arguments": "{}"}}]},
+        {"role": "tool", "tool_call_id": call_id, "name": name, "content": json.dumps({"ref_id": ref_id, "summary": content})},
+    ]
+
+
+def _big_radarr_payload(n: int) -> dict:
+    return {"movies": [{"title": f"Movie {i}", "year": 2000 + i % 20, "overview": "x" * 200, "tmdbId": i} for i in range(n)]}
+
+
+def _transcript() -> list:
+    big = _big_radarr_payload(40)
+    msgs = [{"role": "system", "content": "sys"}, {"role": "user", "content": "hi"}]
+    msgs += _tool_turn(1, "radarr_get_movies", big, big)  # huge, preserved raw
+    msgs += _tool_turn(2, "search_plex", {"items": [{"title": "Heat", "year": 1995}]}, {"items": [{"title": "Heat", "year": 1995}]})
+    msgs += _tool_turn(3, "tmdb_search", {"results": [{"title": "Dune", "year": 2021}]}, {"results": [{"title": "Dune", "year": 2021}]})
+    return msgs
+
+
+def _assert_pairing_valid(msgs: list) -> None:
+    pending: set = set()
+    for m in msgs:
+        if m["role"] == "assistant" and m.get("tool_calls"):
+            pending = {tc["id"] for tc in m["tool_calls"]}
+        elif m["role"] == "tool":
+            assert m["tool_call_id"] in pending
+
+
+def test_under_budget_is_untouched():
+    msgs = _transcript()
+    before = json.dumps(msgs)
+    report = ContextCompactor(10**9, count_text=_count).compact(msgs)
+    assert not report.changed and json.dumps(msgs) == before
+
+
+def test_large_old_result_is_summarized_before_small_ones_are_touched():
+    msgs = _transcript()
+    compactor = ContextCompactor(3000, count_text=_count)
+    small_before = msgs[5]["content"]
+    report = compactor.compact(msgs)
+    assert report.summarized == 1 and report.tokens_after <= 3000
+    summary = json.loads(msgs[3]["content"])["summary"]
+    assert len(json.dumps(summary)) < 3000
+    assert msgs[5]["content"] == small_before
+    _assert_pairing_valid(msgs)
+
+
+def test_progressive_stubs_then_turn_drops_keep_latest_turn_and_pairing():
+    msgs = _transcript()
+    latest = msgs[-1]["content"]
+    compactor = ContextCompactor(450, count_text=_count)
+    report = compactor.compact(msgs)
+    assert report.stubbed >= 1 and report.dropped_turns == 0
+    stub = json.loads(msgs[3]["content"])
+    assert stub["compacted"].startswith("radarr_get_movies: 40 item(s)") and "ref_id" in stub
+    assert msgs[-1]["content"] == latest
+    _assert_pairing_valid(msgs)
+
+    report = ContextCompactor(60, count_text=_count).compact(msgs)
+    assert report.dropped_turns >= 1
+    assert msgs[-1]["content"] == latest and msgs[-2]["role"] == "assistant"
+    _assert_pairing_valid(msgs)
@@ -0,0 +1,124 @@
+import asyncio
+import json
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from bot.agent import Agent
+from integrations.circuit_breaker import circuit_registry
+from integrations.deadline import Deadline, DeadlineExceeded, clamp_timeout_ms, current_deadline, deadline_scope, within_deadline
+from llm.clients import LLMClient
+
+
+def test_clamp_and_reserve():
+    assert clamp_timeout_ms(8000) == 8000
+    d = Deadline(1000)
+    with deadline_scope(d):
+        assert 900 <= clamp_timeout_ms(8000) <= 1000
+        assert clamp_timeout_ms(50) == 50
+    assert current_deadline() is None
+    assert d.reserve(400).remaining_ms() <= 600
+    assert Deadline(1000).reserve(2000).expired
+    queued = Deadline(1000, start=time.monotonic() - 1.5)
+    assert queued.expired
+    queued.extend(1500)
+    assert 900 <= queued.remaining_ms() <= 1000
+
+
+@pytest.mark.asyncio
+async def test_deadline_follows_tasks_and_bounds_awaits():
+    async def child():
+        return current_deadline()
+
+    d = Deadline(50)
+    with deadline_scope(d):
+        assert await asyncio.create_task(child()) is d
+        with pytest.raises(DeadlineExceeded):
+            await within_deadline(asyncio.sleep(1))
+    assert await within_deadline(asyncio.sleep(0, result=7)) == 7
+
+
+@pytest.mark.asyncio
+async def test_stalled_stream_stops_at_the_deadline(monkeypatch):
+    client = LLMClient("x", provider="openrouter")
+
+    async def stalled(**kwargs):
+        yield SimpleNamespace(content="Heat", tool_calls=None)
+        await asyncio.sleep(5)
+        yield SimpleNamespace(content=" (1995)", tool_calls=None)
+
+    monkeypatch.setattr(client, "_astream_chat_deltas", stalled)
+    circuit_registry.reset()
+    parts = []
+    t0 = time.monotonic()
+    try:
+        with deadline_scope(Deadline(100)):
+            with pytest.raises(DeadlineExceeded):
+                async for delta in client.astream_chat_deltas(model="m", messages=[{"role": "user", "content": "hi"}]):
+                    parts.append(delta.content)
+    finally:
+        circuit_registry.reset()
+    assert parts == ["Heat"] and time.monotonic() - t0 < 1
+
+
+def _tool_call(call_id, name, args):
+    return SimpleNamespace(id=call_id, type="function", function=SimpleNamespace(name=name, arguments=json.dumps(args)))
+
+
+def _mk_choice(content=None, tool_calls=None):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content, tool_calls=tool_calls))])
+
+
+def _agent(tmp_path: Path, make_agent, llm, tools) -> Agent:
+    (tmp_path / "config").mkdir(exist_ok=True)
+    (tmp_path / "config" / "config.yaml").write_text(
+        "ux:\n  synthesisReserveMs: 300\n  minTurnMs: 1000\nllm:\n  planMode:\n    enabled: false\n", encoding="utf-8"
+    )
+    return make_agent(llm, tools)
+
+
+@pytest.mark.asyncio
+async def test_tool_timeout_is_clamped_without_tripping_breaker(tmp_path: Path, make_agent):
+    circuit_registry.reset()
+
+    async def slow(args):
+        await asyncio.sleep(2)
+
+    agent = _agent(tmp_path, make_agent, SimpleNamespace(), {"tmdb_search": slow})
+    agent._tuning_cfg = {"tools": {"timeoutMs": 8000, "retryMax": 2}}
+    t0 = asyncio.get_running_loop().time()
+    with deadline_scope(Deadline(100)):
+        _, _, result, _, _ = await agent._execute_single_tool(_tool_call("c1", "tmdb_search", {"query": "x"}), 8000, 2, 10)
+    assert asyncio.get_running_loop().time() - t0 < 0.5
+    assert result["error"] == "deadline_exceeded"
+    assert circuit_registry.snapshot()["tmdb@api.themoviedb.org"]["failures"] == 0
+
+
+@pytest.mark.asyncio
+async def test_agent_answers_from_partial_results_when_budget_runs_low(tmp_path: Path, make_agent):
+    calls = []
+    scripted = [
+        _mk_choice(tool_calls=[_tool_call("c1", "tmdb_search", {"query": "Dune"})]),
+        _mk_choice(content="Dune (2021) - I ran out of time to check Plex."),
+    ]
+
+    class FakeLLM:
+        async def achat(self, **kwargs):
+            calls.append(kwargs)
+            return scripted.pop(0)
+
+    async def tmdb_search(args):
+        await asyncio.sleep(0.3)
+        return {"results": [{"id": 438631, "title": "Dune", "year": 2021}]}
+
+    agent = _agent(tmp_path, make_agent, FakeLLM(), {"tmdb_search": tmdb_search})
+    with deadline_scope(Deadline(1500)):
+        resp = await agent.aconverse([{"role": "user", "content": "tell me about the movie Dune and whether it is on plex"}])
+
+    assert resp.choices[0].message.content.startswith("Dune (2021)")
+    assert len(calls) == 2
+    final_msgs = calls[-1]["messages"]
+    assert final_msgs[-1]["role"] == "system" and "Time is up" in final_msgs[-1]["content"]
+    assert any(m["role"] == "tool" for m in final_msgs)
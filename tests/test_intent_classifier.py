@@ -0,0 +1,87 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+from bot.intent_classifier import (
+    IntentClassifier,
+    append_training_example,
+    families_for_tools,
+    featurize,
+    load_intent_classifier,
+    read_training_examples,
+)
+from llm.governor import Priority, current_priority
+
+
+_TITLES = ["Dune", "Heat", "Alien", "Arrival", "Inception", "Severance", "Andor", "Fargo", "Sicario", "Zodiac"]
+
+
+def _corpus():
+    examples = []
+    for t in _TITLES:
+        examples.append({"query": f"add {t} to radarr", "complexity": "complex", "requires_write": True, "families": ["tmdb", "radarr"]})
+        examples.append({"query": f"please add the series {t} to sonarr", "complexity": "complex", "requires_write": True, "families": ["tmdb", "sonarr"]})
+        examples.append({"query": f"do I have {t} in my plex library", "complexity": "simple", "requires_write": False, "families": ["plex"]})
+        examples.append({"query": f"movies similar to {t}", "complexity": "medium", "requires_write": False, "families": ["tmdb"]})
+    return examples
+
+
+def test_featurize_is_stable_and_normalized():
+    a = featurize("Add Dune to Radarr", 1024)
+    assert a == featurize("add dune to radarr", 1024)
+    assert abs(sum(v * v for v in a.values()) - 1.0) < 1e-9
+
+
+def test_families_for_tools_maps_service_prefixes():
+    assert families_for_tools(["tmdb_search", "search_plex", "radarr_add_movie", "tmdb_movie_details"]) == ["tmdb", "plex", "radarr"]
+
+
+def test_fit_predict_and_roundtrip(tmp_path: Path):
+    clf = IntentClassifier(n_features=1 << 14).fit(_corpus())
+    pred = clf.predict("add Blade Runner to radarr")
+    assert pred.complexity == "complex" and pred.requires_write
+    assert set(pred.families) == {"tmdb", "radarr"}
+    pred = clf.predict("do I have Blade Runner in my plex library")
+    assert pred.complexity == "simple" and not pred.requires_write and pred.families == ["plex"]
+
+    path = tmp_path / "model.json"
+    clf.save(path)
+    loaded = load_intent_classifier(path)
+    assert loaded is not None
+    assert loaded.classify("add Blade Runner to radarr")["complexity"] == "complex"
+    assert load_intent_classifier(tmp_path / "missing.json") is None
+
+
+def test_training_log_append_and_read(tmp_path: Path):
+    path = tmp_path / "log.jsonl"
+    append_training_example(path, "add Dune", {"complexity": "complex", "requires_write": True, "suggested_tools": ["radarr_add_movie"]}, 812)
+    rows = read_training_examples(path)
+    assert rows[0]["query"] == "add Dune" and rows[0]["families"] == ["radarr"] and rows[0]["latency_ms"] == 812
+
+
+def test_agent_uses_local_model_when_confident(tmp_path: Path, make_agent):
+    IntentClassifier(n_features=1 << 14).fit(_corpus()).save(tmp_path / "data" / "intent_model.json")
+    agent = make_agent()
+    msgs = [{"role": "user", "content": "add Blade Runner to radarr"}]
+
+    rc = {"llm": {"intentClassifier": {"enabled": True, "minConfidence": 0.5}}}
+    result = agent._classify_query_complexity_local(msgs, rc)
+    assert result is not None and result["complexity"] == "complex" and result["requires_write"]
+
+    assert agent._classify_query_complexity_local(msgs, {"llm": {"intentClassifier": {"enabled": False}}}) is None
+    # Unsure predictions defer to the LLM path
+    assert agent._classify_query_complexity_local(msgs, {"llm": {"intentClassifier": {"enabled": True, "minConfidence": 1.01}}}) is None
+
+
+async def test_llm_classification_runs_as_a_background_call(make_agent):
+    seen = []
+
+    class FakeLLM:
+        async def achat(self, **kwargs):
+            seen.append(current_priority())
+            content = '{"complexity": "simple", "confidence": 0.9, "reasoning": "lookup"}'
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content, tool_calls=None))])
+
+    agent = make_agent(FakeLLM())
+    result = await agent._classify_query_complexity_llm([{"role": "user", "content": "how long is the film Zodiac, priority check"}])
+    assert result["complexity"] == "simple"
+    assert seen == [Priority.CLASSIFICATION]
@@ -0,0 +1,111 @@
+from pathlib import Path
+
+import pytest
+
+from bot.intent_router import Intent, IntentRouter, ToolStep, _trie_regex, get_intent_router, render_template
+
+
+def test_trie_regex_matches_exactly_the_word_set():
+    import re
+
+    words = ["on deck", "on the", "rate", "rating", "recommend", "recommendation"]
+    rx = re.compile(r"^" + _trie_regex(words) + r"$")
+    assert all(rx.match(w) for w in words)
+    assert not rx.match("on") and not rx.match("rat") and not rx.match("recommenda")
+
+
+def test_route_priority_and_slots():
+    router = get_intent_router()
+    assert router.route("what's trending in my library?").intent.name == "trending"
+    m = router.route("do I have Heat on my plex?")
+    assert m.intent.name == "plex_availability" and m.slots == {"title": "Heat"}
+    assert m.tool_steps() == [ToolStep("search_plex", {"query": "Heat", "limit": 3, "response_level": "compact"})]
+    m = router.route("movies with Tom Hanks")
+    assert m.tool_steps()[0].args["filters"]["actors"] == ["Tom Hanks"]
+    assert m.finalize == "Finalize: best picks with Tom Hanks."
+    assert router.route("whats new").intent.name == "recent_additions"
+    assert router.route("add Dune to radarr") is None
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "is it on plex",
+        "which comedies are available on plex",
+        "are any Nolan films on my plex",
+        "add Heat to radarr, is it on plex?",
+        "is that one in my library?",
+    ],
+)
+def test_references_and_quantifiers_are_not_titles(text):
+    assert get_intent_router().route(text) is None
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        ("hi", True),
+        ("thanks!", True),
+        ("what can you do?", True),
+        ("hi, add Dune to radarr", False),
+        ("hello synchronic (2020)", False),
+        ("hey what's new in my library", False),
+        ("tell me a joke about cinema", False),
+        ("", False),
+    ],
+)
+def test_is_quick_path(text, expected):
+    assert get_intent_router().is_quick_path(text) is expected
+
+
+def test_custom_table_rejects_unknown_kind():
+    with pytest.raises(ValueError):
+        IntentRouter([Intent("x", "bogus", keywords=("x",))])
+
+
+def test_templates_render_from_results_or_defer():
+    router = get_intent_router()
+    m = router.route("is Heat on plex")
+    text = render_template(m, {"search_plex": [{"items": [{"title": "Heat", "year": 1995}]}]})
+    assert text == "Yes — **Heat (1995)** is on Plex."
+    assert render_template(m, {"search_plex": [{"ok": False, "error": "timeout"}]}) is None
+    # Without an exact title match the LLM finalizes from the results
+    assert render_template(m, {"search_plex": [{"items": []}]}) is None
+    assert render_template(m, {"search_plex": [{"items": [{"title": "Heat Wave", "year": 2022}]}]}) is None
+    assert render_template(router.route("movies with Tom Hanks"), {"search_plex": [{"items": []}]}) is None
+
+
+@pytest.mark.asyncio
+async def test_agent_answers_templated_fast_path_without_llm(tmp_path: Path, make_agent):
+    (tmp_path / "config").mkdir()
+    (tmp_path / "config" / "config.yaml").write_text("ux:\n  templateReplies: true\n", encoding="utf-8")
+
+    class NoLLM:
+        async def achat(self, **kwargs):
+            raise AssertionError("fast path should not call the LLM")
+
+    calls = []
+
+    async def search_plex(args):
+        calls.append(args)
+        return {"items": [{"title": "Heat", "year": 1995}]}
+
+    agent = make_agent(NoLLM(), {"search_plex": search_plex})
+    resp = await agent.aconverse([{"role": "user", "content": "do I have Heat on my plex?"}])
+
+    assert resp["choices"][0]["message"]["content"] == "Yes — **Heat (1995)** is on Plex."
+    assert calls == [{"query": "Heat", "limit": 3, "response_level": "compact"}]
+
+
+def test_agent_routes_only_the_latest_read_message(tmp_path: Path, make_agent):
+    (tmp_path / "config").mkdir()
+    (tmp_path / "config" / "config.yaml").write_text("ux:\n  templateReplies: true\n", encoding="utf-8")
+    agent = make_agent()
+    asked = [{"role": "user", "content": "is Heat on my plex?"}, {"role": "assistant", "content": "Yes — **Heat (1995)** is on Plex."}]
+    follow_up = asked + [{"role": "user", "content": "ok add Dune Part Two to radarr please"}]
+    assert agent._route_fastpath_intent(follow_up) is None
+    assert agent._detect_zero_llm_fastpath(follow_up, must_write=False) == (None, None)
+    assert agent._render_fastpath_reply(follow_up, [("c1", "search_plex", {"items": [{"title": "Heat"}]}, 1, False)]) is None
+
+    after_write = [{"role": "user", "content": "add Dune to radarr"}, {"role": "assistant", "content": "Added."}, {"role": "user", "content": "is Heat on my plex?"}]
+    assert agent._route_fastpath_intent(after_write).slots == {"title": "Heat"}
@@ -0,0 +1,94 @@
+import random
+import threading
+from pathlib import Path
+
+import pytest
+
+from bot.latency_tracker import LatencySketch, LatencyTracker
+
+
+def test_sketch_quantiles_within_relative_accuracy():
+    rng = random.Random(7)
+    values = sorted(rng.lognormvariate(5, 0.6) for _ in range(1000))
+    sk = LatencySketch(relative_accuracy=0.02, max_count=10**6)
+    for v in values:
+        sk.add(v)
+    for q in (0.5, 0.9, 0.99):
+        exact = values[int(q * (len(values) - 1))]
+        assert abs(sk.quantile(q) - exact) / exact <= 0.03
+    assert LatencySketch().quantile(0.5) is None
+
+
+def test_sketch_decay_follows_latency_shift():
+    sk = LatencySketch(max_count=200)
+    for _ in range(200):
+        sk.add(100)
+    for _ in range(600):
+        sk.add(1000)
+    assert sk.count <= 200
+    assert sk.quantile(0.5) > 900
+
+
+def test_tracker_uses_static_until_warm_then_clamps(tmp_path: Path):
+    tr = LatencyTracker(min_samples=10, timeout_multiplier=3, timeout_floor_ms=500, timeout_ceiling_ms=2000, hedge_floor_ms=50, hedge_ceiling_ms=400)
+    assert tr.timeout_ms("tmdb_search", "api.themoviedb.org", 2500) == 2500
+    for ms in [100] * 98 + [300] * 2:
+        tr.record("tmdb_search", "api.themoviedb.org", ms)
+    assert 850 <= tr.timeout_ms("tmdb_search", "api.themoviedb.org", 2500) <= 950
+    assert 95 <= tr.hedge_delay_ms("tmdb_search", "api.themoviedb.org", 150) <= 105
+    # A different host has its own sketch
+    assert tr.timeout_ms("tmdb_search", "other", 2500) == 2500
+    for _ in range(5):
+        tr.record("tmdb_search", "api.themoviedb.org", 1500, ok=False)
+    assert tr.timeout_ms("tmdb_search", "api.themoviedb.org", 2500) == 2000
+    assert tr.get_stats()["tmdb_search@api.themoviedb.org"]["timeouts"] == 5
+
+
+def test_tracker_persists_across_restarts(tmp_path: Path):
+    path = tmp_path / "data" / "latency.json"
+    tr = LatencyTracker(min_samples=5, persist_path=path, persist_interval_s=3600)
+    for ms in (200, 210, 220, 230, 240):
+        tr.record("plex_search", "plex:32400", ms)
+    tr.save()
+    again = LatencyTracker(min_samples=5, persist_path=path)
+    assert again.get_stats()["plex_search@plex:32400"]["samples"] == 5
+    assert again.timeout_ms("plex_search", "plex:32400", 4000) == tr.timeout_ms("plex_search", "plex:32400", 4000)
+
+
+@pytest.mark.asyncio
+async def test_periodic_save_runs_off_the_event_loop(tmp_path: Path, monkeypatch):
+    path = tmp_path / "latency.json"
+    tr = LatencyTracker(persist_path=path, persist_interval_s=0)
+    savers = []
+    save = tr.save
+
+    def tracked():
+        savers.append(threading.get_ident())
+        save()
+
+    monkeypatch.setattr(tr, "save", tracked)
+    tr.record("tmdb_search", "api.themoviedb.org", 120)
+    assert savers == []
+    await tr._save_task
+    assert savers and savers[0] != threading.get_ident() and path.exists()
+
+
+@pytest.mark.asyncio
+async def test_agent_records_latency_and_applies_learned_timeout(tmp_path: Path, make_agent):
+    (tmp_path / "config").mkdir()
+    (tmp_path / "config" / "config.yaml").write_text("tools:\n  timeoutMs: 8000\n", encoding="utf-8")
+
+    async def tmdb_search(args):
+        return {"results": []}
+
+    tracker = LatencyTracker(min_samples=3, timeout_floor_ms=500)
+    agent = make_agent(tools={"tmdb_search": tmdb_search}, latency_tracker=tracker)
+    agent._tuning_cfg = {"tools": {"timeoutMs": 8000}}
+
+    assert agent._select_tool_tuning("tmdb_search")["timeoutMs"] == 8000
+    for i in range(3):
+        tc = agent._build_tool_call("tmdb_search", {"query": f"q{i}"})
+        _, _, result, _, _ = await agent._execute_single_tool(tc, 8000, 0, 10)
+        assert result == {"results": []}
+    assert tracker.get_stats()["tmdb_search@api.themoviedb.org"]["samples"] == 3
+    assert agent._select_tool_tuning("tmdb_search")["timeoutMs"] == 500
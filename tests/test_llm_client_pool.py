@@ -0,0 +1,84 @@
+import pytest
+from aiohttp import web
+from openai import InternalServerError
+
+from llm.client_pool import ClientPoolConfig, LLMClientPool, RetryBudget
+
+
+COMPLETION = {
+    "id": "c1",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "gpt-5-nano",
+    "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "hi"}}],
+}
+
+
+@pytest.fixture
+async def stand_in():
+    """Local OpenAI-compatible endpoint; ``fail_first`` requests answer 503."""
+    state = {"calls": 0, "fail_first": 0}
+
+    async def completions(request: web.Request) -> web.Response:
+        state["calls"] += 1
+        if state["calls"] <= state["fail_first"]:
+            return web.json_response({"error": {"message": "overloaded"}}, status=503)
+        return web.json_response(COMPLETION)
+
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", completions)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+    state["base_url"] = f"http://127.0.0.1:{port}/v1"
+    yield state
+    await runner.cleanup()
+
+
+def _pool(**kw) -> LLMClientPool:
+    return LLMClientPool(ClientPoolConfig(http2=False, backoff_base_ms=1, **kw))
+
+
+async def _ask(pool: LLMClientPool, base_url: str):
+    client = pool.async_client("openai", "k", base_url=base_url)
+    return await pool.acall("openai", lambda: client.chat.completions.create(model="gpt-5-nano", messages=[{"role": "user", "content": "hi"}]))
+
+
+async def test_consumers_share_one_warm_connection(stand_in):
+    pool = _pool()
+    assert pool.async_client("openai", "k", base_url=stand_in["base_url"]) is pool.async_client("openai", "k", base_url=stand_in["base_url"])
+    assert pool.async_client("openai", "other", base_url=stand_in["base_url"]) is not pool.async_client("openai", "k", base_url=stand_in["base_url"])
+    for _ in range(5):
+        resp = await _ask(pool, stand_in["base_url"])
+        assert resp.choices[0].message.content == "hi"
+    st = pool.get_stats()["openai"]
+    assert (st["requests"], st["connections_opened"], st["reused_requests"], st["tls_handshakes"]) == (5, 1, 4, 0)
+
+
+async def test_transient_errors_are_retried_within_budget(stand_in):
+    stand_in["fail_first"] = 2
+    pool = _pool(retry_max=2)
+    resp = await _ask(pool, stand_in["base_url"])
+    assert resp.choices[0].message.content == "hi" and stand_in["calls"] == 3
+    assert pool.get_stats()["openai"]["retries"] == 2
+
+
+async def test_exhausted_budget_fails_fast(stand_in):
+    stand_in["fail_first"] = 10
+    pool = _pool(retry_max=5, retry_ratio=0.0, retry_min_per_sec=0.0)
+    pool.budget("openai")._tokens = 1.0
+    with pytest.raises(InternalServerError):
+        await _ask(pool, stand_in["base_url"])
+    st = pool.get_stats()["openai"]
+    assert stand_in["calls"] == 2 and (st["retries"], st["retries_denied"]) == (1, 1)
+
+
+def test_retry_budget_tracks_traffic():
+    b = RetryBudget(ratio=0.5, min_per_sec=0.0, max_tokens=2.0)
+    b._tokens = 0.0
+    assert not b.try_spend()
+    b.record_request()
+    b.record_request()
+    assert b.try_spend() and not b.try_spend()
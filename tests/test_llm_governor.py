@@ -0,0 +1,172 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from aiohttp import web
+
+from llm.client_pool import ClientPoolConfig, GovernedStream, LLMClientPool
+from llm.governor import GovernorConfig, LLMGovernor, Priority, default_priority, llm_priority
+
+
+def _governor(**kw) -> LLMGovernor:
+    return LLMGovernor("openai", GovernorConfig(**kw))
+
+
+async def test_waiters_are_admitted_by_priority_then_fifo():
+    gov = _governor(initial_limit=1, background_share=1.0)
+    held = await gov.acquire(Priority.TOOL_SELECTION)
+    order = []
+
+    async def call(p: Priority, tag: str) -> None:
+        permit = await gov.acquire(p)
+        order.append(tag)
+        await asyncio.sleep(0)
+        permit.release(latency_s=0.01)
+
+    tasks = [
+        asyncio.create_task(call(Priority.CLASSIFICATION, "classify")),
+        asyncio.create_task(call(Priority.SUMMARIZATION, "summarize")),
+        asyncio.create_task(call(Priority.TOOL_SELECTION, "tools-1")),
+        asyncio.create_task(call(Priority.FINAL_ANSWER, "final")),
+        asyncio.create_task(call(Priority.TOOL_SELECTION, "tools-2")),
+    ]
+    await asyncio.sleep(0.01)
+    assert gov.get_stats()["queue_depth"] == 5
+    held.release(latency_s=0.01)
+    await asyncio.gather(*tasks)
+    assert order == ["final", "tools-1", "tools-2", "summarize", "classify"]
+    classes = gov.get_stats()["classes"]
+    assert classes["final_answer"]["queued"] == 1 and classes["classification"]["wait_max_ms"] > 0
+
+
+async def test_background_share_and_final_reserve():
+    gov = _governor(initial_limit=4, reserved_final=1, background_share=0.5)
+    bg = [await gov.acquire(Priority.CLASSIFICATION), await gov.acquire(Priority.SUMMARIZATION)]
+    third_bg = asyncio.create_task(gov.acquire(Priority.CLASSIFICATION))
+    tool = await asyncio.wait_for(gov.acquire(Priority.TOOL_SELECTION), 1)
+    # The last slot is held back for a final answer
+    second_tool = asyncio.create_task(gov.acquire(Priority.TOOL_SELECTION))
+    final = await asyncio.wait_for(gov.acquire(Priority.FINAL_ANSWER), 1)
+    await asyncio.sleep(0.01)
+    assert not third_bg.done() and not second_tool.done()
+    assert gov.get_stats()["in_flight"] == 4
+    final.release()
+    tool.release()
+    (await asyncio.wait_for(second_tool, 1)).release()
+    bg[0].release()
+    (await asyncio.wait_for(third_bg, 1)).release()
+    bg[1].release()
+    assert gov.get_stats()["in_flight"] == 0
+
+
+async def test_429_halves_limit_and_pauses_for_retry_after():
+    gov = _governor(initial_limit=8, cooldown_s=60)
+    first, second = await gov.acquire(), await gov.acquire()
+    first.release(throttled=True, retry_after_s=0.2)
+    second.release(throttled=True)  # within cooldown: no second cut
+    stats = gov.get_stats()
+    assert stats["limit"] == 4 and stats["decreases"] == 1 and stats["paused_ms"] > 0
+    t0 = time.monotonic()
+    (await asyncio.wait_for(gov.acquire(Priority.FINAL_ANSWER), 2)).release()
+    assert time.monotonic() - t0 >= 0.15
+    assert gov.get_stats()["classes"]["final_answer"]["throttled"] == 2
+
+
+async def test_limit_grows_only_while_saturated_and_shrinks_on_slow_calls():
+    gov = _governor(initial_limit=2, max_limit=3, cooldown_s=0, latency_min_samples=3)
+    for _ in range(4):
+        (await gov.acquire()).release(latency_s=0.1)
+    assert gov.limit == 2  # never saturated
+    for _ in range(6):
+        a, b = await gov.acquire(), await gov.acquire()
+        a.release(latency_s=0.1)
+        b.release(latency_s=0.1)
+    assert gov.limit == 3
+    (await gov.acquire()).release(latency_s=5.0)
+    assert gov.limit == 2
+
+
+def test_sync_and_async_callers_share_slots():
+    gov = _governor(initial_limit=1)
+    granted = threading.Event()
+
+    async def main() -> None:
+        permit = await gov.acquire(Priority.TOOL_SELECTION)
+        thread = threading.Thread(target=lambda: (gov.acquire_sync(Priority.SUMMARIZATION).release(), granted.set()))
+        thread.start()
+        await asyncio.sleep(0.05)
+        assert not granted.is_set()
+        permit.release()
+        await asyncio.to_thread(thread.join, 2)
+
+    asyncio.run(main())
+    assert granted.is_set()
+
+
+def test_priority_scope_overrides_inference():
+    assert default_priority([{"type": "function"}]) == Priority.TOOL_SELECTION
+    assert default_priority(None) == Priority.FINAL_ANSWER
+    with llm_priority(Priority.CLASSIFICATION):
+        assert default_priority([{"type": "function"}]) == Priority.CLASSIFICATION
+    assert default_priority(None) == Priority.FINAL_ANSWER
+
+
+async def test_governed_stream_holds_slot_until_consumed():
+    gov = _governor(initial_limit=1)
+
+    async def events():
+        yield 1
+        yield 2
+
+    stream = GovernedStream(events(), await gov.acquire())
+    assert [e async for e in stream] == [1, 2]
+    assert gov.get_stats()["in_flight"] == 0
+    early = GovernedStream(events(), await gov.acquire())
+    await early.__anext__()
+    assert gov.get_stats()["in_flight"] == 1
+    await early.close()
+    assert gov.get_stats()["in_flight"] == 0
+
+
+COMPLETION = {
+    "id": "c1",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "gpt-5-nano",
+    "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "hi"}}],
+}
+
+
+@pytest.fixture
+async def throttling_provider():
+    """OpenAI-compatible endpoint whose first request answers 429 with Retry-After."""
+    state = {"calls": 0}
+
+    async def completions(request: web.Request) -> web.Response:
+        state["calls"] += 1
+        if state["calls"] == 1:
+            return web.json_response({"error": {"message": "rate limited"}}, status=429, headers={"Retry-After": "0.1"})
+        return web.json_response(COMPLETION)
+
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", completions)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+    state["base_url"] = f"http://127.0.0.1:{port}/v1"
+    yield state
+    await runner.cleanup()
+
+
+async def test_pool_reports_429s_to_the_governor(throttling_provider):
+    pool = LLMClientPool(ClientPoolConfig(http2=False, backoff_base_ms=1, governor=GovernorConfig(initial_limit=6)))
+    client = pool.async_client("openai", "k", base_url=throttling_provider["base_url"])
+    with llm_priority(Priority.SUMMARIZATION):
+        resp = await pool.acall("openai", lambda: client.chat.completions.create(model="gpt-5-nano", messages=[{"role": "user", "content": "hi"}]))
+    assert resp.choices[0].message.content == "hi" and throttling_provider["calls"] == 2
+    gov = pool.get_stats()["openai"]["governor"]
+    assert gov["limit"] == 3 and gov["in_flight"] == 0
+    assert gov["classes"]["summarization"]["throttled"] == 1 and gov["classes"]["summarization"]["calls"] == 2
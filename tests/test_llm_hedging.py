@@ -0,0 +1,151 @@
+import asyncio
+
+import pytest
+
+from integrations.circuit_breaker import circuit_registry
+from llm.clients import LLMClient
+from llm.governor import Priority, llm_priority
+from llm.hedging import HedgeConfig, LLMHedger
+from llm.stand_in import StandInServer
+
+
+SECONDARY = {"openai": {"provider": "openrouter", "models": {"gpt-5-nano": "openai/gpt-5-nano"}}}
+
+
+def _hedger(**kw) -> LLMHedger:
+    cfg = dict(enabled=True, min_samples=5, floor_ms=20, ceiling_ms=1000, budget_ratio=1.0, secondary=SECONDARY)
+    cfg.update(kw)
+    return LLMHedger(HedgeConfig(**cfg))
+
+
+def _warm(h: LLMHedger, ms: float = 50.0) -> None:
+    for _ in range(10):
+        h.record("openai", "gpt-5-nano", ms)
+
+
+@pytest.fixture
+async def providers(monkeypatch):
+    """Two local OpenAI-compatible providers: a slow primary and a fast secondary."""
+    primary = StandInServer(script={"fallback": "primary"}, latency_ms=600)
+    secondary = StandInServer(script={"fallback": "secondary"}, latency_ms=10)
+    monkeypatch.setenv("OPENAI_BASE_URL", await primary.start())
+    monkeypatch.setenv("OPENROUTER_BASE_URL", await secondary.start())
+    monkeypatch.setenv("OPENROUTER_API_KEY", "stand-in")
+    yield primary, secondary
+    await primary.close()
+    await secondary.close()
+
+
+def _client(hedger: LLMHedger) -> LLMClient:
+    client = LLMClient("stand-in")
+    client._hedger = hedger
+    return client
+
+
+async def test_slow_primary_is_hedged_on_secondary(providers):
+    primary, secondary = providers
+    hedger = _hedger()
+    _warm(hedger)
+    resp = await _client(hedger).achat(model="gpt-5-nano", messages=[{"role": "user", "content": "hi"}])
+    assert resp.choices[0].message.content == "secondary"
+    assert primary.stats["requests"] == 1 and secondary.stats["requests"] == 1
+    st = hedger.get_stats()["openai:gpt-5-nano"]
+    assert (st["hedged"], st["hedge_wins"], st["primary_wins"]) == (1, 1, 0)
+
+
+async def test_cold_model_and_background_classes_are_not_hedged(providers):
+    primary, secondary = providers
+    primary.latency_ms = 30
+    hedger = _hedger()
+    client = _client(hedger)
+    resp = await client.achat(model="gpt-5-nano", messages=[{"role": "user", "content": "hi"}])
+    assert resp.choices[0].message.content == "primary"
+    _warm(hedger, 5.0)
+    with llm_priority(Priority.SUMMARIZATION):
+        resp = await client.achat(model="gpt-5-nano", messages=[{"role": "user", "content": "hi"}])
+    assert resp.choices[0].message.content == "primary" and secondary.stats.get("requests", 0) == 0
+
+
+async def test_open_circuit_fails_over(providers):
+    _primary, secondary = providers
+    circuit_registry.reset()
+    circuit_registry.configure(open_after_failures=1, open_for_ms=60000)
+    try:
+        circuit_registry.get("llm:openai").record_failure()
+        hedger = _hedger()
+        resp = await _client(hedger).achat(model="gpt-5-nano", messages=[{"role": "user", "content": "hi"}])
+        assert resp.choices[0].message.content == "secondary"
+        assert hedger.get_stats()["openai:gpt-5-nano"]["failovers"] == 1 and secondary.stats["requests"] == 1
+    finally:
+        circuit_registry.configure(open_after_failures=3, open_for_ms=3000)
+        circuit_registry.reset()
+
+
+async def test_hedge_budget_denies_and_loser_is_cancelled():
+    hedger = _hedger(budget_ratio=0.0, budget_min_per_sec=0.0)
+    _warm(hedger)
+    hedger.budget._tokens = 1.0
+    cancelled = []
+
+    async def slow_primary():
+        try:
+            await asyncio.sleep(0.3)
+            return "primary"
+        except asyncio.CancelledError:
+            cancelled.append("primary")
+            raise
+
+    async def fast_secondary():
+        return "secondary"
+
+    assert await hedger.run("openai", "gpt-5-nano", slow_primary, fast_secondary) == "secondary"
+    assert cancelled == ["primary"]
+    # Budget spent: the next slow call just waits for the primary
+    assert await hedger.run("openai", "gpt-5-nano", slow_primary, fast_secondary) == "primary"
+    st = hedger.get_stats()["openai:gpt-5-nano"]
+    assert (st["hedged"], st["denied"]) == (1, 1)
+
+
+async def test_failed_hedge_falls_back_to_primary():
+    hedger = _hedger()
+    _warm(hedger)
+
+    async def primary():
+        await asyncio.sleep(0.15)
+        return "primary"
+
+    async def broken_secondary():
+        raise RuntimeError("secondary down")
+
+    assert await hedger.run("openai", "gpt-5-nano", primary, broken_secondary) == "primary"
+    assert hedger.get_stats()["openai:gpt-5-nano"]["primary_wins"] == 1
+
+
+async def _streamed(client: LLMClient) -> str:
+    parts = [part async for part in client.astream_chat(model="gpt-5-nano", messages=[{"role": "user", "content": "hi"}])]
+    return "".join(parts)
+
+
+async def test_slow_first_chunk_is_hedged_on_secondary(providers):
+    primary, secondary = providers
+    hedger = _hedger()
+    for _ in range(10):
+        hedger.record("openai", "gpt-5-nano#first-chunk", 50.0)
+    assert await _streamed(_client(hedger)) == "secondary"
+    assert primary.stats["requests"] == 1 and secondary.stats["requests"] == 1
+    st = hedger.get_stats()["openai:gpt-5-nano"]
+    assert (st["hedged"], st["hedge_wins"]) == (1, 1) and st["stream_delay_ms"] is not None
+
+
+async def test_open_circuit_fails_over_a_stream(providers):
+    _primary, secondary = providers
+    circuit_registry.reset()
+    circuit_registry.configure(open_after_failures=1, open_for_ms=60000)
+    try:
+        circuit_registry.get("llm:openai").record_failure()
+        hedger = _hedger()
+        assert await _streamed(_client(hedger)) == "secondary"
+        assert hedger.get_stats()["openai:gpt-5-nano"]["failovers"] == 1 and secondary.stats["requests"] == 1
+    finally:
+        circuit_registry.configure(open_after_failures=3, open_for_ms=3000)
+        circuit_registry.reset()
@@ -0,0 +1,59 @@
+import threading
+from pathlib import Path
+
+from llm.response_cache import LLMResponseCache, normalize_input
+
+
+def test_near_identical_phrasings_share_an_entry():
+    cache = LLMResponseCache()
+    cache.put("summarizer", "gpt-5-nano", "v1", "What's new?", '{"complexity": "simple"}', latency_ms=420)
+
+    assert normalize_input("  WHAT’S   new ") == "what's new"
+    assert cache.get("summarizer", "gpt-5-nano", "v1", "what's   NEW") == '{"complexity": "simple"}'
+    # A different model or prompt version must miss
+    assert cache.get("summarizer", "gpt-5-mini", "v1", "what's new") is None
+    assert cache.get("summarizer", "gpt-5-nano", "v2", "what's new") is None
+
+    stats = cache.get_stats()
+    assert stats["hits"] == 1 and stats["misses"] == 2
+    assert stats["saved_ms"] == 420
+    assert stats["by_role"]["summarizer"]["hits"] == 1
+
+
+def test_lru_eviction_and_ttl_expiry():
+    cache = LLMResponseCache(max_entries=2)
+    for q in ("a", "b", "c"):
+        cache.put("r", "m", "v", q, q.upper())
+    assert cache.get("r", "m", "v", "a") is None
+    assert cache.get("r", "m", "v", "c") == "C"
+
+    expired = LLMResponseCache(ttl_sec=-1)
+    expired.put("r", "m", "v", "x", "X")
+    assert expired.get("r", "m", "v", "x") is None
+
+
+def test_persistent_tier_survives_restart(tmp_path: Path):
+    db = tmp_path / "cache.sqlite"
+    first = LLMResponseCache(persist_path=db)
+    first.put("summarizer", "m", "v", "hello there", "cached", latency_ms=300)
+
+    second = LLMResponseCache(persist_path=db)
+    assert second.get("summarizer", "m", "v", "Hello there!") == "cached"
+    assert second.get_stats()["saved_ms"] == 300
+
+
+async def test_async_put_persists_off_the_event_loop(tmp_path: Path, monkeypatch):
+    db = tmp_path / "cache.sqlite"
+    cache = LLMResponseCache(persist_path=db)
+    loop_thread = threading.get_ident()
+    writers = []
+    persist = cache._persist
+
+    def tracked(row):
+        writers.append(threading.get_ident())
+        persist(row)
+
+    monkeypatch.setattr(cache, "_persist", tracked)
+    await cache.aput("summarizer", "m", "v", "what's new", "cached", latency_ms=200)
+    assert writers and loop_thread not in writers
+    assert LLMResponseCache(persist_path=db).get("summarizer", "m", "v", "What's new?") == "cached"
@@ -0,0 +1,105 @@
+import pytest
+from aiohttp import web
+from openai import AsyncOpenAI
+
+from llm.stand_in import (
+    MODE_RECORD,
+    MODE_REPLAY,
+    MODE_SCRIPT,
+    StandInServer,
+    chunks_to_completion,
+    completion_to_chunks,
+    make_completion,
+)
+
+
+TOOLS = [{"type": "function", "function": {"name": "read_household_preferences", "parameters": {"type": "object", "properties": {}}}}]
+
+
+def _client(base_url: str) -> AsyncOpenAI:
+    return AsyncOpenAI(api_key="stand-in", base_url=base_url, max_retries=0)
+
+
+@pytest.fixture
+async def upstream():
+    """Fake provider the recorder proxies to; counts calls so replays can prove they stay local."""
+    state = {"calls": 0}
+
+    async def completions(request: web.Request) -> web.Response:
+        state["calls"] += 1
+        body = await request.json()
+        reply = make_completion(body["model"], f"upstream reply {state['calls']}")
+        return web.json_response(reply)
+
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", completions)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+    state["base_url"] = f"http://127.0.0.1:{port}/v1"
+    yield state
+    await runner.cleanup()
+
+
+def test_chunks_round_trip_to_the_same_completion():
+    resp = make_completion("m", "a fairly long answer that spans several chunks", [{"name": "search", "arguments": {"q": "heat"}}])
+    back = chunks_to_completion(completion_to_chunks(resp, chunk_chars=8))
+    msg, orig = back["choices"][0]["message"], resp["choices"][0]["message"]
+    assert msg["content"] == orig["content"]
+    assert msg["tool_calls"][0]["function"] == orig["tool_calls"][0]["function"]
+    assert back["choices"][0]["finish_reason"] == resp["choices"][0]["finish_reason"]
+
+
+async def test_script_serves_matching_turns_in_order_and_streams():
+    script = {
+        "turns": [
+            {"match": {"tools": False}, "repeat": True, "content": "classified"},
+            {"tool_calls": [{"name": "read_household_preferences", "arguments": {"compact": True}}]},
+            {"content": "done"},
+        ],
+        "fallback": "nothing left",
+    }
+    async with StandInServer(MODE_SCRIPT, script=script, latency_ms=5.0) as srv:
+        client = _client(srv.base_url)
+        msgs = [{"role": "user", "content": "hi"}]
+        r1 = await client.chat.completions.create(model="m", messages=msgs)
+        r2 = await client.chat.completions.create(model="m", messages=msgs, tools=TOOLS)
+        assert r1.choices[0].message.content == "classified"
+        assert r2.choices[0].message.tool_calls[0].function.name == "read_household_preferences"
+        stream = await client.chat.completions.create(model="m", messages=msgs, tools=TOOLS, stream=True)
+        text = "".join([c.choices[0].delta.content or "" async for c in stream if c.choices])
+        assert text == "done"
+        r4 = await client.chat.completions.create(model="m", messages=msgs, tools=TOOLS)
+        assert r4.choices[0].message.content == "nothing left"
+        assert srv.injected_ms == pytest.approx(20.0)
+        srv.reset()
+        r5 = await client.chat.completions.create(model="m", messages=msgs, tools=TOOLS)
+        assert r5.choices[0].message.tool_calls and srv.injected_ms == pytest.approx(5.0)
+        await client.close()
+
+
+async def test_record_then_replay_without_upstream(tmp_path, upstream):
+    cassette = tmp_path / "session.jsonl"
+    asks = [[{"role": "user", "content": "first"}], [{"role": "user", "content": "second"}]]
+    async with StandInServer(MODE_RECORD, cassette=cassette, upstream=upstream["base_url"]) as rec:
+        client = _client(rec.base_url)
+        recorded = [(await client.chat.completions.create(model="m", messages=m)).choices[0].message.content for m in asks]
+        await client.close()
+    assert upstream["calls"] == 2 and len(cassette.read_text().splitlines()) == 2
+
+    async with StandInServer(MODE_REPLAY, cassette=cassette, latency_ms=0.0) as rep:
+        client = _client(rep.base_url)
+        # Out of order, and streamed although recorded non-streaming: exact keys still pick the right entry
+        stream = await client.chat.completions.create(model="m", messages=asks[1], stream=True)
+        second = "".join([c.choices[0].delta.content or "" async for c in stream if c.choices])
+        first = (await client.chat.completions.create(model="m", messages=asks[0])).choices[0].message.content
+        assert [first, second] == recorded and rep.stats["match_exact"] == 2
+
+        # A new session with drifted wording falls back to the same-shaped recording
+        rep.reset()
+        drifted = (await client.chat.completions.create(model="m", messages=[{"role": "user", "content": "first, again"}])).choices[0].message.content
+        assert drifted in recorded and rep.stats["match_exact"] == 2
+        await client.close()
+    assert upstream["calls"] == 2
@@ -0,0 +1,83 @@
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from bot.model_router import ModelRouter
+from integrations.deadline import Deadline, deadline_scope
+
+
+MODELS = {"openai": {"nano": {"cost": 1}, "mini": {"cost": 5}, "big": {"cost": 11, "expectedMs": 9000}}}
+
+
+def _router(**kw):
+    return ModelRouter(models=MODELS, roles={"quick": ["nano", "mini"], "smart": ["mini"]}, min_samples=3, **kw)
+
+
+def _feed(router, model, ms, n=5, ok=True):
+    for _ in range(n):
+        router.record("openai", model, ms, ok=ok)
+
+
+def test_cheapest_candidate_that_fits_the_budget():
+    r = _router()
+    assert r.choose("openai", "quick", "nano", 1000).model == "nano"  # cold: no prior, assumed to fit
+    _feed(r, "nano", 1500)
+    _feed(r, "mini", 400)
+    d = r.choose("openai", "quick", "nano", 1000)
+    assert (d.model, d.reason) == ("mini", "cheapest_within_budget")
+    assert r.choose("openai", "quick", "nano", 2000).model == "nano"
+    assert r.choose("openai", "quick", "nano", None).model == "nano"
+
+
+def test_fastest_when_nothing_fits_and_priors_before_samples():
+    r = _router()
+    _feed(r, "nano", 1500)
+    _feed(r, "mini", 800)
+    d = r.choose("openai", "quick", "nano", 100)
+    assert (d.model, d.reason) == ("mini", "fastest_over_budget")
+    # "big" has only its prior, which is over budget, so smart falls back to the cheaper fitting mini
+    assert r.choose("openai", "smart", "big", 5000).model == "mini"
+    assert r.fits("openai", "big", 10000) and not r.fits("openai", "big", 5000)
+
+
+def test_error_rate_excludes_and_overrides_pin():
+    r = _router(max_error_rate=0.3)
+    _feed(r, "nano", 100, n=10, ok=False)
+    assert r.choose("openai", "quick", "nano", 1000).model == "mini"
+    assert r.snapshot()["openai:nano"]["errors"] == 10
+    pinned = _router(overrides={"quick": "big"})
+    assert pinned.choose("openai", "quick", "nano", 10).model == "big"
+
+
+class LatencyProfileLLM:
+    """Local mock provider whose call latency depends on the model."""
+
+    provider = "openai"
+
+    def __init__(self, latency_ms):
+        self.latency_ms = latency_ms
+        self.models = []
+
+    async def achat(self, *, model, messages, **kwargs):
+        self.models.append(model)
+        await asyncio.sleep(self.latency_ms[model] / 1000)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="ok", tool_calls=None))])
+
+
+@pytest.mark.asyncio
+async def test_agent_routes_away_from_a_slow_model(tmp_path: Path, make_agent):
+    (tmp_path / "config").mkdir()
+    (tmp_path / "config" / "config.yaml").write_text("llm: {}\n", encoding="utf-8")
+    llm = LatencyProfileLLM({"nano": 60, "mini": 5})
+    router = _router()
+    agent = make_agent(llm, model_router=router)
+    messages = [{"role": "user", "content": "hi"}]
+    with deadline_scope(Deadline(40)):
+        for _ in range(3):
+            await agent._achat_once(messages, "nano", "quick")
+    with deadline_scope(Deadline(40)):
+        await agent._achat_once(messages, "nano", "quick")
+    assert llm.models == ["nano", "nano", "nano", "mini"]
+    assert router.snapshot()["openai:nano"]["calls"] == 3
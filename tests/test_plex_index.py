@@ -0,0 +1,132 @@
+import asyncio
+
+import pytest
+
+from integrations.plex_client import PlexClient, ResponseLevel
+from integrations.plex_index import PlexLibraryIndex, parse_item
+from integrations.stand_ins import LibraryScale, ServiceStandIns
+
+
+@pytest.fixture
+async def plex():
+    services = ServiceStandIns(LibraryScale.parse("small"))
+    await services.start()
+    yield services.plex
+    await services.close()
+
+
+async def _clients(plex):
+    """An indexed client (index built) and a plain one, against the same stand-in."""
+    index = PlexLibraryIndex()
+    indexed = await asyncio.to_thread(PlexClient, plex.base_url, plex.token, library_index=index)
+    plain = await asyncio.to_thread(PlexClient, plex.base_url, plex.token)
+    await asyncio.to_thread(index.rebuild, indexed.plex)
+    return index, indexed, plain
+
+
+def _keys(items):
+    return [item["ratingKey"] for item in items]
+
+
+async def test_rebuild_uses_one_listing_per_section(plex):
+    plex.reset_stats()
+    index, _indexed, _plain = await _clients(plex)
+    assert plex.route_count("GET /library/sections/{section}/all") == 2
+    stats = index.get_stats()
+    assert stats["movies"] > 0 and stats["shows"] > 0 and stats["items"] == len(index)
+
+
+async def test_indexed_search_matches_server_without_round_trips(plex):
+    index, indexed, plain = await _clients(plex)
+    # Ties may come back in a different order, so columns with ties compare by value
+    queries = [
+        ("rating", dict(year_min=2000, genres=["Drama"], sort_by="rating", sort_order="desc", limit=10)),
+        ("year", dict(year_min=1990, sort_by="year", limit=15)),
+        ("ratingKey", dict(rating_min=7.5, sort_by="added", sort_order="desc", limit=8)),
+        ("ratingKey", dict(genres=["Comedy", "Action"], sort_by="title", limit=20)),
+    ]
+    for field, q in queries:
+        expected = await asyncio.to_thread(plain.search_movies_filtered, **q)
+        plex.reset_stats()
+        got = await asyncio.to_thread(indexed.search_movies_filtered, **q)
+        assert got and [g[field] for g in got] == [e[field] for e in expected], q
+        assert plex.route_count("GET /library/sections/{section}/all") <= len(q.get("genres", []))
+    # Every genre posting is complete now: repeats never reach the server's listings
+    plex.reset_stats()
+    await asyncio.to_thread(indexed.search_movies_filtered, genres=["Drama"], year_min=2000, limit=10)
+    assert plex.route_count("GET /library/sections/{section}/all") == 0
+    # Bounded ranges are exact locally (the server path applies them to a prefetched page)
+    bounded = await asyncio.to_thread(indexed.search_movies_filtered, year_min=1990, year_max=2005, sort_by="year", sort_order="desc", limit=15)
+    assert len(bounded) == 15 and all(1990 <= item["year"] <= 2005 for item in bounded)
+    assert [item["year"] for item in bounded] == sorted((item["year"] for item in bounded), reverse=True)
+
+
+async def test_truncated_cast_is_completed_once(plex):
+    index, indexed, plain = await _clients(plex)
+    section = await asyncio.to_thread(plain.get_movie_library)
+    movie = (await asyncio.to_thread(section.search, maxresults=1))[0]
+    # Listings only carry the first three cast members; pick one beyond that
+    actor = (await asyncio.to_thread(lambda: [r.tag for r in movie.roles]))[-1]
+    expected = await asyncio.to_thread(plain.search_movies_filtered, actors=[actor], limit=50)
+    got = await asyncio.to_thread(indexed.search_movies_filtered, actors=[actor], limit=50)
+    assert movie.ratingKey in _keys(got) and _keys(got) == _keys(expected)
+    assert index.incomplete("actor", [actor]) == []
+
+
+async def test_response_levels_match_server_shape(plex):
+    _index, indexed, plain = await _clients(plex)
+    for level in (ResponseLevel.MINIMAL, ResponseLevel.COMPACT, ResponseLevel.STANDARD):
+        expected = await asyncio.to_thread(plain.search_movies_filtered, sort_by="rating", sort_order="desc", limit=3, response_level=level)
+        got = await asyncio.to_thread(indexed.search_movies_filtered, sort_by="rating", sort_order="desc", limit=3, response_level=level)
+        assert [set(g) for g in got] == [set(e) for e in expected]
+    got = await asyncio.to_thread(indexed.search_movies_filtered, sort_by="year", limit=5, response_level=ResponseLevel.STANDARD)
+    assert got == await asyncio.to_thread(plain.search_movies_filtered, sort_by="year", limit=5, response_level=ResponseLevel.STANDARD)
+    plex.reset_stats()
+    detailed = await asyncio.to_thread(indexed.search_movies_filtered, sort_by="rating", sort_order="desc", limit=3, response_level=ResponseLevel.DETAILED)
+    assert len(detailed) == 3 and plex.route_count("GET /library/metadata/{keys}") >= 1
+
+
+async def test_unbuilt_index_falls_back_and_builds_in_background(plex):
+    index = PlexLibraryIndex()
+    client = await asyncio.to_thread(PlexClient, plex.base_url, plex.token, library_index=index)
+    first = await asyncio.to_thread(client.search_movies_filtered, sort_by="year", limit=5)
+    assert len(first) == 5
+    for _ in range(100):
+        if index.ready:
+            break
+        await asyncio.sleep(0.05)
+    assert index.ready and len(index) > 0
+
+
+def test_upsert_and_remove_keep_postings_and_order():
+    index = PlexLibraryIndex()
+
+    def item(key, title, year, rating, genres):
+        return {
+            "rating_key": key, "kind": "movie", "section_id": 1, "title": title, "title_sort": title.lower(), "year": year,
+            "rating": rating, "content_rating": "PG", "duration": 0, "added_at": key, "updated_at": key, "last_viewed_at": 0,
+            "summary": "", "resolution": "1080", "height": 1080, "hdr": False, "video_codec": None, "audio_codec": None,
+            "tags": {"genre": genres, "actor": [], "director": [], "collection": [], "label": [], "country": []},
+        }
+
+    index.load([item(1, "Alpha", 2001, 7.0, ["Drama"]), item(2, "Beta", 1999, 8.0, ["Drama", "Comedy"])])
+    assert index.search(tags={"genre": ["drama"]}, sort_by="rating", descending=True) == [1, 0]
+    index.upsert(item(2, "Beta", 1999, 6.0, ["Comedy"]))
+    index.upsert(item(3, "Gamma", 2010, 9.0, ["Drama"]))
+    assert index.search(tags={"genre": ["Drama"]}, sort_by="rating", descending=True) == [2, 0]
+    assert index.remove(1) and not index.remove(1)
+    assert [index.rating_key[r] for r in index.search(sort_by="year")] == [2, 3]
+    assert index.search(year_min=2000, tags={"genre": ["Comedy"]}) == []
+
+
+def test_parse_item_reads_media_and_tags():
+    import xml.etree.ElementTree as ET
+
+    el = ET.fromstring(
+        '<Video ratingKey="7" type="movie" title="X" year="2020" rating="7.5" librarySectionID="1">'
+        '<Media videoResolution="4k" videoDynamicRange="HDR10" videoCodec="hevc"/>'
+        '<Genre tag="Drama"/><Role tag="A"/><Collection tag="Saga"/></Video>'
+    )
+    item = parse_item(el)
+    assert item["height"] == 2160 and item["hdr"] and item["tags"]["collection"] == ["Saga"]
+    assert parse_item(ET.fromstring('<Directory ratingKey="8" type="season"/>')) is None
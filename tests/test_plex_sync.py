@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from integrations.plex_client import PlexClient
+from integrations.plex_index import PlexLibraryIndex
+from integrations.plex_sync import PlexSyncEngine, invalidate_plex_caches
+from integrations.stand_ins import LibraryScale, ServiceStandIns
+from integrations.ttl_cache import shared_cache
+
+
+@pytest.fixture
+async def plex():
+    services = ServiceStandIns(LibraryScale.parse("small"))
+    await services.start()
+    yield services.plex
+    await services.close()
+
+
+async def _engine(plex, **kw) -> PlexSyncEngine:
+    client = await asyncio.to_thread(PlexClient, plex.base_url, plex.token)
+    engine = PlexSyncEngine(client.plex, PlexLibraryIndex(), **kw)
+    first = await asyncio.to_thread(engine.sync_once)
+    assert first.full and first.upserted == len(engine.index)
+    return engine
+
+
+def _rating(engine: PlexSyncEngine, key: int) -> float:
+    return engine.index.rating[engine.index.row_for(key)]
+
+
+async def _until(predicate, timeout: float = 3.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "condition not reached"
+        await asyncio.sleep(0.02)
+
+
+async def test_incremental_pass_fetches_only_changed_items(plex):
+    engine = await _engine(plex)
+    await plex.touch_movie(5, rating=9.9, notify=False)
+    plex.reset_stats()
+    result = await asyncio.to_thread(engine.sync_once)
+    assert (result.upserted, result.removed, result.relisted) == (1, 0, 0)
+    assert _rating(engine, 5) == 9.9
+    # Two watermark queries and one count per section, one batched metadata fetch
+    assert plex.route_count("GET /library/sections/{section}/all") == 6
+    assert plex.route_count("GET /library/metadata/{keys}") == 1
+    quiet = await asyncio.to_thread(engine.sync_once)
+    assert not quiet.changed and plex.route_count("GET /library/metadata/{keys}") == 1
+
+
+async def test_additions_and_deletions_are_reconciled(plex):
+    engine = await _engine(plex)
+    added = await plex.add_movie(notify=False)
+    await plex.delete_movie(7, notify=False)
+    result = await asyncio.to_thread(engine.sync_once)
+    assert (result.upserted, result.removed, result.relisted) == (1, 1, 1)
+    assert engine.index.row_for(added) is not None and engine.index.row_for(7) is None
+    # The new item carries its full tag set, so completed postings stay exact
+    row = engine.index.row_for(added)
+    assert len(engine.index.tags[row]["actor"]) > 3
+
+
+async def test_notifications_apply_within_the_debounce(plex):
+    engine = await _engine(plex, interval_s=3600, debounce_s=0.05)
+    changes = []
+    engine.on_change.append(changes.append)
+    engine.start()
+    try:
+        await _until(lambda: engine.get_stats()["ws_connects"] == 1 and len(plex._sockets) == 1)
+        await plex.touch_movie(3, rating=1.5)
+        await _until(lambda: _rating(engine, 3) == 1.5)
+        added = await plex.add_movie()
+        await plex.delete_movie(4)
+        await _until(lambda: engine.index.row_for(added) is not None and engine.index.row_for(4) is None)
+    finally:
+        await engine.stop()
+    assert changes and all(c.relisted == 0 for c in changes)
+    assert engine.get_stats()["events"] >= 4
+
+
+async def test_changes_invalidate_plex_caches(plex):
+    engine = await _engine(plex, on_change=[lambda _r: invalidate_plex_caches()])
+    shared_cache.set("plex:recently_added:('movie', 4, None):[]", ["stale"], 300)
+    shared_cache.set('tool:search_plex:{"limit":4}', {"items": []}, 300)
+    shared_cache.set("tool:tmdb_trending:{}", {"items": []}, 300)
+    try:
+        await asyncio.to_thread(engine.sync_once)
+        assert shared_cache.get("plex:recently_added:('movie', 4, None):[]") is not None
+        await plex.touch_movie(9, title="Renamed", notify=False)
+        await asyncio.to_thread(engine.sync_once)
+        assert shared_cache.get("plex:recently_added:('movie', 4, None):[]") is None
+        assert shared_cache.get('tool:search_plex:{"limit":4}') is None
+        assert shared_cache.get("tool:tmdb_trending:{}") is not None
+    finally:
+        shared_cache.delete("tool:tmdb_trending:{}")
@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from bot.run_scheduler import AgentRunScheduler
+
+
+async def _run(sched, order, name, *, user, channel, quick=False, hold=None, positions=None):
+    on_position = (lambda p: positions.setdefault(name, []).append(p)) if positions is not None else None
+    async with sched.slot(user=user, channel=channel, quick=quick, on_position=on_position):
+        order.append(name)
+        if hold is not None:
+            await hold.wait()
+
+
+@pytest.mark.asyncio
+async def test_global_cap_and_fair_round_robin():
+    sched = AgentRunScheduler(max_concurrent=1)
+    order, gate, positions = [], asyncio.Event(), {}
+    first = asyncio.create_task(_run(sched, order, "a1", user="alice", channel="c1", hold=gate))
+    await asyncio.sleep(0)
+    tasks = [
+        asyncio.create_task(_run(sched, order, n, user=u, channel=c, positions=positions))
+        for n, u, c in [("a2", "alice", "c2"), ("a3", "alice", "c3"), ("b1", "bob", "c4")]
+    ]
+    tasks.append(asyncio.create_task(_run(sched, order, "q1", user="carol", channel="c5", quick=True, positions=positions)))
+    await asyncio.sleep(0)
+    assert sched.running == 1 and sched.queued == 4
+    gate.set()
+    await asyncio.gather(first, *tasks)
+    # quick path first, then users alternate instead of alice's burst going first
+    assert order == ["a1", "q1", "a2", "b1", "a3"]
+    assert positions["b1"][0] > positions["b1"][-1] >= 1
+    assert sched.get_stats()["dispatched"] == 5
+
+
+@pytest.mark.asyncio
+async def test_channel_runs_one_at_a_time_in_arrival_order():
+    sched = AgentRunScheduler(max_concurrent=4)
+    order, gate = [], asyncio.Event()
+    first = asyncio.create_task(_run(sched, order, "m1", user="alice", channel="c1", hold=gate))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(_run(sched, order, "m2", user="bob", channel="c1"))
+    other = asyncio.create_task(_run(sched, order, "x1", user="bob", channel="c2"))
+    await asyncio.sleep(0.01)
+    assert order == ["m1", "x1"]
+    gate.set()
+    await asyncio.gather(first, second, other)
+    assert order == ["m1", "x1", "m2"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_the_queue():
+    sched = AgentRunScheduler(max_concurrent=1)
+    order, gate = [], asyncio.Event()
+    first = asyncio.create_task(_run(sched, order, "a", user="u1", channel="c1", hold=gate))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(_run(sched, order, "b", user="u2", channel="c2"))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert sched.queued == 0
+    gate.set()
+    await first
+    assert sched.running == 0 and order == ["a"]
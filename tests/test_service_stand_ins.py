@@ -0,0 +1,125 @@
+import asyncio
+
+import httpx
+import pytest
+
+from integrations.plex_client import PlexClient, ResponseLevel
+from integrations.radarr_client import RadarrClient
+from integrations.sonarr_client import SonarrClient
+from integrations.stand_ins import FaultProfile, LibraryScale, ServiceStandIns, SyntheticLibrary
+from integrations.tmdb_client import TMDbClient, TMDbResponseLevel
+
+
+@pytest.fixture
+async def stand_ins(monkeypatch):
+    services = ServiceStandIns(LibraryScale.parse("small"))
+    env = await services.start()
+    for key, value in env.items():
+        monkeypatch.setenv(key, value)
+    yield services
+    await services.close()
+
+
+def test_library_is_deterministic_and_sized():
+    a = SyntheticLibrary(LibraryScale(movies=50, series=6, episodes=400, seed=3))
+    b = SyntheticLibrary(LibraryScale(movies=50, series=6, episodes=400, seed=3))
+    assert [m["title"] for m in a.movies] == [m["title"] for m in b.movies]
+    assert sum(s["episodes"] for s in a.series[:6]) == a.episode_count == 400
+    e = a.episode(399)
+    assert a.episode_by_key(e["key"])["title"] == b.episode(399)["title"]
+    assert a.season_by_key(a.season(e["show"], e["season"])["key"])["index"] == e["season"]
+
+
+async def test_plex_client_searches_filters_and_counts_reloads(stand_ins):
+    client = await asyncio.to_thread(PlexClient, stand_ins.plex.base_url, stand_ins.plex.token)
+    hits = await asyncio.to_thread(client.search_movies, "inception")
+    assert hits and hits[0]["title"] == "Inception"
+
+    filtered = await asyncio.to_thread(client.search_movies_filtered, year_min=2000, genres=["Drama"], sort_by="rating", sort_order="desc", limit=5)
+    assert 0 < len(filtered) <= 5
+    assert all(item["year"] >= 2000 for item in filtered)
+    assert [item["rating"] for item in filtered] == sorted((item["rating"] for item in filtered), reverse=True)
+
+    # Listings are partial like the real server's, so touching a detail-only field reloads each item
+    section = await asyncio.to_thread(client.get_movie_library)
+    stand_ins.plex.reset_stats()
+    movies = await asyncio.to_thread(section.search, maxresults=3)
+    await asyncio.to_thread(lambda: [m.tagline for m in movies])
+    assert stand_ins.plex.route_count("GET /library/sections/{section}/all") == 1
+    assert stand_ins.plex.route_count("GET /library/metadata/{keys}") == 3
+
+
+async def test_serialized_pages_never_reload_items_one_by_one(stand_ins):
+    client = await asyncio.to_thread(PlexClient, stand_ins.plex.base_url, stand_ins.plex.token)
+    # Load plexapi's filter Meta for the section up front
+    await asyncio.to_thread(client.search_movies_filtered, genres=["Drama"], limit=1)
+    for level, metadata_requests in ((ResponseLevel.STANDARD, 0), (ResponseLevel.DETAILED, 1)):
+        stand_ins.plex.reset_stats()
+        page = await asyncio.to_thread(client.search_movies_filtered, genres=["Drama"], sort_by="rating", sort_order="desc", limit=20, response_level=level)
+        assert len(page) == 20
+        # One listing, plus one comma-joined metadata fetch for the detailed page: never one per item
+        assert stand_ins.plex.route_count("GET /library/sections/{section}/all") == 1
+        assert stand_ins.plex.route_count("GET /library/metadata/{keys}") == metadata_requests
+    assert all(item["tagline"] and len(item["actors"]) > 3 for item in page)
+
+
+async def test_arr_clients_round_trip(stand_ins):
+    radarr = RadarrClient(stand_ins.radarr.base_url, stand_ins.radarr.api_key)
+    movies = await radarr.get_movies()
+    lib = stand_ins.library
+    assert len(movies) == lib.scale.movies + lib.wanted_movies
+    owned = movies[0]
+    existing = await radarr.add_movie(tmdb_id=owned["tmdbId"], quality_profile_id=4, root_folder_path="/data/movies")
+    assert existing["already_exists"] is True
+    new_tmdb = lib.movies[-1]["tmdb_id"]
+    added = await radarr.add_movie(tmdb_id=new_tmdb, quality_profile_id=4, root_folder_path="/data/movies")
+    assert added["tmdbId"] == new_tmdb and len(await radarr.get_movies()) == len(movies) + 1
+    wanted = await radarr.get_wanted(page_size=5)
+    assert wanted["totalRecords"] == lib.wanted_movies + 1  # the movie just added has no file yet
+
+    sonarr = SonarrClient(stand_ins.sonarr.base_url, stand_ins.sonarr.api_key)
+    series = await sonarr.get_series()
+    assert len(series) == lib.scale.series
+    episodes = await sonarr.get_episodes(series[0]["id"])
+    assert len(episodes) == series[0]["statistics"]["episodeCount"]
+    lookup = await sonarr.lookup(str(series[0]["tvdbId"]))
+    assert lookup[0]["title"] == series[0]["title"]
+    updated = await sonarr.monitor_episodes([episodes[0]["id"]], False)
+    assert updated[0]["monitored"] is False
+    await radarr.close()
+    await sonarr.close()
+
+
+async def test_tmdb_client_against_stand_in(stand_ins):
+    tmdb = TMDbClient(stand_ins.tmdb.api_key, default_response_level=TMDbResponseLevel.DETAILED)
+    try:
+        found = await tmdb.search_movie("matrix")
+        assert found["results"][0]["title"] == "The Matrix"
+        details = await tmdb.movie_details(found["results"][0]["id"], append_to_response="credits")
+        assert details["credits"]["cast"]
+        discover = await tmdb.discover_movies(with_genres=[18], sort_by="vote_average.desc")
+        assert discover["total_results"] > 0 and len(discover["results"]) <= 20
+        person = await tmdb.search_person("tom hanks")
+        assert person["results"][0]["name"] == "Tom Hanks"
+    finally:
+        await tmdb.close()
+
+
+async def test_fault_injection_throttles_and_fails():
+    services = ServiceStandIns(LibraryScale(movies=20, series=2, episodes=20), FaultProfile(rate_limit_rps=2, retry_after_s=3))
+    await services.start()
+    try:
+        async with httpx.AsyncClient(base_url=services.radarr.base_url, headers={"X-Api-Key": services.radarr.api_key}) as client:
+            statuses = [(await client.get("/api/v3/system/status")) for _ in range(4)]
+            assert [r.status_code for r in statuses[:2]] == [200, 200]
+            assert statuses[-1].status_code == 429 and statuses[-1].headers["Retry-After"] == "3"
+
+            services.radarr.faults = FaultProfile(error_rate=1.0)
+            services.radarr.reset_stats()
+            failed = await client.get("/api/v3/movie")
+            assert failed.status_code in (500, 503)
+            unauthorized = await client.get("/api/v3/movie", headers={"X-Api-Key": "wrong"})
+            assert unauthorized.status_code == 401
+            assert services.radarr.stats["requests"] == 2
+    finally:
+        await services.close()
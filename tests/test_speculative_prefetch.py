@@ -0,0 +1,104 @@
+import asyncio
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from bot.speculative_prefetch import SpeculativePrefetcher, get_speculation_stats, reset_speculation_stats, speculation_key
+from bot.tools.result_cache import tool_dedup_key
+
+
+class FakeRegistry:
+    def __init__(self, impls):
+        self._impls = impls
+
+    def get(self, name):
+        return self._impls[name]
+
+
+def _is_write(name: str) -> bool:
+    return "add" in name
+
+
+def test_predictions_are_read_only_and_capped():
+    spec = SpeculativePrefetcher(FakeRegistry({}), is_write_tool=_is_write, max_calls=3)
+    preds = spec.predict([{"role": "user", "content": "add Dune to radarr"}])
+    assert [p.tool for p in preds] == ["tmdb_search", "radarr_quality_profiles", "radarr_root_folders"]
+    assert preds[0].args == {"query": "Dune"}
+
+    preds = spec.predict([{"role": "user", "content": "Do I have Heat on my plex? Also who is Michael Mann"}])
+    assert {p.tool for p in preds} == {"search_plex", "tmdb_search", "tmdb_search_person"}
+
+
+def test_speculation_key_matches_on_identifying_args():
+    assert speculation_key("tmdb_search", {"query": "Dune"}) == speculation_key("tmdb_search", {"query": " dune ", "page": 1, "language": "en-US", "year": None})
+    # Extra args ride along on the model's call
+    assert speculation_key("tmdb_search", {"query": "Dune"}) == speculation_key("tmdb_search", {"query": "Dune", "year": 2021, "limit": 5})
+    assert speculation_key("tmdb_upcoming_movies", {}) == speculation_key("tmdb_upcoming_movies", {"region": "US"})
+    assert speculation_key("tmdb_search", {"query": "Dune"}) != speculation_key("tmdb_search", {"query": "Dune", "page": 2})
+    assert speculation_key("tmdb_search", {"query": "Dune"}) != speculation_key("tmdb_search", {"query": "Dune Part Two"})
+
+
+@pytest.mark.asyncio
+async def test_claim_waits_for_inflight_and_deposits_into_dedup_cache():
+    reset_speculation_stats()
+    calls = []
+
+    async def tmdb_search(args):
+        calls.append(args)
+        await asyncio.sleep(0.02)
+        return {"results": [{"title": "Dune"}]}
+
+    async def unused(args):
+        return {"results": []}
+
+    spec = SpeculativePrefetcher(FakeRegistry({"tmdb_search": tmdb_search, "tmdb_upcoming_movies": unused}), is_write_tool=_is_write)
+    spec.start(spec.predict([{"role": "user", "content": "add Dune"}])[:1])
+    spec.start(spec.predict([{"role": "user", "content": "what's upcoming"}]))
+    dedup: dict = {}
+    spec.attach(dedup)
+
+    result = await spec.claim("tmdb_search", {"query": "dune", "page": 1})
+    assert result == {"results": [{"title": "Dune"}]}
+    assert dedup[tool_dedup_key("tmdb_search", {"query": "Dune"})] == result
+    assert await spec.claim("tmdb_search_person", {"query": "x"}) is None
+
+    run = await spec.finish()
+    assert run["launched"] == 2 and run["used"] == 1 and run["wasted"] == 1
+    assert len(calls) == 1
+    assert get_speculation_stats()["precision"] == 0.5
+
+
+def _mk_choice(content=None, tool_calls=None):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content, tool_calls=tool_calls))])
+
+
+@pytest.mark.asyncio
+async def test_agent_serves_model_tool_call_from_speculation(tmp_path: Path, make_agent):
+    reset_speculation_stats()
+    tc = SimpleNamespace(id="tc1", type="function", function=SimpleNamespace(name="search_plex", arguments=json.dumps({"query": "heat", "limit": 5})))
+    scripted = [_mk_choice(content="", tool_calls=[tc]), _mk_choice(content="You have Heat.")]
+
+    class SlowLLM:
+        async def achat(self, **kwargs):
+            await asyncio.sleep(0.05)
+            return scripted.pop(0)
+
+    calls = []
+
+    async def search_plex(args):
+        calls.append(args)
+        return {"items": [{"title": "Heat", "year": 1995}]}
+
+    async def tmdb_search(args):
+        return {"results": []}
+
+    registry = FakeRegistry({"search_plex": search_plex, "tmdb_search": tmdb_search})
+    agent = make_agent(SlowLLM(), registry=registry)
+    resp = await agent.aconverse([{"role": "user", "content": "tell me about \"Heat\""}])
+
+    assert resp.choices[0].message.content == "You have Heat."
+    assert calls == [{"query": "Heat"}]
+    stats = get_speculation_stats()
+    assert stats["used"] == 1 and stats["launched"] == 2
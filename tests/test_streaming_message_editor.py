@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from ux.streaming import StreamingMessageEditor
+
+
+class FakeMessage(dict):
+    async def delete(self):
+        self["deleted"] = True
+
+
+class FakeChannel:
+    def __init__(self):
+        self.sent = []
+        self.edits = []
+
+    async def send(self, text):
+        msg = FakeMessage(content=text, deleted=False)
+        self.sent.append(msg)
+        return msg
+
+    async def edit(self, msg, text):
+        msg["content"] = text
+        self.edits.append(text)
+        return msg
+
+
+@pytest.mark.asyncio
+async def test_edits_are_coalesced_under_the_interval():
+    ch = FakeChannel()
+    editor = StreamingMessageEditor(ch.send, ch.edit, min_interval_s=0.05)
+    for i in range(40):
+        await editor(f"tok{i} ")
+        await asyncio.sleep(0.002)
+    final = await editor.finalize(editor.text.strip())
+
+    assert len(ch.sent) == 1
+    # ~80ms of streaming at one edit per 50ms plus the final edit
+    assert len(ch.edits) <= 4
+    assert final is ch.sent[0]
+    assert final["content"] == editor.text.strip()
+    assert editor.metrics()["first_visible_ms"] is not None
+
+
+@pytest.mark.asyncio
+async def test_reset_discards_preamble_and_overflow_falls_back():
+    ch = FakeChannel()
+    editor = StreamingMessageEditor(ch.send, ch.edit, min_interval_s=0.0, max_chars=50)
+    await editor("Let me check that...")
+    editor.reset()
+    await editor("Heat (1995)")
+    await asyncio.sleep(0.01)
+    assert editor.text == "Heat (1995)"
+    assert ch.sent[0]["content"] == "Heat (1995) ▌"
+
+    # Too long for one message: the preview is removed and the caller replies normally
+    assert await editor.finalize("x" * 80) is None
+    assert ch.sent[0]["deleted"] is True
+
+
+@pytest.mark.asyncio
+async def test_reset_deletes_a_preview_already_sent():
+    ch = FakeChannel()
+    editor = StreamingMessageEditor(ch.send, ch.edit, min_interval_s=0.0)
+    await editor("Let me check that...")
+    await asyncio.sleep(0.01)
+    assert ch.sent[0]["content"] == "Let me check that... ▌"
+    editor.reset()
+    await editor("Heat (1995)")
+    await asyncio.sleep(0.01)
+    final = await editor.finalize("Heat (1995)")
+    assert ch.sent[0]["deleted"] is True
+    assert final is ch.sent[1] and final["content"] == "Heat (1995)"
+
+
+@pytest.mark.asyncio
+async def test_finalize_without_stream_returns_none():
+    ch = FakeChannel()
+    editor = StreamingMessageEditor(ch.send, ch.edit)
+    assert await editor.finalize("hello") is None
+    assert ch.sent == []
@@ -0,0 +1,191 @@
+import asyncio
+import json
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from bot.streaming_tools import ToolCallAssembler
+
+
+def _frag(index, id=None, name=None, arguments=None):
+    return {"index": index, "id": id, "function": {"name": name, "arguments": arguments}}
+
+
+def test_assembler_reports_each_call_when_its_json_closes():
+    done = []
+    asm = ToolCallAssembler(lambda tc: done.append((tc.id, tc.function.name, tc.function.arguments)))
+    asm.feed({"tool_calls": [_frag(0, id="a", name="tmdb_search", arguments='{"query": "Du')]})
+    assert done == []
+    asm.feed({"tool_calls": [_frag(0, arguments='ne {x}"}')]})
+    assert done == [("a", "tmdb_search", '{"query": "Dune {x}"}')]
+    asm.feed({"tool_calls": [_frag(1, id="b", name="search_plex", arguments='{"query": "Heat"')]})
+    asm.feed({"content": "ok"})
+    asm.close()
+    assert [d[0] for d in done] == ["a", "b"]
+
+    resp = asm.to_response()
+    msg = resp.choices[0].message
+    assert msg.content == "ok"
+    assert [tc.function.name for tc in msg.tool_calls] == ["tmdb_search", "search_plex"]
+
+
+def test_assembler_without_tool_calls_is_a_plain_answer():
+    asm = ToolCallAssembler()
+    for part in ("Hel", "lo"):
+        asm.feed(SimpleNamespace(content=part, tool_calls=None))
+    asm.close()
+    resp = asm.to_response()
+    assert resp.choices[0].message.content == "Hello"
+    assert resp.choices[0].message.tool_calls is None
+
+
+@pytest.mark.asyncio
+async def test_agent_dispatches_tool_before_stream_ends(tmp_path: Path, make_agent):
+    (tmp_path / "config").mkdir()
+    (tmp_path / "config" / "config.yaml").write_text("llm:\n  streamToolCalls: true\n", encoding="utf-8")
+    events = []
+
+    class StreamingLLM:
+        def __init__(self):
+            self.turn = 0
+
+        async def astream_chat_deltas(self, **kwargs):
+            self.turn += 1
+            if self.turn == 1:
+                yield {"tool_calls": [_frag(0, id="t1", name="tmdb_search", arguments=json.dumps({"query": "Heat"}))]}
+                await asyncio.sleep(0.05)
+                events.append(("stream_end", time.monotonic()))
+                yield {"tool_calls": [_frag(1, id="t2", name="tmdb_search", arguments=json.dumps({"query": "Ronin"}))]}
+            else:
+                yield {"content": "Both found."}
+
+        async def achat(self, **kwargs):  # pragma: no cover - streaming path expected
+            raise AssertionError("non-streaming call not expected")
+
+    async def tmdb_search(args):
+        events.append(("tool_start", args["query"], time.monotonic()))
+        return {"results": [{"title": args["query"]}]}
+
+    agent = make_agent(StreamingLLM(), {"tmdb_search": tmdb_search})
+
+    resp = await agent.aconverse([{"role": "user", "content": "tell me about two Michael Mann films"}])
+
+    assert resp.choices[0].message.content == "Both found."
+    heat_start = next(e[2] for e in events if e[0] == "tool_start" and e[1] == "Heat")
+    stream_end = next(e[1] for e in events if e[0] == "stream_end")
+    assert heat_start < stream_end
+    assert sorted(e[1] for e in events if e[0] == "tool_start") == ["Heat", "Ronin"]
+
+
+@pytest.mark.asyncio
+async def test_final_answer_is_streamed_to_callback(tmp_path: Path, make_agent):
+    class StreamingLLM:
+        def __init__(self):
+            self.turn = 0
+
+        async def astream_chat_deltas(self, **kwargs):
+            self.turn += 1
+            if self.turn == 1:
+                # A preamble followed by a tool call never reaches the sink
+                yield {"content": "Let me check. "}
+                yield {"tool_calls": [_frag(0, id="t1", name="tmdb_search", arguments='{"query": "Heat"}')]}
+            else:
+                for part in ("Heat ", "(1995)"):
+                    yield {"content": part}
+
+    class Sink:
+        def __init__(self):
+            self.parts = []
+            self.resets = 0
+
+        async def __call__(self, chunk):
+            self.parts.append(chunk)
+
+        def reset(self):
+            self.resets += 1
+            self.parts.clear()
+
+    async def tmdb_search(args):
+        return {"results": [{"title": "Heat"}]}
+
+    agent = make_agent(StreamingLLM(), {"tmdb_search": tmdb_search})
+    sink = Sink()
+
+    resp = await agent.aconverse([{"role": "user", "content": "tell me about Michael Mann's best film"}], stream_final_to_callback=sink)
+
+    assert resp.choices[0].message.content == "Heat (1995)"
+    # Tools were offered on the answering turn, so its text arrives once the stream ends
+    assert sink.resets == 0
+    assert sink.parts == ["Heat (1995)"]
+
+
+@pytest.mark.asyncio
+async def test_fallback_reuses_calls_dispatched_before_the_stream_failed(tmp_path: Path, make_agent):
+    (tmp_path / "config").mkdir()
+    (tmp_path / "config" / "config.yaml").write_text("llm:\n  streamToolCalls: true\n", encoding="utf-8")
+    started = []
+    seen_ids = []
+
+    class FlakyStreamLLM:
+        def __init__(self):
+            self.turn = 0
+
+        async def astream_chat_deltas(self, **kwargs):
+            self.turn += 1
+            if self.turn > 1:
+                yield {"content": "Heat (1995)."}
+                return
+            yield {"tool_calls": [_frag(0, id="s1", name="tmdb_search", arguments='{"query": "Heat"}')]}
+            raise ConnectionError("stream dropped")
+
+        async def achat(self, **kwargs):
+            # The non-streaming retry names the same call with a fresh id and reordered JSON
+            tc = SimpleNamespace(id="r1", type="function", function=SimpleNamespace(name="tmdb_search", arguments='{ "query":"Heat" }'))
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=None, tool_calls=[tc]))])
+
+    async def tmdb_search(args):
+        started.append(args["query"])
+        await asyncio.sleep(0.05)
+        return {"results": [{"title": "Heat"}]}
+
+    agent = make_agent(FlakyStreamLLM(), {"tmdb_search": tmdb_search})
+    orig = agent._process_results_async
+
+    async def process(results):
+        seen_ids.extend(r[0] for r in results)
+        return await orig(results)
+
+    agent._process_results_async = process
+    resp = await agent.aconverse([{"role": "user", "content": "tell me about Michael Mann's Heat"}])
+
+    assert resp.choices[0].message.content == "Heat (1995)."
+    assert started == ["Heat"] and seen_ids == ["r1"]
+
+
+@pytest.mark.asyncio
+async def test_failed_turn_cancels_calls_still_running(tmp_path: Path, make_agent):
+    (tmp_path / "config").mkdir()
+    (tmp_path / "config" / "config.yaml").write_text("llm:\n  streamToolCalls: true\n", encoding="utf-8")
+    cancelled = []
+
+    class BrokenLLM:
+        async def astream_chat_deltas(self, **kwargs):
+            yield {"tool_calls": [_frag(0, id="s1", name="tmdb_search", arguments='{"query": "Heat"}')]}
+            raise ConnectionError("stream dropped")
+
+        async def achat(self, **kwargs):
+            raise RuntimeError("provider down")
+
+    async def tmdb_search(args):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(args["query"])
+            raise
+
+    agent = make_agent(BrokenLLM(), {"tmdb_search": tmdb_search})
+    with pytest.raises(RuntimeError):
+        await agent._arun_tools_loop([{"role": "user", "content": "tell me about Michael Mann's Heat"}], "m", "chat")
+    assert cancelled == ["Heat"] and agent._early_tasks == {}
@@ -0,0 +1,157 @@
+import asyncio
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from bot.tool_plan import PlanError, PlanExecutor, describe_tools, parse_plan, resolve_refs
+from llm.governor import Priority, current_priority
+
+
+def test_parse_plan_collects_refs_and_rejects_bad_graphs():
+    steps = parse_plan('```json\n{"steps": [{"id": 1, "tool": "tmdb_search", "args": {"query": "Dune"}},'
+                       ' {"id": 2, "tool": "radarr_lookup", "args": {"term": "tmdb:$1.results[0].id"}},'
+                       ' {"id": 3, "tool": "radarr_get_movies", "depends_on": [2]}]}\n```')
+    assert [s.depends_on for s in steps] == [set(), {1}, {2}]
+
+    with pytest.raises(PlanError):
+        parse_plan('{"steps": []}')
+    with pytest.raises(PlanError):
+        parse_plan([{"id": 1, "tool": "a", "args": {"x": "$2.id"}}, {"id": 2, "tool": "b", "args": {"y": "$1.id"}}])
+    with pytest.raises(PlanError):
+        parse_plan([{"id": 1, "tool": "a", "args": {"x": "$9.id"}}])
+    with pytest.raises(PlanError):
+        parse_plan([{"tool": "a"}] * 3, max_steps=2)
+
+
+def test_resolve_refs_keeps_types_for_whole_refs():
+    outputs = {1: {"results": [{"id": 438631, "title": "Dune"}]}, 2: [{"id": 4}]}
+    args = {"tmdb_id": "$1.results[0].id", "term": "tmdb:$1.results[0].id", "ids": ["$2[-1].id"]}
+    assert resolve_refs(args, outputs) == {"tmdb_id": 438631, "term": "tmdb:438631", "ids": [4]}
+    with pytest.raises(KeyError):
+        resolve_refs("$1.results[3].id", outputs)
+
+
+@pytest.mark.asyncio
+async def test_executor_runs_independent_steps_in_parallel_and_skips_dependents_of_failures():
+    started = []
+
+    async def run_tool(step, args):
+        started.append(step.tool)
+        await asyncio.sleep(0.05)
+        if step.tool == "bad":
+            return {"ok": False, "error": "boom"}
+        return {"value": step.id, "args": args}
+
+    steps = parse_plan([
+        {"id": 1, "tool": "a"},
+        {"id": 2, "tool": "b"},
+        {"id": 3, "tool": "bad"},
+        {"id": 4, "tool": "c", "args": {"from_a": "$1.value"}},
+        {"id": 5, "tool": "d", "args": {"x": "$3.value"}},
+    ])
+    t0 = asyncio.get_running_loop().time()
+    run = await PlanExecutor(run_tool).run(steps)
+    elapsed = asyncio.get_running_loop().time() - t0
+
+    assert elapsed < 0.14  # two dependency levels, not five sequential calls
+    assert run.results[4].args == {"from_a": 1}
+    assert run.results[3].status == "failed" and run.results[3].error == "boom"
+    assert run.results[5].status == "skipped"
+    assert not run.ok and "d" not in started
+
+
+def test_describe_tools_marks_required():
+    tools = [{"type": "function", "function": {"name": "tmdb_search", "parameters": {"properties": {"query": {}, "year": {}}, "required": ["query"]}}}]
+    assert describe_tools(tools) == "- tmdb_search(query*, year)"
+
+
+def _mk_choice(content=None, tool_calls=None):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content, tool_calls=tool_calls))])
+
+
+@pytest.mark.asyncio
+async def test_agent_plan_mode_executes_dag_with_two_llm_calls(tmp_path: Path, make_agent):
+    (tmp_path / "config").mkdir()
+    (tmp_path / "config" / "config.yaml").write_text(
+        "llm:\n  planMode:\n    enabled: true\n    complexities: [unknown]\n", encoding="utf-8"
+    )
+    plan = {"steps": [
+        {"id": 1, "tool": "tmdb_search", "args": {"query": "Dune"}},
+        {"id": 2, "tool": "tmdb_movie_details", "args": {"movie_id": "$1.results[0].id"}},
+    ]}
+    scripted = [_mk_choice(content=json.dumps(plan)), _mk_choice(content="Dune (2021) runs 155 minutes.")]
+    llm_calls = []
+
+    class FakeLLM:
+        async def achat(self, **kwargs):
+            llm_calls.append(kwargs)
+            return scripted.pop(0)
+
+    seen = []
+
+    async def tmdb_search(args):
+        seen.append(("tmdb_search", args))
+        return {"results": [{"id": 438631, "title": "Dune"}]}
+
+    async def tmdb_movie_details(args):
+        seen.append(("tmdb_movie_details", args))
+        return {"id": args["movie_id"], "runtime": 155}
+
+    agent = make_agent(FakeLLM(), {"tmdb_search": tmdb_search, "tmdb_movie_details": tmdb_movie_details})
+    resp = await agent.aconverse([{"role": "user", "content": "how long is the movie Dune?"}])
+
+    assert resp.choices[0].message.content == "Dune (2021) runs 155 minutes."
+    assert seen == [("tmdb_search", {"query": "Dune"}), ("tmdb_movie_details", {"movie_id": 438631})]
+    assert len(llm_calls) == 2
+    final_roles = [m["role"] for m in llm_calls[1]["messages"]]
+    assert final_roles.count("tool") == 2
+
+
+@pytest.mark.asyncio
+async def test_planned_write_needs_an_id_from_a_lookup(tmp_path: Path, make_agent):
+    guessed = {"steps": [{"id": 1, "tool": "radarr_add_movie", "args": {"tmdb_id": 438631}}]}
+    looked_up = {"steps": [
+        {"id": 1, "tool": "tmdb_search", "args": {"query": "Dune"}},
+        {"id": 2, "tool": "radarr_add_movie", "args": {"tmdb_id": "$1.results[0].id"}},
+    ]}
+    scripted = [_mk_choice(content=json.dumps(guessed)), _mk_choice(content=json.dumps(looked_up)), _mk_choice(content="Added Dune.")]
+
+    class FakeLLM:
+        async def achat(self, **kwargs):
+            return scripted.pop(0)
+
+    added = []
+
+    async def tmdb_search(args):
+        return {"results": [{"id": 438631, "title": "Dune"}]}
+
+    async def radarr_get_movies(args):
+        return {"movies": []}
+
+    async def radarr_add_movie(args):
+        added.append(args)
+        return {"id": 12, "title": "Dune", "tmdbId": args["tmdb_id"], "monitored": True}
+
+    agent = make_agent(FakeLLM(), {"tmdb_search": tmdb_search, "radarr_get_movies": radarr_get_movies, "radarr_add_movie": radarr_add_movie})
+    msgs = [{"role": "user", "content": "add the movie Dune to radarr"}]
+    assert await agent._run_plan_mode(list(msgs), "m", "chat", True, {}, {}) is None
+    assert added == []
+    resp, wrote, calls = await agent._run_plan_mode(list(msgs), "m", "chat", True, {}, {})
+    assert resp.choices[0].message.content == "Added Dune." and wrote and calls == 2
+    assert added == [{"tmdb_id": 438631}]
+
+
+@pytest.mark.asyncio
+async def test_planning_turn_is_admitted_as_tool_selection(tmp_path: Path, make_agent):
+    seen = []
+
+    class FakeLLM:
+        async def achat(self, **kwargs):
+            seen.append(current_priority())
+            return _mk_choice(content="not a plan")
+
+    agent = make_agent(FakeLLM(), {})
+    assert await agent._run_plan_mode([{"role": "user", "content": "how long is Dune?"}], "m", "chat", False, {}, {}) is None
+    assert seen == [Priority.TOOL_SELECTION]
@@ -1,4 +1,16 @@
-from bot.tool_summarizers import summarize_tool_result
+import asyncio
+import json
+
+import pytest
+
+from bot.tool_summarizers import (
+    get_summarizer,
+    summarize_tool_result,
+    summarize_tool_result_bytes,
+    summarize_tool_result_bytes_async,
+    tabulate,
+    untabulate,
+)
 
 
 def test_summarize_plex_items_truncates_and_keeps_keys():
@@ -18,3 +30,76 @@ def test_default_truncates_top_level_list():
     res = {"data": list(range(10))}
     out = summarize_tool_result("unknown_tool", res, max_items=4)
     assert len(out["data"]) == 4
+
+
+@pytest.mark.parametrize("name,res", [
+    ("search_plex", {"items": [{"title": "A", "year": 2020, "ratingKey": 1, "extra": 1}] * 8, "total_found": 8, "response_level": "minimal"}),
+    ("radarr_get_movies", {"movies": [{"id": i, "title": f"M{i}", "tmdbId": i, "path": "/x"} for i in range(8)]}),
+    ("tmdb_search", {"page": 1, "results": [{"id": 1, "title": "Ü"}] * 8}),
+    ("tmdb_movie_details", {"id": 1, "title": "Heat", "genres": [{"id": 80}]}),
+    ("read_household_preferences", {"likes": ["heist"], "other": 1}),
+    ("get_plex_item_details", {"item": {"title": "Heat", "year": 1995, "file": "/m"}}),
+    ("unknown_tool", {"data": list(range(10)), "n": 10}),
+    ("unknown_tool", ["not", "a", "dict"]),
+])
+def test_bytes_match_object_summary(name, res):
+    assert json.loads(summarize_tool_result_bytes(name, res, max_items=3)) == summarize_tool_result(name, res, max_items=3)
+
+
+def test_byte_budget_drops_items_and_counts_them():
+    res = {"movies": [{"id": i, "title": f"Movie number {i}", "tmdbId": 1000 + i, "year": 2000, "hasFile": True} for i in range(5000)]}
+    raw = summarize_tool_result_bytes("radarr_get_movies", res, max_items=50, max_bytes=600)
+    out = json.loads(raw)
+    assert len(raw) <= 600
+    assert 0 < len(out["movies"]) < 50 and out["omitted"] == 50 - len(out["movies"])
+    assert out["movies"][0] == {"id": 0, "title": "Movie number 0", "tmdbId": 1000, "year": 2000, "hasFile": True}
+
+
+def test_summarizers_are_compiled_once_per_spec():
+    assert get_summarizer("search_plex") is get_summarizer("get_plex_on_deck")
+    assert get_summarizer("tmdb_search") is get_summarizer("tmdb_trending")
+
+
+@pytest.mark.asyncio
+async def test_large_results_are_summarized_off_the_loop(monkeypatch):
+    offloaded = []
+    real = asyncio.to_thread
+
+    async def spy(fn, *args, **kwargs):
+        offloaded.append(args[0])
+        return await real(fn, *args, **kwargs)
+
+    monkeypatch.setattr("bot.tool_summarizers.asyncio.to_thread", spy)
+    small = {"movies": [{"id": 1}]}
+    big = {"movies": [{"id": i} for i in range(100)]}
+    await summarize_tool_result_bytes_async("radarr_get_movies", small, offload_min_items=50)
+    raw = await summarize_tool_result_bytes_async("radarr_get_movies", big, max_items=2, offload_min_items=50)
+    assert offloaded == ["radarr_get_movies"] and json.loads(raw) == {"movies": [{"id": 0}, {"id": 1}]}
+
+
+def test_tabular_lists_round_trip_and_shrink():
+    res = {"page": 1, "results": [{"id": i, "title": f"T{i}", "vote_average": 7.0, "release_date": "2024-01-01"} for i in range(6)]}
+    plain = summarize_tool_result_bytes("tmdb_search", res, max_items=5)
+    table = summarize_tool_result_bytes("tmdb_search", res, max_items=5, tabular_min_rows=3)
+    out = json.loads(table)
+    assert out["results"]["cols"] == ["id", "title", "vote_average", "release_date"]
+    assert out["results"]["rows"][0] == [0, "T0", 7.0, "2024-01-01"]
+    assert untabulate(out["results"]) == json.loads(plain)["results"]
+    assert out == summarize_tool_result("tmdb_search", res, max_items=5, tabular_min_rows=3)
+    assert len(table) < len(plain)
+
+
+def test_tabular_skips_short_or_ragged_lists():
+    short = {"movies": [{"id": 1, "title": "A"}, {"id": 2, "title": "B"}]}
+    assert isinstance(json.loads(summarize_tool_result_bytes("radarr_get_movies", short, tabular_min_rows=3))["movies"], list)
+    ragged = {"data": [{"a": 1}, {"b": 2}, {"c": 3}]}
+    assert tabulate(ragged["data"]) == ragged["data"]
+    assert untabulate([1, 2]) == [1, 2]
+
+
+def test_tabular_rows_respect_byte_budget():
+    res = {"movies": [{"id": i, "title": f"Movie number {i}", "tmdbId": 1000 + i, "year": 2000, "hasFile": True} for i in range(500)]}
+    raw = summarize_tool_result_bytes("radarr_get_movies", res, max_items=50, max_bytes=400, tabular_min_rows=3)
+    out = json.loads(raw)
+    assert len(raw) <= 400
+    assert out["omitted"] == 50 - len(out["movies"]["rows"]) and out["movies"]["rows"][0][1] == "Movie number 0"
@@ -0,0 +1,156 @@
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from bot.agent import Agent
+from bot.workers.radarr import RadarrWorker
+from bot.workers.sonarr import SonarrWorker
+from bot.write_hooks import get_write_hooks
+from integrations.ttl_cache import shared_cache
+
+
+def _reader(library):
+    async def read(tool, args):
+        return library[tool]
+    return read
+
+
+@pytest.mark.asyncio
+async def test_radarr_preflight_short_circuits_duplicates_and_bad_ids():
+    hooks = get_write_hooks("radarr_add_movie")
+    read = _reader({"radarr_get_movies": {"movies": [{"id": 7, "title": "Heat", "tmdbId": 949, "overview": "..."}]}})
+    dup = await hooks.preflight({"tmdb_id": 949}, read)
+    assert dup["already_exists"] and dup["movie"] == {"id": 7, "title": "Heat", "tmdbId": 949}
+    assert dup["verification"]["verified"]
+    assert await hooks.preflight({"tmdb_id": 438631}, read) is None
+    assert (await hooks.preflight({"tmdb_id": "dune"}, read))["error"] == "invalid_arguments"
+
+
+@pytest.mark.asyncio
+async def test_verify_checks_the_returned_resource():
+    hooks = get_write_hooks("sonarr_add_series")
+    ok = await hooks.verify({"tvdb_id": 81189, "monitored": True}, {"id": 3, "tvdbId": 81189, "monitored": True}, _reader({}))
+    assert ok["verified"] and not ok["problems"]
+    bad = await hooks.verify({"tvdb_id": 81189, "monitored": True}, {"id": 3, "tvdbId": 1, "monitored": False}, _reader({}))
+    assert not bad["verified"] and len(bad["problems"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_worker_writes_drop_cached_listings(tmp_path: Path, monkeypatch):
+    radarr, sonarr = RadarrWorker(tmp_path), SonarrWorker(tmp_path)
+    fetched = []
+
+    async def get_series(series_id=None):
+        fetched.append(series_id)
+        return [{"id": 3, "tvdbId": 81189}]
+
+    async def noop(*args, **kwargs):
+        return {}
+
+    monkeypatch.setattr(radarr.client, "delete_movie", noop)
+    monkeypatch.setattr(sonarr.client, "get_series", get_series)
+    monkeypatch.setattr(sonarr.client, "delete_series", noop)
+    try:
+        shared_cache.set("radarr:movies:all", {"movies": [{"id": 12, "tmdbId": 438631}]}, 120)
+        shared_cache.set("radarr:movies:12", {"movies": {"id": 12}}, 300)
+        await radarr.delete_movie(movie_id=12, delete_files=False, add_import_list_exclusion=False)
+        assert shared_cache.get("radarr:movies:all") is None and shared_cache.get("radarr:movies:12") is None
+
+        await sonarr.get_series()
+        await sonarr.get_series()
+        assert fetched == [None]
+        await sonarr.delete_series(series_id=3, delete_files=False, add_import_list_exclusion=False)
+        await sonarr.get_series()
+        assert fetched == [None, None]
+    finally:
+        shared_cache.delete_where(lambda key: key.startswith(("radarr:movies:", "sonarr:series:")))
+
+
+def _tool_call(call_id, name, args):
+    return SimpleNamespace(id=call_id, type="function", function=SimpleNamespace(name=name, arguments=json.dumps(args)))
+
+
+def _mk_choice(content=None, tool_calls=None):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content, tool_calls=tool_calls))])
+
+
+class ScriptedAddMovieLLM:
+    """Search, then add, then (when asked for validation) read the library, then answer."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def achat(self, *, messages, tools=None, **kwargs):
+        self.calls += 1
+        called = [tc["function"]["name"] for m in messages if m.get("role") == "assistant" for tc in m.get("tool_calls") or []]
+        if tools is None or "radarr_get_movies" in called:
+            return _mk_choice(content="Added Dune (2021) to Radarr.")
+        if "tmdb_search" not in called:
+            return _mk_choice(tool_calls=[_tool_call("c1", "tmdb_search", {"query": "Dune"})])
+        if "radarr_add_movie" not in called:
+            return _mk_choice(tool_calls=[_tool_call("c2", "radarr_add_movie", {"tmdb_id": 438631})])
+        return _mk_choice(tool_calls=[_tool_call("c3", "radarr_get_movies", {})])
+
+
+class GuessingAddMovieLLM(ScriptedAddMovieLLM):
+    """Adds a made-up tmdb id before searching, then follows the scripted flow."""
+
+    def __init__(self):
+        super().__init__()
+        self.guessed = False
+
+    async def achat(self, *, messages, tools=None, **kwargs):
+        if not self.guessed:
+            self.guessed = True
+            self.calls += 1
+            return _mk_choice(tool_calls=[_tool_call("c0", "radarr_add_movie", {"tmdb_id": 999})])
+        return await super().achat(messages=messages, tools=tools, **kwargs)
+
+
+async def _run_add_flow(tmp_path: Path, monkeypatch, make_agent, hooks_enabled: bool, llm=None):
+    (tmp_path / "config").mkdir(parents=True, exist_ok=True)
+    (tmp_path / "config" / "config.yaml").write_text(
+        f"tools:\n  writeHooks:\n    enabled: {str(hooks_enabled).lower()}\nllm:\n  planMode:\n    enabled: false\n", encoding="utf-8"
+    )
+    library = {"movies": []}
+    added = []
+
+    async def tmdb_search(args):
+        return {"results": [{"id": 438631, "title": "Dune", "year": 2021}]}
+
+    async def radarr_get_movies(args):
+        return library
+
+    async def radarr_add_movie(args):
+        added.append(args)
+        movie = {"id": 12, "title": "Dune", "tmdbId": args["tmdb_id"], "monitored": True}
+        library["movies"].append(movie)
+        return movie
+
+    tools = {"tmdb_search": tmdb_search, "radarr_get_movies": radarr_get_movies, "radarr_add_movie": radarr_add_movie}
+    llm = llm or ScriptedAddMovieLLM()
+    # Heuristic classification budgets 3 iterations for write requests (the default estimate is 2)
+    monkeypatch.setattr(Agent, "_classify_query_complexity_local", lambda self, msgs, rc: self._classify_query_complexity_heuristic(msgs))
+    agent = make_agent(llm, tools, project_root=tmp_path)
+    resp = await agent.aconverse([{"role": "user", "content": "please add the movie Dune to radarr"}])
+    return resp, llm.calls, added
+
+
+@pytest.mark.asyncio
+async def test_verified_write_skips_the_validation_turn(tmp_path: Path, monkeypatch, make_agent):
+    resp, hooked_calls, added = await _run_add_flow(tmp_path / "hooked", monkeypatch, make_agent, True)
+    assert resp.choices[0].message.content == "Added Dune (2021) to Radarr."
+    assert added == [{"tmdb_id": 438631}]
+    _, legacy_calls, _ = await _run_add_flow(tmp_path / "legacy", monkeypatch, make_agent, False)
+    # search, add, answer vs. search, add, validation read, answer
+    assert (hooked_calls, legacy_calls) == (3, 4)
+
+
+@pytest.mark.asyncio
+async def test_hooked_write_with_unsourced_id_waits_for_a_lookup(tmp_path: Path, monkeypatch, make_agent):
+    resp, calls, added = await _run_add_flow(tmp_path, monkeypatch, make_agent, True, llm=GuessingAddMovieLLM())
+    assert resp.choices[0].message.content == "Added Dune (2021) to Radarr."
+    # The guessed id never reaches Radarr; the id from tmdb_search does
+    assert added == [{"tmdb_id": 438631}] and calls == 4
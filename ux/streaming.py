@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+class StreamingMessageEditor:
+    """Progressively renders streamed text into one chat message.
+
+    - The first flush sends a new message; later flushes edit it
+    - Edits are coalesced to at most one per ``min_interval_s`` so a fast token
+      stream never trips platform rate limits (Discord allows ~5 edits / 5s)
+    - Flushing happens in a background task; feeding chunks never blocks the
+      model stream
+    - Records time-to-first-visible-token relative to ``started_at``
+
+    Instances are callable so they can be passed directly as a chunk callback,
+    and expose ``reset()`` for discarding text (and the preview already sent)
+    that turned out not to be final.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[str], Awaitable[Any]],
+        edit: Callable[[Any, str], Awaitable[Any]],
+        *,
+        min_interval_s: float = 1.0,
+        max_chars: int = 2000,
+        cursor: str = " ▌",
+        started_at: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._send = send
+        self._edit = edit
+        self.min_interval_s = max(0.0, float(min_interval_s))
+        self.max_chars = int(max_chars)
+        self.cursor = cursor
+        self._clock = clock
+        self.started_at = started_at if started_at is not None else clock()
+        self._parts: List[str] = []
+        self._handle: Any = None
+        self._dirty = False
+        self._closed = False
+        self._next_allowed = 0.0
+        self._flusher: Optional[asyncio.Task] = None
+        # Bumped by reset(); a flush started before it never touches the new preview
+        self._generation = 0
+        self._discards: List[asyncio.Task] = []
+        self.first_visible_at: Optional[float] = None
+        self.edits = 0
+        self.chunks = 0
+        self._log = logging.getLogger("moviebot.ux.streaming")
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+    @property
+    def message(self) -> Any:
+        return self._handle
+
+    async def __call__(self, chunk: str) -> None:
+        if not chunk or self._closed:
+            return
+        self._parts.append(chunk)
+        self.chunks += 1
+        self._dirty = True
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_loop())
+
+    def reset(self) -> None:
+        """Drop streamed text that turned out not to be final; the next chunk starts a new message.
+
+        A preview already sent is deleted in the background.
+        """
+        self._parts.clear()
+        self._dirty = False
+        self._generation += 1
+        handle, self._handle = self._handle, None
+        self._flusher = None
+        self.first_visible_at = None
+        if handle is not None:
+            self._discards.append(asyncio.create_task(self._delete(handle)))
+
+    async def _delete(self, handle: Any) -> None:
+        try:
+            delete = getattr(handle, "delete", None)
+            if delete is not None:
+                await delete()
+        except Exception as e:
+            self._log.debug(f"streaming preview delete failed: {e}")
+
+    def _render(self) -> str:
+        limit = max(1, self.max_chars - len(self.cursor))
+        text = self.text
+        if len(text) > limit:
+            text = text[: limit - 1] + "…"
+        return text + self.cursor
+
+    async def _flush_loop(self) -> None:
+        generation = self._generation
+        try:
+            while self._dirty and not self._closed and generation == self._generation:
+                wait = self._next_allowed - self._clock()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                    if self._closed or generation != self._generation:
+                        return
+                if not self._dirty or not self.text.strip():
+                    return
+                self._dirty = False
+                rendered = self._render()
+                if self._handle is None:
+                    sent = await self._send(rendered)
+                    if generation != self._generation:
+                        # Reset while the preview was being sent
+                        await self._delete(sent)
+                        return
+                    self._handle = sent
+                    self.first_visible_at = self._clock()
+                else:
+                    await self._edit(self._handle, rendered)
+                    self.edits += 1
+                self._next_allowed = self._clock() + self.min_interval_s
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Streaming is a UX nicety; the final reply path still delivers the text
+            self._log.debug(f"streaming edit failed: {e}")
+
+    async def finalize(self, text: str) -> Any:
+        """Stop streaming and render the authoritative final text.
+
+        Returns the streamed message when it now shows ``text``; returns None when
+        nothing was sent or ``text`` does not fit, so the caller sends normally.
+        """
+        self._closed = True
+        if self._flusher is not None and not self._flusher.done():
+            try:
+                # Let an in-flight send complete so we do not orphan a message
+                await asyncio.wait_for(asyncio.shield(self._flusher), timeout=max(2.0, self.min_interval_s * 2))
+            except Exception:
+                self._flusher.cancel()
+        if self._discards:
+            await asyncio.gather(*self._discards, return_exceptions=True)
+            self._discards.clear()
+        if self._handle is None:
+            return None
+        if not text or len(text) > self.max_chars:
+            await self._delete(self._handle)
+            self._handle = None
+            return None
+        try:
+            wait = self._next_allowed - self._clock()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            await self._edit(self._handle, text)
+            self.edits += 1
+        except Exception as e:
+            self._log.debug(f"final streaming edit failed: {e}")
+            return None
+        return self._handle
+
+    def metrics(self) -> Dict[str, Any]:
+        ttfv = None
+        if self.first_visible_at is not None:
+            ttfv = int((self.first_visible_at - self.started_at) * 1000)
+        return {"first_visible_ms": ttfv, "edits": self.edits, "chunks": self.chunks, "chars": len(self.text)}